@@ -3,6 +3,10 @@
 Base Watcher Class
 Abstract base class for all watcher implementations
 Provides common functionality: logging, file creation, duplicate tracking, continuous running
+
+New events are still written to Needs_Action (the durable hand-off), and
+are also announced to a running orchestrator as 'watcher.event.detected'
+over its EventBus socket so it does not wait for the next folder poll.
 """
 
 import os
@@ -12,10 +16,38 @@ import time
 from abc import ABC, abstractmethod
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Set
+from typing import Dict, List, Optional
 import signal
 import sys
 
+# The orchestrator's EventBus transport module, imported on first use
+_event_transport = None
+
+
+def load_event_transport():
+    """
+    Import the orchestrator's EventBus transport (stdlib only)
+
+    Imported on first publish rather than with this module, so watchers do
+    not depend on the orchestrator layout until they announce an event.
+
+    Returns:
+        The event_transport module, or None if the orchestrator is not
+        installed (the watcher then relies on the Needs_Action file drop)
+    """
+    global _event_transport
+    if _event_transport is None:
+        # Appended, so the watcher's own modules keep precedence
+        vault_dir = str(Path(__file__).parent.parent.parent)
+        if vault_dir not in sys.path:
+            sys.path.append(vault_dir)
+        try:
+            from Skills.integration_orchestrator.core import event_transport
+        except ImportError:
+            return None
+        _event_transport = event_transport
+    return _event_transport
+
 
 class BaseWatcher(ABC):
     """Abstract base class for all watchers"""
@@ -26,7 +58,8 @@ class BaseWatcher(ABC):
         needs_action_dir: str = "../../Needs_Action",
         logs_dir: str = "../../Logs",
         check_interval: int = 300,  # 5 minutes default
-        keywords: Optional[List[str]] = None
+        keywords: Optional[List[str]] = None,
+        max_processed_ids: int = 5000
     ):
         """
         Initialize base watcher
@@ -37,6 +70,8 @@ class BaseWatcher(ABC):
             logs_dir: Path to Logs directory
             check_interval: Seconds between checks
             keywords: List of keywords to filter for
+            max_processed_ids: Processed IDs to remember; the oldest are
+                forgotten first
         """
         self.name = name
         self.base_dir = Path(__file__).parent.parent.parent
@@ -46,8 +81,10 @@ class BaseWatcher(ABC):
         self.keywords = [k.lower() for k in (keywords or [])]
 
         # Tracking file for processed items
+        # processed_ids is an insertion-ordered dict used as a bounded set
         self.tracking_file = Path(__file__).parent / f"{name}_processed.json"
-        self.processed_ids: Set[str] = set()
+        self.max_processed_ids = max_processed_ids
+        self.processed_ids: Dict[str, None] = {}
 
         # Running state
         self.running = False
@@ -55,6 +92,7 @@ class BaseWatcher(ABC):
         # Setup
         self._setup_directories()
         self._setup_logging()
+        self.event_client = None
         self._load_processed_ids()
         self._setup_signal_handlers()
 
@@ -94,20 +132,45 @@ class BaseWatcher(ABC):
         self.logger.addHandler(file_handler)
         self.logger.addHandler(console_handler)
 
+    def publish_event(self, event_id: str, filename: str, metadata: Dict[str, str]) -> bool:
+        """
+        Announce a new action file to the orchestrator
+
+        Returns:
+            True if the orchestrator received it, False if only the file drop remains
+        """
+        if self.event_client is None:
+            transport = load_event_transport()
+            if transport is None:
+                return False
+            # Connects lazily, on its first publish
+            self.event_client = transport.EventBusClient(
+                self.logs_dir / transport.EVENT_SOCKET_NAME, self.logger
+            )
+        return self.event_client.publish('watcher.event.detected', {
+            'watcher': self.name,
+            'event_id': event_id,
+            'filename': filename,
+            'filepath': str(self.needs_action_dir / filename),
+            'metadata': metadata,
+            'timestamp': datetime.utcnow().isoformat() + 'Z'
+        })
+
     def _load_processed_ids(self):
         """Load processed IDs from tracking file"""
         try:
             if self.tracking_file.exists():
                 with open(self.tracking_file, 'r') as f:
                     data = json.load(f)
-                    self.processed_ids = set(data)
+                    # Tracking file is a list, oldest first
+                    self.processed_ids = dict.fromkeys(data[-self.max_processed_ids:])
                 self.logger.info(f"Loaded {len(self.processed_ids)} processed IDs")
             else:
-                self.processed_ids = set()
+                self.processed_ids = {}
                 self.logger.info("No existing tracking file, starting fresh")
         except Exception as e:
             self.logger.error(f"Error loading processed IDs: {e}")
-            self.processed_ids = set()
+            self.processed_ids = {}
 
     def _save_processed_ids(self):
         """Save processed IDs to tracking file"""
@@ -133,7 +196,13 @@ class BaseWatcher(ABC):
 
     def mark_processed(self, item_id: str):
         """Mark item as processed"""
-        self.processed_ids.add(item_id)
+        self.processed_ids.pop(item_id, None)
+        self.processed_ids[item_id] = None
+
+        # Forget the oldest IDs once over the limit
+        while len(self.processed_ids) > self.max_processed_ids:
+            del self.processed_ids[next(iter(self.processed_ids))]
+
         self._save_processed_ids()
 
     def contains_keyword(self, text: str) -> bool:
@@ -250,6 +319,10 @@ class BaseWatcher(ABC):
                     processed_count += 1
                     self.logger.info(f"Processed event: {event_id}")
 
+                    # Orchestrator down: it finds the file on its next poll
+                    if not self.publish_event(event_id, filename, metadata):
+                        self.logger.debug("Orchestrator not reachable, relying on file drop")
+
             except Exception as e:
                 self.logger.error(f"Error processing event: {e}")
                 continue
@@ -310,6 +383,8 @@ class BaseWatcher(ABC):
         finally:
             self.logger.info("Shutting down...")
             self.cleanup()
+            if self.event_client:
+                self.event_client.close()
             self.logger.info("Shutdown complete")
 
 
@@ -2,6 +2,9 @@
 """
 Watcher Manager
 Runs multiple watchers concurrently in separate processes
+
+Each watcher publishes new events to the orchestrator's EventBus socket
+(Logs/event_bus.sock) and writes them to Needs_Action as the fallback.
 """
 
 import sys
@@ -19,6 +22,7 @@ from linkedin_watcher import LinkedInWatcher
 from facebook_watcher import FacebookWatcher
 from instagram_watcher import InstagramWatcher
 from twitter_watcher import TwitterWatcher
+import base_watcher
 
 
 class WatcherManager:
@@ -51,6 +55,16 @@ class WatcherManager:
 
         self.running = True
 
+        socket_path = None
+        transport = base_watcher.load_event_transport()
+        if transport is not None:
+            socket_path = Path(__file__).parent.parent.parent / "Logs" / transport.EVENT_SOCKET_NAME
+        if socket_path and socket_path.exists():
+            print(f"Publishing watcher events to orchestrator: {socket_path}")
+        else:
+            print("Orchestrator socket not found - watchers use Needs_Action file drops")
+        print()
+
         # Start Gmail Watcher
         try:
             self.start_watcher(
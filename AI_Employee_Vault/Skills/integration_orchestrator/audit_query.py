@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Audit Query
+============
+
+Searches the audit trail newest-first by event type, actor, action,
+resource, result, metadata and time range, one page at a time.
+
+Usage:
+    python3 audit_query.py --resource linkedin_post --result failure
+    python3 audit_query.py --actor user --meta channel=email --limit 20
+    python3 audit_query.py --since 24 --cursor audit-2026-03-01.jsonl@1048576
+    python3 audit_query.py --interactive
+
+Interactive mode reads filters as field=value tokens (metadata keys as
+meta.key=value, plus since=<hours>). Enter or 'n' shows the next page,
+'q' quits.
+"""
+
+import sys
+import json
+import shlex
+import logging
+import argparse
+from pathlib import Path
+from datetime import datetime, timedelta
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from Skills.integration_orchestrator.core import AuditLogger
+from Skills.integration_orchestrator.core.audit_segments import MANIFEST_NAME
+
+FIELDS = ('event_type', 'actor', 'action', 'resource', 'result')
+
+
+def _metadata_value(raw: str):
+    """Metadata values are JSON when they parse (numbers, booleans), else strings"""
+    try:
+        return json.loads(raw)
+    except ValueError:
+        return raw
+
+
+def _print_page(page, show_metadata: bool):
+    for entry in page['entries']:
+        line = (f"{entry.get('timestamp', '')}  {entry.get('event_type', '')}  "
+                f"{entry.get('actor', '')}  {entry.get('action', '')}  "
+                f"{entry.get('resource', '')}  {entry.get('result', '')}")
+        if show_metadata and entry.get('metadata'):
+            line += f"  {json.dumps(entry['metadata'])}"
+        print(line)
+    print(f"-- {len(page['entries'])} entries ({page['scanned']} lines parsed, "
+          f"{page['blocks']} blocks read)"
+          + (f", next cursor: {page['next_cursor']}" if page['next_cursor'] else ", end of results"))
+
+
+def _parse_filters(tokens):
+    """Turn field=value tokens into search() keyword arguments"""
+    filters = {}
+    metadata = {}
+    for token in tokens:
+        field, sep, value = token.partition('=')
+        if not sep:
+            raise ValueError(f"Expected field=value, got '{token}'")
+        if field in FIELDS:
+            filters[field] = value
+        elif field.startswith('meta.'):
+            metadata[field[5:]] = _metadata_value(value)
+        elif field == 'since':
+            filters['start_time'] = datetime.utcnow() - timedelta(hours=float(value))
+        else:
+            raise ValueError(f"Unknown field '{field}' (use {', '.join(FIELDS)}, meta.<key>, since)")
+    if metadata:
+        filters['metadata'] = metadata
+    return filters
+
+
+def interactive(audit_logger: AuditLogger, limit: int, show_metadata: bool):
+    """Read filters, then page through results until a new query or 'q'"""
+    print(f"Filters as field=value ({', '.join(FIELDS)}, meta.<key>, since=<hours>); "
+          f"Enter/n = next page, q = quit")
+    filters = None
+    cursor = None
+
+    while True:
+        try:
+            command = input("audit> ").strip()
+        except (EOFError, KeyboardInterrupt):
+            print()
+            return
+
+        if command == 'q':
+            return
+        if command in ('', 'n'):
+            if filters is None:
+                continue
+            if cursor is None:
+                print("-- end of results")
+                continue
+        else:
+            try:
+                filters = _parse_filters(shlex.split(command))
+            except ValueError as e:
+                print(f"Error: {e}")
+                continue
+            cursor = None
+
+        page = audit_logger.search(limit=limit, cursor=cursor, **filters)
+        _print_page(page, show_metadata)
+        cursor = page['next_cursor']
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search the audit trail newest-first")
+    parser.add_argument('--logs-dir', type=Path,
+                        default=Path(__file__).parent.parent.parent / "Logs",
+                        help='Directory holding the audit log')
+    for field in FIELDS:
+        parser.add_argument(f"--{field.replace('_', '-')}", dest=field)
+    parser.add_argument('--meta', action='append', default=[], metavar='KEY=VALUE',
+                        help='Metadata key that must equal VALUE (repeatable)')
+    parser.add_argument('--since', type=float, metavar='HOURS', help='Only the last HOURS hours')
+    parser.add_argument('--limit', type=int, default=50, help='Entries per page')
+    parser.add_argument('--cursor', help='Cursor printed by the previous page')
+    parser.add_argument('--metadata', action='store_true', help='Print entry metadata')
+    parser.add_argument('--interactive', '-i', action='store_true', help='Interactive pager')
+    args = parser.parse_args()
+
+    logger = logging.getLogger("audit_query")
+    # Read the layout the orchestrator writes; leave the manifest and compression to it
+    segmented = (args.logs_dir / MANIFEST_NAME).exists()
+    audit_logger = AuditLogger(args.logs_dir, logger, segmented=segmented, read_only=segmented)
+
+    try:
+        if args.interactive:
+            interactive(audit_logger, args.limit, args.metadata)
+            return
+
+        tokens = [f"{field}={getattr(args, field)}" for field in FIELDS if getattr(args, field)]
+        tokens += [f"meta.{item}" for item in args.meta]
+        if args.since is not None:
+            tokens.append(f"since={args.since}")
+        try:
+            filters = _parse_filters(tokens)
+            page = audit_logger.search(limit=args.limit, cursor=args.cursor, **filters)
+        except ValueError as e:
+            parser.error(str(e))
+        _print_page(page, args.metadata)
+    finally:
+        audit_logger.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -383,23 +383,38 @@ class SocialMediaAutomation:
             self.logger.error(f"Error discovering social skills: {e}")
             return []
 
+    def retry_social_post(self, platform: str, message: str, media: List[str],
+                          source_file: str) -> Dict[str, Any]:
+        """
+        Retry a failed social media post (RetryQueue 'social_post' resolver).
+
+        The RetryQueue owns the retry schedule, so this skips the
+        recently-attempted guard and does not enqueue another retry on failure.
+        """
+        return self._trigger_social_skill(platform=platform, message=message, media=media,
+                                          source_file=source_file, immediate=False,
+                                          retry_on_failure=False)
+
     def _trigger_social_skill(self, platform: str, message: str, media: List[str],
-                             source_file: str, immediate: bool):
+                             source_file: str, immediate: bool,
+                             retry_on_failure: bool = True) -> Dict[str, Any]:
         """
         Trigger a specific social media skill with failure recovery.
 
         Uses the orchestrator's social_adapter if available, otherwise
-        falls back to direct skill execution.
+        falls back to direct skill execution. With retry_on_failure=False
+        the post is attempted even if recently tried, and a failure is
+        returned without enqueueing a retry.
         """
+        tracking_key = f"social_{platform}_{source_file}"
         try:
-            tracking_key = f"social_{platform}_{source_file}"
-
             # Check if recently attempted
             with self.social_lock:
                 last_attempt = self.last_check_times.get(tracking_key)
-                if last_attempt and (datetime.utcnow() - last_attempt) < timedelta(minutes=10):
+                if (retry_on_failure and last_attempt
+                        and (datetime.utcnow() - last_attempt) < timedelta(minutes=10)):
                     self.logger.debug(f"Skipping {platform}, recently attempted")
-                    return
+                    return {'success': False, 'skipped': True, 'error': 'Recently attempted'}
 
                 self.last_check_times[tracking_key] = datetime.utcnow()
 
@@ -451,7 +466,7 @@ class SocialMediaAutomation:
                         'immediate': immediate
                     }
                 )
-            else:
+            elif retry_on_failure:
                 # Handle failure
                 self._handle_social_post_failure(
                     platform=platform,
@@ -461,17 +476,23 @@ class SocialMediaAutomation:
                     tracking_key=tracking_key,
                     error=result.get('error', 'Unknown error') if result else 'No result'
                 )
+            else:
+                self.logger.warning(f"Social post retry failed: {platform} - {result.get('error')}")
+
+            return result
 
         except Exception as e:
             self.logger.error(f"Error triggering social skill {platform}: {e}", exc_info=True)
-            self._handle_social_post_failure(
-                platform=platform,
-                message=message,
-                media=media,
-                source_file=source_file,
-                tracking_key=f"social_{platform}_{source_file}",
-                error=str(e)
-            )
+            if retry_on_failure:
+                self._handle_social_post_failure(
+                    platform=platform,
+                    message=message,
+                    media=media,
+                    source_file=source_file,
+                    tracking_key=tracking_key,
+                    error=str(e)
+                )
+            return {'success': False, 'error': str(e)}
 
     def _handle_social_post_failure(self, platform: str, message: str, media: List[str],
                                    source_file: str, tracking_key: str, error: str):
@@ -505,12 +526,11 @@ class SocialMediaAutomation:
 
                 # Create retry operation
                 def retry_operation():
-                    return self._trigger_social_skill(
+                    return self.retry_social_post(
                         platform=platform,
                         message=message,
                         media=media,
-                        source_file=source_file,
-                        immediate=False
+                        source_file=source_file
                     )
 
                 self.retry_queue.enqueue(
@@ -519,6 +539,11 @@ class SocialMediaAutomation:
                         'name': f"social_{platform}",
                         'source_file': source_file,
                         'attempt': failure_count
+                    },
+                    descriptor={
+                        'kind': 'social_post',
+                        'params': {'platform': platform, 'message': message,
+                                   'media': media, 'source_file': source_file}
                     }
                 )
 
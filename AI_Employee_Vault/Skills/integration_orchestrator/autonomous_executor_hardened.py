@@ -875,6 +875,11 @@ class HardenedSocialMediaAutomation:
                             'name': f"social_{platform}",
                             'source_file': source_file,
                             'attempt': failure_count
+                        },
+                        descriptor={
+                            'kind': 'social_post',
+                            'params': {'platform': platform, 'message': message,
+                                       'media': media, 'source_file': source_file}
                         }
                     )
 
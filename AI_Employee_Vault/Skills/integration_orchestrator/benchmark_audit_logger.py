@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+AuditLogger Latency Benchmark
+==============================
+
+Measures the latency AuditLogger adds to SkillRegistry.execute_skill.
+The dispatcher resolves a missing skill, so no subprocess runs and the
+timings are dominated by registry bookkeeping, events and the audit write.
+The "added" columns subtract a run with a no-op audit logger.
+
+--gap-ms spaces calls out the way real skill runs are; with --gap-ms 0 the
+caller and the writer thread compete for the GIL on every call.
+
+Usage:
+    python3 benchmark_audit_logger.py
+    python3 benchmark_audit_logger.py --calls 20000 --gap-ms 0
+"""
+
+import sys
+import time
+import logging
+import argparse
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from Skills.integration_orchestrator.core import EventBus, RetryQueue, AuditLogger
+from Skills.integration_orchestrator.skills import SkillRegistry, SkillDispatcher
+
+CONFIGS = [
+    ('sync', {}),
+    ('async/always', {'async_writer': True, 'flush_policy': 'always'}),
+    ('async/entries=100', {'async_writer': True, 'flush_policy': 'entries', 'flush_entries': 100}),
+    ('async/interval=200ms', {'async_writer': True, 'flush_policy': 'interval',
+                              'flush_interval_ms': 200}),
+]
+
+
+class _NullAuditLogger:
+    def log_skill_execution(self, *args, **kwargs):
+        pass
+
+
+def _percentile(samples, pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+def measure(audit_logger, skills_dir: Path, calls: int, gap_ms: float):
+    """Return per-call execute_skill latencies in microseconds"""
+    logger = logging.getLogger("benchmark")
+    registry = SkillRegistry(SkillDispatcher(skills_dir, logger), EventBus(logger),
+                             RetryQueue(logger), audit_logger, logger)
+
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        registry.execute_skill('missing_skill', ['--flag'], retry_on_failure=False)
+        samples.append((time.perf_counter() - start) * 1e6)
+        if gap_ms:
+            time.sleep(gap_ms / 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AuditLogger latency benchmark")
+    parser.add_argument('--calls', type=int, default=5000)
+    parser.add_argument('--gap-ms', type=float, default=1.0,
+                        help='Idle time between execute_skill calls')
+    args = parser.parse_args()
+
+    logger = logging.getLogger("benchmark")
+    logger.setLevel(logging.CRITICAL)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        skills_dir = Path(tmpdir) / "Skills"
+        skills_dir.mkdir()
+
+        baseline = measure(_NullAuditLogger(), skills_dir, args.calls, args.gap_ms)
+        base_p50 = _percentile(baseline, 0.50)
+        base_p99 = _percentile(baseline, 0.99)
+
+        print("=" * 80)
+        print(f"SKILLREGISTRY.EXECUTE_SKILL AUDIT LATENCY ({args.calls} calls, "
+              f"{args.gap_ms}ms apart)")
+        print("=" * 80)
+        print(f"{'writer':>22} {'p50 us':>9} {'p99 us':>9} {'added p50':>10} "
+              f"{'added p99':>10} {'drain ms':>9} {'fsyncs':>7}")
+        print(f"{'none (baseline)':>22} {base_p50:>9.1f} {base_p99:>9.1f}")
+
+        for name, kwargs in CONFIGS:
+            logs_dir = Path(tmpdir) / name.replace('/', '_').replace('=', '_')
+            audit_logger = AuditLogger(logs_dir, logger, **kwargs)
+            samples = measure(audit_logger, skills_dir, args.calls, args.gap_ms)
+
+            start = time.perf_counter()
+            audit_logger.close()
+            drain_ms = (time.perf_counter() - start) * 1000
+
+            p50 = _percentile(samples, 0.50)
+            p99 = _percentile(samples, 0.99)
+            fsyncs = audit_logger.get_writer_stats()['fsyncs']
+            print(f"{name:>22} {p50:>9.1f} {p99:>9.1f} {p50 - base_p50:>10.1f} "
+                  f"{p99 - base_p99:>10.1f} {drain_ms:>9.1f} {fsyncs:>7}")
+
+        print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Audit Query Benchmark
+======================
+
+Compares a "last 24 hours" query over a large single audit.jsonl:
+- full scan: the previous query_logs loop (json.loads + fromisoformat on
+  every line, no early exit)
+- indexed: AuditLogger.query_logs, which bisects the sparse timestamp
+  index, filters on raw timestamp prefixes and stops past end_time
+
+and a "last 50 failures for resource X" query, where X is a rare resource
+written once every --rare-every entries:
+- full scan: json.loads every line, keep the newest matches
+- search: AuditLogger.search, which reads only the blocks whose postings
+  hold X, newest first
+
+The synthetic log spans --days days with evenly spaced entries.
+
+Usage:
+    python3 benchmark_audit_query.py
+    python3 benchmark_audit_query.py --lines 1000000 --days 30
+"""
+
+import sys
+import json
+import time
+import logging
+import argparse
+import tempfile
+from pathlib import Path
+from datetime import datetime, timedelta, timezone
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from Skills.integration_orchestrator.core import AuditLogger
+from Skills.integration_orchestrator.core.audit_postings import AuditFileIndex
+
+RARE_RESOURCE = 'billing_sync'
+
+
+def _write_log(audit_file: Path, lines: int, days: int, rare_every: int) -> datetime:
+    """Write `lines` evenly spaced entries ending now; return the last timestamp"""
+    end = datetime.utcnow().replace(microsecond=0)
+    step = timedelta(days=days) / lines
+    start = end - step * (lines - 1)
+    results = ('failure', 'success', 'success', 'success')
+
+    with open(audit_file, 'w', encoding='utf-8') as f:
+        batch = []
+        for i in range(lines):
+            batch.append(json.dumps({
+                'timestamp': (start + step * i).isoformat() + 'Z',
+                'event_type': 'skill_execution',
+                'actor': 'integration_orchestrator',
+                'action': 'execute_skill',
+                'resource': RARE_RESOURCE if i % rare_every == 0 else f'skill_{i % 40}',
+                'result': results[i % 4],
+                'metadata': {'args': [], 'duration': 0.25, 'returncode': 0, 'error': None}
+            }) + '\n')
+            if len(batch) == 10000:
+                f.write(''.join(batch))
+                batch = []
+        f.write(''.join(batch))
+    return end
+
+
+def full_scan(audit_file: Path, start_time: datetime, end_time: datetime):
+    """The previous query_logs loop"""
+    results = []
+    with open(audit_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line.strip())
+                entry_time = datetime.fromisoformat(entry['timestamp'].replace('Z', '+00:00'))
+                if start_time and entry_time < start_time:
+                    continue
+                if end_time and entry_time > end_time:
+                    continue
+                results.append(entry)
+            except json.JSONDecodeError:
+                continue
+    return results
+
+
+def full_scan_search(audit_file: Path, resource: str, result: str, limit: int):
+    """Match every line, keep the newest `limit` matches"""
+    matches = []
+    with open(audit_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if entry.get('resource') == resource and entry.get('result') == result:
+                matches.append(entry)
+    return matches[::-1][:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Audit query benchmark")
+    parser.add_argument('--lines', type=int, default=5000000)
+    parser.add_argument('--days', type=int, default=90)
+    parser.add_argument('--index-interval', type=int, default=1000)
+    parser.add_argument('--rare-every', type=int, default=20000)
+    args = parser.parse_args()
+
+    logger = logging.getLogger("benchmark")
+    logger.setLevel(logging.CRITICAL)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        logs_dir = Path(tmpdir)
+        audit_file = logs_dir / "audit.jsonl"
+
+        start = time.perf_counter()
+        last = _write_log(audit_file, args.lines, args.days, args.rare_every)
+        generate_s = time.perf_counter() - start
+        size_mb = audit_file.stat().st_size / 1e6
+
+        end_time = last.replace(tzinfo=timezone.utc)
+        start_time = end_time - timedelta(hours=24)
+
+        start = time.perf_counter()
+        index = AuditFileIndex(audit_file, interval=args.index_interval)
+        build_s = time.perf_counter() - start
+        index_kb = (index.index_file.stat().st_size + index.postings_file.stat().st_size) / 1024
+
+        start = time.perf_counter()
+        baseline = full_scan(audit_file, start_time, end_time)
+        scan_s = time.perf_counter() - start
+
+        audit_logger = AuditLogger(logs_dir, logger, index_interval=args.index_interval)
+        timings = []
+        for _ in range(3):
+            start = time.perf_counter()
+            indexed = audit_logger.query_logs(start_time=start_time, end_time=end_time, limit=None)
+            timings.append(time.perf_counter() - start)
+        indexed_s = min(timings)
+
+        assert len(indexed) == len(baseline)
+
+        start = time.perf_counter()
+        scan_matches = full_scan_search(audit_file, RARE_RESOURCE, 'failure', 50)
+        search_scan_s = time.perf_counter() - start
+
+        timings = []
+        for _ in range(3):
+            start = time.perf_counter()
+            page = audit_logger.search(resource=RARE_RESOURCE, result='failure', limit=50)
+            timings.append(time.perf_counter() - start)
+        search_s = min(timings)
+
+        assert page['entries'] == scan_matches
+
+        print("=" * 70)
+        print(f"AUDIT LAST-24H QUERY ({args.lines} lines, {size_mb:.0f} MB, "
+              f"{args.days} days, generated in {generate_s:.1f}s)")
+        print("=" * 70)
+        print(f"Matching entries:          {len(indexed)}")
+        print(f"One-time index build:      {build_s:.2f}s ({index.marks} marks, {index_kb:.0f} KB)")
+        print(f"Full scan (previous):      {scan_s * 1000:.0f} ms")
+        print(f"Indexed seek + early stop: {indexed_s * 1000:.0f} ms")
+        print(f"Speedup:                   {scan_s / indexed_s:.0f}x")
+        print("=" * 70)
+        print(f"LAST 50 FAILURES FOR {RARE_RESOURCE} (1 in {args.rare_every} entries)")
+        print("=" * 70)
+        print(f"Blocks read / total:       {page['blocks']} / {index.blocks + 1}")
+        print(f"Full scan:                 {search_scan_s * 1000:.0f} ms")
+        print(f"Postings search:           {search_s * 1000:.1f} ms")
+        print(f"Speedup:                   {search_scan_s / search_s:.0f}x")
+        print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+EventBus Publish Latency Benchmark
+===================================
+
+Measures how long EventBus.publish holds the publisher (e.g. the watchdog
+thread inside EventRouter.route_event) when one of the subscribers is
+slow, in synchronous and async dispatch modes. The remaining subscribers
+are cheap logging-style handlers.
+
+The burst section publishes --burst events back-to-back to the slow
+subscriber through a --queue-size queue under each overflow policy.
+
+The heartbeat section publishes --heartbeats skill_execution_completed
+events for 20 skills to a logging-style subscriber, with and without a
+--window coalescing window keyed by skill name.
+
+Usage:
+    python3 benchmark_event_bus.py
+    python3 benchmark_event_bus.py --events 2000 --slow-ms 5 --subscribers 8
+    python3 benchmark_event_bus.py --burst 20000 --queue-size 100
+    python3 benchmark_event_bus.py --heartbeats 50000 --window 0.5
+"""
+
+import sys
+import time
+import logging
+import argparse
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from Skills.integration_orchestrator.core import EventBus
+
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def run(async_dispatch: bool, events: int, slow_ms: float, subscribers: int):
+    logger = logging.getLogger("benchmark")
+    logger.setLevel(logging.CRITICAL)
+    event_bus = EventBus(logger, async_dispatch=async_dispatch, queue_size=events)
+
+    handled = []
+    event_bus.subscribe('accounting_transaction_added', lambda data: time.sleep(slow_ms / 1000))
+    for _ in range(subscribers - 1):
+        event_bus.subscribe('accounting_transaction_added', lambda data: handled.append(data['n']))
+
+    latencies = []
+    start = time.perf_counter()
+    for i in range(events):
+        call_start = time.perf_counter()
+        event_bus.publish('accounting_transaction_added', {'n': i, 'amount': 10.0})
+        latencies.append(time.perf_counter() - call_start)
+    publish_s = time.perf_counter() - start
+
+    event_bus.flush(timeout=events * slow_ms)
+    total_s = time.perf_counter() - start
+    event_bus.close()
+
+    assert len(handled) == events * (subscribers - 1)
+    return latencies, publish_s, total_s
+
+
+def run_burst(overflow: str, burst: int, slow_ms: float, queue_size: int):
+    logger = logging.getLogger("benchmark")
+    logger.setLevel(logging.CRITICAL)
+    event_bus = EventBus(logger, async_dispatch=True)
+    event_bus.subscribe('watcher.event.detected', lambda data: time.sleep(slow_ms / 1000),
+                        queue_size=queue_size, overflow=overflow,
+                        coalesce_key=lambda data: data['source'])
+
+    start = time.perf_counter()
+    for i in range(burst):
+        event_bus.publish('watcher.event.detected', {'n': i, 'source': f'watcher_{i % 8}'})
+    publish_s = time.perf_counter() - start
+    stats = event_bus.get_stats()
+    event_bus.close()
+    return publish_s, stats
+
+
+def run_heartbeats(window: float, heartbeats: int, handler_us: float):
+    logger = logging.getLogger("benchmark")
+    logger.setLevel(logging.CRITICAL)
+    event_bus = EventBus(logger, async_dispatch=True, queue_size=heartbeats)
+    calls = []
+
+    def log_completed(data):
+        deadline = time.perf_counter() + handler_us / 1e6
+        while time.perf_counter() < deadline:
+            pass
+        calls.append(data['skill_name'])
+
+    event_bus.subscribe('skill_execution_completed', log_completed,
+                        coalesce_key=lambda data: data['skill_name'], coalesce_window=window)
+
+    start = time.perf_counter()
+    for i in range(heartbeats):
+        event_bus.publish('skill_execution_completed', {'skill_name': f'skill_{i % 20}', 'success': True})
+    publish_s = time.perf_counter() - start
+    event_bus.flush(timeout=60)
+    total_s = time.perf_counter() - start
+    stats = event_bus.get_stats()
+    event_bus.close()
+    return publish_s, total_s, len(calls), stats['coalesced']
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EventBus publish latency benchmark")
+    parser.add_argument('--events', type=int, default=500)
+    parser.add_argument('--slow-ms', type=float, default=2.0, help='Latency of the slow subscriber')
+    parser.add_argument('--subscribers', type=int, default=4)
+    parser.add_argument('--burst', type=int, default=2000)
+    parser.add_argument('--queue-size', type=int, default=100)
+    parser.add_argument('--heartbeats', type=int, default=20000)
+    parser.add_argument('--window', type=float, default=0.25, help='Coalescing window (seconds)')
+    parser.add_argument('--handler-us', type=float, default=50.0, help='Heartbeat handler cost')
+    args = parser.parse_args()
+
+    print("=" * 78)
+    print(f"EVENTBUS PUBLISH ({args.events} events, {args.subscribers} subscribers, "
+          f"one taking {args.slow_ms} ms)")
+    print("=" * 78)
+    print(f"{'mode':<8} {'p50 us':>10} {'p99 us':>10} {'max us':>10} {'publisher s':>13} {'handled s':>11}")
+    for name, async_dispatch in (('sync', False), ('async', True)):
+        latencies, publish_s, total_s = run(async_dispatch, args.events, args.slow_ms, args.subscribers)
+        print(f"{name:<8} {_percentile(latencies, 50) * 1e6:>10.1f} "
+              f"{_percentile(latencies, 99) * 1e6:>10.1f} {max(latencies) * 1e6:>10.1f} "
+              f"{publish_s:>13.3f} {total_s:>11.3f}")
+    print("=" * 78)
+    print(f"BURST ({args.burst} events, queue {args.queue_size}, subscriber taking {args.slow_ms} ms)")
+    print("=" * 78)
+    print(f"{'overflow':<12} {'publisher s':>12} {'dropped':>9} {'coalesced':>10} {'high water':>11}")
+    for overflow in ('block', 'drop_oldest', 'drop_newest', 'coalesce'):
+        publish_s, stats = run_burst(overflow, args.burst, args.slow_ms, args.queue_size)
+        topic = stats['by_topic']['watcher.event.detected']
+        print(f"{overflow:<12} {publish_s:>12.3f} {topic['dropped']:>9} {topic['coalesced']:>10} "
+              f"{topic['high_water']:>11}")
+    print("=" * 78)
+    print(f"HEARTBEATS ({args.heartbeats} events, 20 keys, handler {args.handler_us} us)")
+    print("=" * 78)
+    print(f"{'window s':<12} {'publisher s':>12} {'handled s':>10} {'handler calls':>14} {'coalesced':>10}")
+    for window in (0.0, args.window):
+        publish_s, total_s, calls, coalesced = run_heartbeats(window, args.heartbeats, args.handler_us)
+        print(f"{window:<12} {publish_s:>12.3f} {total_s:>10.3f} {calls:>14} {coalesced:>10}")
+    print("=" * 78)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+EventBus Topic Matching Benchmark
+==================================
+
+Resolves published topics against --subscriptions patterns (a third
+exact topics, a third 'svcN.*.started', a third 'svcN.#'):
+- linear scan: test every pattern (precompiled regex) on each publish
+- trie: TopicTrie.match, O(topic depth)
+- cached: EventBus route cache, hit after the first publish of a topic
+
+and reports full EventBus.publish cost (sync mode, no-op handlers).
+
+Usage:
+    python3 benchmark_event_topics.py
+    python3 benchmark_event_topics.py --subscriptions 5000 --publishes 200000
+"""
+
+import re
+import sys
+import time
+import random
+import logging
+import argparse
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from Skills.integration_orchestrator.core import EventBus
+from Skills.integration_orchestrator.core.topic_trie import TopicTrie
+
+VERBS = ('started', 'completed', 'failed')
+
+
+def _patterns(count: int):
+    patterns = []
+    for i in range(count):
+        service = f"svc{i // 3}"
+        kind = i % 3
+        if kind == 0:
+            patterns.append(f"{service}.action.{VERBS[i % len(VERBS)]}")
+        elif kind == 1:
+            patterns.append(f"{service}.*.started")
+        else:
+            patterns.append(f"{service}.#")
+    return patterns
+
+
+def _compile(pattern: str):
+    parts = []
+    for level in pattern.split('.'):
+        parts.append({'*': r'[^.]+', '#': r'.*'}.get(level, re.escape(level)))
+    return re.compile(r'\.'.join(parts).replace(r'\..*', r'(\..*)?') + '$')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EventBus topic matching benchmark")
+    parser.add_argument('--subscriptions', type=int, default=1000)
+    parser.add_argument('--publishes', type=int, default=100000)
+    parser.add_argument('--topics', type=int, default=500, help='Distinct published topics')
+    args = parser.parse_args()
+
+    logger = logging.getLogger("benchmark")
+    logger.setLevel(logging.CRITICAL)
+
+    patterns = _patterns(args.subscriptions)
+    services = args.subscriptions // 3 + 1
+    rng = random.Random(7)
+    topic_pool = [f"svc{rng.randrange(services)}.{rng.choice(('action', 'post', 'sync'))}."
+                  f"{rng.choice(VERBS)}" for _ in range(args.topics)]
+    topics = [rng.choice(topic_pool) for _ in range(args.publishes)]
+
+    compiled = [(pattern, _compile(pattern)) for pattern in patterns]
+    trie = TopicTrie()
+    for pattern in patterns:
+        trie.add(pattern)
+
+    event_bus = EventBus(logger)
+    for pattern in patterns:
+        event_bus.subscribe(pattern, lambda data: None)
+
+    # Same answers from every strategy
+    for topic in topic_pool:
+        assert trie.match(topic) == {p for p, regex in compiled if regex.match(topic)}, topic
+
+    results = []
+
+    start = time.perf_counter()
+    for topic in topics:
+        [p for p, regex in compiled if regex.match(topic)]
+    results.append(('linear scan', time.perf_counter() - start))
+
+    start = time.perf_counter()
+    for topic in topics:
+        trie.match(topic)
+    results.append(('trie', time.perf_counter() - start))
+
+    start = time.perf_counter()
+    for topic in topics:
+        with event_bus.lock:
+            event_bus._route(topic)
+    results.append(('cached route', time.perf_counter() - start))
+
+    start = time.perf_counter()
+    for topic in topics:
+        event_bus.publish(topic, {})
+    publish_s = time.perf_counter() - start
+
+    delivered = event_bus.get_stats()['delivered']
+
+    print("=" * 60)
+    print(f"TOPIC MATCHING ({args.subscriptions} subscriptions, {args.publishes} publishes, "
+          f"{args.topics} topics)")
+    print("=" * 60)
+    baseline = results[0][1]
+    for name, elapsed in results:
+        print(f"{name:<14} {elapsed / args.publishes * 1e6:>9.2f} us/publish "
+              f"{baseline / elapsed:>8.0f}x")
+    print(f"{'publish':<14} {publish_s / args.publishes * 1e6:>9.2f} us/publish "
+          f"({delivered / args.publishes:.1f} handlers each)")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
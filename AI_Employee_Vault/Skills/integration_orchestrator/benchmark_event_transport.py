@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Watcher → Orchestrator Latency Benchmark
+=========================================
+
+Time from a watcher process reporting an event until an orchestrator-side
+handler sees it:
+- socket: EventBusClient.publish over the Unix socket to EventBusServer
+- file drop: a markdown file in a watched folder, found by a directory
+  scan every --poll-interval seconds (PollingObserver's default is 1s)
+
+The watcher runs in its own process, as under run_all_watchers.py.
+
+Usage:
+    python3 benchmark_event_transport.py
+    python3 benchmark_event_transport.py --events 500 --poll-interval 1.0
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+import tempfile
+import threading
+import multiprocessing
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from Skills.integration_orchestrator.core import EventBus, EventBusServer, EventBusClient
+
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def _socket_watcher(socket_path, events, gap_s):
+    client = EventBusClient(Path(socket_path))
+    for i in range(events):
+        client.publish('watcher.event.detected', {'n': i, 'sent': time.time()})
+        time.sleep(gap_s)
+    client.close()
+
+
+def _file_watcher(folder, events, gap_s):
+    for i in range(events):
+        path = Path(folder) / f"gmail_{i}.md"
+        temp = path.with_suffix('.tmp')
+        temp.write_text(f"---\nsent: {time.time()}\n---\n")
+        os.replace(temp, path)
+        time.sleep(gap_s)
+
+
+def bench_socket(events: int, gap_s: float):
+    logger = logging.getLogger("benchmark")
+    logger.setLevel(logging.CRITICAL)
+    latencies = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        socket_path = Path(temp_dir) / "event_bus.sock"
+        event_bus = EventBus(logger, async_dispatch=True)
+        event_bus.subscribe('watcher.event.detected',
+                            lambda data: latencies.append(time.time() - data['sent']))
+        server = EventBusServer(event_bus, socket_path, logger)
+        server.start()
+
+        process = multiprocessing.Process(target=_socket_watcher, args=(str(socket_path), events, gap_s))
+        process.start()
+        process.join()
+        event_bus.flush()
+        server.stop()
+        event_bus.close()
+    return latencies
+
+
+def bench_file_drop(events: int, gap_s: float, poll_interval: float):
+    latencies = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        seen = set()
+        done = threading.Event()
+
+        def poll():
+            while not done.is_set() or len(seen) < events:
+                for entry in os.scandir(temp_dir):
+                    if entry.name.endswith('.md') and entry.name not in seen:
+                        seen.add(entry.name)
+                        sent = float(Path(entry.path).read_text().split('sent: ')[1].split('\n')[0])
+                        latencies.append(time.time() - sent)
+                if len(seen) >= events:
+                    return
+                time.sleep(poll_interval)
+
+        poller = threading.Thread(target=poll, daemon=True)
+        poller.start()
+        process = multiprocessing.Process(target=_file_watcher, args=(temp_dir, events, gap_s))
+        process.start()
+        process.join()
+        done.set()
+        poller.join()
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Watcher to orchestrator latency benchmark")
+    parser.add_argument('--events', type=int, default=200)
+    parser.add_argument('--gap-ms', type=float, default=10.0, help='Pause between watcher events')
+    parser.add_argument('--poll-interval', type=float, default=1.0)
+    args = parser.parse_args()
+
+    gap_s = args.gap_ms / 1000
+    results = [
+        ('socket', bench_socket(args.events, gap_s)),
+        (f'file drop ({args.poll_interval}s poll)', bench_file_drop(args.events, gap_s, args.poll_interval)),
+    ]
+
+    print("=" * 66)
+    print(f"WATCHER EVENT LATENCY ({args.events} events, {args.gap_ms} ms apart)")
+    print("=" * 66)
+    print(f"{'transport':<24} {'p50 ms':>10} {'p99 ms':>10} {'max ms':>10}")
+    for name, latencies in results:
+        assert len(latencies) == args.events
+        print(f"{name:<24} {_percentile(latencies, 50) * 1000:>10.3f} "
+              f"{_percentile(latencies, 99) * 1000:>10.3f} {max(latencies) * 1000:>10.3f}")
+    print("=" * 66)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+RetryQueue Scheduler Benchmark
+===============================
+
+Queues --operations retries with next_retry spread over --spread seconds
+around now (--due-fraction of them already due, interleaved with the
+rest), then times enqueue and one pass taking every due item with:
+- scan: the former scheduler - deque, full scan each tick and
+  deque.remove() per due item (O(n^2))
+- heap: RetryQueue's min-heap (O(log n) per item)
+
+The timing section measures how late retries fire against their backoff
+deadline with the live RetryQueue (the former scheduler polled every 5s,
+so a retry could fire up to 5s late).
+
+The pool section queues one retry that hangs for --hang seconds (a stuck
+skill subprocess) followed by --pool-ops short retries across several
+targets, and times how long the short ones take to finish with 1 worker
+(the former single retry thread) and with --workers workers.
+
+The jitter section fails --herd operations at the same instant and
+reports the peak number of retries landing in one 100 ms slot over the
+first --herd-attempts attempts, with deterministic and full-jitter backoff.
+
+Usage:
+    python3 benchmark_retry_queue.py
+    python3 benchmark_retry_queue.py --operations 100000 --timed 200
+    python3 benchmark_retry_queue.py --workers 6 --pool-ops 60 --hang 3
+"""
+
+import sys
+import time
+import random
+import logging
+import argparse
+from collections import deque
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from Skills.integration_orchestrator.core import RetryQueue, RetryPolicy
+
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def _items(operations: int, spread: float, due_fraction: float):
+    rng = random.Random(7)
+    now = datetime.utcnow()
+    items = []
+    for i in range(operations):
+        if rng.random() < due_fraction:
+            offset = -rng.uniform(1, spread)
+        else:
+            offset = rng.uniform(60, spread)
+        items.append({'context': {'name': f'op_{i}'}, 'next_retry': now + timedelta(seconds=offset)})
+    return items
+
+
+def bench_scan(items):
+    queue = deque()
+    start = time.perf_counter()
+    for item in items:
+        queue.append(item)
+    enqueue_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    now = datetime.utcnow()
+    due = []
+    for item in list(queue):
+        if item['next_retry'] <= now:
+            due.append(item)
+            queue.remove(item)
+    return enqueue_s, time.perf_counter() - start, len(due)
+
+
+def bench_heap(items):
+    logger = logging.getLogger("benchmark")
+    logger.setLevel(logging.CRITICAL)
+    retry_queue = RetryQueue(logger)
+    retry_queue.running = True
+
+    start = time.perf_counter()
+    with retry_queue.cond:
+        for item in items:
+            retry_queue._push(item)
+    enqueue_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    due = retry_queue._take_due()
+    return enqueue_s, time.perf_counter() - start, len(due)
+
+
+def bench_lateness(timed: int, max_delay: float):
+    logger = logging.getLogger("benchmark")
+    logger.setLevel(logging.CRITICAL)
+    retry_queue = RetryQueue(logger)
+    retry_queue.start()
+    rng = random.Random(11)
+    lateness = []
+
+    def operation(deadline):
+        lateness.append((datetime.utcnow() - deadline).total_seconds())
+        return {'success': True}
+
+    with retry_queue.cond:
+        for i in range(timed):
+            deadline = datetime.utcnow() + timedelta(seconds=rng.uniform(0, max_delay))
+            retry_queue._push({'operation': operation, 'args': (deadline,), 'kwargs': {},
+                               'policy': None, 'context': {'name': f'timed_{i}'},
+                               'attempts': 0, 'next_retry': deadline, 'created_at': datetime.utcnow()})
+
+    while len(lateness) < timed:
+        time.sleep(0.05)
+    retry_queue.stop()
+    return lateness
+
+
+def bench_pool(workers: int, pool_ops: int, hang: float, op_ms: float):
+    logger = logging.getLogger("benchmark")
+    logger.setLevel(logging.CRITICAL)
+    retry_queue = RetryQueue(logger, workers=workers, target_limits={'social_*': 1, 'accounting_core': 4})
+    targets = ['accounting_core', 'social_linkedin', 'social_twitter', 'gmail_watcher_skill']
+    finished = []
+
+    def operation(seconds):
+        time.sleep(seconds)
+        finished.append(time.perf_counter())
+        return {'success': True}
+
+    retry_queue.enqueue(operation, args=(hang,), context={'name': 'hung', 'target': 'social_facebook'})
+    for i in range(pool_ops):
+        target = targets[i % len(targets)]
+        retry_queue.enqueue(operation, args=(op_ms / 1000,), context={'name': f'op_{i}', 'target': target})
+
+    start = time.perf_counter()
+    retry_queue.start()
+    while len(finished) < pool_ops + 1:
+        time.sleep(0.01)
+    retry_queue.stop()
+    # The hung retry is the slowest to finish; the rest are the unrelated ones
+    return sorted(finished)[pool_ops - 1] - start
+
+
+def bench_herd(herd: int, attempts: int, jitter: bool):
+    logger = logging.getLogger("benchmark")
+    logger.setLevel(logging.CRITICAL)
+    retry_queue = RetryQueue(logger, jitter=jitter)
+    retry_queue._random.seed(3)
+    slots = {}
+    for _ in range(herd):
+        at = 0.0
+        for attempt in range(1, attempts + 1):
+            at += retry_queue._calculate_backoff(attempt, RetryPolicy.EXPONENTIAL)
+            slot = int(at * 10)
+            slots[slot] = slots.get(slot, 0) + 1
+    return max(slots.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RetryQueue scheduler benchmark")
+    parser.add_argument('--operations', type=int, default=100000)
+    parser.add_argument('--spread', type=float, default=300.0, help='Seconds over which items fall due')
+    parser.add_argument('--due-fraction', type=float, default=0.5)
+    parser.add_argument('--timed', type=int, default=200, help='Retries in the timing section')
+    parser.add_argument('--max-delay', type=float, default=2.0)
+    parser.add_argument('--workers', type=int, default=6)
+    parser.add_argument('--pool-ops', type=int, default=60, help='Short retries in the pool section')
+    parser.add_argument('--op-ms', type=float, default=50.0, help='Duration of each short retry')
+    parser.add_argument('--hang', type=float, default=3.0, help='Seconds the hung retry blocks')
+    parser.add_argument('--herd', type=int, default=1000, help='Operations failing together')
+    parser.add_argument('--herd-attempts', type=int, default=5)
+    args = parser.parse_args()
+
+    print("=" * 66)
+    print(f"RETRY SCHEDULER ({args.operations} queued operations, {args.due_fraction:.0%} due)")
+    print("=" * 66)
+    print(f"{'scheduler':<10} {'enqueue ms':>12} {'drain ms':>12} {'due':>10}")
+    results = []
+    for name, bench in (('scan', bench_scan), ('heap', bench_heap)):
+        items = _items(args.operations, args.spread, args.due_fraction)
+        expected = sum(item['next_retry'] <= datetime.utcnow() for item in items)
+        enqueue_s, drain_s, due = bench(items)
+        assert due == expected
+        results.append(drain_s)
+        print(f"{name:<10} {enqueue_s * 1000:>12.1f} {drain_s * 1000:>12.1f} {due:>10}")
+    print(f"drain speedup: {results[0] / results[1]:.0f}x")
+
+    lateness = bench_lateness(args.timed, args.max_delay)
+    print("=" * 66)
+    print(f"FIRING LATENESS ({args.timed} retries due within {args.max_delay}s)")
+    print("=" * 66)
+    print(f"p50 {_percentile(lateness, 50) * 1000:.2f} ms   p99 {_percentile(lateness, 99) * 1000:.2f} ms   "
+          f"max {max(lateness) * 1000:.2f} ms   (5s polling: up to 5000 ms)")
+
+    print("=" * 66)
+    print(f"WORKER POOL ({args.pool_ops} x {args.op_ms:.0f} ms retries behind one {args.hang}s hung retry)")
+    print("=" * 66)
+    print(f"{'workers':<10} {'short retries done after':>28}")
+    for workers in (1, args.workers):
+        elapsed = bench_pool(workers, args.pool_ops, args.hang, args.op_ms)
+        print(f"{workers:<10} {elapsed * 1000:>25.0f} ms")
+
+    print("=" * 66)
+    print(f"RETRY HERD ({args.herd} operations failing together, {args.herd_attempts} attempts)")
+    print("=" * 66)
+    for name, jitter in (('deterministic', False), ('full jitter', True)):
+        peak = bench_herd(args.herd, args.herd_attempts, jitter)
+        print(f"{name:<14} peak {peak:>6} retries in one 100 ms slot")
+    print("=" * 66)
+
+
+if __name__ == "__main__":
+    main()
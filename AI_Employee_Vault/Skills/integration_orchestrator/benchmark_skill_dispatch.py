@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Python Skill Dispatch Benchmark
+================================
+
+Times SkillDispatcher.execute_skill for real Python skills:
+- subprocess: a fresh python3 per call (interpreter startup + imports)
+- warm: PythonSkillPool workers that imported the skill once
+
+The skills run from copies in a temporary vault so nothing touches the
+real Needs_Action, Data or Logs folders:
+- process_needs_action (empty Needs_Action)
+- accounting_core --dry-run summary
+- facebook_post_skill --help (imports social_media_common, posts nothing)
+
+The router section hands --events events, each triggering a skill that
+runs --skill-ms, to one thread (like the watchdog observer) and times how
+long that thread is busy accepting them and when the last skill finishes:
+blocking execute_skill() vs submit_skill() under the dispatcher's
+concurrency limits.
+
+The resolution section times finding a skill's entrypoint: probing the
+directory with exists() per call (the old path) vs a SkillManifest lookup.
+
+The output section runs a skill printing --output-mb MB and compares the
+orchestrator's peak Python allocation (tracemalloc) and result size:
+capture_output=True buffering vs the dispatcher's head + tail capture
+(full output spilled to a file).
+
+Usage:
+    python3 benchmark_skill_dispatch.py
+    python3 benchmark_skill_dispatch.py --calls 50
+    python3 benchmark_skill_dispatch.py --events 40 --skill-ms 200
+    python3 benchmark_skill_dispatch.py --resolutions 100000
+    python3 benchmark_skill_dispatch.py --output-mb 50
+"""
+
+import sys
+import time
+import shutil
+import logging
+import subprocess
+import tracemalloc
+import argparse
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from Skills.integration_orchestrator.skills import SkillDispatcher, SkillManifest
+from Skills.integration_orchestrator.skills.skill_manifest import ENTRYPOINTS
+
+SKILLS_DIR = Path(__file__).parent.parent
+CASES = [
+    ('process_needs_action', []),
+    ('accounting_core', ['--dry-run', 'summary']),
+    ('facebook_post_skill', ['--help']),
+]
+
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def _vault(temp_dir: Path) -> Path:
+    skills_dir = temp_dir / "Skills"
+    skills_dir.mkdir()
+    for name, _ in CASES:
+        shutil.copytree(SKILLS_DIR / name, skills_dir / name,
+                        ignore=shutil.ignore_patterns('__pycache__', '*.log'))
+    # Shared modules (social_media_common) are imported from here
+    (skills_dir / "integration_orchestrator").symlink_to(Path(__file__).parent)
+    (temp_dir / "Needs_Action").mkdir()
+    return skills_dir
+
+
+def bench(dispatcher: SkillDispatcher, skill: str, args, calls: int):
+    # One untimed call: starts the warm worker (the orchestrator does it at startup)
+    result = dispatcher.execute_skill(skill, args)
+    assert result['success'], result['stderr'][-500:]
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        result = dispatcher.execute_skill(skill, args)
+        samples.append(time.perf_counter() - start)
+        assert result['success'], result['stderr'][-500:]
+    return samples
+
+
+def bench_router(skills_dir: Path, events: int, skill_ms: float, submit: bool):
+    logger = logging.getLogger("benchmark")
+    skill = skills_dir / "sleep_skill"
+    skill.mkdir(exist_ok=True)
+    (skill / "index.py").write_text("import sys, time\ntime.sleep(float(sys.argv[1]))\n")
+    dispatcher = SkillDispatcher(skills_dir, logger, max_concurrent=8, default_skill_limit=8)
+
+    start = time.perf_counter()
+    if submit:
+        futures = [dispatcher.submit_skill("sleep_skill", [skill_ms / 1000]) for _ in range(events)]
+        accepted = time.perf_counter() - start
+        assert all(future.result()['success'] for future in futures)
+    else:
+        for _ in range(events):
+            assert dispatcher.execute_skill("sleep_skill", [skill_ms / 1000])['success']
+        accepted = time.perf_counter() - start
+    finished = time.perf_counter() - start
+    dispatcher.close()
+    return accepted, finished
+
+
+def _probe(skills_dir: Path, skill_name: str):
+    """Entrypoint lookup as done per call before the manifest"""
+    skill_path = skills_dir / skill_name
+    if not skill_path.exists():
+        return None
+    for filename, interpreter in ENTRYPOINTS:
+        if (skill_path / filename).exists():
+            return interpreter, skill_path / filename
+    return None
+
+
+def bench_resolution(skills_dir: Path, resolutions: int):
+    names = [name for name, _ in CASES]
+    manifest = SkillManifest(skills_dir)
+    results = []
+    for label, resolve in (('exists() probing', lambda name: _probe(skills_dir, name)),
+                           ('manifest', manifest.get)):
+        start = time.perf_counter()
+        for i in range(resolutions):
+            resolve(names[i % len(names)])
+        results.append((label, (time.perf_counter() - start) / resolutions))
+    return results
+
+
+def bench_output(skills_dir: Path, output_dir: Path, output_mb: int):
+    skill = skills_dir / "chatty_skill"
+    skill.mkdir(exist_ok=True)
+    (skill / "index.py").write_text(
+        "import sys\nline = 'x' * 99\n"
+        "for _ in range(int(sys.argv[1]) * 10486):\n    print(line)\n")
+    logger = logging.getLogger("benchmark")
+    results = []
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    completed = subprocess.run(["python3", str(skill / "index.py"), str(output_mb)],
+                               capture_output=True, text=True, cwd=skill)
+    elapsed = time.perf_counter() - start
+    results.append(('capture_output', tracemalloc.get_traced_memory()[1], len(completed.stdout), elapsed))
+    del completed
+    tracemalloc.stop()
+
+    dispatcher = SkillDispatcher(skills_dir, logger, output_dir=output_dir)
+    dispatcher.execute_skill("chatty_skill", [0])
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = dispatcher.execute_skill("chatty_skill", [output_mb])
+    elapsed = time.perf_counter() - start
+    results.append(('head + tail', tracemalloc.get_traced_memory()[1], len(result['stdout']), elapsed))
+    tracemalloc.stop()
+    assert Path(result['output_logs']['stdout']).stat().st_size == output_mb * 10486 * 100
+    dispatcher.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Python skill dispatch benchmark")
+    parser.add_argument('--calls', type=int, default=20, help='Timed calls per skill and mode')
+    parser.add_argument('--events', type=int, default=40, help='Events in the router section')
+    parser.add_argument('--skill-ms', type=float, default=200.0, help='Skill duration in the router section')
+    parser.add_argument('--resolutions', type=int, default=100000, help='Lookups in the resolution section')
+    parser.add_argument('--output-mb', type=int, default=50, help='Skill output in the output section')
+    args = parser.parse_args()
+
+    logger = logging.getLogger("benchmark")
+    logger.setLevel(logging.CRITICAL)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        skills_dir = _vault(Path(temp_dir))
+        cold = SkillDispatcher(skills_dir, logger)
+        warm = SkillDispatcher(skills_dir, logger, warm_skills=[name for name, _ in CASES])
+
+        print("=" * 66)
+        print(f"PYTHON SKILL DISPATCH ({args.calls} calls per skill)")
+        print("=" * 66)
+        print(f"{'skill':<22} {'mode':<11} {'p50 ms':>9} {'p99 ms':>9} {'speedup':>9}")
+        for skill, skill_args in CASES:
+            cold_samples = bench(cold, skill, skill_args, args.calls)
+            warm_samples = bench(warm, skill, skill_args, args.calls)
+            cold_p50 = _percentile(cold_samples, 50)
+            warm_p50 = _percentile(warm_samples, 50)
+            print(f"{skill:<22} {'subprocess':<11} {cold_p50 * 1000:>9.1f} "
+                  f"{_percentile(cold_samples, 99) * 1000:>9.1f}")
+            print(f"{'':<22} {'warm':<11} {warm_p50 * 1000:>9.2f} "
+                  f"{_percentile(warm_samples, 99) * 1000:>9.2f} {cold_p50 / warm_p50:>8.0f}x")
+        stats = warm.get_stats()['warm']
+        print("=" * 66)
+        print(f"warm workers started: {stats['started']}, warm calls: {stats['warm_calls']}, "
+              f"fallbacks: {stats['fallbacks']}")
+        print("=" * 66)
+        warm.close()
+
+        print(f"ROUTER THREAD ({args.events} events, {args.skill_ms:.0f} ms skill each, 8 concurrent)")
+        print("=" * 66)
+        print(f"{'api':<16} {'thread busy ms':>16} {'all done ms':>14}")
+        for name, submit in (('execute_skill', False), ('submit_skill', True)):
+            accepted, finished = bench_router(skills_dir, args.events, args.skill_ms, submit)
+            print(f"{name:<16} {accepted * 1000:>16.1f} {finished * 1000:>14.0f}")
+        print("=" * 66)
+
+        print(f"SKILL RESOLUTION ({args.resolutions} lookups)")
+        print("=" * 66)
+        print(f"{'lookup':<20} {'us per lookup':>16}")
+        for label, seconds in bench_resolution(skills_dir, args.resolutions):
+            print(f"{label:<20} {seconds * 1e6:>16.2f}")
+        print("=" * 66)
+
+        print(f"SKILL OUTPUT ({args.output_mb} MB on stdout)")
+        print("=" * 66)
+        print(f"{'capture':<16} {'peak alloc MB':>14} {'result KB':>11} {'wall ms':>9}")
+        for label, peak, kept, elapsed in bench_output(skills_dir, Path(temp_dir) / "output", args.output_mb):
+            print(f"{label:<16} {peak / 2 ** 20:>14.1f} {kept / 1024:>11.1f} {elapsed * 1000:>9.0f}")
+        print("=" * 66)
+
+
+if __name__ == "__main__":
+    main()
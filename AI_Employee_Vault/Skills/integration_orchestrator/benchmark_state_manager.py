@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+StateManager Persistence Benchmark
+===================================
+
+Measures StateManager costs as the number of processed events grows:
+- per-mutation cost (mark_processed) for each persistence mode
+- startup (load) time
+- is_processed() lookup latency
+
+Modes compared: full JSON snapshot rewrites, JSON write-ahead journal,
+the SQLite backend, and group commit (journal + 1s background flusher).
+
+--retention measures processed-event memory and is_processed() latency at
+a large ID count with and without the retention cap and Bloom filter.
+
+Usage:
+    python3 benchmark_state_manager.py
+    python3 benchmark_state_manager.py --sizes 1000 10000 100000 --mutations 200
+    python3 benchmark_state_manager.py --retention 1000000
+"""
+
+import sys
+import json
+import time
+import argparse
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from Skills.integration_orchestrator.core import StateManager
+
+MODES = {
+    'snapshot': {'backend': 'json', 'journal': False},
+    'journal': {'backend': 'json', 'journal': True},
+    'sqlite': {'backend': 'sqlite'},
+    'group': {'backend': 'json', 'journal': True, 'flush_interval': 1.0},
+}
+
+
+def _prepare_state(state_file: Path, size: int, mode: str):
+    """Persist `size` processed events for the given mode"""
+    seed = StateManager(state_file)
+    events = seed.processed_events
+    for i in range(size):
+        events[f'seed_{i}'] = {'file': f'file_{i}.md', 'processed_at': '2026-01-01T00:00:00Z'}
+    seed.save_state()
+
+    if mode == 'sqlite':
+        # First open migrates state.json into state.db
+        StateManager(state_file, **MODES[mode]).close()
+
+
+def measure(size: int, mutations: int, mode: str) -> dict:
+    """Return startup ms, lookup us and mean ms per mark_processed call"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        state_file = Path(tmpdir) / "state.json"
+        _prepare_state(state_file, size, mode)
+
+        start = time.perf_counter()
+        # Large threshold so the timed loop measures appends, not compaction
+        state_manager = StateManager(state_file, compact_threshold=mutations + 1,
+                                     **MODES[mode])
+        startup_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        for i in range(1000):
+            state_manager.is_processed(f'seed_{i * 7919 % max(size, 1)}')
+        lookup_us = (time.perf_counter() - start) / 1000 * 1e6
+
+        start = time.perf_counter()
+        for i in range(mutations):
+            state_manager.mark_processed(f'bench_{i}', {'file': f'bench_{i}.md'})
+        mutation_ms = (time.perf_counter() - start) / mutations * 1000
+
+        state_manager.close()
+        stats = state_manager.get_persistence_stats()
+        return {'startup_ms': startup_ms, 'lookup_us': lookup_us, 'mutation_ms': mutation_ms,
+                'writes_avoided': stats['writes_avoided']}
+
+
+def _write_json_state(state_file: Path, size: int):
+    """Write a compact state.json holding `size` processed events"""
+    with open(state_file, 'w') as f:
+        json.dump({
+            'processed_events': {
+                f'evt_{i}': {'processed_at': '2026-01-01T00:00:00Z'} for i in range(size)
+            },
+            'system_state': {},
+            'metrics': {},
+        }, f)
+
+
+def _lookup_us(state_manager: StateManager, keys) -> float:
+    start = time.perf_counter()
+    for key in keys:
+        state_manager.is_processed(key)
+    return (time.perf_counter() - start) / len(keys) * 1e6
+
+
+def bench_retention(size: int, cap: int):
+    """Memory and is_processed() latency at `size` processed IDs"""
+    print("=" * 89)
+    print(f"PROCESSED-EVENT RETENTION BENCHMARK ({size} IDs, cap {cap})")
+    print("=" * 89)
+    print(f"{'config':>28} {'resident events':>16} {'memory MB':>10} "
+          f"{'bloom KB':>9} {'hit us':>8} {'miss us':>8}")
+
+    configs = [
+        ('json unbounded', {'backend': 'json'}),
+        ('json unbounded + bloom', {'backend': 'json', 'bloom_filter': True}),
+        ('json capped + bloom', {'backend': 'json', 'bloom_filter': True,
+                                 'max_processed_events': cap}),
+        ('sqlite unbounded', {'backend': 'sqlite'}),
+        ('sqlite unbounded + bloom', {'backend': 'sqlite', 'bloom_filter': True}),
+    ]
+
+    misses = [f'new_{i}' for i in range(10000)]
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        json_file = Path(tmpdir) / "state.json"
+        _write_json_state(json_file, size)
+        # Migrate once; the SQLite configs reuse state.db
+        StateManager(json_file, backend='sqlite').close()
+
+        # Steady state of a capped deployment: a snapshot that was already
+        # trimmed to the cap, reloaded by a fresh process
+        capped_file = Path(tmpdir) / "capped.json"
+        capped_file.write_bytes(json_file.read_bytes())
+        StateManager(capped_file, max_processed_events=cap).close()
+
+        for name, kwargs in configs:
+            state_file = capped_file if 'max_processed_events' in kwargs else json_file
+            tracemalloc.start()
+            state_manager = StateManager(state_file, **kwargs)
+            memory_mb = tracemalloc.get_traced_memory()[0] / 1e6
+            tracemalloc.stop()
+
+            stats = state_manager.get_retention_stats()
+            resident = stats['processed_events']
+            hits = [f'evt_{size - 1 - (i * 7919 % resident)}' for i in range(10000)]
+
+            print(f"{name:>28} {resident:>16} {memory_mb:>10.1f} "
+                  f"{stats['bloom_filter_bytes'] / 1024:>9.0f} "
+                  f"{_lookup_us(state_manager, hits):>8.2f} "
+                  f"{_lookup_us(state_manager, misses):>8.2f}")
+
+            state_manager.close()
+
+    print("=" * 89)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="StateManager persistence benchmark")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--mutations', type=int, default=50,
+                        help='Timed mutations per state size')
+    parser.add_argument('--modes', nargs='+', default=list(MODES), choices=list(MODES))
+    parser.add_argument('--retention', type=int, default=None, metavar='IDS',
+                        help='Run the retention/Bloom filter benchmark at this many IDs')
+    parser.add_argument('--cap', type=int, default=100000,
+                        help='max_processed_events for the retention benchmark')
+    args = parser.parse_args()
+
+    if args.retention:
+        bench_retention(args.retention, args.cap)
+        return
+
+    print("=" * 89)
+    print("STATE MANAGER PERSISTENCE BENCHMARK")
+    print("=" * 89)
+    print(f"{'events':>10} {'mode':>10} {'startup ms':>12} {'lookup us':>12} "
+          f"{'mutation ms/op':>16} {'writes avoided':>16}")
+
+    for size in args.sizes:
+        for mode in args.modes:
+            result = measure(size, args.mutations, mode)
+            print(f"{size:>10} {mode:>10} {result['startup_ms']:>12.2f} "
+                  f"{result['lookup_us']:>12.2f} {result['mutation_ms']:>16.3f} "
+                  f"{result['writes_avoided']:>16}")
+
+    print("=" * 89)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Offline StateManager compaction
+================================
+
+Applies the processed-event retention policy to a state store and folds
+journals/WAL back into the primary file. Run it while the orchestrator is
+stopped.
+
+Usage:
+    python3 compact_state.py --max-events 100000
+    python3 compact_state.py --ttl-days 30 --backend sqlite
+    python3 compact_state.py --state-file /path/to/state.json --max-events 5000
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from Skills.integration_orchestrator.core import StateManager
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compact orchestrator state")
+    parser.add_argument('--state-file', type=Path,
+                        default=Path(__file__).parent / "state.json",
+                        help='State file (the SQLite backend uses <stem>.db next to it)')
+    parser.add_argument('--backend', choices=['json', 'sqlite'], default='json',
+                        help='Storage backend the orchestrator was started with')
+    parser.add_argument('--max-events', type=int, default=None,
+                        help='Keep at most this many processed events')
+    parser.add_argument('--ttl-days', type=float, default=None,
+                        help='Drop processed events older than this many days')
+    args = parser.parse_args()
+
+    ttl = args.ttl_days * 86400 if args.ttl_days is not None else None
+
+    # Load without limits first so the before/after counts are accurate
+    state_manager = StateManager(args.state_file, journal=True, backend=args.backend)
+    before = state_manager.get_retention_stats()['processed_events']
+
+    state_manager.max_processed_events = args.max_events
+    state_manager.processed_ttl = ttl
+    evicted = state_manager.enforce_retention()
+    state_manager.compact()
+    state_manager.close()
+
+    print("=" * 60)
+    print("STATE COMPACTION")
+    print("=" * 60)
+    print(f"Backend:            {args.backend}")
+    print(f"Processed before:   {before}")
+    print(f"Evicted:            {evicted}")
+    print(f"Processed after:    {before - evicted}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,10 +6,14 @@ Centralized infrastructure components for the Gold Tier architecture.
 """
 
 from .event_bus import EventBus
+from .event_log import EventLog
+from .event_transport import EventBusServer, EventBusClient
 from .retry_queue import RetryQueue, RetryPolicy
 from .health_monitor import HealthMonitor, ComponentStatus
 from .audit_logger import AuditLogger
+from .audit_segments import AuditSegmentStore
 from .state_manager import StateManager
+from .state_storage import JSONStateStorage, SQLiteStateStorage
 from .approval_manager import ApprovalManager
 from .circuit_breaker import CircuitBreakerManager, CircuitState
 from .social_config_parser import SocialMediaConfigParser
@@ -18,12 +22,18 @@ from .folder_manager import FolderManager
 
 __all__ = [
     'EventBus',
+    'EventLog',
+    'EventBusServer',
+    'EventBusClient',
     'RetryQueue',
     'RetryPolicy',
     'HealthMonitor',
     'ComponentStatus',
     'AuditLogger',
+    'AuditSegmentStore',
     'StateManager',
+    'JSONStateStorage',
+    'SQLiteStateStorage',
     'ApprovalManager',
     'CircuitBreakerManager',
     'CircuitState',
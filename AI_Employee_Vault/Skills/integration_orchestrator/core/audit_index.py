@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+SparseTimestampIndex - Seekable Audit Files
+============================================
+
+Sidecar index (<file>.idx) for an uncompressed audit JSONL file. Every
+`interval` entries it records a mark: the byte offset of the next entry and
+the largest timestamp written before it. Marks are appended as entries are
+written, so the index is maintained incrementally.
+
+Because each mark stores a running maximum, bisecting the marks for a start
+time gives an offset before which no entry can fall inside the range, even
+when concurrent writers appended slightly out of order.
+
+Only the process writing the data file maintains the sidecar. Readers
+(read_only=True) load the marks and index the rest of the file in memory.
+A reader can see marks for data the writer has not flushed yet, so it
+ignores marks past EOF instead of rewriting the sidecar without them.
+
+Timestamps are compared on their first 19 characters (YYYY-MM-DDTHH:MM:SS),
+which every audit timestamp shares regardless of fractional seconds.
+"""
+
+import json
+from bisect import bisect_left
+from pathlib import Path
+from threading import Lock
+from typing import List, Optional
+
+# Byte prefix of every line written by AuditLogger (json.dumps, timestamp first)
+LINE_PREFIX = b'{"timestamp": "'
+KEY_LENGTH = 19
+
+
+def line_key(line: bytes) -> Optional[str]:
+    """Extract the second-resolution timestamp key from a raw audit line"""
+    if line.startswith(LINE_PREFIX):
+        return line[15:15 + KEY_LENGTH].decode('ascii', 'replace')
+    try:
+        return json.loads(line)['timestamp'][:KEY_LENGTH]
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+class SparseTimestampIndex:
+    """Sparse timestamp -> byte offset index for one audit file"""
+
+    def __init__(self, data_file: Path, interval: int = 1000, read_only: bool = False):
+        """
+        Initialize SparseTimestampIndex.
+
+        Args:
+            data_file: Uncompressed audit JSONL file being indexed
+            interval: Entries between index marks
+            read_only: Never write the sidecar (the file is written by another owner)
+        """
+        self.data_file = data_file
+        self.index_file = data_file.with_name(data_file.name + '.idx')
+        self.interval = max(1, interval)
+        self.read_only = read_only
+        self.lock = Lock()
+
+        self.keys: List[str] = []
+        self.offsets: List[int] = []
+        self._max_key = ''
+        self._since_mark = 0
+        self.end_offset = 0
+
+        self._load()
+
+    def _load(self):
+        """Load marks, then index the tail"""
+        self._load_marks()
+        self.catch_up()
+
+    def _load_marks(self):
+        """Load marks, discarding any that point past the data"""
+        size = self.data_file.stat().st_size if self.data_file.exists() else 0
+
+        if self.index_file.exists():
+            with open(self.index_file, 'r', encoding='ascii') as f:
+                lines = f.readlines()
+            for line in lines:
+                parts = line.split()
+                if len(parts) != 2 or not parts[1].isdigit():
+                    break
+                key, offset = parts[0], int(parts[1])
+                if offset > size or (self.offsets and offset <= self.offsets[-1]):
+                    break
+                self.keys.append(key)
+                self.offsets.append(offset)
+
+            # Marks were dropped (data truncated or torn index line)
+            if len(lines) != len(self.offsets) and not self.read_only:
+                self._rewrite()
+
+        if self.offsets:
+            self._max_key = self.keys[-1]
+            self.end_offset = self.offsets[-1]
+
+    def _rewrite(self):
+        with open(self.index_file, 'w', encoding='ascii') as f:
+            for key, offset in zip(self.keys, self.offsets):
+                f.write(f"{key} {offset}\n")
+
+    def catch_up(self):
+        """Index entries appended to the data file beyond end_offset"""
+        if not self.data_file.exists() or self.data_file.stat().st_size <= self.end_offset:
+            return
+
+        with open(self.data_file, 'rb') as f:
+            f.seek(self.end_offset)
+            offset = self.end_offset
+            for line in f:
+                if not line.endswith(b'\n'):
+                    # Torn tail - index it once it is complete
+                    break
+                key, entry = self._parse(line) if line.strip() else (None, None)
+                if key is not None:
+                    self.note(key, offset, len(line), entry)
+                else:
+                    self.end_offset = offset + len(line)
+                offset += len(line)
+
+    def _parse(self, line: bytes):
+        """Timestamp key and (optionally) parsed entry for a raw line"""
+        return line_key(line), None
+
+    def _on_block_closed(self, offset: int):
+        """Hook - a mark was just added at offset (called with the lock held)"""
+
+    def _on_entry(self, key: str, entry: Optional[dict]):
+        """Hook - an entry was added to the open block"""
+
+    def note(self, key: str, offset: int, length: int, entry: Optional[dict] = None):
+        """Record an entry written at offset (single writer)"""
+        if offset < self.end_offset:
+            # Already indexed by catch_up()
+            return
+        if self._since_mark >= self.interval:
+            if not self.read_only:
+                with open(self.index_file, 'a', encoding='ascii') as f:
+                    f.write(f"{self._max_key} {offset}\n")
+            with self.lock:
+                self.keys.append(self._max_key)
+                self.offsets.append(offset)
+                self._on_block_closed(offset)
+            self._since_mark = 0
+
+        if key > self._max_key:
+            self._max_key = key
+        self._since_mark += 1
+        self._on_entry(key, entry)
+        self.end_offset = offset + length
+
+    def seek_offset(self, start_key: Optional[str]) -> int:
+        """Offset before which no entry has a key >= start_key"""
+        if not start_key:
+            return 0
+        with self.lock:
+            position = bisect_left(self.keys, start_key) - 1
+            return self.offsets[position] if position >= 0 else 0
+
+    @property
+    def marks(self) -> int:
+        return len(self.offsets)
@@ -5,29 +5,154 @@ AuditLogger - Structured Audit Logging
 
 Structured audit logging for compliance and traceability.
 JSONL format for easy parsing and analysis with queryable audit trail.
+
+Writer modes:
+- Synchronous (default): every log_event() opens, appends and closes the file.
+- async_writer=True: log_event() enqueues the entry on a bounded queue and
+  returns; a writer thread keeps one file handle open and writes batches.
+  flush_policy controls durability:
+    'always'    flush + fsync after every entry
+    'entries'   flush + fsync every flush_entries entries
+    'interval'  flush + fsync at most every flush_interval_ms
+  close() drains the queue before returning.
+
+Segmented mode (segmented=True) writes daily audit-YYYY-MM-DD.jsonl
+segments tracked by an AuditSegmentStore manifest; time-range queries only
+open the segments that overlap the range.
+
+Time-range queries seek through a sparse timestamp index kept next to each
+uncompressed file (see SparseTimestampIndex) and stop once past end_time,
+comparing raw timestamp prefixes so only lines in range are JSON-parsed.
+
+rollups=True keeps hourly (event_type, actor, result) counters up to date
+as entries are appended (see AuditRollups); get_rollup_summary() answers
+count questions without reading raw entries.
+
+search() answers multi-attribute queries newest-first with pagination
+cursors. The sparse index also keeps per-block postings for event_type,
+actor, action, resource and result (see AuditFileIndex), so only blocks
+that can hold a match are read.
 """
 
+import os
 import json
+import gzip
+import time
+import queue
+import atexit
 import logging
+from collections import deque
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta
+from threading import Thread, Event, Lock
 from typing import List, Dict, Any, Optional
 
+from .audit_segments import AuditSegmentStore, parse_timestamp
+from .audit_index import line_key, KEY_LENGTH
+from .audit_postings import AuditFileIndex, INDEXED_FIELDS
+from .audit_rollups import AuditRollups, ROLLUP_NAME
+
+FLUSH_POLICIES = ('always', 'entries', 'interval')
+
+# Queue sentinel that stops the writer thread
+_STOP = object()
+
+# Appends between segment manifest / rollup checkpoints
+CHECKPOINT_ENTRIES = 100
+
+# Out-of-order slack allowed between concurrent writers when a time-range
+# scan decides it has passed end_time
+SKEW_TOLERANCE = timedelta(seconds=5)
+
 
 class AuditLogger:
     """Structured audit logging for compliance"""
 
-    def __init__(self, logs_dir: Path, logger: logging.Logger):
+    def __init__(self, logs_dir: Path, logger: logging.Logger,
+                 async_writer: bool = False, queue_size: int = 10000,
+                 flush_policy: str = 'interval', flush_entries: int = 100,
+                 flush_interval_ms: float = 200, segmented: bool = False,
+                 max_segment_bytes: Optional[int] = None,
+                 compress_segments: bool = True, index_interval: int = 1000,
+                 rollups: bool = False, read_only: bool = False):
+        """
+        Initialize AuditLogger.
+
+        Args:
+            logs_dir: Directory holding audit.jsonl
+            logger: Logger instance
+            async_writer: Write entries from a background thread
+            queue_size: Maximum queued entries before log_event() blocks
+            flush_policy: 'always', 'entries' or 'interval' (async mode only)
+            flush_entries: Entries between fsyncs for the 'entries' policy
+            flush_interval_ms: Milliseconds between fsyncs for the 'interval' policy
+            segmented: Write daily segments instead of a single audit.jsonl
+            max_segment_bytes: Segmented mode - start a new part past this size
+            compress_segments: Segmented mode - gzip segments from earlier days
+            index_interval: Entries between sparse timestamp index marks
+            rollups: Maintain hourly rollup counters in audit-rollups.jsonl
+            read_only: Segmented mode - query segments another process writes,
+                leaving its manifest untouched
+        """
+        if flush_policy not in FLUSH_POLICIES:
+            raise ValueError(f"Unknown audit flush policy: {flush_policy}")
+
         self.logs_dir = logs_dir
         self.logger = logger
-        self.audit_file = logs_dir / "audit.jsonl"
+        self.lock = Lock()
+        self._handle = None
+        self._handle_path: Optional[Path] = None
+        self._handle_offset = 0
+        self._handle_index: Optional[AuditFileIndex] = None
 
-        # Ensure audit file exists
-        self.audit_file.parent.mkdir(parents=True, exist_ok=True)
-        if not self.audit_file.exists():
-            self.audit_file.touch()
+        # Sparse timestamp / postings indexes, one per uncompressed file
+        self.index_interval = index_interval
+        self._indexes: Dict[Path, AuditFileIndex] = {}
+        self._index_lock = Lock()
 
-        self.logger.info(f"AuditLogger initialized (file: {self.audit_file})")
+        if segmented:
+            self.segments = AuditSegmentStore(logs_dir, logger, max_segment_bytes=max_segment_bytes,
+                                              compress=compress_segments, read_only=read_only)
+            self.audit_file = self.segments.current_path()
+        else:
+            self.segments = None
+            self.audit_file = logs_dir / "audit.jsonl"
+
+            # Ensure audit file exists
+            self.audit_file.parent.mkdir(parents=True, exist_ok=True)
+            if not self.audit_file.exists():
+                self.audit_file.touch()
+
+        # Hourly rollups - count anything appended since the last checkpoint
+        self._unsaved = 0
+        self.rollups = None
+        if rollups:
+            self.rollups = AuditRollups(logs_dir / ROLLUP_NAME)
+            self.rollups.catch_up(self._audit_files())
+
+        # Async writer
+        self.async_writer = async_writer
+        self.flush_policy = flush_policy
+        self.flush_entries = max(1, flush_entries)
+        self.flush_interval = flush_interval_ms / 1000
+        self.writer_stats = {
+            'entries': 0,
+            'batches': 0,
+            'fsyncs': 0,
+            'max_queue_depth': 0,
+        }
+        self._queue: Optional[queue.Queue] = None
+        self._writer: Optional[Thread] = None
+
+        if async_writer:
+            self._queue = queue.Queue(maxsize=queue_size)
+            self._writer = Thread(target=self._writer_loop, daemon=True)
+            self._writer.start()
+            # Not close(): it logs, and handler streams may be closed at exit
+            atexit.register(self._stop_writer)
+
+        mode = f"async, flush={flush_policy}" if async_writer else "sync"
+        self.logger.info(f"AuditLogger initialized (file: {self.audit_file}, {mode})")
 
     def log_event(self, event_type: str, actor: str, action: str,
                   resource: str, result: str, metadata: Dict[str, Any] = None):
@@ -43,13 +168,189 @@ class AuditLogger:
                 'metadata': metadata or {}
             }
 
+            if self._writer is not None:
+                # Blocks only when the writer has fallen queue_size entries behind
+                self._queue.put(audit_entry)
+                return
+
             # Append to audit log
-            with open(self.audit_file, 'a', encoding='utf-8') as f:
-                f.write(json.dumps(audit_entry) + '\n')
+            with self.lock:
+                try:
+                    self._write_entries([audit_entry])
+                finally:
+                    self._close_handle()
+                if self._unsaved >= CHECKPOINT_ENTRIES:
+                    self._checkpoint()
 
         except Exception as e:
             self.logger.error(f"Failed to write audit log: {e}")
 
+    def _writer_loop(self):
+        """Background writer - drains the queue in batches onto one handle"""
+        unsynced = 0
+        last_sync = time.monotonic()
+        running = True
+
+        try:
+            while running:
+                try:
+                    item = self._queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    item = None
+
+                batch = []
+                waiters = []
+                while item is not None:
+                    if isinstance(item, Event):
+                        waiters.append(item)
+                    elif item is _STOP:
+                        running = False
+                    else:
+                        batch.append(item)
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        item = None
+
+                # self.lock pauses the writer during rebuild_rollups()
+                with self.lock:
+                    try:
+                        if self.flush_policy == 'always':
+                            for entry in batch:
+                                self._write_entries([entry])
+                                self._sync()
+                        elif batch:
+                            self._write_entries(batch)
+                            unsynced += len(batch)
+
+                        if batch:
+                            self.writer_stats['entries'] += len(batch)
+                            self.writer_stats['batches'] += 1
+                            self.writer_stats['max_queue_depth'] = max(
+                                self.writer_stats['max_queue_depth'], len(batch))
+
+                        due = (
+                            (self.flush_policy == 'entries' and unsynced >= self.flush_entries) or
+                            (self.flush_policy == 'interval' and
+                             time.monotonic() - last_sync >= self.flush_interval)
+                        )
+                        if unsynced and (due or waiters or not running):
+                            self._sync()
+                            unsynced = 0
+                            last_sync = time.monotonic()
+
+                        if waiters or not running or self._unsaved >= CHECKPOINT_ENTRIES:
+                            self._checkpoint()
+
+                    except Exception as e:
+                        self.logger.error(f"Failed to write audit log: {e}")
+
+                for waiter in waiters:
+                    waiter.set()
+        finally:
+            self._close_handle()
+
+    def _write_entries(self, entries: List[Dict]):
+        """Append entries, switching files at segment boundaries (single writer)"""
+        lines = []
+        for entry in entries:
+            line = json.dumps(entry) + '\n'
+            if self.segments is not None:
+                segment = self.segments.segment_for(entry['timestamp'])
+                path = self.segments.path(segment)
+            else:
+                segment = None
+                path = self.audit_file
+
+            if path != self._handle_path:
+                if lines:
+                    self._handle.write(''.join(lines))
+                    lines = []
+                self._open_handle(path)
+
+            lines.append(line)
+            self._handle_index.note(entry['timestamp'][:KEY_LENGTH], self._handle_offset, len(line), entry)
+            self._handle_offset += len(line)
+            if self.rollups is not None:
+                self.rollups.add(entry, path.name, self._handle_offset)
+            if segment is not None:
+                self.segments.record(segment, entry['timestamp'], len(line))
+
+        if lines:
+            self._handle.write(''.join(lines))
+        self._unsaved += len(entries)
+
+    def _checkpoint(self):
+        """Persist the segment manifest and rollups (single writer)"""
+        self._unsaved = 0
+        if self.segments is not None:
+            self.segments.save()
+        if self.rollups is not None:
+            # Rollup watermarks must not run ahead of bytes on disk
+            if self._handle is not None:
+                self._handle.flush()
+            self.rollups.checkpoint()
+
+    def _open_handle(self, path: Path):
+        if self._handle is not None:
+            # Leaving a segment - make it durable before moving on
+            self._sync()
+            self._handle.close()
+        self._handle = open(path, 'a', encoding='utf-8')
+        self._handle_path = path
+        self._handle_offset = path.stat().st_size
+        self._handle_index = self._index_for(path, owner=True)
+        # Pick up anything appended by another process
+        self._handle_index.catch_up()
+        if self.segments is not None:
+            self.audit_file = path
+
+    def _close_handle(self):
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+            self._handle_path = None
+            self._handle_index = None
+
+    def _sync(self):
+        if self._handle is None:
+            return
+        self._handle.flush()
+        os.fsync(self._handle.fileno())
+        self.writer_stats['fsyncs'] += 1
+
+    def flush(self, timeout: float = 5.0):
+        """Wait until every entry logged so far is written and fsynced"""
+        if self._writer is None or not self._writer.is_alive():
+            return
+        done = Event()
+        self._queue.put(done)
+        done.wait(timeout)
+
+    def close(self):
+        """Drain the queue and stop the writer thread"""
+        if self._stop_writer():
+            self.logger.info(f"AuditLogger closed ({self.writer_stats['entries']} entries written async)")
+
+    def _stop_writer(self) -> bool:
+        """Drain and stop the writer thread; True if it was running"""
+        writer, self._writer = self._writer, None
+        if writer is not None:
+            atexit.unregister(self._stop_writer)
+            self._queue.put(_STOP)
+            writer.join()
+
+        with self.lock:
+            self._checkpoint()
+        return writer is not None
+
+    def get_writer_stats(self) -> Dict[str, Any]:
+        """Get async writer statistics"""
+        stats = dict(self.writer_stats)
+        stats['mode'] = f"async/{self.flush_policy}" if self.async_writer else 'sync'
+        stats['queue_depth'] = self._queue.qsize() if self._queue else 0
+        return stats
+
     def log_skill_execution(self, skill_name: str, args: List[str],
                            result: Dict, duration: float):
         """Log skill execution"""
@@ -63,7 +364,8 @@ class AuditLogger:
                 'args': args,
                 'duration': duration,
                 'returncode': result.get('returncode'),
-                'error': result.get('stderr') if not result.get('success') else None
+                'error': result.get('stderr') if not result.get('success') else None,
+                'output_logs': result.get('output_logs')
             }
         )
 
@@ -90,44 +392,307 @@ class AuditLogger:
         )
 
     def query_logs(self, event_type: str = None, start_time: datetime = None,
-                   end_time: datetime = None, limit: int = 100) -> List[Dict]:
-        """Query audit logs with filters"""
+                   end_time: datetime = None, limit: Optional[int] = 100) -> List[Dict]:
+        """Query audit logs with filters (limit=None returns every match)"""
+        # Make entries still queued in the async writer visible
+        self.flush()
+
         try:
             results = []
 
-            if not self.audit_file.exists():
-                return results
+            start = parse_timestamp(start_time)
+            end = parse_timestamp(end_time)
+            start_key = start.isoformat()[:KEY_LENGTH] if start else None
+            end_key = end.isoformat()[:KEY_LENGTH] if end else None
+            stop_key = (end + SKEW_TOLERANCE).isoformat()[:KEY_LENGTH] if end else None
 
-            with open(self.audit_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    if not line.strip():
-                        continue
+            for path in self._segment_paths(start_time, end_time):
+                with self._open_at(path, start_key) as f:
+                    for line in f:
+                        # Filter on the raw timestamp prefix before parsing JSON
+                        key = line_key(line) if line.strip() else None
+                        if key is None:
+                            continue
+                        if stop_key and key > stop_key:
+                            break
+                        if (start_key and key < start_key) or (end_key and key > end_key):
+                            continue
 
-                    try:
-                        entry = json.loads(line.strip())
+                        try:
+                            entry = json.loads(line)
+                        except json.JSONDecodeError:
+                            continue
 
                         # Apply filters
                         if event_type and entry.get('event_type') != event_type:
                             continue
 
-                        entry_time = datetime.fromisoformat(entry['timestamp'].replace('Z', '+00:00'))
-
-                        if start_time and entry_time < start_time:
-                            continue
-
-                        if end_time and entry_time > end_time:
-                            continue
+                        # Sub-second precision only matters in the boundary seconds
+                        if key == start_key or key == end_key:
+                            entry_time = parse_timestamp(entry['timestamp'])
+                            if start and entry_time < start:
+                                continue
+                            if end and entry_time > end:
+                                continue
 
                         results.append(entry)
 
-                        if len(results) >= limit:
-                            break
-
-                    except json.JSONDecodeError:
-                        continue
+                        if limit is not None and len(results) >= limit:
+                            return results
 
             return results
 
         except Exception as e:
             self.logger.error(f"Error querying audit logs: {e}")
             return []
+
+    def search(self, event_type: str = None, actor: str = None, action: str = None,
+               resource: str = None, result: str = None, metadata: Dict[str, Any] = None,
+               start_time: datetime = None, end_time: datetime = None,
+               limit: int = 50, cursor: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Search audit entries newest-first.
+
+        Args:
+            event_type: Exact event_type to match
+            actor: Exact actor to match
+            action: Exact action to match
+            resource: Exact resource to match
+            result: Exact result to match
+            metadata: Metadata keys that must equal the given values
+            start_time: Oldest entry time to include
+            end_time: Newest entry time to include
+            limit: Maximum entries per page
+            cursor: next_cursor from the previous page
+
+        Returns:
+            entries (newest first), next_cursor (None when exhausted), and the
+            number of lines parsed and blocks read
+        """
+        filters = {
+            field: value for field, value in (
+                ('event_type', event_type), ('actor', actor), ('action', action),
+                ('resource', resource), ('result', result)
+            ) if value is not None
+        }
+        metadata = metadata or {}
+
+        cursor_file, cursor_offset = None, None
+        if cursor:
+            cursor_file, _, offset = cursor.rpartition('@')
+            if not cursor_file or not offset.isdigit():
+                raise ValueError(f"Invalid audit search cursor: {cursor}")
+            cursor_offset = int(offset)
+
+        # Make entries still queued in the async writer visible
+        self.flush()
+
+        page = {'entries': [], 'next_cursor': None, 'scanned': 0, 'blocks': 0}
+        try:
+            start = parse_timestamp(start_time)
+            end = parse_timestamp(end_time)
+            bounds = (
+                start,
+                end,
+                start.isoformat()[:KEY_LENGTH] if start else None,
+                end.isoformat()[:KEY_LENGTH] if end else None,
+            )
+
+            # Raw substrings every matching line must contain (json.dumps layout)
+            needles = [json.dumps({field: value})[1:-1].encode('utf-8')
+                       for field, value in list(filters.items()) + list(metadata.items())]
+
+            paths = list(reversed(self._segment_paths(start_time, end_time)))
+            if cursor_file is not None:
+                names = [self._file_name(path) for path in paths]
+                if cursor_file not in names:
+                    return page
+                paths = paths[names.index(cursor_file):]
+
+            for path in paths:
+                name = self._file_name(path)
+                before = cursor_offset if name == cursor_file else None
+                if path.suffix != '.gz' and not path.exists():
+                    # Compressed by the background thread since the manifest was read
+                    path = path.with_name(path.name + '.gz')
+
+                if path.suffix == '.gz':
+                    lines = self._search_compressed(path, before, filters, metadata,
+                                                    bounds, needles, limit, page)
+                else:
+                    lines = self._search_indexed(path, before, filters, metadata,
+                                                 bounds, needles, page)
+
+                for offset, entry in lines:
+                    page['entries'].append(entry)
+                    if len(page['entries']) >= limit:
+                        page['next_cursor'] = f"{name}@{offset}"
+                        return page
+
+            return page
+
+        except Exception as e:
+            self.logger.error(f"Error searching audit logs: {e}")
+            return page
+
+    @staticmethod
+    def _file_name(path: Path) -> str:
+        # Compression keeps content, so cursors carry over to the .gz name
+        return path.name[:-3] if path.name.endswith('.gz') else path.name
+
+    @staticmethod
+    def _search_match(line: bytes, filters: Dict, metadata: Dict, bounds, needles, page) -> Optional[Dict]:
+        """Parse and exactly match one raw line, or None"""
+        start, end, start_key, end_key = bounds
+        for needle in needles:
+            if needle not in line:
+                return None
+        key = line_key(line)
+        if key is None or (start_key and key < start_key) or (end_key and key > end_key):
+            return None
+
+        page['scanned'] += 1
+        try:
+            entry = json.loads(line)
+        except json.JSONDecodeError:
+            return None
+
+        for field, value in filters.items():
+            if entry.get(field) != value:
+                return None
+        entry_metadata = entry.get('metadata') or {}
+        for field, value in metadata.items():
+            if entry_metadata.get(field) != value:
+                return None
+
+        # Sub-second precision only matters in the boundary seconds
+        if key == start_key or key == end_key:
+            entry_time = parse_timestamp(entry['timestamp'])
+            if (start and entry_time < start) or (end and entry_time > end):
+                return None
+        return entry
+
+    def _search_indexed(self, path: Path, before: Optional[int], filters: Dict,
+                        metadata: Dict, bounds, needles, page):
+        """Yield (offset, entry) matches newest-first, reading only candidate blocks"""
+        index = self._index_for(path)
+        indexed = {field: value for field, value in filters.items() if field in INDEXED_FIELDS}
+        ranges = index.candidate_ranges(indexed, bounds[2], bounds[3])
+
+        with open(path, 'rb') as f:
+            for range_start, range_end in reversed(ranges):
+                if before is not None:
+                    if range_start >= before:
+                        continue
+                    range_end = before if range_end is None else min(range_end, before)
+
+                f.seek(range_start)
+                data = f.read(range_end - range_start) if range_end is not None else f.read()
+                # Ignore a torn tail still being written
+                data = data[:data.rfind(b'\n') + 1]
+                page['blocks'] += 1
+
+                offsets = []
+                offset = range_start
+                lines = data.splitlines(keepends=True)
+                for line in lines:
+                    offsets.append(offset)
+                    offset += len(line)
+
+                for offset, line in zip(reversed(offsets), reversed(lines)):
+                    entry = self._search_match(line, filters, metadata, bounds, needles, page)
+                    if entry is not None:
+                        yield offset, entry
+
+    def _search_compressed(self, path: Path, before: Optional[int], filters: Dict,
+                           metadata: Dict, bounds, needles, limit: int, page):
+        """Matches newest-first from a gzip segment (streamed, last `limit` kept)"""
+        stop_key = (bounds[1] + SKEW_TOLERANCE).isoformat()[:KEY_LENGTH] if bounds[1] else None
+        matches = deque(maxlen=limit - len(page['entries']))
+        offset = 0
+        page['blocks'] += 1
+
+        with gzip.open(path, 'rb') as f:
+            for line in f:
+                if before is not None and offset >= before:
+                    break
+                line_offset = offset
+                offset += len(line)
+                if stop_key and line.startswith(b'{"timestamp": "') and line_key(line) > stop_key:
+                    break
+                entry = self._search_match(line, filters, metadata, bounds, needles, page)
+                if entry is not None:
+                    matches.append((line_offset, entry))
+
+        return reversed(matches)
+
+    def _segment_paths(self, start_time: datetime = None, end_time: datetime = None) -> List[Path]:
+        """Files that may hold entries in the time range, oldest first"""
+        if self.segments is None:
+            return [self.audit_file] if self.audit_file.exists() else []
+        return [self.segments.path(s) for s in self.segments.segments_for_range(start_time, end_time)]
+
+    def _index_for(self, path: Path, owner: bool = False) -> AuditFileIndex:
+        """
+        Get (or load) the timestamp / postings index for an uncompressed file.
+
+        Only the file this logger writes (owner=True) gets a writable index;
+        indexes for reads keep their sidecars read-only, as the file may be
+        appended to by another process whose marks are ahead of its data.
+        """
+        with self._index_lock:
+            index = self._indexes.get(path)
+            if index is None or (owner and index.read_only):
+                index = AuditFileIndex(path, interval=self.index_interval, read_only=not owner)
+                self._indexes[path] = index
+            return index
+
+    def _open_at(self, path: Path, start_key: Optional[str]):
+        """Open an audit file for binary reads, seeked near start_key when indexed"""
+        if path.suffix != '.gz':
+            try:
+                f = open(path, 'rb')
+            except FileNotFoundError:
+                # Compressed by the background thread since the manifest was read
+                path = path.with_name(path.name + '.gz')
+            else:
+                if start_key:
+                    f.seek(self._index_for(path).seek_offset(start_key))
+                return f
+        return gzip.open(path, 'rb')
+
+    def _audit_files(self) -> List[Path]:
+        """Every audit file, oldest first"""
+        if self.segments is None:
+            return [self.audit_file]
+        return [self.segments.path(s) for s in self.segments.get_manifest()]
+
+    def get_rollup_summary(self, start_time: datetime = None,
+                           end_time: datetime = None) -> Optional[Dict[str, Any]]:
+        """
+        Get event counts from the hourly rollups.
+
+        Args:
+            start_time: Range start (widened to the hour)
+            end_time: Range end (widened to the hour)
+
+        Returns:
+            Totals by event type, actor, result and event type/result,
+            or None when rollups are disabled
+        """
+        if self.rollups is None:
+            return None
+        self.flush()
+        return self.rollups.summary(start_time, end_time)
+
+    def rebuild_rollups(self) -> int:
+        """Regenerate the rollups from the raw audit files"""
+        self.flush()
+        if self.rollups is None:
+            self.rollups = AuditRollups(self.logs_dir / ROLLUP_NAME)
+        # The async writer appends rollups under self.lock, so it waits here
+        with self.lock:
+            # Entries counted so far must be on disk for the rebuild to see them
+            if self._handle is not None:
+                self._handle.flush()
+            return self.rollups.rebuild(self._audit_files())
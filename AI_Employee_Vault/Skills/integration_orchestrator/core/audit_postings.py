@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+AuditFileIndex - Block Postings for Audit Queries
+==================================================
+
+Extends the sparse timestamp index with postings for the frequently
+filtered audit fields (event_type, actor, action, resource, result).
+
+Each run of `interval` entries between two index marks is a block. When a
+block closes, one record is appended to <file>.postings with the block's
+min/max timestamp keys and the distinct values of every indexed field.
+In memory these become postings lists (field -> value -> block ids), so a
+query intersects the lists of its filters and only reads the blocks that
+can contain a match. The open tail block is always scanned.
+
+As with the marks, only the writer's index (read_only=False) persists
+postings. Readers rebuild missing postings in memory and leave the file
+alone, since its newest records may belong to blocks that are not yet flushed.
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .audit_index import SparseTimestampIndex, KEY_LENGTH
+
+INDEXED_FIELDS = ('event_type', 'actor', 'action', 'resource', 'result')
+
+
+class AuditFileIndex(SparseTimestampIndex):
+    """Sparse timestamp index plus per-block field postings for one audit file"""
+
+    def __init__(self, data_file: Path, interval: int = 1000, fields=INDEXED_FIELDS,
+                 read_only: bool = False):
+        """
+        Initialize AuditFileIndex.
+
+        Args:
+            data_file: Uncompressed audit JSONL file being indexed
+            interval: Entries per block
+            fields: Top-level entry fields to keep postings for
+            read_only: Never write the sidecars (the file is written by another owner)
+        """
+        self.fields = tuple(fields)
+        self.postings_file = data_file.with_name(data_file.name + '.postings')
+        self.postings: Dict[str, Dict[str, List[int]]] = {field: {} for field in self.fields}
+        self.block_bounds: List[Tuple[str, str]] = []
+        self._reset_block()
+
+        super().__init__(data_file, interval, read_only=read_only)
+
+    def _reset_block(self):
+        self._block_values = {field: set() for field in self.fields}
+        self._block_min: Optional[str] = None
+        self._block_max: Optional[str] = None
+
+    def _load(self):
+        """Load marks and postings, index blocks missing postings, then the tail"""
+        self._load_marks()
+
+        records = []
+        if self.postings_file.exists():
+            with open(self.postings_file, 'r', encoding='utf-8') as f:
+                lines = f.readlines()
+            for line in lines:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    break
+                if record.get('b') != len(records) or len(records) >= len(self.offsets):
+                    break
+                records.append(record)
+            # Postings ahead of the marks (index truncated) or a torn record
+            if len(records) != len(lines) and not self.read_only:
+                with open(self.postings_file, 'w', encoding='utf-8') as f:
+                    for record in records:
+                        f.write(json.dumps(record, separators=(',', ':')) + '\n')
+
+        for record in records:
+            self._add_block(record)
+
+        # Blocks closed without postings (crash, or an index that predates them)
+        if len(records) < len(self.offsets):
+            with open(self.data_file, 'rb') as f:
+                for block in range(len(records), len(self.offsets)):
+                    start = self.offsets[block - 1] if block else 0
+                    f.seek(start)
+                    for line in f.read(self.offsets[block] - start).splitlines():
+                        key, entry = self._parse(line) if line.strip() else (None, None)
+                        if key is not None:
+                            self._on_entry(key, entry)
+                    self._on_block_closed(self.offsets[block])
+
+        self._reset_block()
+        self.catch_up()
+
+    def _parse(self, line: bytes):
+        try:
+            entry = json.loads(line)
+            return entry['timestamp'][:KEY_LENGTH], entry
+        except (ValueError, KeyError, TypeError):
+            return None, None
+
+    def _on_entry(self, key: str, entry: Optional[dict]):
+        if self._block_min is None or key < self._block_min:
+            self._block_min = key
+        if self._block_max is None or key > self._block_max:
+            self._block_max = key
+        if entry is None:
+            return
+        for field in self.fields:
+            value = entry.get(field)
+            if value is not None:
+                self._block_values[field].add(str(value))
+
+    def _on_block_closed(self, offset: int):
+        record = {
+            'b': len(self.block_bounds),
+            'min': self._block_min or '',
+            'max': self._block_max or '',
+            'v': {field: sorted(values) for field, values in self._block_values.items()},
+        }
+        if not self.read_only:
+            with open(self.postings_file, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, separators=(',', ':')) + '\n')
+        self._add_block(record)
+        self._reset_block()
+
+    def _add_block(self, record: Dict):
+        block = record['b']
+        self.block_bounds.append((record['min'], record['max']))
+        for field, values in record['v'].items():
+            postings = self.postings.get(field)
+            if postings is None:
+                continue
+            for value in values:
+                postings.setdefault(value, []).append(block)
+
+    def candidate_ranges(self, filters: Dict[str, str], start_key: Optional[str] = None,
+                         end_key: Optional[str] = None) -> List[Tuple[int, Optional[int]]]:
+        """
+        Byte ranges, oldest first, of blocks that may hold matching entries.
+
+        Args:
+            filters: Indexed field -> required value
+            start_key: Skip blocks whose newest entry is older than this
+            end_key: Skip blocks whose oldest entry is newer than this
+
+        Returns:
+            (start, end) offsets; end is None for the open tail block
+        """
+        with self.lock:
+            blocks = None
+            for field, value in filters.items():
+                if field not in self.postings:
+                    continue
+                ids = self.postings[field].get(str(value), [])
+                blocks = ids if blocks is None else sorted(set(blocks).intersection(ids))
+            if blocks is None:
+                blocks = range(len(self.block_bounds))
+
+            ranges = []
+            for block in blocks:
+                block_min, block_max = self.block_bounds[block]
+                if (start_key and block_max < start_key) or (end_key and block_min > end_key):
+                    continue
+                ranges.append((self.offsets[block - 1] if block else 0, self.offsets[block]))
+
+            # The open tail block has no postings yet
+            ranges.append((self.offsets[-1] if self.offsets else 0, None))
+            return ranges
+
+    @property
+    def blocks(self) -> int:
+        return len(self.block_bounds)
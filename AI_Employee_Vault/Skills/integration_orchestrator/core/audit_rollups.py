@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+AuditRollups - Hourly Audit Counters
+=====================================
+
+Counts audit entries per hour by (event_type, actor, result) as they are
+appended, so reports aggregate O(hours) buckets instead of O(events) lines.
+
+Persistence follows the StateManager journal pattern: audit-rollups.jsonl
+holds one record per checkpoint with the counts added since the previous
+one, plus per-file watermarks (bytes of each audit file already counted).
+Counts and watermarks live in the same record, so a torn or missing
+checkpoint never double counts: on load, anything past a file's watermark
+is counted again from the raw file. Past compact_threshold records the
+journal is folded into a single snapshot record.
+
+Buckets are hour-granular: ranges are widened to whole hours.
+
+Readers outside the writing process (read_only=True) replay the journal and
+count entries past the watermarks in memory; they never append checkpoints.
+"""
+
+import os
+import json
+import gzip
+from pathlib import Path
+from datetime import datetime
+from threading import Lock
+from typing import Dict, List, Optional
+
+from .audit_segments import parse_timestamp
+
+ROLLUP_NAME = "audit-rollups.jsonl"
+KEY_SEPARATOR = '|'
+
+
+def _merge(target: Dict[str, Dict[str, int]], source: Dict[str, Dict[str, int]]):
+    for hour, counts in source.items():
+        bucket = target.setdefault(hour, {})
+        for key, count in counts.items():
+            bucket[key] = bucket.get(key, 0) + count
+
+
+def summarize(hours: Dict[str, Dict[str, int]], start_time=None, end_time=None) -> Dict:
+    """Aggregate hourly buckets overlapping [start_time, end_time]"""
+    start = parse_timestamp(start_time)
+    end = parse_timestamp(end_time)
+    start_hour = start.isoformat()[:13] if start else None
+    end_hour = end.isoformat()[:13] if end else None
+
+    summary = {
+        'total_events': 0,
+        'events_by_type': {},
+        'events_by_actor': {},
+        'events_by_result': {},
+        'events_by_type_result': {},
+        'buckets': 0,
+    }
+
+    for hour, counts in hours.items():
+        if (start_hour and hour < start_hour) or (end_hour and hour > end_hour):
+            continue
+        summary['buckets'] += 1
+        for key, count in counts.items():
+            event_type, actor, result = key.split(KEY_SEPARATOR)
+            summary['total_events'] += count
+            for field, value in (('events_by_type', event_type), ('events_by_actor', actor),
+                                 ('events_by_result', result)):
+                summary[field][value] = summary[field].get(value, 0) + count
+            by_result = summary['events_by_type_result'].setdefault(event_type, {})
+            by_result[result] = by_result.get(result, 0) + count
+
+    return summary
+
+
+class AuditRollups:
+    """Hourly (event_type, actor, result) counters for the audit trail"""
+
+    def __init__(self, rollup_file: Path, compact_threshold: int = 1000, read_only: bool = False):
+        """
+        Initialize AuditRollups.
+
+        Args:
+            rollup_file: Journal file holding rollup checkpoints
+            compact_threshold: Checkpoint records after which the journal
+                is folded into a single snapshot record
+            read_only: Never write the journal (the audit log is written by another owner)
+        """
+        self.rollup_file = rollup_file
+        self.compact_threshold = compact_threshold
+        self.read_only = read_only
+        self.lock = Lock()
+
+        self.hours: Dict[str, Dict[str, int]] = {}
+        self.watermarks: Dict[str, int] = {}
+        self._delta: Dict[str, Dict[str, int]] = {}
+        self._delta_watermarks: Dict[str, int] = {}
+        self._records = 0
+
+        self._load()
+
+    def _load(self):
+        """Replay checkpoint records, stopping at a torn line"""
+        if not self.rollup_file.exists():
+            return
+
+        with open(self.rollup_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.endswith('\n'):
+                    break
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    break
+                _merge(self.hours, record.get('h', {}))
+                self.watermarks.update(record.get('w', {}))
+                self._records += 1
+
+    @staticmethod
+    def _file_key(path: Path) -> str:
+        # Compression keeps content, so offsets carry over to the .gz name
+        return path.name[:-3] if path.name.endswith('.gz') else path.name
+
+    def add(self, entry: Dict, file_name: str, end_offset: int):
+        """Count an entry written to file_name, ending at end_offset"""
+        hour = entry.get('timestamp', '')[:13]
+        key = KEY_SEPARATOR.join(
+            str(entry.get(field) or 'unknown').replace(KEY_SEPARATOR, '/')
+            for field in ('event_type', 'actor', 'result')
+        )
+        with self.lock:
+            for hours in (self.hours, self._delta):
+                bucket = hours.setdefault(hour, {})
+                bucket[key] = bucket.get(key, 0) + 1
+            self.watermarks[file_name] = end_offset
+            self._delta_watermarks[file_name] = end_offset
+
+    def checkpoint(self):
+        """Append the counts added since the last checkpoint"""
+        with self.lock:
+            if not self._delta_watermarks or self.read_only:
+                return
+            record = {'h': self._delta, 'w': self._delta_watermarks}
+            with open(self.rollup_file, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, separators=(',', ':')) + '\n')
+            self._delta = {}
+            self._delta_watermarks = {}
+            self._records += 1
+
+            if self._records >= self.compact_threshold:
+                self._compact()
+
+    def _compact(self):
+        """Fold the journal into one snapshot record (caller holds the lock)"""
+        temp_file = self.rollup_file.with_suffix('.tmp')
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'h': self.hours, 'w': self.watermarks}, separators=(',', ':')) + '\n')
+        os.replace(temp_file, self.rollup_file)
+        self._records = 1
+
+    def catch_up(self, files: List[Path]) -> int:
+        """Count entries past each file's watermark; returns entries counted"""
+        counted = 0
+        for path in files:
+            key = self._file_key(path)
+            if not path.exists() and path.with_name(path.name + '.gz').exists():
+                path = path.with_name(path.name + '.gz')
+            if not path.exists():
+                continue
+
+            offset = self.watermarks.get(key, 0)
+            if path.suffix != '.gz' and path.stat().st_size <= offset:
+                continue
+
+            with gzip.open(path, 'rb') if path.suffix == '.gz' else open(path, 'rb') as f:
+                f.seek(offset)
+                for line in f:
+                    if not line.endswith(b'\n'):
+                        break
+                    offset += len(line)
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    self.add(entry, key, offset)
+                    counted += 1
+
+        self.checkpoint()
+        return counted
+
+    def rebuild(self, files: List[Path]) -> int:
+        """Discard all rollups and regenerate them from the raw audit files"""
+        if self.read_only:
+            raise RuntimeError("Cannot rebuild read-only audit rollups")
+        with self.lock:
+            self.hours = {}
+            self.watermarks = {}
+            self._delta = {}
+            self._delta_watermarks = {}
+            if self.rollup_file.exists():
+                self.rollup_file.unlink()
+            self._records = 0
+
+        counted = self.catch_up(files)
+        with self.lock:
+            self._compact()
+        return counted
+
+    def summary(self, start_time: Optional[datetime] = None,
+                end_time: Optional[datetime] = None) -> Dict:
+        """Aggregate counts for the hours overlapping the range"""
+        with self.lock:
+            return summarize(self.hours, start_time, end_time)
@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+AuditSegmentStore - Time-Partitioned Audit Log Segments
+========================================================
+
+Splits the audit trail into daily segments (audit-YYYY-MM-DD.jsonl), with
+an optional size cap that starts numbered parts (audit-YYYY-MM-DD.1.jsonl).
+Segments from earlier days are gzip-compressed in the background.
+
+audit-manifest.json records every segment's file, time bounds, entry count
+and size so time-range queries only open overlapping segments. The manifest
+is checkpointed rather than rewritten on every append; on load, any bytes
+past the recorded size of an uncompressed segment are scanned to bring its
+bounds and counts up to date.
+
+A pre-existing audit.jsonl is adopted as a read-only legacy segment.
+
+Only the process appending to the segments maintains the manifest. Readers
+(read_only=True) reconcile it with the files in memory and never save it,
+delete files or compress segments.
+"""
+
+import os
+import re
+import json
+import gzip
+import logging
+from pathlib import Path
+from datetime import datetime, timezone
+from threading import Lock, Thread
+from typing import Dict, List, Optional
+
+MANIFEST_NAME = "audit-manifest.json"
+LEGACY_NAME = "audit.jsonl"
+SEGMENT_PATTERN = re.compile(r'^audit-(\d{4}-\d{2}-\d{2})(?:\.(\d+))?\.jsonl(\.gz)?$')
+
+
+def parse_timestamp(value) -> Optional[datetime]:
+    """Parse an audit timestamp or datetime into a naive UTC datetime"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+class AuditSegmentStore:
+    """Daily audit segments and their manifest"""
+
+    def __init__(self, logs_dir: Path, logger: logging.Logger,
+                 max_segment_bytes: Optional[int] = None, compress: bool = True,
+                 read_only: bool = False):
+        """
+        Initialize AuditSegmentStore.
+
+        Args:
+            logs_dir: Directory holding the segments and manifest
+            logger: Logger instance
+            max_segment_bytes: Start a new part once a segment reaches this size
+            compress: Gzip segments from earlier days
+            read_only: Never write the manifest (the segments are written by another owner)
+        """
+        self.logs_dir = logs_dir
+        self.logger = logger
+        self.max_segment_bytes = max_segment_bytes
+        self.compress = compress and not read_only
+        self.read_only = read_only
+        self.manifest_file = logs_dir / MANIFEST_NAME
+        self.lock = Lock()
+
+        self.segments: List[Dict] = []
+        self._unsaved = 0
+        self._compressor: Optional[Thread] = None
+
+        self.logs_dir.mkdir(parents=True, exist_ok=True)
+        self._load()
+        self._compress_closed()
+
+    # Manifest
+
+    def _load(self):
+        """Load the manifest and reconcile it with the files on disk"""
+        if self.manifest_file.exists():
+            try:
+                with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                    self.segments = json.load(f).get('segments', [])
+            except Exception as e:
+                self.logger.warning(f"Could not load audit manifest, rebuilding: {e}")
+                self.segments = []
+
+        known = {segment['file'] for segment in self.segments}
+        changed = False
+
+        # Files missing from the manifest (first run, or manifest lost)
+        for path in sorted(self.logs_dir.iterdir()):
+            match = SEGMENT_PATTERN.match(path.name)
+            is_legacy = path.name == LEGACY_NAME and path.stat().st_size > 0
+            if path.name in known or not (match or is_legacy):
+                continue
+            # Interrupted compression - keep whichever copy the manifest names
+            if match and path.suffix == '.gz' and path.name[:-3] in known:
+                continue
+            if match and f"{path.name}.gz" in known:
+                if not self.read_only:
+                    path.unlink()
+                continue
+            segment = self._new_segment(
+                path.name,
+                date=match.group(1) if match else None,
+                part=int(match.group(2) or 0) if match else 0
+            )
+            segment['compressed'] = path.suffix == '.gz'
+            self.segments.append(segment)
+            changed = True
+
+        # Drop entries whose files are gone
+        present = [s for s in self.segments if (self.logs_dir / s['file']).exists()]
+        changed |= len(present) != len(self.segments)
+        self.segments = present
+
+        # Catch up on appends made after the last checkpoint
+        for segment in self.segments:
+            path = self.logs_dir / segment['file']
+            size = path.stat().st_size
+            if segment['compressed']:
+                if segment['entries'] == 0 and segment['start'] is None:
+                    self._scan(segment, path, 0)
+                    changed = True
+            elif size != segment['bytes']:
+                self._scan(segment, path, segment['bytes'] if size > segment['bytes'] else 0)
+                changed = True
+
+        self.segments.sort(key=self._sort_key)
+        if changed and not self.read_only:
+            self._save()
+
+    @staticmethod
+    def _sort_key(segment: Dict):
+        # Legacy audit.jsonl predates every dated segment
+        return (segment['date'] or '', segment['part'])
+
+    @staticmethod
+    def _new_segment(name: str, date: Optional[str], part: int = 0) -> Dict:
+        return {
+            'file': name,
+            'date': date,
+            'part': part,
+            'start': None,
+            'end': None,
+            'entries': 0,
+            'bytes': 0,
+            'compressed': False,
+        }
+
+    def _scan(self, segment: Dict, path: Path, offset: int):
+        """Update a segment's bounds and counts from the entries at offset onward"""
+        if offset == 0:
+            segment.update(start=None, end=None, entries=0, bytes=0)
+
+        with gzip.open(path, 'rb') if path.suffix == '.gz' else open(path, 'rb') as f:
+            f.seek(offset)
+            size = offset
+            for line in f:
+                size += len(line)
+                if not line.strip():
+                    continue
+                try:
+                    timestamp = json.loads(line)['timestamp']
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    continue
+                self._record(segment, timestamp, 0)
+
+        if not segment['compressed']:
+            segment['bytes'] = size
+
+    def _save(self):
+        """Atomically write the manifest (caller holds the lock or is initializing)"""
+        # Per-process temp name - a stray second writer must not interleave into ours
+        temp_file = self.manifest_file.with_name(f"{MANIFEST_NAME}.{os.getpid()}.tmp")
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump({'version': 1, 'segments': self.segments}, f, indent=2)
+        os.replace(temp_file, self.manifest_file)
+        self._unsaved = 0
+
+    def save(self):
+        """Checkpoint the manifest if anything was appended since the last save"""
+        with self.lock:
+            if self._unsaved and not self.read_only:
+                self._save()
+
+    @property
+    def unsaved(self) -> int:
+        return self._unsaved
+
+    # Appends
+
+    def segment_for(self, timestamp: str) -> Dict:
+        """Get the segment an entry with this timestamp should be appended to"""
+        if self.read_only:
+            raise RuntimeError("Cannot append to a read-only audit segment store")
+        date = timestamp[:10]
+
+        with self.lock:
+            active = self.segments[-1] if self.segments and self.segments[-1]['date'] else None
+
+            if active and not active['compressed']:
+                full = self.max_segment_bytes is not None and active['bytes'] >= self.max_segment_bytes
+                # An entry stamped before the active day (clock skew) stays in the active segment
+                if active['date'] >= date and not full:
+                    return active
+
+            part = active['part'] + 1 if active and active['date'] >= date else 0
+            date = max(date, active['date']) if active else date
+            name = f"audit-{date}.jsonl" if part == 0 else f"audit-{date}.{part}.jsonl"
+            segment = self._new_segment(name, date, part)
+            self.segments.append(segment)
+            self._save()
+
+        self._compress_closed()
+        return segment
+
+    def path(self, segment: Dict) -> Path:
+        return self.logs_dir / segment['file']
+
+    def current_path(self) -> Path:
+        """Path of the segment currently receiving appends"""
+        with self.lock:
+            if self.segments and self.segments[-1]['date'] and not self.segments[-1]['compressed']:
+                return self.logs_dir / self.segments[-1]['file']
+        return self.logs_dir / f"audit-{datetime.utcnow().strftime('%Y-%m-%d')}.jsonl"
+
+    @staticmethod
+    def _record(segment: Dict, timestamp: str, nbytes: int):
+        if segment['start'] is None or timestamp < segment['start']:
+            segment['start'] = timestamp
+        if segment['end'] is None or timestamp > segment['end']:
+            segment['end'] = timestamp
+        segment['entries'] += 1
+        segment['bytes'] += nbytes
+
+    def record(self, segment: Dict, timestamp: str, nbytes: int):
+        """Record an entry appended to a segment"""
+        with self.lock:
+            self._record(segment, timestamp, nbytes)
+            self._unsaved += 1
+
+    # Compression
+
+    def _compress_closed(self):
+        """Gzip segments from earlier days in a background thread"""
+        if not self.compress:
+            return
+        if self._compressor is not None and self._compressor.is_alive():
+            return
+        self._compressor = Thread(target=self._compress_loop, daemon=True)
+        self._compressor.start()
+
+    def _compress_loop(self):
+        while True:
+            with self.lock:
+                active = self.segments[-1] if self.segments else None
+                candidates = [
+                    s for s in self.segments
+                    if s['date'] and not s['compressed'] and s is not active
+                    and s['date'] < (active['date'] or '')
+                ]
+            if not candidates:
+                return
+
+            segment = candidates[0]
+            source = self.logs_dir / segment['file']
+            target = source.with_name(source.name + '.gz')
+            temp = source.with_name(source.name + '.gz.tmp')
+            try:
+                with open(source, 'rb') as src, gzip.open(temp, 'wb') as dst:
+                    while True:
+                        chunk = src.read(1 << 20)
+                        if not chunk:
+                            break
+                        dst.write(chunk)
+                os.replace(temp, target)
+
+                with self.lock:
+                    segment['file'] = target.name
+                    segment['compressed'] = True
+                    self._save()
+                source.unlink()
+                # Sparse indexes only apply to seekable, uncompressed segments
+                for sidecar in ('.idx', '.postings'):
+                    index_file = source.with_name(source.name + sidecar)
+                    if index_file.exists():
+                        index_file.unlink()
+                self.logger.debug(f"Compressed audit segment {source.name}")
+
+            except Exception as e:
+                self.logger.error(f"Failed to compress audit segment {source.name}: {e}")
+                return
+
+    def wait_for_compression(self, timeout: Optional[float] = None):
+        """Block until background compression finishes"""
+        if self._compressor is not None:
+            self._compressor.join(timeout)
+
+    # Queries
+
+    def segments_for_range(self, start_time=None, end_time=None) -> List[Dict]:
+        """Get the segments whose time bounds overlap [start_time, end_time]"""
+        start = parse_timestamp(start_time)
+        end = parse_timestamp(end_time)
+
+        with self.lock:
+            segments = [dict(s) for s in self.segments]
+
+        selected = []
+        for index, segment in enumerate(segments):
+            if segment['entries'] == 0 and segment['start'] is None:
+                continue
+            seg_start = parse_timestamp(segment['start'])
+            seg_end = parse_timestamp(segment['end'])
+            # The newest segment may still be receiving appends
+            if index == len(segments) - 1:
+                seg_end = None
+            if end is not None and seg_start is not None and seg_start > end:
+                continue
+            if start is not None and seg_end is not None and seg_end < start:
+                continue
+            selected.append(segment)
+        return selected
+
+    def get_manifest(self) -> List[Dict]:
+        """Get a copy of the manifest segments"""
+        with self.lock:
+            return [dict(s) for s in self.segments]
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+BloomFilter - Compact Membership Pre-Check
+===========================================
+
+Probabilistic set used by StateManager as a fast path for is_processed():
+a negative answer is always correct, so lookups for new IDs never touch
+the processed-events store. A positive answer may be a false positive and
+is confirmed against the store.
+
+The filter lives in memory only and is rebuilt from the store on load, so
+it uses Python's per-process string hash instead of a stable digest.
+"""
+
+import math
+from typing import Iterable
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over string keys"""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        """
+        Initialize BloomFilter.
+
+        Args:
+            capacity: Expected number of keys
+            error_rate: Target false-positive rate at capacity
+        """
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(-self.capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / self.capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str):
+        # Kirsch-Mitzenmacher double hashing
+        h1 = hash(key)
+        h2 = hash(key + '\x00') | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, key: str):
+        """Add a key"""
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def update(self, keys: Iterable[str]):
+        """Add many keys"""
+        for key in keys:
+            self.add(key)
+
+    def __contains__(self, key: str) -> bool:
+        for pos in self._positions(key):
+            if not self.bits[pos >> 3] & (1 << (pos & 7)):
+                return False
+        return True
+
+    def is_saturated(self) -> bool:
+        """True once more keys were added than the filter was sized for"""
+        return self.count > self.capacity
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self.bits)
@@ -56,6 +56,10 @@ class CircuitBreakerManager:
 
         self.lock = Lock()
 
+        # Breakers live in their own state namespace so one update writes
+        # one entry instead of the whole breaker map
+        self.breakers = state_manager.namespace('circuit_breakers') if state_manager else None
+
         # Load state from StateManager if available
         self._load_state()
 
@@ -63,27 +67,24 @@ class CircuitBreakerManager:
 
     def _load_state(self):
         """Load circuit breaker state from StateManager"""
-        if self.state_manager:
-            breakers_state = self.state_manager.get_system_state('circuit_breakers')
-            if breakers_state:
-                self.logger.info(f"Loaded {len(breakers_state)} circuit breaker states")
+        if self.breakers is not None:
+            count = len(self.breakers)
+            if count:
+                self.logger.info(f"Loaded {count} circuit breaker states")
                 return
 
         self.logger.debug("No persisted circuit breaker state found, starting fresh")
 
     def _get_breaker_state(self, component: str) -> Dict:
         """Get circuit breaker state for component from StateManager"""
-        if self.state_manager:
-            breakers = self.state_manager.get_system_state('circuit_breakers') or {}
-            return breakers.get(component, self._create_default_breaker())
+        if self.breakers is not None:
+            return self.breakers.get(component) or self._create_default_breaker()
         return self._create_default_breaker()
 
     def _set_breaker_state(self, component: str, breaker: Dict):
         """Set circuit breaker state for component in StateManager"""
-        if self.state_manager:
-            breakers = self.state_manager.get_system_state('circuit_breakers') or {}
-            breakers[component] = breaker
-            self.state_manager.set_system_state('circuit_breakers', breakers)
+        if self.breakers is not None:
+            self.breakers.set(component, breaker)
 
     def _create_default_breaker(self) -> Dict:
         """Create default circuit breaker state"""
@@ -188,8 +189,8 @@ class CircuitBreakerManager:
         Returns:
             Dictionary of component -> breaker state
         """
-        if self.state_manager:
-            return self.state_manager.get_system_state('circuit_breakers') or {}
+        if self.breakers is not None:
+            return self.breakers.items()
         return {}
 
     def reset_breaker(self, component: str):
@@ -5,31 +5,501 @@ EventBus - Central Pub/Sub Event System
 
 Central pub/sub event bus for inter-component communication.
 Enables reactive programming patterns and decouples components.
+
+Dispatch modes:
+- Synchronous (default): publish() calls every subscriber on the
+  publisher's thread, so handlers have run when it returns (tests rely on it).
+- async_dispatch=True: every subscription gets its own bounded queue and
+  worker. publish() only appends to those queues, so a slow handler never
+  stalls the publisher (e.g. the watchdog thread inside EventRouter).
+  Plain callbacks run on a worker thread; coroutine functions run as tasks
+  on a shared asyncio loop thread. Each subscriber sees events in publish
+  order.
+
+Each async subscription's queue is bounded (queue_size) with an overflow
+policy for when it is full:
+    'block'        publish() waits for the worker (default, lossless)
+    'drop_oldest'  discard the oldest queued event
+    'drop_newest'  discard the event being published
+    'coalesce'     replace the queued event with the same coalesce_key,
+                   else drop the oldest
+Published / delivered / dropped / coalesced counts and the queue high-water
+mark are kept per topic and per subscriber (get_stats()).
+
+Status heartbeats can be coalesced in time: subscribe(coalesce_window=s)
+holds each event for up to s seconds and, if a newer event with the same
+coalesce_key (default: the topic) arrives meanwhile, delivers only the
+newest. Every superseded event counts as 'coalesced' - one handler call
+saved. Windowed subscriptions get a worker in either dispatch mode.
+
+Subscriptions may use wildcards on the dotted topic levels: '*' matches one
+level (mcp.action.*), '#' matches zero or more (file.#). Patterns live in a
+TopicTrie; the subscriptions matching a topic are resolved once and cached
+until the next subscribe/unsubscribe.
+
+With an EventLog attached, events on its topics are appended to the log
+(and given an offset) before delivery. subscribe(durable=name) first
+replays the logged events that consumer has not acknowledged, then
+continues live; each handled event is acknowledged in the log. Logged
+events a durable consumer does not subscribe to are acknowledged for it as
+they are published (once it has nothing in flight), so a rare topic never
+pins retention or reports lag.
 """
 
+import atexit
+import asyncio
 import logging
-from typing import Dict, List, Callable, Any
-from threading import Lock
+import time
+from collections import deque
+from itertools import count
+from typing import Dict, List, Callable, Any, Optional, Tuple
+from threading import Lock, Thread, Condition, current_thread
+
+from .topic_trie import TopicTrie
+from .event_log import EventLog
+
+# Marks "nothing queued" for the asyncio worker
+_EMPTY = object()
+
+# Distinct topics kept in the route cache before it is reset
+ROUTE_CACHE_SIZE = 4096
+
+OVERFLOW_POLICIES = ('block', 'drop_oldest', 'drop_newest', 'coalesce')
+
+
+class _Subscription:
+    """One subscriber: direct delivery, or a bounded queue plus worker (async mode)"""
+
+    def __init__(self, bus: 'EventBus', pattern: str, callback: Callable, maxsize: int,
+                 seq: int, with_topic: bool = False, overflow: str = 'block',
+                 coalesce_key: Optional[Callable] = None, durable: Optional[str] = None,
+                 window: float = 0.0):
+        self.bus = bus
+        self.pattern = pattern
+        self.callback = callback
+        self.maxsize = max(1, maxsize)
+        self.seq = seq
+        self.with_topic = with_topic
+        self.overflow = overflow
+        self.coalesce_key = coalesce_key
+        self.durable = durable
+        self.window = window
+        self.name = durable or f"{pattern}:{getattr(callback, '__qualname__', repr(callback))}#{seq}"
+        # Logged offsets [start, end) to replay before live events (durable consumers)
+        self.replay: Optional[Tuple[int, int]] = None
+        # Durable consumers: logged events accepted but not yet handled (the
+        # replay counts as one), and the newest unrelated offset to ack once idle
+        self.unacked = 0
+        self.skipped = -1
+        # Queued items are [topic, data, key, offset, due] so coalescing can update them in place
+        self.buffer: deque = deque()
+        self._pending: Dict[Any, list] = {}
+        self.cond = Condition()
+        self.closed = False
+        self.busy = False
+        self.offered = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.blocked = 0
+        self.replayed = 0
+        self.high_water = 0
+        self.is_coroutine = asyncio.iscoroutinefunction(callback)
+        self._wake: Optional[Callable] = None
+        self._worker = None
+
+    def start(self):
+        if self.replay is not None:
+            # drain() waits for the replay too
+            self.busy = True
+        if self.is_coroutine:
+            self._worker = asyncio.run_coroutine_threadsafe(self._run_async(), self.bus._get_loop())
+        else:
+            self._worker = Thread(target=self._run, daemon=True,
+                                  name=f"EventBus-{self.pattern}")
+            self._worker.start()
+
+    def _invoke(self, topic: str, data: Dict[str, Any]):
+        return self.callback(topic, data) if self.with_topic else self.callback(data)
+
+    def deliver(self, topic: str, data: Dict[str, Any], offset: Optional[int] = None):
+        """Call the handler on the publisher's thread (sync mode)"""
+        try:
+            result = self._invoke(topic, data)
+            if asyncio.iscoroutine(result):
+                asyncio.run(result)
+        except Exception as e:
+            self.bus.logger.error(f"Error in event subscriber for {topic}: {e}")
+        self.offered += 1
+        self.delivered += 1
+        self.bus._count(topic, 'delivered')
+        self._settle(offset)
+
+    def _ack(self, offset: Optional[int]):
+        if self.durable is not None and offset is not None:
+            self.bus.event_log.ack(self.durable, offset)
+
+    def reserve(self):
+        """Count a logged event routed to this durable consumer (publisher holds the bus lock)"""
+        with self.cond:
+            self.unacked += 1
+
+    def skip(self, offset: int):
+        """Acknowledge a logged event this consumer does not subscribe to (publisher holds the bus lock)"""
+        with self.cond:
+            if self.unacked:
+                # Acking now would also cover events still in flight
+                self.skipped = max(self.skipped, offset)
+            else:
+                self._ack(offset)
+
+    def _settle(self, offset: Optional[int]):
+        """Acknowledge a handled event, plus skipped ones once nothing is in flight"""
+        if self.durable is None or offset is None:
+            return
+        with self.cond:
+            self.unacked -= 1
+            if not self.unacked and self.skipped > offset:
+                offset = self.skipped
+            self._ack(offset)
+
+    def _replay_events(self):
+        """Logged events for this subscription the consumer has not acknowledged"""
+        start, end = self.replay
+        self.replay = None
+        matcher = TopicTrie()
+        matcher.add(self.pattern)
+        for offset, topic, data in self.bus.event_log.read(start, end):
+            if matcher.match(topic):
+                yield offset, topic, data
+        # Everything else in the range was never meant for this consumer
+        self._settle(end - 1)
+
+    def replay_sync(self):
+        """Replay on the caller's thread (sync mode)"""
+        for offset, topic, data in self._replay_events():
+            self.deliver(topic, data)
+            self._ack(offset)
+            self.replayed += 1
+
+    def _replay_thread(self):
+        try:
+            for offset, topic, data in self._replay_events():
+                try:
+                    self._invoke(topic, data)
+                except Exception as e:
+                    self.bus.logger.error(f"Error in event subscriber for {topic}: {e}")
+                self.replayed += 1
+                self._ack(offset)
+        finally:
+            with self.cond:
+                self.busy = False
+                self.cond.notify_all()
+
+    def put(self, topic: str, data: Dict[str, Any], offset: Optional[int] = None) -> bool:
+        """Queue an event, applying the overflow policy when the queue is full"""
+        key = self.coalesce_key(data) if self.coalesce_key is not None else None
+        if key is None and self.window:
+            key = topic
+
+        with self.cond:
+            if self.closed:
+                return False
+            self.offered += 1
+
+            if self.window and key in self._pending:
+                # Still inside its window - the newest event replaces the queued one
+                item = self._pending[key]
+                self.coalesced += 1
+                self.bus._count(item[0], 'coalesced')
+                item[0], item[1], item[3] = topic, data, offset
+                return True
+
+            if len(self.buffer) >= self.maxsize:
+                if self.overflow == 'block':
+                    self.blocked += 1
+                    while len(self.buffer) >= self.maxsize and not self.closed:
+                        self.cond.wait()
+                    if self.closed:
+                        return False
+                elif self.overflow == 'drop_newest':
+                    self.dropped += 1
+                    self.bus._count(topic, 'dropped')
+                    return False
+                elif self.overflow == 'coalesce' and key in self._pending:
+                    item = self._pending[key]
+                    self.coalesced += 1
+                    self.bus._count(item[0], 'coalesced')
+                    item[0], item[1], item[3] = topic, data, offset
+                    return True
+                else:
+                    oldest = self._forget(self.buffer.popleft())
+                    self.dropped += 1
+                    self.bus._count(oldest[0], 'dropped')
+
+            item = [topic, data, key, offset, time.monotonic() + self.window]
+            self.buffer.append(item)
+            if key is not None:
+                self._pending[key] = item
+            depth = len(self.buffer)
+            if depth > self.high_water:
+                self.high_water = depth
+            self.bus._note_depth(topic, depth)
+            self.cond.notify_all()
+
+        if self._wake is not None:
+            self._wake()
+        return True
+
+    def _forget(self, item: list) -> list:
+        """Drop a dequeued item from the coalescing index (caller holds the condition)"""
+        if item[2] is not None and self._pending.get(item[2]) is item:
+            del self._pending[item[2]]
+        return item
+
+    def _take(self):
+        """Pop the next event (caller holds the condition)"""
+        topic, data, _, offset, _ = self._forget(self.buffer.popleft())
+        self.busy = True
+        self.cond.notify_all()
+        return topic, data, offset
+
+    def _wait_due(self) -> float:
+        """Seconds until the head event's window closes; 0 when closing (caller holds the condition)"""
+        if not self.window or self.closed:
+            return 0.0
+        return max(0.0, self.buffer[0][4] - time.monotonic())
+
+    def _done(self, topic: str, offset: Optional[int]):
+        self._settle(offset)
+        with self.cond:
+            self.busy = False
+            self.delivered += 1
+            self.cond.notify_all()
+        self.bus._count(topic, 'delivered')
+
+    def _run(self):
+        """Thread worker - deliver events in order until closed and drained"""
+        if self.replay is not None:
+            self._replay_thread()
+        while True:
+            with self.cond:
+                while not self.buffer and not self.closed:
+                    self.cond.wait()
+                if not self.buffer:
+                    return
+                remaining = self._wait_due()
+                if remaining:
+                    self.cond.wait(remaining)
+                    continue
+                topic, data, offset = self._take()
+            try:
+                self._invoke(topic, data)
+            except Exception as e:
+                self.bus.logger.error(f"Error in event subscriber for {topic}: {e}")
+            self._done(topic, offset)
+
+    async def _run_async(self):
+        """Asyncio worker - same contract as _run, awaiting the handler"""
+        loop = asyncio.get_running_loop()
+        wakeup = asyncio.Event()
+        self._wake = lambda: loop.call_soon_threadsafe(wakeup.set)
+
+        if self.replay is not None:
+            try:
+                for offset, topic, data in self._replay_events():
+                    try:
+                        await self._invoke(topic, data)
+                    except Exception as e:
+                        self.bus.logger.error(f"Error in event subscriber for {topic}: {e}")
+                    self.replayed += 1
+                    self._ack(offset)
+            finally:
+                with self.cond:
+                    self.busy = False
+                    self.cond.notify_all()
+
+        while True:
+            wakeup.clear()
+            remaining = None
+            with self.cond:
+                if self.buffer:
+                    remaining = self._wait_due()
+                    item = _EMPTY if remaining else self._take()
+                elif self.closed:
+                    return
+                else:
+                    item = _EMPTY
+            if item is _EMPTY:
+                try:
+                    await asyncio.wait_for(wakeup.wait(), remaining)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            topic, data, offset = item
+            try:
+                await self._invoke(topic, data)
+            except Exception as e:
+                self.bus.logger.error(f"Error in event subscriber for {topic}: {e}")
+            self._done(topic, offset)
+
+    def drain(self, deadline: float) -> bool:
+        """Wait until every queued event has been handled"""
+        with self.cond:
+            while self.buffer or self.busy:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self.cond.wait(remaining)
+        return True
+
+    def close(self, timeout: float = 5.0):
+        """Stop accepting events, deliver what is queued, stop the worker"""
+        with self.cond:
+            self.closed = True
+            self.cond.notify_all()
+        if self._wake is not None:
+            self._wake()
+        if isinstance(self._worker, Thread):
+            # A handler may unsubscribe itself
+            if self._worker is not current_thread():
+                self._worker.join(timeout)
+        elif self._worker is not None and current_thread() is not self.bus._loop_thread:
+            try:
+                self._worker.result(timeout)
+            except Exception:
+                pass
+
+    @property
+    def depth(self) -> int:
+        return len(self.buffer)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'pattern': self.pattern,
+            'overflow': self.overflow,
+            'coalesce_window': self.window,
+            'queue_size': self.maxsize,
+            'queued': len(self.buffer),
+            'offered': self.offered,
+            'delivered': self.delivered,
+            'dropped': self.dropped,
+            'coalesced': self.coalesced,
+            'blocked': self.blocked,
+            'replayed': self.replayed,
+            'high_water': self.high_water,
+        }
 
 
 class EventBus:
     """Central pub/sub event bus for inter-component communication"""
 
-    def __init__(self, logger: logging.Logger):
+    def __init__(self, logger: logging.Logger, async_dispatch: bool = False,
+                 queue_size: int = 1000, overflow: str = 'block',
+                 event_log: Optional[EventLog] = None):
+        """
+        Initialize EventBus.
+
+        Args:
+            logger: Logger instance
+            async_dispatch: Deliver through per-subscriber queues and workers
+            queue_size: Default maximum queued events per subscriber (async mode)
+            overflow: Default overflow policy for full subscriber queues
+            event_log: Persist events on the log's topics and enable durable consumers
+        """
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown event overflow policy: {overflow}")
+
         self.logger = logger
         self.subscribers: Dict[str, List[Callable]] = {}
         self.lock = Lock()
 
-    def subscribe(self, event_type: str, callback: Callable):
-        """Subscribe to an event type"""
+        self.async_dispatch = async_dispatch
+        self.queue_size = queue_size
+        self.overflow = overflow
+        self.event_log = event_log
+        self._subscriptions: Dict[str, List[_Subscription]] = {}
+        self._seq = count()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[Thread] = None
+
+        # Pattern trie and per-topic resolution cache
+        self._trie = TopicTrie()
+        self._routes: Dict[str, List[_Subscription]] = {}
+        # Durable subscriptions, acknowledged past logged events they do not match
+        self._durable: List[_Subscription] = []
+
+        # Per-topic counters
+        self._topic_stats: Dict[str, Dict[str, int]] = {}
+        self._stats_lock = Lock()
+
+        if async_dispatch:
+            atexit.register(self.close)
+
+    def subscribe(self, event_type: str, callback: Callable, with_topic: bool = False,
+                  queue_size: Optional[int] = None, overflow: Optional[str] = None,
+                  coalesce_key: Optional[Callable] = None, durable: Optional[str] = None,
+                  coalesce_window: float = 0.0):
+        """
+        Subscribe to an event type or wildcard pattern.
+
+        Args:
+            event_type: Topic, or pattern using '*' (one level) / '#' (any levels)
+            callback: Handler called with the event data
+            with_topic: Call the handler as callback(topic, data) instead
+            queue_size: Maximum queued events (async mode, defaults to the bus setting)
+            overflow: Policy when the queue is full (defaults to the bus setting)
+            coalesce_key: Function of the event data naming events that
+                supersede each other ('coalesce' policy, coalesce_window)
+            durable: Consumer name - replay unacknowledged logged events first
+                and acknowledge each handled event (needs an event_log)
+            coalesce_window: Seconds to hold each event; only the newest per
+                coalesce_key within the window is delivered
+        """
+        overflow = overflow or self.overflow
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown event overflow policy: {overflow}")
+        if overflow == 'coalesce' and coalesce_key is None:
+            raise ValueError("The 'coalesce' overflow policy needs a coalesce_key")
+        if durable is not None:
+            if self.event_log is None:
+                raise ValueError("Durable subscriptions need an event_log")
+            if overflow != 'block' or coalesce_window:
+                raise ValueError("Durable subscriptions cannot drop events (use overflow='block')")
+        if coalesce_window < 0:
+            raise ValueError(f"Invalid coalesce window: {coalesce_window}")
+
         with self.lock:
             if event_type not in self.subscribers:
                 self.subscribers[event_type] = []
+                self._trie.add(event_type)
             self.subscribers[event_type].append(callback)
+
+            subscription = _Subscription(self, event_type, callback, queue_size or self.queue_size,
+                                         next(self._seq), with_topic, overflow, coalesce_key, durable,
+                                         coalesce_window)
+            if durable is not None:
+                # Publishes append under this lock, so next_offset splits replay from live
+                start = self.event_log.register(durable)
+                if start < self.event_log.next_offset:
+                    subscription.replay = (start, self.event_log.next_offset)
+                    subscription.unacked = 1
+                self._durable.append(subscription)
+            if self.async_dispatch or coalesce_window:
+                subscription.start()
+            if coalesce_window and not self.async_dispatch:
+                # Deliver held events at exit, as async mode does
+                atexit.register(self.close)
+            self._subscriptions.setdefault(event_type, []).append(subscription)
+            self._routes.clear()
             self.logger.debug(f"Subscribed to event: {event_type}")
 
+        if subscription.replay is not None and not self.async_dispatch:
+            subscription.replay_sync()
+
     def unsubscribe(self, event_type: str, callback: Callable):
         """Unsubscribe from an event type"""
+        subscription = None
         with self.lock:
             if event_type in self.subscribers:
                 try:
@@ -37,21 +507,149 @@ class EventBus:
                     self.logger.debug(f"Unsubscribed from event: {event_type}")
                 except ValueError:
                     pass
+            for candidate in self._subscriptions.get(event_type, []):
+                if candidate.callback == callback:
+                    subscription = candidate
+                    self._subscriptions[event_type].remove(candidate)
+                    if candidate in self._durable:
+                        self._durable.remove(candidate)
+                    break
+            if event_type in self.subscribers and not self.subscribers[event_type]:
+                del self.subscribers[event_type]
+                self._subscriptions.pop(event_type, None)
+                self._trie.remove(event_type)
+            self._routes.clear()
+
+        # Outside the lock - the handler may itself publish or subscribe
+        if subscription is not None:
+            subscription.close()
+
+    def _route(self, topic: str) -> List[_Subscription]:
+        """Subscriptions matching a topic in subscription order (caller holds the lock)"""
+        route = self._routes.get(topic)
+        if route is None:
+            route = sorted(
+                (s for pattern in self._trie.match(topic) for s in self._subscriptions.get(pattern, ())),
+                key=lambda s: s.seq
+            )
+            if len(self._routes) >= ROUTE_CACHE_SIZE:
+                self._routes.clear()
+            self._routes[topic] = route
+        return route
+
+    def _count(self, topic: str, field: str):
+        with self._stats_lock:
+            stats = self._topic_stats.get(topic)
+            if stats is None:
+                stats = self._topic_stats[topic] = {
+                    'published': 0, 'delivered': 0, 'dropped': 0, 'coalesced': 0, 'high_water': 0
+                }
+            stats[field] += 1
+
+    def _note_depth(self, topic: str, depth: int):
+        with self._stats_lock:
+            stats = self._topic_stats.get(topic)
+            if stats is not None and depth > stats['high_water']:
+                stats['high_water'] = depth
 
     def publish(self, event_type: str, data: Dict[str, Any]):
         """Publish an event to all subscribers"""
+        self._count(event_type, 'published')
+        offset = None
         with self.lock:
-            subscribers = self.subscribers.get(event_type, []).copy()
-
-        if subscribers:
-            self.logger.debug(f"Publishing event: {event_type} to {len(subscribers)} subscribers")
-            for callback in subscribers:
+            if self.event_log is not None and self.event_log.should_log(event_type):
                 try:
-                    callback(data)
+                    offset = self.event_log.append(event_type, data)
                 except Exception as e:
-                    self.logger.error(f"Error in event subscriber for {event_type}: {e}")
+                    self.logger.error(f"Failed to log event {event_type}: {e}")
+            # Cached lists are replaced, never mutated, so iterating outside the lock is safe
+            subscriptions = self._route(event_type)
+            if offset is not None:
+                for subscription in self._durable:
+                    if subscription in subscriptions:
+                        subscription.reserve()
+                    else:
+                        subscription.skip(offset)
+
+        if self.async_dispatch:
+            for subscription in subscriptions:
+                subscription.put(event_type, data, offset)
+            return
+
+        if subscriptions:
+            self.logger.debug(f"Publishing event: {event_type} to {len(subscriptions)} subscribers")
+            for subscription in subscriptions:
+                if subscription.window:
+                    subscription.put(event_type, data, offset)
+                else:
+                    subscription.deliver(event_type, data, offset)
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until every event published so far has been handled"""
+        with self.lock:
+            subscriptions = [s for subs in self._subscriptions.values() for s in subs]
+        deadline = time.monotonic() + timeout
+        return all(subscription.drain(deadline) for subscription in subscriptions)
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        """Loop thread hosting coroutine subscribers (started on first use)"""
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+            self._loop_thread = Thread(target=self._loop.run_forever, daemon=True,
+                                       name="EventBus-asyncio")
+            self._loop_thread.start()
+        return self._loop
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get dispatch statistics, with per-topic and per-subscriber counters"""
+        with self.lock:
+            subscriptions = [s for subs in self._subscriptions.values() for s in subs]
+            topics = len(self.subscribers)
+            routes = len(self._routes)
+        with self._stats_lock:
+            by_topic = {topic: dict(stats) for topic, stats in self._topic_stats.items()}
+        by_subscriber = {s.name: s.get_stats() for s in subscriptions}
+
+        return {
+            'mode': 'async' if self.async_dispatch else 'sync',
+            'topics': topics,
+            'subscriptions': len(subscriptions),
+            'cached_routes': routes,
+            'published': sum(stats['published'] for stats in by_topic.values()),
+            'queued': sum(s['queued'] for s in by_subscriber.values()),
+            'delivered': sum(s['delivered'] for s in by_subscriber.values()),
+            'dropped': sum(s['dropped'] for s in by_subscriber.values()),
+            'coalesced': sum(s['coalesced'] for s in by_subscriber.values()),
+            'blocked': sum(s['blocked'] for s in by_subscriber.values()),
+            'replayed': sum(s['replayed'] for s in by_subscriber.values()),
+            'max_fill': max((s['queued'] / s['queue_size'] for s in by_subscriber.values()), default=0.0),
+            'by_topic': by_topic,
+            'by_subscriber': by_subscriber,
+            'event_log': self.event_log.get_stats() if self.event_log is not None else None,
+        }
+
+    def _close_subscriptions(self):
+        with self.lock:
+            subscriptions = [s for subs in self._subscriptions.values() for s in subs]
+            self._subscriptions.clear()
+            self._durable.clear()
+            self._routes.clear()
+        for subscription in subscriptions:
+            subscription.close()
+
+    def close(self):
+        """Deliver queued events and stop the workers"""
+        atexit.unregister(self.close)
+        self._close_subscriptions()
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop_thread.join(timeout=5)
+            self._loop.close()
+            self._loop = None
 
     def clear(self):
         """Clear all subscriptions"""
+        self._close_subscriptions()
         with self.lock:
             self.subscribers.clear()
+            self._trie = TopicTrie()
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+EventLog - Durable, Replayable EventBus Traffic
+================================================
+
+Append-only log of published events, split into segment files named by the
+offset of their first event (events-00000000000000000000.jsonl). Every
+event gets the next integer offset; a segment rolls over past
+segment_bytes.
+
+Durable consumers are named cursors into the log. consumers.json records
+the last offset each one acknowledged, so after a restart a consumer
+resumes with the first event it had not finished handling. Acks are
+written at most every commit_interval seconds (and on close), so delivery
+is at-least-once: events handled just before a crash may be seen again.
+
+Only topics matching the configured patterns are logged (TopicTrie
+syntax), which keeps high-frequency heartbeats out of the log. Closed
+segments are deleted once every durable consumer has acknowledged past
+them and more than retain_segments segments exist.
+"""
+
+import os
+import re
+import time
+import json
+import logging
+from bisect import bisect_right
+from datetime import datetime
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .topic_trie import TopicTrie
+
+SEGMENT_PATTERN = re.compile(r'^events-(\d{20})\.jsonl$')
+CONSUMERS_NAME = "consumers.json"
+
+
+class EventLog:
+    """Segmented append-only event log with durable consumer offsets"""
+
+    def __init__(self, log_dir: Path, logger: logging.Logger, topics=('#',),
+                 segment_bytes: int = 4 * 1024 * 1024, retain_segments: int = 8,
+                 fsync: bool = False, commit_interval: float = 1.0):
+        """
+        Initialize EventLog.
+
+        Args:
+            log_dir: Directory holding the segments and consumer offsets
+            logger: Logger instance
+            topics: Topic patterns to persist ('*' one level, '#' any levels)
+            segment_bytes: Start a new segment once the current one reaches this size
+            retain_segments: Segments always kept, acknowledged or not
+            fsync: fsync after every append (otherwise flushed to the OS only)
+            commit_interval: Seconds between writes of consumer acks (0 = every ack)
+        """
+        self.log_dir = log_dir
+        self.logger = logger
+        self.segment_bytes = segment_bytes
+        self.retain_segments = max(1, retain_segments)
+        self.fsync = fsync
+        self.commit_interval = commit_interval
+        self.lock = Lock()
+
+        self._topics = TopicTrie()
+        for pattern in topics:
+            self._topics.add(pattern)
+        self._logged: Dict[str, bool] = {}
+
+        self.segments: List[int] = []
+        self.next_offset = 0
+        self._handle = None
+        self._handle_bytes = 0
+
+        self.consumers_file = log_dir / CONSUMERS_NAME
+        self.consumers: Dict[str, int] = {}
+        self._acks_dirty = False
+        self._acks_saved_at = 0.0
+
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        self._load()
+
+    def _path(self, base: int) -> Path:
+        return self.log_dir / f"events-{base:020d}.jsonl"
+
+    def _load(self):
+        """Find segments, drop a torn tail and open the newest for appends"""
+        for path in self.log_dir.iterdir():
+            match = SEGMENT_PATTERN.match(path.name)
+            if match:
+                self.segments.append(int(match.group(1)))
+        self.segments.sort()
+
+        if self.consumers_file.exists():
+            try:
+                with open(self.consumers_file, 'r', encoding='utf-8') as f:
+                    self.consumers = json.load(f)
+            except Exception as e:
+                self.logger.warning(f"Could not load event consumer offsets: {e}")
+
+        if not self.segments:
+            self.segments.append(0)
+            self._path(0).touch()
+
+        last = self._path(self.segments[-1])
+        with open(last, 'rb') as f:
+            data = f.read()
+        complete = data.rfind(b'\n') + 1
+        if complete != len(data):
+            # Crash mid-append - the event was never acknowledged to the publisher
+            with open(last, 'r+b') as f:
+                f.truncate(complete)
+        self.next_offset = self.segments[-1] + data.count(b'\n', 0, complete)
+
+        self._handle = open(last, 'ab')
+        self._handle_bytes = complete
+
+    def should_log(self, topic: str) -> bool:
+        """Whether events on this topic are persisted"""
+        logged = self._logged.get(topic)
+        if logged is None:
+            logged = self._logged[topic] = bool(self._topics.match(topic))
+        return logged
+
+    def append(self, topic: str, data: Dict[str, Any]) -> int:
+        """Append an event and return its offset"""
+        with self.lock:
+            offset = self.next_offset
+            line = json.dumps({
+                'offset': offset,
+                'topic': topic,
+                'timestamp': datetime.utcnow().isoformat() + 'Z',
+                'data': data,
+            }, default=str).encode('utf-8') + b'\n'
+
+            self._handle.write(line)
+            self._handle.flush()
+            if self.fsync:
+                os.fsync(self._handle.fileno())
+            self._handle_bytes += len(line)
+            self.next_offset += 1
+
+            if self._handle_bytes >= self.segment_bytes:
+                self._roll()
+            return offset
+
+    def _roll(self):
+        """Start a new segment and apply retention (caller holds the lock)"""
+        self._handle.close()
+        self.segments.append(self.next_offset)
+        self._handle = open(self._path(self.next_offset), 'ab')
+        self._handle_bytes = 0
+
+        floor = min(self.consumers.values()) + 1 if self.consumers else self.next_offset
+        while len(self.segments) > self.retain_segments and self.segments[1] <= floor:
+            base = self.segments.pop(0)
+            self._path(base).unlink(missing_ok=True)
+            self.logger.debug(f"Removed acknowledged event segment {base}")
+
+    def read(self, start_offset: int = 0, end_offset: Optional[int] = None
+             ) -> Iterator[Tuple[int, str, Dict[str, Any]]]:
+        """Yield (offset, topic, data) for offsets in [start_offset, end_offset)"""
+        with self.lock:
+            segments = list(self.segments)
+            if end_offset is None:
+                end_offset = self.next_offset
+
+        position = max(0, bisect_right(segments, start_offset) - 1)
+        for base in segments[position:]:
+            if base >= end_offset:
+                return
+            try:
+                f = open(self._path(base), 'rb')
+            except FileNotFoundError:
+                # Removed by retention since the segment list was copied
+                continue
+            with f:
+                for offset, line in enumerate(f, start=base):
+                    if offset >= end_offset:
+                        return
+                    if offset < start_offset:
+                        continue
+                    if not line.endswith(b'\n'):
+                        return
+                    event = json.loads(line)
+                    yield event['offset'], event['topic'], event['data']
+
+    def committed(self, consumer: str) -> int:
+        """Last offset the consumer acknowledged (-1 if none)"""
+        with self.lock:
+            return self.consumers.get(consumer, -1)
+
+    def register(self, consumer: str, start_offset: Optional[int] = None) -> int:
+        """
+        Register a durable consumer.
+
+        Args:
+            consumer: Consumer name
+            start_offset: First offset a new consumer should see (default: the
+                current end of the log, i.e. only events published from now on)
+
+        Returns:
+            First offset the consumer has not acknowledged
+        """
+        with self.lock:
+            if consumer not in self.consumers:
+                start = self.next_offset if start_offset is None else start_offset
+                self.consumers[consumer] = start - 1
+                self._save_consumers()
+            return self.consumers[consumer] + 1
+
+    def ack(self, consumer: str, offset: int):
+        """Record that a consumer finished handling every event up to offset"""
+        with self.lock:
+            if offset > self.consumers.get(consumer, -1):
+                self.consumers[consumer] = offset
+                self._acks_dirty = True
+                if time.monotonic() - self._acks_saved_at >= self.commit_interval:
+                    self._save_consumers()
+
+    def _save_consumers(self):
+        self._acks_dirty = False
+        self._acks_saved_at = time.monotonic()
+        temp_file = self.consumers_file.with_suffix('.tmp')
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.consumers, f, indent=2, sort_keys=True)
+        os.replace(temp_file, self.consumers_file)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get log size and per-consumer lag"""
+        with self.lock:
+            return {
+                'segments': len(self.segments),
+                'first_offset': self.segments[0],
+                'next_offset': self.next_offset,
+                'consumers': {
+                    name: {'acked': acked, 'lag': self.next_offset - acked - 1}
+                    for name, acked in self.consumers.items()
+                },
+            }
+
+    def close(self):
+        """Write pending acks and close the active segment"""
+        with self.lock:
+            if self._acks_dirty:
+                self._save_consumers()
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+EventTransport - Cross-Process EventBus Publishing
+===================================================
+
+Lets other local processes (the watchers started by run_all_watchers.py)
+publish onto the orchestrator's EventBus over a Unix domain socket instead
+of waiting for the PollingObserver to rediscover a file they wrote.
+
+Frame format (network byte order):
+
+    +-------+---------+----------------+---------------------------+
+    | 'EB'  | version | payload length | payload (UTF-8 JSON)      |
+    | 2 B   | 1 B     | 4 B            | {"topic": ..., "data": {}}|
+    +-------+---------+----------------+---------------------------+
+
+Publishing is one-way and best effort: EventBusClient.publish returns
+False when the orchestrator is not listening, and callers keep their
+file drop as the fallback. The server only forwards topics matching its
+allowed patterns (TopicTrie syntax). On platforms without AF_UNIX the
+server stays disabled and clients always report False.
+"""
+
+import os
+import json
+import socket
+import struct
+import logging
+from pathlib import Path
+from threading import Lock, Thread
+from typing import Any, Dict, Optional, Tuple
+
+from .topic_trie import TopicTrie
+
+EVENT_SOCKET_NAME = "event_bus.sock"
+
+FRAME_MAGIC = b'EB'
+FRAME_VERSION = 1
+FRAME_HEADER = struct.Struct('!2sBI')
+MAX_FRAME_BYTES = 1024 * 1024
+
+UNIX_SOCKETS = hasattr(socket, 'AF_UNIX')
+
+
+class FrameError(ValueError):
+    """Malformed or oversized frame"""
+
+
+def encode_frame(topic: str, data: Dict[str, Any]) -> bytes:
+    """Encode one event as a frame"""
+    payload = json.dumps({'topic': topic, 'data': data}, default=str).encode('utf-8')
+    if len(payload) > MAX_FRAME_BYTES:
+        raise FrameError(f"Event frame too large: {len(payload)} bytes")
+    return FRAME_HEADER.pack(FRAME_MAGIC, FRAME_VERSION, len(payload)) + payload
+
+
+def _recv_exact(sock: socket.socket, size: int) -> Optional[bytes]:
+    chunks = []
+    while size:
+        chunk = sock.recv(size)
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+def read_frame(sock: socket.socket) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """Read one event frame; None when the peer closed the connection"""
+    header = _recv_exact(sock, FRAME_HEADER.size)
+    if header is None:
+        return None
+    magic, version, length = FRAME_HEADER.unpack(header)
+    if magic != FRAME_MAGIC or version != FRAME_VERSION:
+        raise FrameError(f"Unknown event frame header: {header!r}")
+    if length > MAX_FRAME_BYTES:
+        raise FrameError(f"Event frame too large: {length} bytes")
+    payload = _recv_exact(sock, length)
+    if payload is None:
+        return None
+    event = json.loads(payload)
+    if not isinstance(event, dict) or not isinstance(event.get('topic'), str):
+        raise FrameError(f"Event frame is not an object with a topic: {payload[:80]!r}")
+    data = event.get('data') or {}
+    if not isinstance(data, dict):
+        raise FrameError(f"Event data is not an object on topic: {event['topic']}")
+    return event['topic'], data
+
+
+class EventBusServer:
+    """Accepts framed events on a Unix socket and publishes them on an EventBus"""
+
+    def __init__(self, event_bus, socket_path: Path, logger: logging.Logger,
+                 topics=('watcher.#',)):
+        """
+        Initialize EventBusServer.
+
+        Args:
+            event_bus: EventBus to publish received events on
+            socket_path: Unix socket path (replaced if a stale one exists)
+            logger: Logger instance
+            topics: Topic patterns remote publishers may use
+        """
+        self.event_bus = event_bus
+        self.socket_path = socket_path
+        self.logger = logger
+        self.lock = Lock()
+
+        self._topics = TopicTrie()
+        for pattern in topics:
+            self._topics.add(pattern)
+
+        self._server: Optional[socket.socket] = None
+        self._thread: Optional[Thread] = None
+        self._connections: Dict[int, socket.socket] = {}
+        self.running = False
+
+        self.stats = {'connections': 0, 'received': 0, 'rejected': 0, 'errors': 0}
+
+    def start(self) -> bool:
+        """Bind the socket and start accepting publishers"""
+        if not UNIX_SOCKETS:
+            self.logger.warning("Unix sockets unavailable - watchers fall back to file drops")
+            return False
+        try:
+            self.socket_path.unlink(missing_ok=True)
+            server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            server.bind(str(self.socket_path))
+            os.chmod(self.socket_path, 0o600)
+            server.listen(16)
+            # accept() is not woken by close() on every platform - poll running instead
+            server.settimeout(1.0)
+        except OSError as e:
+            self.logger.error(f"Could not listen on {self.socket_path}: {e}")
+            return False
+
+        self._server = server
+        self.running = True
+        self._thread = Thread(target=self._accept_loop, daemon=True, name="EventBusServer")
+        self._thread.start()
+        self.logger.info(f"EventBus server listening on {self.socket_path}")
+        return True
+
+    def _accept_loop(self):
+        while self.running:
+            try:
+                conn, _ = self._server.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                # Listening socket closed by stop()
+                return
+            if not self.running:
+                conn.close()
+                return
+            conn.settimeout(None)
+            with self.lock:
+                self._connections[conn.fileno()] = conn
+                self.stats['connections'] += 1
+            Thread(target=self._serve, args=(conn,), daemon=True,
+                   name="EventBusServer-conn").start()
+
+    def _serve(self, conn: socket.socket):
+        """Publish every frame from one connection until it closes"""
+        fileno = conn.fileno()
+        try:
+            while True:
+                frame = read_frame(conn)
+                if frame is None:
+                    return
+                topic, data = frame
+                if not self._topics.match(topic):
+                    with self.lock:
+                        self.stats['rejected'] += 1
+                    self.logger.warning(f"Rejected remote event on topic: {topic}")
+                    continue
+                with self.lock:
+                    self.stats['received'] += 1
+                self.event_bus.publish(topic, data)
+        except (OSError, ValueError) as e:
+            if self.running:
+                with self.lock:
+                    self.stats['errors'] += 1
+                self.logger.warning(f"Dropping EventBus client connection: {e}")
+        finally:
+            with self.lock:
+                self._connections.pop(fileno, None)
+            conn.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get connection and message counters"""
+        with self.lock:
+            return {
+                'listening': self.running,
+                'socket': str(self.socket_path),
+                'clients': len(self._connections),
+                **self.stats,
+            }
+
+    def stop(self):
+        """Stop accepting, disconnect publishers and remove the socket"""
+        if not self.running:
+            return
+        self.running = False
+        try:
+            # Wake accept() with a throwaway connection instead of waiting out the poll
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as wake:
+                wake.connect(str(self.socket_path))
+        except OSError:
+            pass
+        if self._thread:
+            self._thread.join(timeout=5)
+        self._server.close()
+        with self.lock:
+            connections = list(self._connections.values())
+        for conn in connections:
+            try:
+                conn.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        self.socket_path.unlink(missing_ok=True)
+
+
+class EventBusClient:
+    """Publishes events to an EventBusServer; reconnects lazily"""
+
+    def __init__(self, socket_path: Path, logger: Optional[logging.Logger] = None,
+                 timeout: float = 1.0):
+        """
+        Initialize EventBusClient.
+
+        Args:
+            socket_path: Unix socket the orchestrator listens on
+            logger: Logger instance (optional)
+            timeout: Seconds to wait on connect and send
+        """
+        self.socket_path = socket_path
+        self.logger = logger or logging.getLogger(__name__)
+        self.timeout = timeout
+        self.lock = Lock()
+        self._sock: Optional[socket.socket] = None
+
+    def _connect(self) -> Optional[socket.socket]:
+        if not UNIX_SOCKETS or not self.socket_path.exists():
+            return None
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(str(self.socket_path))
+        except OSError as e:
+            sock.close()
+            self.logger.debug(f"EventBus server not reachable: {e}")
+            return None
+        return sock
+
+    def publish(self, topic: str, data: Dict[str, Any]) -> bool:
+        """Send an event; False if the orchestrator could not be reached"""
+        try:
+            frame = encode_frame(topic, data)
+        except FrameError as e:
+            self.logger.error(str(e))
+            return False
+
+        with self.lock:
+            # A connection the server dropped is only noticed on send - retry once
+            for _ in range(2):
+                if self._sock is None:
+                    self._sock = self._connect()
+                    if self._sock is None:
+                        return False
+                try:
+                    self._sock.sendall(frame)
+                    return True
+                except OSError:
+                    self._sock.close()
+                    self._sock = None
+            return False
+
+    def close(self):
+        """Close the connection"""
+        with self.lock:
+            if self._sock is not None:
+                self._sock.close()
+                self._sock = None
@@ -24,7 +24,7 @@ class MCPServerManager:
     """
 
     def __init__(self, logger: logging.Logger, event_bus=None, retry_queue=None,
-                 audit_logger=None, base_dir: Path = None):
+                 audit_logger=None, base_dir: Path = None, skill_manifest=None):
         """
         Initialize MCP Server Manager.
 
@@ -34,12 +34,15 @@ class MCPServerManager:
             retry_queue: RetryQueue for failed operations
             audit_logger: AuditLogger for compliance
             base_dir: Base directory for AI Employee Vault
+            skill_manifest: SkillManifest shared with the dispatcher (optional);
+                an "mcp" object in a skill's skill.json overrides its mapping below
         """
         self.logger = logger
         self.event_bus = event_bus
         self.retry_queue = retry_queue
         self.audit_logger = audit_logger
         self.base_dir = base_dir
+        self.skill_manifest = skill_manifest
 
         # MCP servers registry
         self.servers: Dict[str, Any] = {}
@@ -76,6 +79,29 @@ class MCPServerManager:
 
         self.logger.info("MCPServerManager initialized")
 
+    def _mapping(self, skill_name: str) -> Optional[Dict[str, Any]]:
+        """MCP mapping for a skill: skill.json "mcp" (via the manifest) over the built-in one"""
+        if self.skill_manifest is not None:
+            entry = self.skill_manifest.get(skill_name)
+            if entry is not None and isinstance(entry['metadata'].get('mcp'), dict):
+                mapping = {**self.skill_to_mcp_mapping.get(skill_name, {}), **entry['metadata']['mcp']}
+                if not isinstance(mapping.get('server'), str) or not mapping['server']:
+                    self.logger.warning(f"Ignoring MCP mapping for skill {skill_name}: no server")
+                    return None
+                if not isinstance(mapping.get('action_map', {}), dict):
+                    self.logger.warning(f"Ignoring MCP mapping for skill {skill_name}: action_map is not an object")
+                    return None
+                return mapping
+        return self.skill_to_mcp_mapping.get(skill_name)
+
+    def _skill_dir(self, skill_name: str) -> Path:
+        """Directory of a skill (from the manifest when available)"""
+        if self.skill_manifest is not None:
+            entry = self.skill_manifest.get(skill_name)
+            if entry is not None:
+                return entry['cwd']
+        return self.base_dir / "Skills" / skill_name
+
     def register_server(self, server_name: str, server_instance):
         """Register an MCP server."""
         self.servers[server_name] = server_instance
@@ -96,7 +122,8 @@ class MCPServerManager:
                 logger=self.logger,
                 event_bus=self.event_bus,
                 retry_queue=self.retry_queue,
-                base_dir=self.base_dir
+                base_dir=self.base_dir,
+                skill_dir=self._skill_dir('accounting_core')
             )
             self.register_server('accounting', accounting_server)
 
@@ -133,14 +160,14 @@ class MCPServerManager:
             Execution result dict with 'success', 'data', 'error'
         """
         # Check if skill has MCP mapping
-        if skill_name not in self.skill_to_mcp_mapping:
+        mapping = self._mapping(skill_name)
+        if not mapping:
             return {
                 'success': False,
                 'error': f"No MCP mapping for skill: {skill_name}",
                 'via_mcp': False
             }
 
-        mapping = self.skill_to_mcp_mapping[skill_name]
         server_name = mapping['server']
 
         # Get MCP server
@@ -157,7 +184,7 @@ class MCPServerManager:
         payload = self._convert_args_to_payload(skill_name, args or [])
 
         # Determine MCP action
-        action_name = self._get_mcp_action(skill_name, args or [])
+        action_name = self._get_mcp_action(skill_name, args or [], mapping)
 
         if not action_name:
             return {
@@ -208,9 +235,10 @@ class MCPServerManager:
                 'mcp_action': action_name
             }
 
-    def _get_mcp_action(self, skill_name: str, args: list) -> Optional[str]:
+    def _get_mcp_action(self, skill_name: str, args: list,
+                        mapping: Optional[Dict[str, Any]] = None) -> Optional[str]:
         """Determine MCP action from skill name and args."""
-        mapping = self.skill_to_mcp_mapping.get(skill_name, {})
+        mapping = mapping if mapping is not None else self._mapping(skill_name) or {}
         action_map = mapping.get('action_map', {})
 
         # For accounting_core, first arg is the command
@@ -286,17 +314,19 @@ class AccountingMCPServerAdapter:
     Provides real ledger updates via the actual accounting system.
     """
 
-    def __init__(self, logger: logging.Logger, event_bus=None, retry_queue=None, base_dir: Path = None):
+    def __init__(self, logger: logging.Logger, event_bus=None, retry_queue=None, base_dir: Path = None,
+                 skill_dir: Path = None):
         self.logger = logger
         self.event_bus = event_bus
         self.retry_queue = retry_queue
         self.base_dir = base_dir
+        self.skill_dir = skill_dir or base_dir / "Skills" / "accounting_core"
         self.name = 'accounting'
 
         # Import accounting core
         try:
             import sys
-            sys.path.insert(0, str(base_dir / "Skills" / "accounting_core"))
+            sys.path.insert(0, str(self.skill_dir))
             from index import AccountingCore
 
             self.accounting_core = AccountingCore(base_dir, dry_run=False)
@@ -320,7 +350,7 @@ class AccountingMCPServerAdapter:
         try:
             # Import TransactionType enum
             import sys
-            sys.path.insert(0, str(self.base_dir / "Skills" / "accounting_core"))
+            sys.path.insert(0, str(self.skill_dir))
             from index import TransactionType
 
             if action_name == 'add_revenue':
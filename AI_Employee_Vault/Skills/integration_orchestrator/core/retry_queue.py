@@ -5,16 +5,66 @@ RetryQueue - Intelligent Retry Mechanism
 
 Queue for failed operations with configurable retry policies.
 Handles transient failures gracefully with exponential backoff.
+
+Pending items live in a min-heap keyed on next_retry (O(log n) enqueue and
+dequeue). The processor thread sleeps on a condition until the earliest
+deadline and is woken early by enqueue() and stop(), so retries fire when
+their backoff expires rather than on a polling tick.
+
+Callables cannot outlive the process, so enqueue() also takes a
+serializable descriptor ({'kind': ..., 'params': {...}}). With a
+store_path, items that have one are persisted (RetryStore) with their
+attempt count and next_retry, and start() rehydrates them through the
+resolver registered for their kind:
+
+    retry_queue.register_resolver('skill', lambda skill_name, args=None: ...)
+
+Items without a descriptor are kept in memory only.
+
+Due items run on a pool of worker threads, capped per target (the skill,
+MCP server or social platform a retry hits) so a hung retry only holds
+its own worker and no backend sees more than its limit at once:
+
+    RetryQueue(logger, workers=4, target_limits={'social_*': 1, 'accounting_core': 4})
+
+Patterns are fnmatch-style and each matching target gets its own limit.
+A due item whose target is at its limit is parked until a retry for that
+target finishes - it does not consume an attempt.
+
+Backoff uses full jitter (a uniform delay up to the policy's ceiling) so
+operations that failed together do not retry in lockstep. Before a due
+item is dispatched, the scheduler checks its component (the breaker name:
+context['component'], the social platform, or the target):
+- circuit_breakers.check_breaker(component) - while the breaker is open
+  the item is deferred to the breaker's next_retry
+- a per-component token bucket (budget_capacity retries, refilled at
+  budget_refill_per_minute) - when empty the item waits for the next token
+Deferred items keep their attempt count.
+
+With a store, items that exhaust max_retries are dead-lettered with their
+context, last error and attempt history instead of being dropped
+(get_stats() counts those as dead_lettered, the rest as dropped).
+replay_dead_letters() (or dead_letters.py followed by reload()) moves
+them back with a fresh attempt count, spaced out to a rate limit.
 """
 
 import time
+import uuid
+import heapq
+import random
 import logging
+from fnmatch import fnmatch
+from queue import Queue, Empty
+from collections import defaultdict, deque
+from pathlib import Path
 from datetime import datetime, timedelta
-from typing import Dict, Callable
-from threading import Lock, Thread, Event
-from collections import deque
+from itertools import count
+from typing import Any, Dict, Callable, List, Optional
+from threading import Lock, Thread, Event, Condition
 from enum import Enum
 
+from .retry_store import RetryStore
+
 
 class RetryPolicy(Enum):
     """Retry policy types"""
@@ -26,81 +76,426 @@ class RetryPolicy(Enum):
 class RetryQueue:
     """Queue for failed operations with exponential backoff retry"""
 
-    def __init__(self, logger: logging.Logger, max_retries: int = 5):
+    def __init__(self, logger: logging.Logger, max_retries: int = 5,
+                 store_path: Optional[Path] = None, workers: int = 4,
+                 target_limits: Optional[Dict[str, int]] = None,
+                 default_target_limit: int = 2, circuit_breakers=None,
+                 budget_capacity: Optional[int] = None, budget_refill_per_minute: float = 6.0,
+                 jitter: bool = True):
+        """
+        Initialize RetryQueue.
+
+        Args:
+            logger: Logger instance
+            max_retries: Attempts before an item is given up
+            store_path: SQLite file persisting items that have a descriptor
+            workers: Retries executing concurrently
+            target_limits: fnmatch pattern -> concurrent retries per matching target
+            default_target_limit: Concurrent retries for targets matching no pattern
+            circuit_breakers: CircuitBreakerManager consulted before each retry (optional)
+            budget_capacity: Retry tokens per component (None disables the budget)
+            budget_refill_per_minute: Tokens each component regains per minute
+            jitter: Randomize backoff delays (full jitter)
+        """
+        if workers < 1:
+            raise ValueError(f"Invalid retry worker count: {workers}")
+        for pattern, limit in (target_limits or {}).items():
+            if limit < 1:
+                raise ValueError(f"Invalid retry limit for {pattern}: {limit}")
+
         self.logger = logger
         self.max_retries = max_retries
-        self.queue: deque = deque()
+        # Heap entries are (next_retry, seq, item); seq keeps FIFO order on ties
+        self.queue: List[tuple] = []
+        self._seq = count()
         self.lock = Lock()
+        self.cond = Condition(self.lock)
         self.running = False
         self.thread = None
         self.stop_event = Event()
 
-    def enqueue(self, operation: Callable, args: tuple = (), kwargs: dict = None,
-                policy: RetryPolicy = RetryPolicy.EXPONENTIAL, context: Dict = None):
-        """Add operation to retry queue"""
+        # Worker pool: the processor hands due items to workers via ready
+        self.workers = workers
+        self.worker_threads: List[Thread] = []
+        self.ready: Queue = Queue()
+        self.target_limits = dict(target_limits or {})
+        self.default_target_limit = default_target_limit
+        self.in_flight: Dict[str, int] = defaultdict(int)
+        # Target -> due items parked while the target is at its limit
+        self.parked: Dict[str, deque] = defaultdict(deque)
+
+        # Scheduling guards: breakers, per-component token buckets, jitter
+        self.circuit_breakers = circuit_breakers
+        self.budget_capacity = budget_capacity
+        self.budget_refill = budget_refill_per_minute / 60.0
+        # Component -> [tokens, last refill (monotonic)]
+        self.budgets: Dict[str, List[float]] = {}
+        self.jitter = jitter
+        self._random = random.Random()
+        self.stats = {'deferred_breaker': 0, 'deferred_budget': 0}
+
+        # Descriptor kind -> function(**params) returning the operation's result
+        self.resolvers: Dict[str, Callable] = {}
+        self.store = RetryStore(store_path) if store_path else None
+        self._restored = False
+        # Ids of items this queue holds (scheduled, parked or running)
+        self.live_ids = set()
+        self.stats['dead_lettered'] = 0
+        self.stats['dropped'] = 0
+
+    def register_resolver(self, kind: str, resolver: Callable):
+        """Register how descriptors of a kind are executed (needed to rehydrate them)"""
+        self.resolvers[kind] = resolver
+
+    def enqueue(self, operation: Optional[Callable] = None, args: tuple = (), kwargs: dict = None,
+                policy: RetryPolicy = RetryPolicy.EXPONENTIAL, context: Dict = None,
+                descriptor: Optional[Dict[str, Any]] = None):
+        """
+        Add operation to retry queue.
+
+        Args:
+            operation: Callable to retry in this process (optional with a descriptor)
+            args: Positional arguments for operation
+            kwargs: Keyword arguments for operation
+            policy: Backoff policy
+            context: Details for logs (must be JSON-serializable to be persisted)
+            descriptor: {'kind': ..., 'params': {...}} - persisted and resolved
+                through register_resolver() when no operation is available
+        """
+        context = context or {}
+        if operation is None:
+            if descriptor is None:
+                raise ValueError("RetryQueue.enqueue needs an operation or a descriptor")
+            if descriptor.get('kind') not in self.resolvers:
+                raise ValueError(f"Unknown retry descriptor kind: {descriptor.get('kind')}")
+
+        retry_item = {
+            'id': uuid.uuid4().hex,
+            'operation': operation,
+            'args': args,
+            'kwargs': kwargs or {},
+            'descriptor': descriptor,
+            'policy': policy,
+            'context': context,
+            'attempts': 0,
+            'next_retry': datetime.utcnow(),
+            'created_at': datetime.utcnow(),
+            'history': []
+        }
+        self._persist(retry_item)
+        with self.cond:
+            self.live_ids.add(retry_item['id'])
+            self._push(retry_item)
+        self.logger.info(f"Enqueued operation for retry: {context.get('name', 'unknown')}")
+
+    def _persist(self, item: Dict):
+        """Write an item with a descriptor to the store"""
+        if self.store is None or item.get('descriptor') is None:
+            return
+        try:
+            self.store.save(item)
+        except Exception as e:
+            self.logger.error(f"Failed to persist retry {item['context'].get('name', 'unknown')}: {e}")
+
+    def _forget(self, item: Dict):
+        """Remove a finished item from the store"""
+        if self.store is None or item.get('descriptor') is None:
+            return
+        try:
+            self.store.delete(item['id'])
+        except Exception as e:
+            self.logger.error(f"Failed to remove persisted retry {item['id']}: {e}")
+
+    def _bury(self, item: Dict, last_error: str):
+        """Dead-letter an exhausted item (dropped when there is no store)"""
+        buried = False
+        if self.store is not None:
+            try:
+                self.store.bury(item, last_error)
+                buried = True
+            except Exception as e:
+                self.logger.error(f"Failed to dead-letter retry {item.get('id')}: {e}")
+        # Only after the row left the queue table, so reload() cannot schedule it again
+        with self.cond:
+            self.live_ids.discard(item.get('id'))
+            self.stats['dead_lettered' if buried else 'dropped'] += 1
+
+    def _restore(self) -> int:
+        """Load persisted items this queue does not hold yet, keeping their attempts and next_retry"""
+        restored = 0
+        with self.cond:
+            # Enqueued before start(), or already running in this process
+            queued = set(self.live_ids)
+        for item in self.store.load():
+            if item['id'] in queued:
+                continue
+            kind = item['descriptor'].get('kind')
+            if kind not in self.resolvers:
+                # Left in the store for a later start that registers the resolver
+                self.logger.warning(f"No resolver for retry kind '{kind}', keeping {item['id']} persisted")
+                continue
+            try:
+                item['policy'] = RetryPolicy(item['policy'])
+            except ValueError:
+                item['policy'] = RetryPolicy.EXPONENTIAL
+            item.update({'operation': None, 'args': (), 'kwargs': {}})
+            with self.cond:
+                self.live_ids.add(item['id'])
+                self._push(item)
+            restored += 1
+        if restored:
+            self.logger.info(f"Restored {restored} persisted retries")
+        return restored
+
+    def reload(self) -> int:
+        """Pick up rows added to the store by another process (e.g. a dead-letter replay)"""
+        if self.store is None:
+            return 0
+        return self._restore()
+
+    def replay_dead_letters(self, rate_per_second: float = 1.0, limit: Optional[int] = None,
+                            **filters) -> Dict[str, int]:
+        """
+        Move dead letters back into the queue with a fresh attempt count.
+
+        Args:
+            rate_per_second: Replayed items become due at most this fast
+            limit: Maximum items to replay
+            **filters: See RetryStore.list_dead (ids, kind, name, error, since)
+
+        Returns:
+            {'replayed': n, 'skipped': n} - skipped items have no descriptor
+        """
+        if self.store is None:
+            raise ValueError("Dead-letter replay needs a RetryQueue store_path")
+        result = self.store.replay_dead(rate_per_second=rate_per_second, limit=limit, **filters)
+        self.reload()
+        self.logger.info(f"Replayed {result['replayed']} dead letters ({result['skipped']} not replayable)")
+        return result
+
+    def _push(self, item: Dict):
+        """Schedule an item and wake the processor if it is now the earliest (caller holds the lock)"""
+        entry = (item['next_retry'], next(self._seq), item)
+        heapq.heappush(self.queue, entry)
+        if self.queue[0] is entry:
+            self.cond.notify()
+
+    def _target_key(self, item: Dict) -> str:
+        """Backend a retry hits: context['target'], else derived from the descriptor"""
+        context = item.get('context') or {}
+        if context.get('target'):
+            return context['target']
+        descriptor = item.get('descriptor') or {}
+        params = descriptor.get('params', {})
+        kind = descriptor.get('kind')
+        if kind == 'skill':
+            return params.get('skill_name', 'skill')
+        if kind == 'mcp':
+            return params.get('server', 'mcp')
+        if kind == 'social_post':
+            return f"social_{params.get('platform', 'unknown')}"
+        return context.get('name', 'unknown')
+
+    def _component(self, item: Dict) -> str:
+        """Circuit breaker / budget name: context['component'], the social platform, else the target"""
+        context = item.get('context') or {}
+        if context.get('component'):
+            return context['component']
+        descriptor = item.get('descriptor') or {}
+        if descriptor.get('kind') == 'social_post':
+            return descriptor.get('params', {}).get('platform', 'unknown')
+        return self._target_key(item)
+
+    def _breaker_deadline(self, component: str) -> Optional[datetime]:
+        """When an open breaker allows the component again, or None if it is allowed now"""
+        if self.circuit_breakers is None:
+            return None
+        try:
+            if self.circuit_breakers.check_breaker(component):
+                return None
+            next_retry = self.circuit_breakers.get_breaker_status(component).get('next_retry')
+        except Exception as e:
+            self.logger.error(f"Circuit breaker check failed for {component}: {e}")
+            return None
+        soonest = datetime.utcnow() + timedelta(seconds=1)
+        if not next_retry:
+            return soonest
+        deadline = datetime.fromisoformat(next_retry.replace('Z', '+00:00')).replace(tzinfo=None)
+        return max(deadline, soonest)
+
+    def _take_token(self, component: str) -> float:
+        """Spend a retry token; returns 0, or the seconds until one is available"""
+        if self.budget_capacity is None:
+            return 0.0
+        now = time.monotonic()
         with self.lock:
-            retry_item = {
-                'operation': operation,
-                'args': args,
-                'kwargs': kwargs or {},
-                'policy': policy,
-                'context': context or {},
-                'attempts': 0,
-                'next_retry': datetime.utcnow(),
-                'created_at': datetime.utcnow()
-            }
-            self.queue.append(retry_item)
-            self.logger.info(f"Enqueued operation for retry: {context.get('name', 'unknown')}")
+            bucket = self.budgets.setdefault(component, [float(self.budget_capacity), now])
+            bucket[0] = min(self.budget_capacity, bucket[0] + (now - bucket[1]) * self.budget_refill)
+            bucket[1] = now
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                return 0.0
+            if self.budget_refill <= 0:
+                return 60.0
+            return (1 - bucket[0]) / self.budget_refill
+
+    def _defer(self, item: Dict, until: datetime, reason: str):
+        """Reschedule a due item without using an attempt"""
+        item['next_retry'] = until
+        self._persist(item)
+        with self.cond:
+            self.stats[f'deferred_{reason}'] += 1
+            self._push(item)
+        self.logger.info(f"Deferred retry {item['context'].get('name', 'unknown')} "
+                         f"until {until.isoformat()}Z ({reason})")
+
+    def _target_limit(self, key: str) -> int:
+        """Concurrent retries allowed for a target"""
+        for pattern, limit in self.target_limits.items():
+            if fnmatch(key, pattern):
+                return limit
+        return self.default_target_limit
+
+    def _dispatch(self, item: Dict):
+        """Hand a due item to the workers, or defer/park it without using an attempt"""
+        component = self._component(item)
+        deadline = self._breaker_deadline(component)
+        if deadline is not None:
+            self._defer(item, deadline, 'breaker')
+            return
+        wait = self._take_token(component)
+        if wait:
+            self._defer(item, datetime.utcnow() + timedelta(seconds=wait), 'budget')
+            return
+
+        key = self._target_key(item)
+        with self.cond:
+            if not self.running:
+                self._push(item)
+                return
+            if self.in_flight[key] >= self._target_limit(key):
+                self.parked[key].append(item)
+                return
+            self.in_flight[key] += 1
+        self.ready.put((key, item))
+
+    def _release(self, key: str):
+        """Free a target slot, handing it straight to the next parked item"""
+        with self.lock:
+            if self.parked[key] and self.running:
+                self.ready.put((key, self.parked[key].popleft()))
+                return
+            self.in_flight[key] -= 1
+            if not self.in_flight[key]:
+                del self.in_flight[key]
+            if not self.parked[key]:
+                del self.parked[key]
 
     def start(self):
-        """Start retry queue processor"""
+        """Start retry queue processor (rehydrating persisted items on first start)"""
+        if self.store is not None and not self._restored:
+            self._restored = True
+            self._restore()
         self.running = True
+        self.stop_event.clear()
         self.thread = Thread(target=self._process_queue, daemon=True)
         self.thread.start()
-        self.logger.info("RetryQueue started")
+        self.worker_threads = [
+            Thread(target=self._work, name=f"retry-worker-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for worker in self.worker_threads:
+            worker.start()
+        self.logger.info(f"RetryQueue started ({self.workers} workers)")
 
     def stop(self):
-        """Stop retry queue processor"""
-        self.running = False
-        self.stop_event.set()
-        if self.thread:
-            self.thread.join(timeout=5)
+        """Stop retry queue processor and workers (retries still running are not interrupted)"""
+        with self.cond:
+            self.running = False
+            self.stop_event.set()
+            self.cond.notify_all()
+            # Parked items go back on the heap for a later start()
+            for items in self.parked.values():
+                for item in items:
+                    self._push(item)
+            self.parked.clear()
+        for _ in self.worker_threads:
+            self.ready.put(None)
+
+        deadline = time.monotonic() + 5
+        for thread in [self.thread] + self.worker_threads:
+            if thread:
+                thread.join(timeout=max(0, deadline - time.monotonic()))
         self.logger.info("RetryQueue stopped")
 
-    def _calculate_backoff(self, attempts: int, policy: RetryPolicy) -> int:
-        """Calculate backoff delay in seconds"""
+    def _calculate_backoff(self, attempts: int, policy: RetryPolicy) -> float:
+        """Calculate backoff delay in seconds (uniform up to the policy's ceiling with jitter)"""
         if policy == RetryPolicy.EXPONENTIAL:
-            return min(300, 2 ** attempts)  # Max 5 minutes
+            ceiling = min(300, 2 ** attempts)  # Max 5 minutes
         elif policy == RetryPolicy.LINEAR:
-            return min(300, 30 * attempts)  # 30s, 60s, 90s...
+            ceiling = min(300, 30 * attempts)  # 30s, 60s, 90s...
         else:  # FIXED
-            return 60
+            ceiling = 60
+        if not self.jitter:
+            return ceiling
+        return self._random.uniform(0, ceiling)
+
+    def _take_due(self) -> List[Dict]:
+        """Block until items are due (or stop) and pop them in next_retry order"""
+        with self.cond:
+            while self.running:
+                if not self.queue:
+                    self.cond.wait()
+                    continue
+                now = datetime.utcnow()
+                delay = (self.queue[0][0] - now).total_seconds()
+                if delay > 0:
+                    self.cond.wait(delay)
+                    continue
+                due = []
+                while self.queue and self.queue[0][0] <= now:
+                    due.append(heapq.heappop(self.queue)[2])
+                return due
+            return []
 
     def _process_queue(self):
         """Process retry queue"""
         while self.running:
             try:
-                now = datetime.utcnow()
-                items_to_retry = []
-
-                with self.lock:
-                    # Find items ready for retry
-                    for item in list(self.queue):
-                        if item['next_retry'] <= now:
-                            items_to_retry.append(item)
-                            self.queue.remove(item)
+                # Workers execute the items outside the lock
+                for item in self._take_due():
+                    self._dispatch(item)
 
-                # Process items outside lock
-                for item in items_to_retry:
-                    self._retry_operation(item)
-
-                # Sleep for 5 seconds
+            except Exception as e:
+                self.logger.error(f"Error processing retry queue: {e}")
                 if self.stop_event.wait(timeout=5):
                     break
 
+    def _work(self):
+        """Worker thread: execute dispatched retries"""
+        while True:
+            try:
+                entry = self.ready.get(timeout=1)
+            except Empty:
+                if not self.running:
+                    break
+                continue
+            if entry is None:
+                break
+
+            key, item = entry
+            if not self.running:
+                # Stopping - back on the heap without using an attempt
+                with self.cond:
+                    self._push(item)
+                self._release(key)
+                continue
+            try:
+                self._retry_operation(item)
             except Exception as e:
-                self.logger.error(f"Error processing retry queue: {e}")
-                time.sleep(5)
+                self.logger.error(f"Error executing retry {key}: {e}")
+            finally:
+                self._release(key)
 
     def _retry_operation(self, item: Dict):
         """Retry a single operation"""
@@ -111,33 +506,63 @@ class RetryQueue:
         self.logger.info(f"Retrying operation: {operation_name} (attempt {item['attempts']}/{self.max_retries})")
 
         try:
-            # Execute operation
-            result = item['operation'](*item['args'], **item['kwargs'])
+            # Execute operation (resolved from the descriptor after a restart)
+            if item['operation'] is not None:
+                result = item['operation'](*item['args'], **item['kwargs'])
+            else:
+                descriptor = item['descriptor']
+                result = self.resolvers[descriptor['kind']](**descriptor.get('params', {}))
 
             # Check if successful
             if isinstance(result, dict) and result.get('success'):
                 self.logger.info(f"Retry successful for: {operation_name}")
+                # Delete the row before releasing the id, so reload() cannot run it again
+                self._forget(item)
+                with self.cond:
+                    self.live_ids.discard(item.get('id'))
                 return True
             else:
                 raise Exception(f"Operation returned failure: {result}")
 
         except Exception as e:
             self.logger.warning(f"Retry failed for {operation_name}: {e}")
+            history = item.setdefault('history', [])
+            history.append({'attempt': item['attempts'], 'at': datetime.utcnow().isoformat() + 'Z',
+                            'error': str(e)[:500]})
+            del history[:-self.max_retries * 2]
 
             # Re-enqueue if under max retries
             if item['attempts'] < self.max_retries:
                 backoff = self._calculate_backoff(item['attempts'], item['policy'])
                 item['next_retry'] = datetime.utcnow() + timedelta(seconds=backoff)
 
-                with self.lock:
-                    self.queue.append(item)
+                self._persist(item)
+                with self.cond:
+                    self._push(item)
 
-                self.logger.info(f"Re-enqueued {operation_name}, next retry in {backoff}s")
+                self.logger.info(f"Re-enqueued {operation_name}, next retry in {backoff:.1f}s")
             else:
-                self.logger.error(f"Max retries exceeded for {operation_name}, giving up")
+                fate = "moving to dead letters" if self.store is not None else "dropping it"
+                self.logger.error(f"Max retries exceeded for {operation_name}, {fate}")
+                self._bury(item, str(e)[:500])
                 return False
 
     def get_queue_size(self) -> int:
-        """Get current queue size"""
+        """Get current queue size (scheduled and parked items)"""
+        with self.lock:
+            return len(self.queue) + sum(len(items) for items in self.parked.values())
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get worker pool statistics"""
         with self.lock:
-            return len(self.queue)
+            return {
+                'queued': len(self.queue),
+                'workers': self.workers,
+                'running': sum(self.in_flight.values()),
+                'in_flight': dict(self.in_flight),
+                'parked': {key: len(items) for key, items in self.parked.items()},
+                'deferred_breaker': self.stats['deferred_breaker'],
+                'deferred_budget': self.stats['deferred_budget'],
+                'dead_lettered': self.stats['dead_lettered'],
+                'dropped': self.stats['dropped'],
+            }
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+RetryStore - Persisted RetryQueue Items
+========================================
+
+SQLite table (stdlib sqlite3, WAL mode) holding every pending retry that
+has a serializable descriptor, so the queue survives restarts:
+
+    descriptor = {'kind': 'skill', 'params': {'skill_name': ..., 'args': [...]}}
+
+Rows keep the attempt count, next_retry and attempt history; RetryQueue
+rewrites a row after each failed attempt and deletes it once the item
+succeeds. Items that exhaust max_retries move to the dead_letters table
+(with the last error) where dead_letters.py can list them and replay
+them into retry_items, spaced out to a rate limit. Thread-safe:
+RetryQueue calls it from enqueuers and its worker threads.
+"""
+
+import json
+import sqlite3
+from pathlib import Path
+from datetime import datetime, timedelta
+from threading import Lock
+from typing import Any, Dict, List, Optional
+
+
+class RetryStore:
+    """SQLite persistence for retry descriptors"""
+
+    def __init__(self, db_file: Path):
+        """
+        Initialize RetryStore.
+
+        Args:
+            db_file: SQLite database file (created if missing)
+        """
+        self.db_file = db_file
+        self.lock = Lock()
+
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_file), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS retry_items ("
+            "id TEXT PRIMARY KEY, descriptor TEXT NOT NULL, policy TEXT NOT NULL, "
+            "context TEXT NOT NULL, attempts INTEGER NOT NULL, "
+            "next_retry TEXT NOT NULL, created_at TEXT NOT NULL, "
+            "history TEXT NOT NULL DEFAULT '[]')"
+        )
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(retry_items)")}
+        if 'history' not in columns:
+            self.conn.execute("ALTER TABLE retry_items ADD COLUMN history TEXT NOT NULL DEFAULT '[]'")
+        # descriptor is NULL for in-memory callables: inspectable, not replayable
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS dead_letters ("
+            "id TEXT PRIMARY KEY, descriptor TEXT, policy TEXT NOT NULL, "
+            "context TEXT NOT NULL, attempts INTEGER NOT NULL, history TEXT NOT NULL, "
+            "last_error TEXT, created_at TEXT NOT NULL, failed_at TEXT NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_dead_letters_failed_at ON dead_letters (failed_at)")
+        self.conn.commit()
+
+    def save(self, item: Dict[str, Any]):
+        """Insert or update an item's row"""
+        row = (
+            item['id'],
+            json.dumps(item['descriptor'], default=str),
+            item['policy'].value,
+            json.dumps(item['context'], default=str),
+            item['attempts'],
+            item['next_retry'].isoformat(),
+            item['created_at'].isoformat(),
+            json.dumps(item.get('history', []), default=str),
+        )
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO retry_items "
+                "(id, descriptor, policy, context, attempts, next_retry, created_at, history) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", row
+            )
+            self.conn.commit()
+
+    def delete(self, item_id: str):
+        """Remove an item's row"""
+        with self.lock:
+            self.conn.execute("DELETE FROM retry_items WHERE id = ?", (item_id,))
+            self.conn.commit()
+
+    def load(self) -> List[Dict[str, Any]]:
+        """All persisted items, earliest next_retry first (policy as its string value)"""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT id, descriptor, policy, context, attempts, next_retry, created_at, history "
+                "FROM retry_items ORDER BY next_retry"
+            ).fetchall()
+        return [{
+            'id': item_id,
+            'descriptor': json.loads(descriptor),
+            'policy': policy,
+            'context': json.loads(context),
+            'attempts': attempts,
+            'next_retry': datetime.fromisoformat(next_retry),
+            'created_at': datetime.fromisoformat(created_at),
+            'history': json.loads(history),
+        } for item_id, descriptor, policy, context, attempts, next_retry, created_at, history in rows]
+
+    def bury(self, item: Dict[str, Any], last_error: str):
+        """Move an exhausted item to dead_letters (replacing its retry row)"""
+        descriptor = item.get('descriptor')
+        policy = item['policy']
+        row = (
+            item['id'],
+            json.dumps(descriptor, default=str) if descriptor is not None else None,
+            policy.value if hasattr(policy, 'value') else str(policy),
+            json.dumps(item['context'], default=str),
+            item['attempts'],
+            json.dumps(item.get('history', []), default=str),
+            last_error,
+            item['created_at'].isoformat(),
+            datetime.utcnow().isoformat(),
+        )
+        with self.lock:
+            with self.conn:
+                self.conn.execute("DELETE FROM retry_items WHERE id = ?", (item['id'],))
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO dead_letters "
+                    "(id, descriptor, policy, context, attempts, history, last_error, created_at, failed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", row
+                )
+
+    def _dead_filter(self, ids: Optional[List[str]] = None, kind: Optional[str] = None,
+                     name: Optional[str] = None, error: Optional[str] = None,
+                     since: Optional[datetime] = None):
+        """WHERE clause and parameters for dead-letter filters"""
+        clauses, params = [], []
+        if ids:
+            clauses.append(f"id IN ({', '.join('?' * len(ids))})")
+            params.extend(ids)
+        if kind:
+            clauses.append("json_extract(descriptor, '$.kind') = ?")
+            params.append(kind)
+        if name:
+            clauses.append("json_extract(context, '$.name') GLOB ?")
+            params.append(name)
+        if error:
+            clauses.append("last_error LIKE ?")
+            params.append(f"%{error}%")
+        if since:
+            clauses.append("failed_at >= ?")
+            params.append(since.isoformat())
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def list_dead(self, limit: Optional[int] = None, **filters) -> List[Dict[str, Any]]:
+        """
+        Dead letters, oldest failure first.
+
+        Args:
+            limit: Maximum rows
+            **filters: ids, kind (descriptor kind), name (glob on context name),
+                error (substring of the last error), since (failed_at datetime)
+        """
+        where, params = self._dead_filter(**filters)
+        sql = ("SELECT id, descriptor, policy, context, attempts, history, last_error, created_at, failed_at "
+               f"FROM dead_letters{where} ORDER BY failed_at")
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self.lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        return [{
+            'id': item_id,
+            'descriptor': json.loads(descriptor) if descriptor is not None else None,
+            'policy': policy,
+            'context': json.loads(context),
+            'attempts': attempts,
+            'history': json.loads(history),
+            'last_error': last_error,
+            'created_at': datetime.fromisoformat(created_at),
+            'failed_at': datetime.fromisoformat(failed_at),
+        } for item_id, descriptor, policy, context, attempts, history, last_error, created_at, failed_at in rows]
+
+    def replay_dead(self, rate_per_second: float = 1.0, limit: Optional[int] = None,
+                    **filters) -> Dict[str, int]:
+        """
+        Move matching dead letters back to retry_items with a fresh attempt count.
+
+        Their next_retry values are spaced 1/rate_per_second apart so the
+        queue picks them up no faster than the rate. Rows without a
+        descriptor cannot be rehydrated and stay dead.
+
+        Returns:
+            {'replayed': n, 'skipped': n}
+        """
+        if rate_per_second <= 0:
+            raise ValueError(f"Invalid replay rate: {rate_per_second}")
+        dead = self.list_dead(limit=limit, **filters)
+        start = datetime.utcnow()
+        replayed = 0
+        with self.lock:
+            with self.conn:
+                for row in dead:
+                    if row['descriptor'] is None:
+                        continue
+                    next_retry = start + timedelta(seconds=replayed / rate_per_second)
+                    self.conn.execute(
+                        "INSERT OR REPLACE INTO retry_items "
+                        "(id, descriptor, policy, context, attempts, next_retry, created_at, history) "
+                        "VALUES (?, ?, ?, ?, 0, ?, ?, ?)",
+                        (row['id'], json.dumps(row['descriptor']), row['policy'],
+                         json.dumps(row['context']), next_retry.isoformat(),
+                         row['created_at'].isoformat(), json.dumps(row['history']))
+                    )
+                    self.conn.execute("DELETE FROM dead_letters WHERE id = ?", (row['id'],))
+                    replayed += 1
+        return {'replayed': replayed, 'skipped': len(dead) - replayed}
+
+    def purge_dead(self, **filters) -> int:
+        """Delete matching dead letters; returns the number removed"""
+        where, params = self._dead_filter(**filters)
+        with self.lock:
+            with self.conn:
+                return self.conn.execute(f"DELETE FROM dead_letters{where}", params).rowcount
+
+    def count_dead(self) -> int:
+        """Number of dead letters"""
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM dead_letters").fetchone()[0]
+
+    def count(self) -> int:
+        """Number of persisted items"""
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM retry_items").fetchone()[0]
+
+    def close(self):
+        """Close the database"""
+        with self.lock:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
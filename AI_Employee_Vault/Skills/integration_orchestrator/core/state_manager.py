@@ -5,80 +5,493 @@ StateManager - State Persistence
 
 Manages processed events state and system-wide state tracking.
 Enhanced for Gold Tier with metrics collection and persistence.
+
+Storage backends (see state_storage.py):
+- 'json' (default): in-memory dicts persisted to state.json. Every
+  mutation rewrites the full snapshot, or with journal=True appends one
+  small record to a write-ahead journal that is periodically compacted
+  (every compact_threshold records, and with compact_interval at least
+  that often, so tools reading state.json directly stay current).
+- 'sqlite': indexed tables in state.db (WAL mode). Existing state.json
+  content is migrated on first open.
+
+Commit modes:
+- Synchronous (default): every mutation is persisted on the caller's thread.
+- Group commit (flush_interval set): mutations only mark the state dirty and
+  a background flusher persists them at most once per interval. flush(),
+  close() and durable=True on individual mutations still give synchronous
+  durability where a caller needs it.
+
+Processed-event retention:
+- max_processed_events / processed_ttl bound the processed-events store;
+  the oldest entries are evicted first.
+- bloom_filter=True keeps an in-memory Bloom filter of processed IDs so
+  is_processed() answers "new ID" without touching the store.
+
+Namespaces:
+- namespace(name) returns a StateNamespace - a key/value map with its own
+  lock and its own file (<stem>.<name>.json / .db). Hot components such as
+  CircuitBreakerManager read and write single entries there instead of
+  round-tripping one large system_state value through the main store.
 """
 
-import json
+import re
+import time
+import atexit
 import hashlib
 import logging
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Dict, Any, Optional
-from threading import Lock
+from threading import Lock, Thread, Event
+
+from .state_storage import JSONStateStorage, SQLiteStateStorage, STATE_TABLES
+from .bloom_filter import BloomFilter
+
+
+class StateNamespace:
+    """
+    Independently persisted and locked key/value namespace.
+
+    Created through StateManager.namespace(); shares the manager's backend
+    and commit mode but never contends on the manager's lock or file.
+    """
+
+    def __init__(self, name: str, storage, group_commit: bool = False):
+        self.name = name
+        self.storage = storage
+        self.group_commit = group_commit
+        self.lock = Lock()
+        self._dirty = False
+
+        with self.lock:
+            self.storage.load()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get a single entry"""
+        with self.lock:
+            return self.storage.get('entries', key, default)
+
+    def set(self, key: str, value: Any, durable: bool = False):
+        """Set a single entry"""
+        with self.lock:
+            self.storage.set('entries', key, value)
+            self._dirty = True
+        if not self.group_commit or durable:
+            self.flush()
+
+    def delete(self, key: str, durable: bool = False):
+        """Delete a single entry"""
+        with self.lock:
+            self.storage.delete('entries', key)
+            self._dirty = True
+        if not self.group_commit or durable:
+            self.flush()
+
+    def items(self) -> Dict[str, Any]:
+        """Get a copy of all entries"""
+        with self.lock:
+            return dict(self.storage.items('entries'))
+
+    def __contains__(self, key: str) -> bool:
+        with self.lock:
+            return self.storage.contains('entries', key)
+
+    def __len__(self) -> int:
+        with self.lock:
+            return self.storage.count('entries')
+
+    def flush(self):
+        """Persist pending changes"""
+        try:
+            with self.lock:
+                if self._dirty:
+                    self.storage.commit()
+                    self._dirty = False
+        except Exception as e:
+            print(f"Error saving state namespace {self.name}: {e}")
+
+    def close(self):
+        """Flush and release storage resources"""
+        self.flush()
+        try:
+            with self.lock:
+                self.storage.close()
+        except Exception as e:
+            print(f"Error closing state namespace {self.name}: {e}")
 
 
 class StateManager:
     """Manages processed events state - Enhanced for Gold Tier"""
 
-    def __init__(self, state_file: Path):
+    def __init__(self, state_file: Path, journal: bool = False,
+                 compact_threshold: int = 1000, backend: str = 'json',
+                 flush_interval: Optional[float] = None,
+                 max_processed_events: Optional[int] = None,
+                 processed_ttl: Optional[float] = None,
+                 bloom_filter: bool = False,
+                 compact_interval: Optional[float] = None):
+        """
+        Initialize StateManager.
+
+        Args:
+            state_file: Path to the JSON state file (the SQLite backend
+                stores its database next to it as <stem>.db)
+            journal: JSON backend only - append mutations to a write-ahead
+                journal instead of rewriting the full snapshot each time
+            compact_threshold: Journal records after which the journal is
+                folded into a fresh snapshot
+            backend: Storage engine, 'json' or 'sqlite'
+            flush_interval: Enable group commit - seconds between background
+                flushes. None persists every mutation synchronously.
+            max_processed_events: Keep at most this many processed events,
+                evicting the oldest
+            processed_ttl: Evict processed events older than this many seconds
+            bloom_filter: Use a Bloom filter fast path for is_processed()
+            compact_interval: Journal mode - fold the journal into the
+                snapshot once its oldest record is this many seconds old
+                (checked on each flusher tick, or on each commit without
+                group commit)
+        """
         self.state_file = state_file
-        self.processed_events: Dict[str, Dict] = {}
-        # Gold Tier enhancements
-        self.system_state: Dict[str, Any] = {}
-        self.metrics: Dict[str, Any] = {}
+        self.backend = backend
         self.lock = Lock()
+
+        # Group commit
+        self.flush_interval = flush_interval
+        self._dirty = False
+        self._pending_mutations = 0
+        self._flusher = None
+        self._stop_event = Event()
+        self.persistence_stats = {
+            'mutations': 0,
+            'writes': 0,
+            'writes_avoided': 0,
+            'last_flush_ms': 0.0,
+            'max_flush_ms': 0.0,
+            'total_flush_ms': 0.0,
+        }
+
+        # Processed-event retention
+        self.max_processed_events = max_processed_events
+        self.processed_ttl = processed_ttl
+        self.use_bloom_filter = bloom_filter
+        self._bloom: Optional[BloomFilter] = None
+        self._processed_count = 0
+        self._evicted_since_rebuild = 0
+        self._last_ttl_sweep = 0.0
+        self.retention_stats = {
+            'evicted': 0,
+            'bloom_negatives': 0,
+            'bloom_rebuilds': 0,
+        }
+
+        # Namespaces
+        self.journal = journal
+        self.compact_threshold = compact_threshold
+        self.compact_interval = compact_interval
+        self._journal_since: Optional[float] = None
+        self._namespaces: Dict[str, StateNamespace] = {}
+        self._namespaces_lock = Lock()
+
+        if backend not in ('json', 'sqlite'):
+            raise ValueError(f"Unknown state backend: {backend}")
+        self.storage = self._create_storage(state_file, STATE_TABLES, migrate_from=state_file)
+
         self.load_state()
 
+        if flush_interval is not None:
+            self._flusher = Thread(target=self._flush_loop, daemon=True)
+            self._flusher.start()
+            atexit.register(self.close)
+
+    def _create_storage(self, state_file: Path, tables, migrate_from: Path = None):
+        """Create a storage engine for the configured backend"""
+        if self.backend == 'sqlite':
+            return SQLiteStateStorage(
+                state_file.with_suffix('.db'),
+                migrate_from=migrate_from,
+                tables=tables
+            )
+        return JSONStateStorage(
+            state_file,
+            journal=self.journal,
+            compact_threshold=self.compact_threshold,
+            tables=tables
+        )
+
+    def namespace(self, name: str) -> StateNamespace:
+        """
+        Get (or create) an independently persisted state namespace.
+
+        On first use, an existing system_state[name] dict is moved into
+        the namespace so components switching over keep their state.
+
+        Args:
+            name: Namespace name (letters, digits, '_' and '-')
+
+        Returns:
+            StateNamespace instance, shared by all callers of the same name
+        """
+        if not re.fullmatch(r'[A-Za-z0-9_\-]+', name):
+            raise ValueError(f"Invalid state namespace name: {name}")
+
+        with self._namespaces_lock:
+            namespace = self._namespaces.get(name)
+            if namespace is not None:
+                return namespace
+
+            namespace_file = self.state_file.with_name(f"{self.state_file.stem}.{name}.json")
+            namespace = StateNamespace(
+                name,
+                self._create_storage(namespace_file, ('entries',)),
+                group_commit=self.flush_interval is not None
+            )
+
+            legacy = self.get_system_state(name)
+            if isinstance(legacy, dict) and len(namespace) == 0:
+                for key, value in legacy.items():
+                    namespace.set(key, value)
+                namespace.flush()
+                with self.lock:
+                    self.storage.delete('system_state', name)
+                self._persist(durable=True)
+
+            self._namespaces[name] = namespace
+            return namespace
+
+    # Whole-table views kept for callers that read state directly.
+    # The JSON backend returns its live dicts, SQLite returns copies.
+    @property
+    def processed_events(self) -> Dict[str, Dict]:
+        return self.storage.items('processed_events')
+
+    @property
+    def system_state(self) -> Dict[str, Any]:
+        return self.storage.items('system_state')
+
+    @property
+    def metrics(self) -> Dict[str, Any]:
+        return self.storage.items('metrics')
+
     def load_state(self):
         """Load processed events from file"""
+        with self.lock:
+            self.storage.load()
+            self._processed_count = self.storage.count('processed_events')
+            if self._apply_retention(force_ttl_sweep=True):
+                self._pending_mutations += 1
+                self._dirty = True
+            if self.use_bloom_filter:
+                self._rebuild_bloom()
+
+    def _rebuild_bloom(self):
+        """Rebuild the Bloom filter from the store (caller holds lock)"""
+        capacity = max(self._processed_count * 2, self.max_processed_events or 0, 10000)
+        self._bloom = BloomFilter(capacity)
+        self._bloom.update(self.storage.keys('processed_events'))
+        self._evicted_since_rebuild = 0
+        self.retention_stats['bloom_rebuilds'] += 1
+
+    def _apply_retention(self, force_ttl_sweep: bool = False) -> int:
+        """Evict processed events over the size/age limits (caller holds lock)"""
+        evicted = 0
+
+        if self.max_processed_events is not None:
+            overflow = self._processed_count - self.max_processed_events
+            if overflow > 0:
+                evicted += self.storage.evict_oldest('processed_events', overflow)
+
+        # Age-based sweeps scan the whole table, so run them at most once a
+        # minute rather than on every insert
+        now = time.time()
+        if self.processed_ttl is not None and (force_ttl_sweep or now - self._last_ttl_sweep >= 60):
+            cutoff = (datetime.utcnow() - timedelta(seconds=self.processed_ttl)).isoformat() + 'Z'
+            evicted += self.storage.evict_before('processed_events', cutoff)
+            self._last_ttl_sweep = now
+
+        if evicted:
+            self._processed_count -= evicted
+            self.retention_stats['evicted'] += evicted
+            self._evicted_since_rebuild += evicted
+            # Evicted IDs stay set in the filter and only cost extra store
+            # lookups; rebuild once they make up a large share of it
+            if self._bloom is not None and self._evicted_since_rebuild > self._bloom.capacity // 2:
+                self._rebuild_bloom()
+
+        return evicted
+
+    def enforce_retention(self) -> int:
+        """
+        Apply the retention policy now and persist the evictions.
+
+        Returns:
+            Number of processed events evicted
+        """
+        with self.lock:
+            evicted = self._apply_retention(force_ttl_sweep=True)
+            if evicted:
+                self._pending_mutations += 1
+                self._dirty = True
+        if evicted:
+            self.flush()
+        return evicted
+
+    def get_retention_stats(self) -> Dict[str, Any]:
+        """Get processed-event store size, eviction and Bloom filter statistics"""
+        with self.lock:
+            stats = dict(self.retention_stats)
+            stats['processed_events'] = self._processed_count
+            stats['max_processed_events'] = self.max_processed_events
+            stats['processed_ttl'] = self.processed_ttl
+            stats['bloom_filter_bytes'] = self._bloom.size_bytes if self._bloom else 0
+            return stats
+
+    def _persist(self, durable: bool = False):
+        """Persist the mutation that was just applied, or defer it to the flusher"""
+        with self.lock:
+            self.persistence_stats['mutations'] += 1
+            self._pending_mutations += 1
+            self._dirty = True
+
+        if self._flusher is None or durable:
+            self.flush()
+
+    def _flush_loop(self):
+        """Background flusher - at most one write per flush_interval"""
+        while not self._stop_event.wait(timeout=self.flush_interval):
+            self.flush()
+            self._flush_namespaces()
+            self._compact_if_due()
+
+    def _flush_namespaces(self):
+        with self._namespaces_lock:
+            namespaces = list(self._namespaces.values())
+        for namespace in namespaces:
+            namespace.flush()
+
+    def flush(self):
+        """Synchronously persist all pending mutations"""
         try:
-            if self.state_file.exists():
-                with open(self.state_file, 'r') as f:
-                    data = json.load(f)
-                    # Support both old and new format
-                    if isinstance(data, dict) and 'processed_events' in data:
-                        # New format with enhanced state
-                        self.processed_events = data.get('processed_events', {})
-                        self.system_state = data.get('system_state', {})
-                        self.metrics = data.get('metrics', {})
-                    else:
-                        # Old format - just processed events
-                        self.processed_events = data
-                        self.system_state = {}
-                        self.metrics = {}
+            with self.lock:
+                if not self._dirty:
+                    return
+
+                start = time.perf_counter()
+                self.storage.commit()
+                elapsed_ms = (time.perf_counter() - start) * 1000
+
+                stats = self.persistence_stats
+                stats['writes'] += 1
+                stats['writes_avoided'] += self._pending_mutations - 1
+                stats['last_flush_ms'] = elapsed_ms
+                stats['max_flush_ms'] = max(stats['max_flush_ms'], elapsed_ms)
+                stats['total_flush_ms'] += elapsed_ms
+                self._pending_mutations = 0
+                self._dirty = False
+                if self._journal_since is None and getattr(self.storage, 'journal_records', 0):
+                    self._journal_since = time.monotonic()
+        except Exception as e:
+            print(f"Error saving state: {e}")
+
+        if self._flusher is None:
+            self._compact_if_due()
+
+    def _compact_if_due(self):
+        """Rewrite the snapshot once the journal is compact_interval seconds old"""
+        if self.compact_interval is None:
+            return
+        try:
+            with self.lock:
+                if not getattr(self.storage, 'journal_records', 0):
+                    self._journal_since = None
+                    return
+                if self._journal_since is None:
+                    # Journal replayed at startup - age it from now
+                    self._journal_since = time.monotonic()
+                if time.monotonic() - self._journal_since < self.compact_interval:
+                    return
+                self.storage.compact()
+                self._journal_since = None
         except Exception as e:
-            print(f"Warning: Could not load state file: {e}")
-            self.processed_events = {}
-            self.system_state = {}
-            self.metrics = {}
+            print(f"Error compacting state: {e}")
+
+    def get_persistence_stats(self) -> Dict[str, Any]:
+        """Get write coalescing and flush latency statistics"""
+        with self.lock:
+            stats = dict(self.persistence_stats)
+            stats['mode'] = 'group_commit' if self._flusher else 'synchronous'
+            stats['flush_interval'] = self.flush_interval
+            stats['pending_mutations'] = self._pending_mutations
+            stats['avg_flush_ms'] = (
+                stats['total_flush_ms'] / stats['writes'] if stats['writes'] else 0.0
+            )
+            return stats
 
     def save_state(self):
         """Save processed events to file - Enhanced format"""
         try:
             with self.lock:
-                state_data = {
-                    'processed_events': self.processed_events,
-                    'system_state': self.system_state,
-                    'metrics': self.metrics,
-                    'last_updated': datetime.utcnow().isoformat() + 'Z'
-                }
-                with open(self.state_file, 'w') as f:
-                    json.dump(state_data, f, indent=2)
+                self.storage.compact()
+                self._pending_mutations = 0
+                self._dirty = False
         except Exception as e:
             print(f"Error saving state: {e}")
 
+    def compact(self):
+        """Fold journals/WAL into the primary store"""
+        self.save_state()
+
+    def close(self):
+        """Stop the flusher, flush pending state and release storage resources"""
+        if self._flusher is not None:
+            self._stop_event.set()
+            self._flusher.join(timeout=5)
+            self._flusher = None
+            atexit.unregister(self.close)
+
+        with self._namespaces_lock:
+            namespaces = list(self._namespaces.values())
+            self._namespaces.clear()
+        for namespace in namespaces:
+            namespace.close()
+
+        self.flush()
+        try:
+            with self.lock:
+                self.storage.close()
+        except Exception as e:
+            print(f"Error closing state storage: {e}")
+
     def is_processed(self, event_id: str) -> bool:
         """Check if event has been processed"""
         with self.lock:
-            return event_id in self.processed_events
+            if self._bloom is not None and event_id not in self._bloom:
+                self.retention_stats['bloom_negatives'] += 1
+                return False
+            return self.storage.contains('processed_events', event_id)
 
-    def mark_processed(self, event_id: str, metadata: Dict):
+    def mark_processed(self, event_id: str, metadata: Dict, durable: bool = False):
         """Mark event as processed"""
         with self.lock:
-            self.processed_events[event_id] = {
+            if self._bloom is not None and event_id not in self._bloom:
+                is_new = True
+            else:
+                is_new = not self.storage.contains('processed_events', event_id)
+
+            self.storage.set('processed_events', event_id, {
                 **metadata,
                 'processed_at': datetime.utcnow().isoformat() + 'Z'
-            }
-        self.save_state()
+            })
+
+            if is_new:
+                self._processed_count += 1
+                if self._bloom is not None:
+                    self._bloom.add(event_id)
+                    if self._bloom.is_saturated():
+                        self._rebuild_bloom()
+            self._apply_retention()
+        self._persist(durable)
 
     def get_event_hash(self, filepath: Path) -> str:
         """Generate unique hash for file event"""
@@ -90,36 +503,36 @@ class StateManager:
             return hashlib.md5(str(filepath).encode()).hexdigest()
 
     # Gold Tier enhancements
-    def set_system_state(self, key: str, value: Any):
+    def set_system_state(self, key: str, value: Any, durable: bool = False):
         """Set system state value"""
         with self.lock:
-            self.system_state[key] = value
-        self.save_state()
+            self.storage.set('system_state', key, value)
+        self._persist(durable)
 
     def get_system_state(self, key: str, default: Any = None) -> Any:
         """Get system state value"""
         with self.lock:
-            return self.system_state.get(key, default)
+            return self.storage.get('system_state', key, default)
 
-    def update_metric(self, metric_name: str, value: Any):
+    def update_metric(self, metric_name: str, value: Any, durable: bool = False):
         """Update a metric"""
         with self.lock:
-            self.metrics[metric_name] = {
+            self.storage.set('metrics', metric_name, {
                 'value': value,
                 'updated_at': datetime.utcnow().isoformat() + 'Z'
-            }
-        self.save_state()
+            })
+        self._persist(durable)
 
     def get_metric(self, metric_name: str) -> Optional[Dict]:
         """Get a metric"""
         with self.lock:
-            return self.metrics.get(metric_name)
+            return self.storage.get('metrics', metric_name)
 
-    def increment_counter(self, counter_name: str, amount: int = 1):
+    def increment_counter(self, counter_name: str, amount: int = 1, durable: bool = False):
         """Increment a counter metric"""
         with self.lock:
-            if counter_name not in self.metrics:
-                self.metrics[counter_name] = {'value': 0}
-            self.metrics[counter_name]['value'] += amount
-            self.metrics[counter_name]['updated_at'] = datetime.utcnow().isoformat() + 'Z'
-        self.save_state()
+            metric = self.storage.get('metrics', counter_name) or {'value': 0}
+            metric['value'] += amount
+            metric['updated_at'] = datetime.utcnow().isoformat() + 'Z'
+            self.storage.set('metrics', counter_name, metric)
+        self._persist(durable)
@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+"""
+State Storage Backends
+======================
+
+Pluggable storage engines behind StateManager.
+
+Every backend stores a fixed set of tables as key -> JSON value maps.
+StateManager uses processed_events, system_state and metrics; state
+namespaces use a single 'entries' table in their own file.
+
+- JSONStateStorage: in-memory dicts persisted to state.json, either by
+  rewriting the full snapshot or through an append-only journal.
+- SQLiteStateStorage: indexed tables in a stdlib sqlite3 database (WAL
+  mode), so lookups and updates touch a single row and startup does not
+  parse the whole state.
+
+Keys are kept in write order (a re-written key moves to the end), which
+lets retention evict the oldest entries without sorting.
+
+Backends are not thread-safe on their own; StateManager serializes access.
+"""
+
+import os
+import json
+import sqlite3
+from pathlib import Path
+from datetime import datetime
+from abc import ABC, abstractmethod
+from itertools import islice
+from typing import Dict, Any, Tuple, Iterator
+
+
+STATE_TABLES = ('processed_events', 'system_state', 'metrics')
+
+
+def _stamped_before(value: Any, field: str, cutoff: str) -> bool:
+    """True if value carries a `field` timestamp older than cutoff"""
+    if not isinstance(value, dict):
+        return False
+    stamp = value.get(field)
+    return isinstance(stamp, str) and bool(stamp) and stamp < cutoff
+
+
+class BaseStateStorage(ABC):
+    """Base class for StateManager storage engines"""
+
+    @abstractmethod
+    def load(self):
+        """Load or open persisted state"""
+        pass
+
+    @abstractmethod
+    def get(self, table: str, key: str, default: Any = None) -> Any:
+        """Get a single value"""
+        pass
+
+    @abstractmethod
+    def contains(self, table: str, key: str) -> bool:
+        """Check whether a key exists"""
+        pass
+
+    @abstractmethod
+    def set(self, table: str, key: str, value: Any):
+        """Set a single value (durable after commit())"""
+        pass
+
+    @abstractmethod
+    def delete(self, table: str, key: str):
+        """Delete a single value (durable after commit())"""
+        pass
+
+    @abstractmethod
+    def items(self, table: str) -> Dict[str, Any]:
+        """Return the whole table as a dict"""
+        pass
+
+    @abstractmethod
+    def count(self, table: str) -> int:
+        """Return the number of keys in a table"""
+        pass
+
+    @abstractmethod
+    def keys(self, table: str) -> Iterator[str]:
+        """Iterate over keys, oldest write first"""
+        pass
+
+    @abstractmethod
+    def evict_oldest(self, table: str, count: int) -> int:
+        """Delete the `count` least recently written keys; returns keys removed"""
+        pass
+
+    @abstractmethod
+    def evict_before(self, table: str, cutoff: str, field: str = 'processed_at') -> int:
+        """Delete keys whose value[field] ISO timestamp is older than cutoff (keys without one are kept)"""
+        pass
+
+    @abstractmethod
+    def commit(self):
+        """Make all pending mutations durable"""
+        pass
+
+    def compact(self):
+        """Reclaim space / fold logs into the primary store"""
+        self.commit()
+
+    def close(self):
+        """Flush and release resources"""
+        self.compact()
+
+
+class JSONStateStorage(BaseStateStorage):
+    """
+    Dict-based storage persisted to a JSON snapshot.
+
+    In journal mode, commit() appends one small record per changed key to
+    `<state_file>.journal` and the full snapshot is only rewritten once the
+    journal reaches `compact_threshold` records.
+    """
+
+    def __init__(self, state_file: Path, journal: bool = False,
+                 compact_threshold: int = 1000, tables: Tuple[str, ...] = STATE_TABLES):
+        self.state_file = state_file
+        self.table_names = tables
+        self.tables: Dict[str, Dict[str, Any]] = {table: {} for table in tables}
+
+        # Write-ahead journal
+        self.journal = journal
+        self.journal_file = state_file.with_name(state_file.name + '.journal')
+        self.compact_threshold = compact_threshold
+        self._journal_records = 0
+        self._journal_handle = None
+        # Keys changed since the last commit; insertion-ordered, de-duplicated
+        self._pending: Dict[Tuple[str, str], None] = {}
+
+    def load(self):
+        """Load snapshot, then replay the journal on top of it"""
+        self.tables = {table: {} for table in self.table_names}
+        try:
+            if self.state_file.exists():
+                with open(self.state_file, 'r') as f:
+                    data = json.load(f)
+                    # Support both old and new format
+                    if isinstance(data, dict) and self.table_names[0] in data:
+                        # New format with enhanced state
+                        for table in self.table_names:
+                            self.tables[table] = data.get(table, {})
+                    elif self.table_names == STATE_TABLES:
+                        # Old format - just processed events
+                        self.tables['processed_events'] = data
+        except Exception as e:
+            print(f"Warning: Could not load state file: {e}")
+            self.tables = {table: {} for table in self.table_names}
+
+        if self.journal:
+            self._replay_journal()
+
+    def _replay_journal(self):
+        """Apply journal records on top of the loaded snapshot"""
+        self._journal_records = 0
+        if not self.journal_file.exists():
+            return
+
+        try:
+            with open(self.journal_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Torn write from a crash - everything after it is lost
+                        print(f"Warning: Ignoring truncated journal record in {self.journal_file}")
+                        break
+
+                    table = self.tables.get(record.get('t'))
+                    if table is None:
+                        continue
+                    table.pop(record['k'], None)
+                    if not record.get('d'):
+                        table[record['k']] = record['v']
+                    self._journal_records += 1
+        except Exception as e:
+            print(f"Warning: Could not replay state journal: {e}")
+
+    def get(self, table: str, key: str, default: Any = None) -> Any:
+        return self.tables[table].get(key, default)
+
+    def contains(self, table: str, key: str) -> bool:
+        return key in self.tables[table]
+
+    def set(self, table: str, key: str, value: Any):
+        # Re-insert so the key moves to the end of the write order
+        self.tables[table].pop(key, None)
+        self.tables[table][key] = value
+        self._pending[(table, key)] = None
+
+    def delete(self, table: str, key: str):
+        self.tables[table].pop(key, None)
+        self._pending[(table, key)] = None
+
+    def items(self, table: str) -> Dict[str, Any]:
+        # Live dict - callers that iterate it must hold StateManager.lock
+        return self.tables[table]
+
+    def count(self, table: str) -> int:
+        return len(self.tables[table])
+
+    def keys(self, table: str) -> Iterator[str]:
+        return iter(self.tables[table])
+
+    def evict_oldest(self, table: str, count: int) -> int:
+        victims = list(islice(self.tables[table], max(0, count)))
+        for key in victims:
+            self.delete(table, key)
+        return len(victims)
+
+    def evict_before(self, table: str, cutoff: str, field: str = 'processed_at') -> int:
+        # Full scan: state written before keys were re-inserted on update is
+        # not in age order. Entries without a timestamp are kept.
+        victims = [key for key, value in self.tables[table].items()
+                   if _stamped_before(value, field, cutoff)]
+        for key in victims:
+            self.delete(table, key)
+        return len(victims)
+
+    def commit(self):
+        """Append pending changes to the journal, or rewrite the snapshot"""
+        if not self.journal:
+            self._pending.clear()
+            self._write_snapshot()
+            return
+
+        if not self._pending:
+            return
+
+        if self._journal_handle is None:
+            self._journal_handle = open(self.journal_file, 'a', encoding='utf-8')
+
+        lines = []
+        for table, key in self._pending:
+            if key in self.tables[table]:
+                record = {'t': table, 'k': key, 'v': self.tables[table][key]}
+            else:
+                record = {'t': table, 'k': key, 'd': 1}
+            lines.append(json.dumps(record, separators=(',', ':')) + '\n')
+
+        self._journal_handle.write(''.join(lines))
+        self._journal_handle.flush()
+        self._journal_records += len(lines)
+        self._pending.clear()
+
+        if self._journal_records >= self.compact_threshold:
+            self.compact()
+
+    @property
+    def journal_records(self) -> int:
+        """Records appended since the snapshot was last written"""
+        return self._journal_records
+
+    def compact(self):
+        """Fold the journal into a fresh snapshot and truncate the journal"""
+        self._pending.clear()
+        self._write_snapshot()
+        if self._journal_handle is not None:
+            self._journal_handle.close()
+            self._journal_handle = None
+        # Records are absolute values, so replaying a journal that survived
+        # a crash right here over the new snapshot is harmless
+        if self.journal_file.exists():
+            self.journal_file.unlink()
+        self._journal_records = 0
+
+    def _write_snapshot(self):
+        """Atomically write the full state snapshot"""
+        state_data = {
+            **self.tables,
+            'last_updated': datetime.utcnow().isoformat() + 'Z'
+        }
+        tmp_file = self.state_file.with_name(self.state_file.name + '.tmp')
+        with open(tmp_file, 'w') as f:
+            json.dump(state_data, f, indent=2)
+        os.replace(tmp_file, self.state_file)
+
+
+class SQLiteStateStorage(BaseStateStorage):
+    """
+    SQLite storage engine (stdlib sqlite3, WAL journal mode).
+
+    Each table is keyed by a PRIMARY KEY index, so is_processed(),
+    get_system_state() and increment_counter() are single-row operations.
+    On first open an existing JSON state file is migrated into the database.
+    """
+
+    def __init__(self, db_file: Path, migrate_from: Path = None,
+                 tables: Tuple[str, ...] = STATE_TABLES):
+        self.db_file = db_file
+        self.migrate_from = migrate_from
+        self.table_names = tables
+        self.conn = None
+
+    def load(self):
+        """Open the database, create the schema and migrate legacy JSON state"""
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            self._open()
+        except sqlite3.DatabaseError as e:
+            # Corrupt or not a database: keep the file for inspection and start empty
+            print(f"Error: Could not open state database {self.db_file}: {e}; starting with empty state")
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
+            for path in (self.db_file, Path(f"{self.db_file}-wal"), Path(f"{self.db_file}-shm")):
+                if path.exists():
+                    os.replace(path, path.with_name(path.name + '.corrupt'))
+            self._open()
+
+    def _open(self):
+        self.conn = sqlite3.connect(str(self.db_file), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+
+        for table in self.table_names:
+            self.conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+        )
+        self.conn.commit()
+
+        if self.migrate_from and self.migrate_from.exists():
+            if self._get_meta('migrated_from') is None:
+                self.migrate_json(self.migrate_from)
+
+    def migrate_json(self, state_file: Path) -> Dict[str, int]:
+        """
+        Import a state.json snapshot (old or new layout, plus any journal).
+
+        Args:
+            state_file: Path to the JSON state file
+
+        Returns:
+            Number of imported keys per table
+        """
+        source = JSONStateStorage(state_file, journal=True)
+        source.load()
+
+        counts = {}
+        for table in STATE_TABLES:
+            rows = [(key, json.dumps(value)) for key, value in source.tables[table].items()]
+            self.conn.executemany(
+                f"INSERT OR REPLACE INTO {table} (key, value) VALUES (?, ?)", rows
+            )
+            counts[table] = len(rows)
+
+        self._set_meta('migrated_from', json.dumps({
+            'file': str(state_file),
+            'counts': counts,
+            'migrated_at': datetime.utcnow().isoformat() + 'Z'
+        }))
+        self.conn.commit()
+        print(f"Migrated {state_file} into {self.db_file}: {counts}")
+        return counts
+
+    def _get_meta(self, key: str):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: str):
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def get(self, table: str, key: str, default: Any = None) -> Any:
+        row = self.conn.execute(f"SELECT value FROM {table} WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def contains(self, table: str, key: str) -> bool:
+        row = self.conn.execute(f"SELECT 1 FROM {table} WHERE key = ?", (key,)).fetchone()
+        return row is not None
+
+    def set(self, table: str, key: str, value: Any):
+        self.conn.execute(
+            f"INSERT OR REPLACE INTO {table} (key, value) VALUES (?, ?)",
+            (key, json.dumps(value))
+        )
+
+    def delete(self, table: str, key: str):
+        self.conn.execute(f"DELETE FROM {table} WHERE key = ?", (key,))
+
+    def items(self, table: str) -> Dict[str, Any]:
+        # Detached copy - mutating it does not write through
+        rows = self.conn.execute(f"SELECT key, value FROM {table}").fetchall()
+        return {key: json.loads(value) for key, value in rows}
+
+    def count(self, table: str) -> int:
+        return self.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    def keys(self, table: str) -> Iterator[str]:
+        # INSERT OR REPLACE assigns a fresh rowid, so rowid order is write order
+        for (key,) in self.conn.execute(f"SELECT key FROM {table} ORDER BY rowid"):
+            yield key
+
+    def evict_oldest(self, table: str, count: int) -> int:
+        if count <= 0:
+            return 0
+        cursor = self.conn.execute(
+            f"DELETE FROM {table} WHERE rowid IN "
+            f"(SELECT rowid FROM {table} ORDER BY rowid LIMIT ?)", (count,)
+        )
+        return cursor.rowcount
+
+    def evict_before(self, table: str, cutoff: str, field: str = 'processed_at') -> int:
+        # Same rules as JSONStateStorage.evict_before (migrated rows keep their file order)
+        victims = [(key,) for key, value in self.conn.execute(f"SELECT key, value FROM {table}")
+                   if _stamped_before(json.loads(value), field, cutoff)]
+        self.conn.executemany(f"DELETE FROM {table} WHERE key = ?", victims)
+        return len(victims)
+
+    def commit(self):
+        self.conn.commit()
+
+    def compact(self):
+        """Commit and checkpoint the WAL back into the main database file"""
+        self.conn.commit()
+        self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def close(self):
+        if self.conn is not None:
+            self.compact()
+            self.conn.close()
+            self.conn = None
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+TopicTrie - Hierarchical Topic Matching
+========================================
+
+Trie of dotted subscription patterns (file.moved.to.failed,
+mcp.action.*, file.#). Each level is one trie node, so matching a topic
+walks at most its depth instead of testing every pattern.
+
+Wildcards (whole levels only):
+- '*' matches exactly one level:      mcp.action.*  ~ mcp.action.started
+- '#' matches zero or more levels:    file.#        ~ file, file.moved.to.done
+"""
+
+from typing import Dict, List, Optional, Set
+
+SEPARATOR = '.'
+SINGLE = '*'
+MULTI = '#'
+
+
+class _Node:
+    __slots__ = ('children', 'pattern')
+
+    def __init__(self):
+        self.children: Dict[str, '_Node'] = {}
+        self.pattern: Optional[str] = None
+
+
+class TopicTrie:
+    """Dotted-pattern trie supporting '*' and '#' wildcards"""
+
+    def __init__(self):
+        self.root = _Node()
+        self.patterns = 0
+
+    def add(self, pattern: str):
+        """Add a pattern (idempotent)"""
+        node = self.root
+        for level in pattern.split(SEPARATOR):
+            node = node.children.setdefault(level, _Node())
+        if node.pattern is None:
+            node.pattern = pattern
+            self.patterns += 1
+
+    def remove(self, pattern: str):
+        """Remove a pattern, pruning nodes left empty"""
+        path = [self.root]
+        for level in pattern.split(SEPARATOR):
+            node = path[-1].children.get(level)
+            if node is None:
+                return
+            path.append(node)
+        if path[-1].pattern is None:
+            return
+
+        path[-1].pattern = None
+        self.patterns -= 1
+        levels = pattern.split(SEPARATOR)
+        for depth in range(len(levels), 0, -1):
+            if path[depth].pattern is not None or path[depth].children:
+                break
+            del path[depth - 1].children[levels[depth - 1]]
+
+    def match(self, topic: str) -> Set[str]:
+        """Get every pattern matching a published topic"""
+        levels = topic.split(SEPARATOR)
+        depth_total = len(levels)
+        matched: Set[str] = set()
+        stack = [(self.root, 0)]
+
+        while stack:
+            node, depth = stack.pop()
+
+            multi = node.children.get(MULTI)
+            if multi is not None:
+                if multi.pattern is not None:
+                    matched.add(multi.pattern)
+                if multi.children:
+                    # '#' mid-pattern - resume after it at any remaining depth
+                    stack.extend((multi, d) for d in range(depth, depth_total + 1))
+
+            if depth == depth_total:
+                if node.pattern is not None:
+                    matched.add(node.pattern)
+                continue
+
+            child = node.children.get(levels[depth])
+            if child is not None:
+                stack.append((child, depth + 1))
+            single = node.children.get(SINGLE)
+            if single is not None and single is not child:
+                stack.append((single, depth + 1))
+
+        return matched
+
+    def list_patterns(self) -> List[str]:
+        """Get every stored pattern"""
+        patterns = []
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node.pattern is not None:
+                patterns.append(node.pattern)
+            stack.extend(node.children.values())
+        return patterns
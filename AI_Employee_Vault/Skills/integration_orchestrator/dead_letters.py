@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Dead-Letter Queue
+==================
+
+Lists, replays and purges retries that exhausted max_retries. RetryQueue
+dead-letters them into retry_queue.db with their context, last error and
+attempt history.
+
+Replay moves matching items back to the retry table with a fresh attempt
+count. Their next_retry values are spaced --rate per second apart, so
+even a bulk replay reaches a backend no faster than that. A running
+orchestrator is told over its event socket and schedules them right
+away. Otherwise they are picked up on its next start. Items enqueued as
+plain callables have no descriptor and cannot be replayed.
+
+Usage:
+    python3 dead_letters.py list
+    python3 dead_letters.py list --kind social_post --since 24 --history
+    python3 dead_letters.py replay --name 'skill_accounting_*' --rate 0.5
+    python3 dead_letters.py replay --id 3f2a... --id 9c41...
+    python3 dead_letters.py purge --error timeout --yes
+"""
+
+import sys
+import json
+import argparse
+from pathlib import Path
+from datetime import datetime, timedelta
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from Skills.integration_orchestrator.core import EventBusClient
+from Skills.integration_orchestrator.core.retry_store import RetryStore
+from Skills.integration_orchestrator.core.event_transport import EVENT_SOCKET_NAME
+
+
+def _filters(args):
+    """list_dead/replay_dead/purge_dead keyword arguments from the CLI filters"""
+    filters = {'ids': args.id, 'kind': args.kind, 'name': args.name, 'error': args.error}
+    if args.since is not None:
+        filters['since'] = datetime.utcnow() - timedelta(hours=args.since)
+    return filters
+
+
+def _print_dead(rows, show_history: bool):
+    for row in rows:
+        kind = row['descriptor']['kind'] if row['descriptor'] else '-'
+        print(f"{row['id']}  {row['failed_at'].isoformat(timespec='seconds')}Z  {kind:<12} "
+              f"{row['context'].get('name', 'unknown')}  attempts={row['attempts']}  "
+              f"{row['last_error'] or ''}")
+        if show_history:
+            for entry in row['history']:
+                print(f"    #{entry.get('attempt')}  {entry.get('at')}  {entry.get('error')}")
+            print(f"    context: {json.dumps(row['context'], default=str)}")
+    print(f"-- {len(rows)} dead letters")
+
+
+def _notify(logs_dir: Path, result):
+    """Tell a running orchestrator to schedule the replayed items"""
+    client = EventBusClient(logs_dir / EVENT_SOCKET_NAME)
+    try:
+        return client.publish('retry.dead_letters.replayed', result)
+    finally:
+        client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect and replay dead-lettered retries")
+    parser.add_argument('command', choices=['list', 'replay', 'purge'])
+    parser.add_argument('--db', type=Path, default=Path(__file__).parent / "retry_queue.db",
+                        help='RetryQueue store')
+    parser.add_argument('--logs-dir', type=Path,
+                        default=Path(__file__).parent.parent.parent / "Logs",
+                        help='Directory holding the orchestrator event socket')
+    parser.add_argument('--id', action='append', default=[], help='Dead letter id (repeatable)')
+    parser.add_argument('--kind', help='Descriptor kind (skill, mcp, social_post)')
+    parser.add_argument('--name', help='Glob on the retry name, e.g. social_*')
+    parser.add_argument('--error', help='Substring of the last error')
+    parser.add_argument('--since', type=float, metavar='HOURS', help='Only failures in the last HOURS hours')
+    parser.add_argument('--limit', type=int, default=None)
+    parser.add_argument('--history', action='store_true', help='Print attempt history and context')
+    parser.add_argument('--rate', type=float, default=1.0, help='Replayed retries per second')
+    parser.add_argument('--yes', action='store_true', help='Confirm purge')
+    args = parser.parse_args()
+
+    if not args.db.exists():
+        parser.error(f"No retry store at {args.db}")
+    store = RetryStore(args.db)
+
+    try:
+        filters = _filters(args)
+        if args.command == 'list':
+            _print_dead(store.list_dead(limit=args.limit, **filters), args.history)
+
+        elif args.command == 'replay':
+            try:
+                result = store.replay_dead(rate_per_second=args.rate, limit=args.limit, **filters)
+            except ValueError as e:
+                parser.error(str(e))
+            print(f"Replayed {result['replayed']} dead letters at {args.rate}/s "
+                  f"({result['skipped']} without a descriptor left in place)")
+            if result['replayed']:
+                if _notify(args.logs_dir, result):
+                    print("Running orchestrator notified")
+                else:
+                    print("Orchestrator not reachable; replayed retries start on its next launch")
+
+        else:
+            if not args.yes:
+                matches = store.list_dead(**filters)
+                print(f"{len(matches)} dead letters match; re-run with --yes to delete them")
+                return
+            print(f"Purged {store.purge_dead(**filters)} dead letters")
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
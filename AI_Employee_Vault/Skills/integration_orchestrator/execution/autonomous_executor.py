@@ -361,7 +361,8 @@ class AutonomousExecutor(SocialMediaAutomation):
                         operation=self.skill_registry.execute_skill,
                         args=(skill_name, args),
                         kwargs={'retry_on_failure': False},  # Prevent infinite retry loop
-                        context={'name': f"autonomous_{skill_name}", 'context': context}
+                        context={'name': f"autonomous_{skill_name}", 'context': context},
+                        descriptor={'kind': 'skill', 'params': {'skill_name': skill_name, 'args': args}}
                     )
 
         except Exception as e:
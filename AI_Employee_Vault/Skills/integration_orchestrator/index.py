@@ -39,7 +39,8 @@ import sys
 import logging
 import time
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta
+from threading import Lock
 from typing import Dict, Any
 
 # Add parent directory to path for direct execution
@@ -51,6 +52,8 @@ try:
     # Try relative imports first (when imported as module)
     from .core import (
         EventBus,
+        EventLog,
+        EventBusServer,
         RetryQueue,
         RetryPolicy,
         HealthMonitor,
@@ -64,6 +67,7 @@ try:
     )
     from .skills import (
         SkillDispatcher,
+        SkillManifest,
         SkillRegistry,
     )
     from .routing import (
@@ -81,6 +85,8 @@ except ImportError:
     # Fall back to absolute imports (when run directly)
     from Skills.integration_orchestrator.core import (
         EventBus,
+        EventLog,
+        EventBusServer,
         RetryQueue,
         RetryPolicy,
         HealthMonitor,
@@ -94,6 +100,7 @@ except ImportError:
     )
     from Skills.integration_orchestrator.skills import (
         SkillDispatcher,
+        SkillManifest,
         SkillRegistry,
     )
     from Skills.integration_orchestrator.routing import (
@@ -175,12 +182,14 @@ __all__ = [
 class IntegrationOrchestrator:
     """Main orchestrator class - Enhanced with Gold Tier architecture"""
 
-    def __init__(self, base_dir: Path):
+    def __init__(self, base_dir: Path, state_backend: str = 'json'):
         self.base_dir = base_dir
+        self.state_backend = state_backend
         self.skills_dir = base_dir / "Skills"
         self.logs_dir = base_dir / "Logs"
         self.state_file = Path(__file__).parent / "state.json"
         self.approval_state_file = Path(__file__).parent / "processed_approvals.json"
+        self.retry_state_file = Path(__file__).parent / "retry_queue.db"
         self.mcp_server_path = base_dir / "mcp_servers" / "email_mcp"
 
         # Monitored directories
@@ -199,6 +208,7 @@ class IntegrationOrchestrator:
         self.dispatcher = None
         self.email_executor = None
         self.event_router = None
+        self.event_server = None
         self.observer = None
         self.periodic_trigger = None
 
@@ -275,9 +285,25 @@ class IntegrationOrchestrator:
 
     def _setup_components(self):
         """Setup core components"""
-        self.state_manager = StateManager(self.state_file)
+        self.state_manager = StateManager(
+            self.state_file,
+            journal=True,
+            backend=self.state_backend,
+            flush_interval=1.0,  # Group commit: at most one state write per second
+            max_processed_events=100000,
+            processed_ttl=30 * 24 * 3600,  # 30 days
+            bloom_filter=True,
+            compact_interval=60.0  # state.json readers (check_status.py, briefing) lag at most a minute
+        )
         self.approval_manager = ApprovalManager(self.approval_state_file)
-        self.dispatcher = SkillDispatcher(self.skills_dir, self.logger)
+        # Skill Dispatcher (shares the manifest with SkillRegistry and MCPServerManager)
+        self.skill_manifest = SkillManifest(self.skills_dir, self.logger)
+        self.dispatcher = SkillDispatcher(self.skills_dir, self.logger,
+                                          warm_skills=['process_needs_action', 'accounting_core'],
+                                          max_concurrent=8, skill_limits={'process_needs_action': 1},
+                                          manifest=self.skill_manifest,
+                                          output_dir=self.logs_dir / "skill_output",
+                                          on_progress=self._publish_skill_progress)
         self.email_executor = EmailExecutor(self.mcp_server_path, self.logs_dir, self.logger)
         self.periodic_trigger = PeriodicTrigger(self.logger)
 
@@ -288,10 +314,25 @@ class IntegrationOrchestrator:
         """Setup Gold Tier components"""
         self.logger.info("Initializing Gold Tier components...")
 
-        # Event Bus
-        self.event_bus = EventBus(self.logger)
+        # Event Bus (workflow topics are logged for durable subscribers)
+        self.event_log = EventLog(self.logs_dir / "events", self.logger, topics=(
+            'file.moved.to.*',
+            'plan_approved',
+            'email_approved',
+            'email_sent',
+            'email_failed',
+            'accounting_transaction_added',
+            'invoice_executing',
+            'invoice_completed',
+            'auto_execution.#',
+        ))
+        self.event_bus = EventBus(self.logger, async_dispatch=True, event_log=self.event_log)
         self.logger.info("EventBus initialized")
 
+        # Event Bus socket for watchers and dead_letters.py (started in start())
+        self.event_server = EventBusServer(self.event_bus, self.logs_dir / "event_bus.sock", self.logger,
+                                           topics=('watcher.#', 'retry.dead_letters.replayed'))
+
         # Folder Manager (initialize early for HITL architecture)
         self.folder_manager = FolderManager(
             base_dir=self.base_dir,
@@ -301,8 +342,12 @@ class IntegrationOrchestrator:
         )
         self.logger.info("FolderManager initialized with HITL architecture")
 
-        # Retry Queue
-        self.retry_queue = RetryQueue(self.logger, max_retries=5)
+        # Retry Queue (persisted retries are rehydrated on start())
+        self.retry_queue = RetryQueue(
+            self.logger, max_retries=5, store_path=self.retry_state_file, workers=6,
+            target_limits={'social_*': 1, '*_post_skill': 1, 'accounting_core': 4},
+            budget_capacity=20, budget_refill_per_minute=10
+        )
         self.logger.info("RetryQueue initialized")
 
         # Health Monitor
@@ -310,7 +355,9 @@ class IntegrationOrchestrator:
         self.logger.info("HealthMonitor initialized")
 
         # Audit Logger
-        self.audit_logger = AuditLogger(self.logs_dir, self.logger)
+        self.audit_logger = AuditLogger(self.logs_dir, self.logger, async_writer=True,
+                                        flush_policy='interval', flush_interval_ms=200,
+                                        segmented=True, rollups=True)
         self.logger.info("AuditLogger initialized")
 
         # Connect AuditLogger to FolderManager
@@ -324,7 +371,8 @@ class IntegrationOrchestrator:
             event_bus=self.event_bus,
             retry_queue=self.retry_queue,
             audit_logger=self.audit_logger,
-            base_dir=self.base_dir
+            base_dir=self.base_dir,
+            skill_manifest=self.skill_manifest
         )
         self.mcp_manager.initialize_servers()
         self.logger.info(f"MCPServerManager initialized with {len(self.mcp_manager.list_servers())} servers")
@@ -336,7 +384,8 @@ class IntegrationOrchestrator:
             self.retry_queue,
             self.audit_logger,
             self.logger,
-            mcp_manager=self.mcp_manager
+            mcp_manager=self.mcp_manager,
+            skill_manifest=self.skill_manifest
         )
         self.logger.info("SkillRegistry initialized with MCP support")
 
@@ -352,6 +401,8 @@ class IntegrationOrchestrator:
             failure_threshold=5,
             recovery_timeout=300
         )
+        # Retries into an open circuit wait for its next_retry
+        self.retry_queue.circuit_breakers = self.circuit_breaker_manager
         self.logger.info("CircuitBreakerManager initialized")
 
         # Autonomous Executor (Ralph Wiggum Loop)
@@ -389,8 +440,29 @@ class IntegrationOrchestrator:
         # Initialize Approved Folder Monitor (Step 5)
         self._initialize_approved_folder_monitor()
 
+        # How persisted retries are executed after a restart
+        self._register_retry_resolvers()
+
         self.logger.info("Gold Tier components initialized successfully")
 
+    def _register_retry_resolvers(self):
+        """Map RetryQueue descriptor kinds to the components that execute them"""
+
+        def retry_skill(skill_name, args=None):
+            return self.skill_registry.execute_skill(skill_name, args, retry_on_failure=False)
+
+        def retry_mcp_action(server, action, payload):
+            mcp_server = self.mcp_manager.get_server(server)
+            if mcp_server is None:
+                return {'success': False, 'error': f"MCP server not registered: {server}"}
+            result = mcp_server.execute_action(action, payload, retry_on_failure=False)
+            return result.to_dict() if hasattr(result, 'to_dict') else result
+
+        self.retry_queue.register_resolver('skill', retry_skill)
+        self.retry_queue.register_resolver('mcp', retry_mcp_action)
+        if hasattr(self.autonomous_executor, 'retry_social_post'):
+            self.retry_queue.register_resolver('social_post', self.autonomous_executor.retry_social_post)
+
     def _reinitialize_event_router(self):
         """Reinitialize EventRouter with Gold Tier components"""
         self.event_router = EventRouter(
@@ -406,27 +478,16 @@ class IntegrationOrchestrator:
         )
         self.logger.info("EventRouter reinitialized with Gold Tier components")
 
+    def _publish_skill_progress(self, progress: Dict[str, Any]):
+        """Forward a skill's progress line to the EventBus"""
+        if self.event_bus is not None:
+            self.event_bus.publish('skill.progress', progress)
+
     def _discover_skills(self):
         """Auto-discover and register skills"""
         try:
-            if not self.skills_dir.exists():
-                return
-
-            for skill_path in self.skills_dir.iterdir():
-                if skill_path.is_dir() and not skill_path.name.startswith('.'):
-                    # Check if it has an executable
-                    has_executable = any([
-                        (skill_path / "index.js").exists(),
-                        (skill_path / "index.py").exists(),
-                        (skill_path / "process_needs_action.py").exists(),
-                        (skill_path / "run.sh").exists()
-                    ])
-
-                    if has_executable:
-                        self.skill_registry.register_skill(
-                            skill_path.name,
-                            metadata={'path': str(skill_path)}
-                        )
+            count = self.skill_registry.discover_skills()
+            self.logger.info(f"Discovered {count} skills")
 
         except Exception as e:
             self.logger.error(f"Error discovering skills: {e}")
@@ -734,6 +795,37 @@ class IntegrationOrchestrator:
                     'message': f'Folder manager error: {str(e)}'
                 }
 
+        # Event Bus health check - degraded while subscribers drop events or near capacity
+        event_bus_drops = {'dropped': 0}
+
+        def check_event_bus():
+            try:
+                stats = self.event_bus.get_stats()
+                new_drops = stats['dropped'] - event_bus_drops['dropped']
+                event_bus_drops['dropped'] = stats['dropped']
+                message = (f"Event bus {stats['mode']} ({stats['published']} published, "
+                           f"{stats['delivered']} delivered, {stats['dropped']} dropped, "
+                           f"{stats['queued']} queued)")
+                if new_drops or stats['max_fill'] >= 0.8:
+                    lagging = [
+                        name for name, sub in stats['by_subscriber'].items()
+                        if sub['queued'] >= 0.8 * sub['queue_size'] or sub['dropped']
+                    ]
+                    return {
+                        'status': ComponentStatus.DEGRADED,
+                        'message': f"{message}; {new_drops} dropped since last check, "
+                                   f"lagging: {', '.join(lagging[:3])}"
+                    }
+                return {
+                    'status': ComponentStatus.HEALTHY,
+                    'message': message
+                }
+            except Exception as e:
+                return {
+                    'status': ComponentStatus.UNHEALTHY,
+                    'message': f'Event bus error: {str(e)}'
+                }
+
         # Register all health checks
         self.health_monitor.register_health_check('state_manager', check_state_manager)
         self.health_monitor.register_health_check('skill_dispatcher', check_skill_dispatcher)
@@ -744,6 +836,7 @@ class IntegrationOrchestrator:
         self.health_monitor.register_health_check('autonomous_executor', check_autonomous_executor)
         self.health_monitor.register_health_check('approved_folder_monitor', check_approved_folder_monitor)
         self.health_monitor.register_health_check('folder_manager', check_folder_manager)
+        self.health_monitor.register_health_check('event_bus', check_event_bus)
 
         self.logger.info("Health checks registered")
 
@@ -764,19 +857,72 @@ class IntegrationOrchestrator:
             if queue_size > 10:
                 self.logger.warning(f"Retry queue is large: {queue_size} items")
 
-        def on_accounting_transaction_added(data):
-            """Cross-domain: Accounting → Reporting integration"""
-            self.logger.info(f"Ledger updated: {data.get('type')} ${data.get('amount')} - Triggering report generation")
+        def log_workflow_backlog(data):
+            self.logger.debug(f"Unfinished workflow in {data.get('location')}: {data.get('file_count', 0)} files")
+
+        # One briefing regeneration at a time: transactions arriving while it
+        # runs (a burst, or the durable replay after a restart) queue one more
+        briefing_lock = Lock()
+        briefing_running = False
+        briefing_dirty = False
 
-            # Trigger weekly CEO briefing to regenerate with new data
+        def on_briefing_done(future):
+            nonlocal briefing_running, briefing_dirty
             try:
-                result = self.skill_registry.execute_skill('weekly_ceo_briefing', ['generate'])
+                result = future.result()
                 if result.get('success'):
                     self.logger.info("Weekly CEO briefing regenerated successfully")
                 else:
                     self.logger.warning(f"Failed to regenerate briefing: {result.get('error')}")
+            except Exception as e:
+                self.logger.error(f"Error generating weekly CEO briefing: {e}")
+            with briefing_lock:
+                briefing_running = again = briefing_dirty
+                briefing_dirty = False
+            if again:
+                submit_briefing()
+
+        def submit_briefing():
+            nonlocal briefing_running
+            try:
+                future = self.skill_registry.submit_skill('weekly_ceo_briefing', ['generate'])
             except Exception as e:
                 self.logger.error(f"Error triggering report generation: {e}")
+                with briefing_lock:
+                    briefing_running = False
+                return
+            future.add_done_callback(on_briefing_done)
+
+        def on_accounting_transaction_added(data):
+            """Cross-domain: Accounting → Reporting integration"""
+            nonlocal briefing_running, briefing_dirty
+            self.logger.info(f"Ledger updated: {data.get('type')} ${data.get('amount')} - Triggering report generation")
+
+            # Regenerate the weekly CEO briefing with the new data (the ledger is
+            # read fresh, so one run covers every transaction before it started)
+            with briefing_lock:
+                if briefing_running:
+                    briefing_dirty = True
+                    return
+                briefing_running = True
+            submit_briefing()
+
+        def on_watcher_event(data):
+            """Route a watcher's new Needs_Action file without waiting for the folder poll"""
+            filepath = Path(data.get('filepath', ''))
+            if filepath.parent != self.needs_action_dir or not filepath.exists():
+                self.logger.warning(f"Ignoring watcher event for {filepath}")
+                return
+            self.logger.info(f"Watcher {data.get('watcher')} reported {filepath.name}")
+            # The observer delivers the same file from its own thread. route_event
+            # claims the event atomically, so that delivery is skipped while the
+            # skill runs (pending) and after it succeeded (processed)
+            self.event_router.route_event('needs_action_created', filepath)
+
+        def on_dead_letters_replayed(data):
+            """Schedule retries that dead_letters.py moved back into the store"""
+            restored = self.retry_queue.reload()
+            self.logger.info(f"Dead-letter replay of {data.get('replayed', 0)} items: {restored} scheduled")
 
         def on_file_moved_to_approved(data):
             """Log when files are moved to Approved folder"""
@@ -794,18 +940,35 @@ class IntegrationOrchestrator:
             error = data.get('error', 'unknown error')
             self.logger.warning(f"File execution failed: {filename} - {error}")
 
-        # Subscribe to events
-        self.event_bus.subscribe('skill_execution_started', log_skill_execution)
-        self.event_bus.subscribe('skill_execution_completed', log_skill_completed)
-        self.event_bus.subscribe('retry_queue_status', check_retry_queue)
+        # Subscribe to events - logging and status handlers may shed load in a burst.
+        # Heartbeats only need their latest value: one delivery per key per window.
+        skill_name = lambda data: data.get('skill_name')
+        self.event_bus.subscribe('skill_execution_started', log_skill_execution, overflow='drop_oldest',
+                                 coalesce_key=skill_name, coalesce_window=1.0)
+        self.event_bus.subscribe('skill_execution_completed', log_skill_completed, overflow='drop_oldest',
+                                 coalesce_key=skill_name, coalesce_window=1.0)
+        self.event_bus.subscribe('retry_queue_status', check_retry_queue,
+                                 queue_size=10, overflow='drop_oldest', coalesce_window=5.0)
+        self.event_bus.subscribe('unfinished_workflow_detected', log_workflow_backlog,
+                                 queue_size=10, overflow='drop_oldest',
+                                 coalesce_key=lambda data: data.get('location'), coalesce_window=5.0)
 
         # Cross-domain integration: Accounting → Reporting
-        self.event_bus.subscribe('accounting_transaction_added', on_accounting_transaction_added)
+        # Durable: transactions published before a crash still regenerate the briefing
+        self.event_bus.subscribe('accounting_transaction_added', on_accounting_transaction_added,
+                                 durable='orchestrator.accounting_reporting')
+
+        # Cross-process watcher events (file drop in Needs_Action is the fallback)
+        self.event_bus.subscribe('watcher.event.detected', on_watcher_event)
+        self.event_bus.subscribe('retry.dead_letters.replayed', on_dead_letters_replayed)
 
         # Folder Manager events
-        self.event_bus.subscribe('file.moved.to.approved', on_file_moved_to_approved)
-        self.event_bus.subscribe('file.moved.to.done', on_file_moved_to_done)
-        self.event_bus.subscribe('file.moved.to.failed', on_file_moved_to_failed)
+        self.event_bus.subscribe('file.moved.to.approved', on_file_moved_to_approved,
+                                 durable='orchestrator.file_approved')
+        self.event_bus.subscribe('file.moved.to.done', on_file_moved_to_done,
+                                 durable='orchestrator.file_done')
+        self.event_bus.subscribe('file.moved.to.failed', on_file_moved_to_failed,
+                                 durable='orchestrator.file_failed')
 
         self.logger.info("Event subscriptions configured")
 
@@ -848,6 +1011,7 @@ class IntegrationOrchestrator:
         self.logger.info("=" * 60)
 
         # Start Gold Tier components
+        self.dispatcher.warm_up()
         self.retry_queue.start()
         self.health_monitor.start()
         self.periodic_trigger.start()
@@ -879,6 +1043,9 @@ class IntegrationOrchestrator:
 
         self.observer.start()
 
+        # Watchers publish to the bus directly once the socket is up
+        self.event_server.start()
+
         # Record startup
         self.state_manager.set_system_state('last_startup', datetime.utcnow().isoformat() + 'Z')
         self.state_manager.set_system_state('orchestrator_version', 'gold_tier_v1.0_refactored')
@@ -912,6 +1079,9 @@ class IntegrationOrchestrator:
         self.running = False
 
         # Stop components
+        if self.event_server:
+            self.event_server.stop()
+
         if self.observer:
             self.observer.stop()
             self.observer.join(timeout=5)
@@ -931,8 +1101,20 @@ class IntegrationOrchestrator:
         if self.retry_queue:
             self.retry_queue.stop()
 
+        if self.dispatcher:
+            self.dispatcher.close()
+
+        # Deliver queued events while state and audit are still open
+        if self.event_bus:
+            self.event_bus.close()
+            self.event_log.close()
+
         # Record shutdown
         self.state_manager.set_system_state('last_shutdown', datetime.utcnow().isoformat() + 'Z')
+        self.state_manager.close()
+
+        # Drain queued audit entries
+        self.audit_logger.close()
 
         self.logger.info("Integration Orchestrator stopped")
         self.logger.info("=" * 60)
@@ -961,6 +1143,8 @@ class IntegrationOrchestrator:
                 'running': self.running,
                 'health': health,
                 'retry_queue_size': queue_size,
+                'retry_workers': self.retry_queue.get_stats(),
+                'skill_workers': self.dispatcher.get_stats(),
                 'registered_skills': len(registered_skills),
                 'degraded_mode': self.graceful_degradation.degraded_mode,
                 'disabled_features': list(self.graceful_degradation.disabled_features),
@@ -970,6 +1154,12 @@ class IntegrationOrchestrator:
                     'skills_succeeded': skills_succeeded.get('value', 0) if skills_succeeded else 0,
                     'skills_failed': skills_failed.get('value', 0) if skills_failed else 0
                 },
+                'state_persistence': self.state_manager.get_persistence_stats(),
+                'audit_writer': self.audit_logger.get_writer_stats(),
+                'event_bus': self.event_bus.get_stats(),
+                'event_server': self.event_server.get_stats(),
+                'audit_last_24h': self.audit_logger.get_rollup_summary(
+                    start_time=datetime.utcnow() - timedelta(hours=24)),
                 'last_startup': self.state_manager.get_system_state('last_startup'),
                 'version': self.state_manager.get_system_state('orchestrator_version', 'unknown')
             }
@@ -1010,7 +1200,73 @@ class IntegrationOrchestrator:
             report.append(f"  - Skills Succeeded: {metrics.get('skills_succeeded', 0)}")
             report.append(f"  - Skills Failed: {metrics.get('skills_failed', 0)}")
             report.append(f"  - Retry Queue Size: {status.get('retry_queue_size', 0)}")
+            retry_workers = status.get('retry_workers', {})
+            if retry_workers:
+                report.append(f"  - Retry Workers: {retry_workers.get('running', 0)}/{retry_workers.get('workers', 0)} busy, "
+                              f"{sum(retry_workers.get('parked', {}).values())} parked, "
+                              f"{retry_workers.get('deferred_breaker', 0)} deferred by breakers, "
+                              f"{retry_workers.get('deferred_budget', 0)} by budget, "
+                              f"{retry_workers.get('dead_lettered', 0)} dead-lettered, "
+                              f"{retry_workers.get('dropped', 0)} dropped")
             report.append(f"  - Registered Skills: {status.get('registered_skills', 0)}")
+            skill_workers = status.get('skill_workers', {})
+            if skill_workers:
+                report.append(f"  - Skill Executions: {skill_workers.get('running', 0)} running, "
+                              f"{skill_workers.get('waiting', 0)} waiting, "
+                              f"{skill_workers.get('cancelled', 0)} cancelled")
+                warm = skill_workers.get('warm', {})
+                if warm:
+                    report.append(f"  - Warm Skill Workers: {warm.get('idle_workers', 0) + warm.get('busy_workers', 0)} "
+                                  f"({warm.get('warm_calls', 0)} warm calls, "
+                                  f"{warm.get('fallbacks', 0)} subprocess fallbacks)")
+                report.append(f"  - Skill Output: {skill_workers.get('truncated_outputs', 0)} truncated, "
+                              f"{skill_workers.get('spilled_outputs', 0)} spilled to Logs/skill_output, "
+                              f"{skill_workers.get('progress_lines', 0)} progress lines")
+                manifest = skill_workers.get('manifest', {})
+                if manifest:
+                    report.append(f"  - Skill Manifest: {manifest.get('skills', 0)} skills cached "
+                                  f"({manifest.get('hits', 0)} hits, {manifest.get('resolved', 0)} resolved, "
+                                  f"{manifest.get('reloads', 0)} reloads)")
+
+            persistence = status.get('state_persistence', {})
+            if persistence:
+                report.append(f"  - State Writes: {persistence.get('writes', 0)} "
+                              f"(avoided: {persistence.get('writes_avoided', 0)}, "
+                              f"avg flush: {persistence.get('avg_flush_ms', 0.0):.2f}ms)")
+
+            audit_writer = status.get('audit_writer', {})
+            if audit_writer:
+                report.append(f"  - Audit Writer: {audit_writer.get('mode')} "
+                              f"(queued: {audit_writer.get('queue_depth', 0)}, "
+                              f"fsyncs: {audit_writer.get('fsyncs', 0)})")
+
+            event_bus = status.get('event_bus', {})
+            if event_bus:
+                report.append(f"  - Event Bus: {event_bus.get('mode')} "
+                              f"(subscriptions: {event_bus.get('subscriptions', 0)}, "
+                              f"queued: {event_bus.get('queued', 0)}, "
+                              f"dropped: {event_bus.get('dropped', 0)}, "
+                              f"coalesced: {event_bus.get('coalesced', 0)})")
+                event_log = event_bus.get('event_log')
+                if event_log:
+                    lag = max((c['lag'] for c in event_log['consumers'].values()), default=0)
+                    report.append(f"  - Event Log: offsets {event_log['first_offset']}-"
+                                  f"{event_log['next_offset']} ({event_log['segments']} segments, "
+                                  f"max consumer lag: {lag})")
+
+            event_server = status.get('event_server', {})
+            if event_server:
+                report.append(f"  - Watcher Socket: {'listening' if event_server.get('listening') else 'off'} "
+                              f"(clients: {event_server.get('clients', 0)}, "
+                              f"received: {event_server.get('received', 0)}, "
+                              f"rejected: {event_server.get('rejected', 0)})")
+
+            audit_24h = status.get('audit_last_24h')
+            if audit_24h:
+                skills = audit_24h['events_by_type_result'].get('skill_execution', {})
+                report.append(f"  - Audit Events (24h): {audit_24h['total_events']} "
+                              f"(skill runs: {sum(skills.values())}, "
+                              f"failed: {sum(skills.values()) - skills.get('success', 0)})")
 
             report.append("")
             report.append("=" * 60)
@@ -243,8 +243,9 @@ class BaseMCPServer(ABC):
         try:
             from index import RetryPolicy  # Import from main module
 
+            # RetryQueue expects a result dict, not an MCPActionResult
             self.retry_queue.enqueue(
-                operation=lambda: self.execute_action(action_name, payload, retry_on_failure=False),
+                operation=lambda: self.execute_action(action_name, payload, retry_on_failure=False).to_dict(),
                 args=(),
                 kwargs={},
                 policy=RetryPolicy.EXPONENTIAL,
@@ -253,6 +254,10 @@ class BaseMCPServer(ABC):
                     'execution_id': execution_id,
                     'server': self.name,
                     'action': action_name
+                },
+                descriptor={
+                    'kind': 'mcp',
+                    'params': {'server': self.name, 'action': action_name, 'payload': payload}
                 }
             )
             self.logger.info(f"Enqueued action '{action_name}' for retry")
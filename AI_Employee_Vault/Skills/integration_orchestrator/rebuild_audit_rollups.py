@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Rebuild Audit Rollups
+======================
+
+Regenerates Logs/audit-rollups.jsonl from the raw audit files (the legacy
+audit.jsonl and every daily segment, compressed or not). Run it while the
+orchestrator is stopped, e.g. after restoring segments from a backup.
+
+Usage:
+    python3 rebuild_audit_rollups.py
+    python3 rebuild_audit_rollups.py --logs-dir /path/to/Logs
+"""
+
+import sys
+import time
+import logging
+import argparse
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from Skills.integration_orchestrator.core import AuditLogger
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild hourly audit rollups")
+    parser.add_argument('--logs-dir', type=Path,
+                        default=Path(__file__).parent.parent.parent / "Logs",
+                        help='Directory holding the audit segments')
+    args = parser.parse_args()
+
+    logger = logging.getLogger("rebuild_audit_rollups")
+
+    start = time.perf_counter()
+    audit_logger = AuditLogger(args.logs_dir, logger, segmented=True)
+    counted = audit_logger.rebuild_rollups()
+    audit_logger.close()
+    elapsed = time.perf_counter() - start
+
+    summary = audit_logger.get_rollup_summary()
+
+    print("=" * 60)
+    print("AUDIT ROLLUP REBUILD")
+    print("=" * 60)
+    print(f"Logs directory:     {args.logs_dir}")
+    print(f"Entries counted:    {counted}")
+    print(f"Hourly buckets:     {summary['buckets']}")
+    print(f"Event types:        {len(summary['events_by_type'])}")
+    print(f"Elapsed:            {elapsed:.2f}s")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
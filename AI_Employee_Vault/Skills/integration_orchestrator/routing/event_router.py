@@ -4,13 +4,20 @@
 
 Routes filesystem events to appropriate handlers.
 Enhanced for Gold Tier with EventBus integration.
+
+Handlers that only trigger a skill submit it (SkillRegistry.submit_skill)
+and return its Future, so the observer thread is free for the next event
+while the skill runs. The event is marked processed when the skill
+succeeds; until then repeats of it are skipped as pending.
 """
 
 import shutil
 import logging
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Optional
+from threading import Lock
+from concurrent.futures import Future
+from typing import Dict, Optional, Set
 
 # Import components for type hints
 from core import StateManager, ApprovalManager
@@ -36,6 +43,9 @@ class EventRouter:
         self.skill_registry = skill_registry
         self.event_bus = event_bus
         self.graceful_degradation = graceful_degradation
+        # Event ids whose skill is still running
+        self._pending: Set[str] = set()
+        self._pending_lock = Lock()
 
     def route_event(self, event_type: str, filepath: Path) -> bool:
         """Route event to appropriate handler"""
@@ -44,6 +54,23 @@ class EventRouter:
             event_id = f"{event_type}_{self.state_manager.get_event_hash(filepath)}"
 
             # Check if already processed
+            if self.state_manager.is_processed(event_id):
+                self.logger.debug(f"Event already processed: {event_id}")
+                return True
+            # Claim the event in one step - the watcher bus and the observer
+            # can deliver the same file from two threads
+            with self._pending_lock:
+                if event_id in self._pending:
+                    self.logger.debug(f"Event already in progress: {event_id}")
+                    return True
+                self._pending.add(event_id)
+        except Exception as e:
+            self.logger.error(f"Error routing event: {e}")
+            return False
+
+        submitted = False
+        try:
+            # A claim released just before ours may have finished the event
             if self.state_manager.is_processed(event_id):
                 self.logger.debug(f"Event already processed: {event_id}")
                 return True
@@ -67,21 +94,54 @@ class EventRouter:
                 self.logger.warning(f"Unknown event type: {event_type}")
                 return False
 
-            # Mark as processed if successful
+            if isinstance(result, Future):
+                # Skill still running - _complete releases the claim
+                submitted = True
+                result.add_done_callback(
+                    lambda future: self._complete(event_id, event_type, filepath, future))
+                return True
+
             if result:
-                self.state_manager.mark_processed(event_id, {
-                    'event_type': event_type,
-                    'filepath': str(filepath),
-                    'filename': filepath.name
-                })
+                self._mark_processed(event_id, event_type, filepath)
 
             return result
 
         except Exception as e:
             self.logger.error(f"Error routing event: {e}")
             return False
-
-    def _handle_needs_action(self, filepath: Path) -> bool:
+        finally:
+            if not submitted:
+                with self._pending_lock:
+                    self._pending.discard(event_id)
+
+    def _mark_processed(self, event_id: str, event_type: str, filepath: Path):
+        """Persist immediately so a crash cannot replay an already executed action"""
+        self.state_manager.mark_processed(event_id, {
+            'event_type': event_type,
+            'filepath': str(filepath),
+            'filename': filepath.name
+        }, durable=True)
+
+    def _complete(self, event_id: str, event_type: str, filepath: Path, future: Future):
+        """Mark a submitted event processed once its skill succeeded"""
+        try:
+            if not future.cancelled() and future.exception() is None and future.result().get('success'):
+                self._mark_processed(event_id, event_type, filepath)
+            elif not future.cancelled():
+                self.logger.warning(f"Skill for {event_type} ({filepath.name}) failed")
+        except Exception as e:
+            self.logger.error(f"Error completing event {event_id}: {e}")
+        finally:
+            with self._pending_lock:
+                self._pending.discard(event_id)
+
+    def _submit_skill(self, skill_name: str, args=None):
+        """Submit a skill (Future) through SkillRegistry, or run it on the dispatcher"""
+        if self.skill_registry:
+            return self.skill_registry.submit_skill(skill_name, args)
+        return self.dispatcher.execute_skill(skill_name, args)['success']
+
+    def _handle_needs_action(self, filepath: Path):
         """Handle new file in Needs_Action - Enhanced with Gold Tier"""
         self.logger.info(f"Processing Needs_Action file: {filepath.name}")
 
@@ -93,12 +153,10 @@ class EventRouter:
                 'timestamp': datetime.utcnow().isoformat() + 'Z'
             })
 
-        # Trigger process_needs_action skill via SkillRegistry
-        result = self.skill_registry.execute_skill("process_needs_action")
+        # Trigger process_needs_action skill via SkillRegistry without blocking
+        return self._submit_skill("process_needs_action")
 
-        return result['success']
-
-    def _handle_pending_approval(self, filepath: Path) -> bool:
+    def _handle_pending_approval(self, filepath: Path):
         """Handle modified file in Pending_Approval - Enhanced with Gold Tier"""
         try:
             # Read file to check status
@@ -121,10 +179,8 @@ class EventRouter:
                 if 'type: linkedin_post' in content:
                     self.logger.info("Triggering LinkedIn post skill")
 
-                    # Trigger via SkillRegistry
-                    result = self.skill_registry.execute_skill("linkedin_post_skill", ["process"])
-
-                    return result['success']
+                    # Trigger via SkillRegistry without blocking
+                    return self._submit_skill("linkedin_post_skill", ["process"])
                 else:
                     self.logger.info("Approved file but no specific handler")
                     return True
@@ -4,13 +4,22 @@ Skill Management Components
 
 Components for skill discovery, registration, and execution:
 - SkillDispatcher: Core skill execution
+- SkillManifest: Cached skill entrypoints and skill.json metadata
+- PythonSkillPool: Warm worker processes for Python skills
+- OutputCapture: Bounded head + tail capture of skill output
 - SkillRegistry: Enhanced skill management with retry and audit
 """
 
 from .skill_dispatcher import SkillDispatcher
+from .skill_manifest import SkillManifest
+from .python_skill_pool import PythonSkillPool
+from .output_capture import OutputCapture
 from .skill_registry import SkillRegistry
 
 __all__ = [
     'SkillDispatcher',
+    'SkillManifest',
+    'PythonSkillPool',
+    'OutputCapture',
     'SkillRegistry',
 ]
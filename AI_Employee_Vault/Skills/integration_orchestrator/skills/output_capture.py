@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+OutputCapture - Bounded Streaming Skill Output
+===============================================
+
+Captures one output stream of a skill (stdout or stderr) chunk by chunk,
+in fixed memory, instead of buffering the whole output:
+
+- head: the first head_bytes bytes
+- tail: the last tail_bytes bytes, kept in a ring buffer
+
+getvalue() returns the complete output while it fits in head + tail.
+Beyond that it returns head, a marker naming the omitted byte count and
+the spill file, and tail. The spill file is opened only when the output
+first overflows. Everything captured so far is still in memory at that
+point, so the file gets the full output, written as the chunks arrive.
+
+Lines starting with PROGRESS_PREFIX (e.g. "PROGRESS: 40/100 invoices")
+are passed to on_progress as they complete, without the prefix.
+
+Stdlib only and without package-relative imports: skill_worker.py
+imports it directly.
+"""
+
+import logging
+from pathlib import Path
+from typing import Callable, Optional
+
+PROGRESS_PREFIX = b"PROGRESS:"
+
+# Part of the marker getvalue() puts between head and tail
+OMITTED = " bytes omitted"
+
+# Longest line scanned for the progress prefix
+MAX_LINE_BYTES = 4096
+
+
+class OutputCapture:
+    """Head + ring-buffer tail capture of one stream, spilling the full output to a file"""
+
+    def __init__(self, head_bytes: int = 32768, tail_bytes: int = 32768,
+                 spill_path: Optional[Path] = None,
+                 on_progress: Optional[Callable[[str], None]] = None,
+                 logger: Optional[logging.Logger] = None):
+        """
+        Initialize OutputCapture.
+
+        Args:
+            head_bytes: Bytes kept from the start of the output
+            tail_bytes: Bytes kept from the end of the output
+            spill_path: File that receives the full output once it overflows (optional)
+            on_progress: Called with the text of each progress line (optional)
+            logger: Logger instance (optional)
+        """
+        if head_bytes < 0 or tail_bytes < 0:
+            raise ValueError(f"Invalid output capture size: {head_bytes}/{tail_bytes}")
+
+        self.head_bytes = head_bytes
+        self.tail_bytes = tail_bytes
+        self.spill_path = Path(spill_path) if spill_path else None
+        self.on_progress = on_progress
+        self.logger = logger or logging.getLogger(__name__)
+
+        self.head = bytearray()
+        self._ring = bytearray(tail_bytes)
+        self._ring_pos = 0
+        self._ring_len = 0
+        self.total = 0
+        # Path of the written spill file, once the output overflowed
+        self.spilled: Optional[Path] = None
+        self._spill = None
+
+        self._line = bytearray()
+        self._line_overflow = False
+
+    @property
+    def truncated(self) -> bool:
+        return self.total > self.head_bytes + self.tail_bytes
+
+    def write(self, data: bytes):
+        """Capture the next chunk of the stream"""
+        if not data:
+            return
+        if self.on_progress is not None:
+            self._scan_lines(data)
+
+        overflowing = self.total + len(data) > self.head_bytes + self.tail_bytes
+        if overflowing and self._spill is None and self.spill_path is not None and self.spilled is None:
+            self._open_spill()
+        if self._spill is not None:
+            try:
+                self._spill.write(data)
+            except OSError as e:
+                self._close_spill(f"Failed to write skill output to {self.spill_path}: {e}")
+        self.total += len(data)
+
+        room = self.head_bytes - len(self.head)
+        if room > 0:
+            self.head += data[:room]
+            data = data[room:]
+        if data:
+            self._ring_write(data)
+
+    def _ring_write(self, data: bytes):
+        size = self.tail_bytes
+        if size == 0:
+            return
+        if len(data) >= size:
+            self._ring[:] = data[-size:]
+            self._ring_pos = 0
+            self._ring_len = size
+            return
+        first = min(len(data), size - self._ring_pos)
+        self._ring[self._ring_pos:self._ring_pos + first] = data[:first]
+        self._ring[:len(data) - first] = data[first:]
+        self._ring_pos = (self._ring_pos + len(data)) % size
+        self._ring_len = min(size, self._ring_len + len(data))
+
+    def _tail(self) -> bytes:
+        if self._ring_len < self.tail_bytes:
+            return bytes(self._ring[:self._ring_len])
+        return bytes(self._ring[self._ring_pos:] + self._ring[:self._ring_pos])
+
+    def _open_spill(self):
+        """Start the spill file with everything captured so far (nothing has been dropped yet)"""
+        try:
+            self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+            self._spill = open(self.spill_path, 'wb', buffering=65536)
+            self._spill.write(bytes(self.head) + self._tail())
+            self.spilled = self.spill_path
+        except OSError as e:
+            self._close_spill(f"Failed to spill skill output to {self.spill_path}: {e}")
+
+    def _close_spill(self, error: str):
+        self.logger.error(error)
+        if self._spill is not None:
+            try:
+                self._spill.close()
+            except OSError:
+                pass
+        self._spill = None
+        # Keep the capture bounded; the marker no longer names a file
+        self.spill_path = self.spilled = None
+
+    def _scan_lines(self, data: bytes):
+        """Pass completed progress lines to on_progress"""
+        start = 0
+        while True:
+            end = data.find(b'\n', start)
+            if end < 0:
+                break
+            if not self._line_overflow:
+                line = bytes(self._line) + data[start:end] if self._line else data[start:end]
+                self._progress(line)
+            self._line.clear()
+            self._line_overflow = False
+            start = end + 1
+        if not self._line_overflow and start < len(data):
+            self._line += data[start:]
+            if len(self._line) > MAX_LINE_BYTES:
+                self._line.clear()
+                self._line_overflow = True
+
+    def _progress(self, line: bytes):
+        if line.startswith(PROGRESS_PREFIX):
+            text = line[len(PROGRESS_PREFIX):].decode('utf-8', errors='replace').strip()
+            try:
+                self.on_progress(text)
+            except Exception as e:
+                self.logger.error(f"Progress callback failed: {e}")
+
+    def close(self):
+        """Flush a pending progress line and close the spill file"""
+        if self.on_progress is not None and self._line and not self._line_overflow:
+            self._progress(bytes(self._line))
+        self._line.clear()
+        if self._spill is not None:
+            try:
+                self._spill.close()
+            except OSError as e:
+                self.logger.error(f"Failed to close {self.spill_path}: {e}")
+            self._spill = None
+
+    def getvalue(self) -> str:
+        """Captured output: complete, or head + omission marker + tail once truncated"""
+        if not self.truncated:
+            return (bytes(self.head) + self._tail()).decode('utf-8', errors='replace')
+        omitted = self.total - len(self.head) - self._ring_len
+        where = f"; full output in {self.spilled}" if self.spilled else ""
+        marker = f"\n... [{omitted}{OMITTED}{where}] ...\n"
+        return (bytes(self.head).decode('utf-8', errors='replace') + marker +
+                self._tail().decode('utf-8', errors='replace'))
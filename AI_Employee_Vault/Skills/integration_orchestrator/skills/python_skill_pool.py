@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+PythonSkillPool - Warm Python Skill Workers
+============================================
+
+Keeps long-lived skill_worker.py processes per Python skill script. Each
+one imports the script once and then runs its main() per call, so a call
+costs a pipe round trip instead of interpreter startup plus imports
+(50-300 ms per call on the subprocess path).
+
+Calls return the same dict as SkillDispatcher's subprocess path
+(success, returncode, stdout, stderr). execute() returns None when a
+script cannot run warm: it has no main(), its import failed, or all of
+its workers are busy. SkillDispatcher then falls back to a fresh
+subprocess. A call passed a `call` dict can be cancelled from another
+thread with cancel(call), which kills its worker (the next call gets a
+fresh one). Output is captured in the worker with the caller's
+OutputCapture settings, and progress lines are passed to on_progress
+while the call runs. A worker that times out is killed. A worker that exits
+mid-call fails that call (its side effects may have happened) and is
+replaced on the next call.
+"""
+
+import os
+import json
+import time
+import atexit
+import select
+import logging
+import subprocess
+from pathlib import Path
+from threading import Lock, Thread
+from typing import Any, Callable, Dict, List, Optional
+
+WORKER_SCRIPT = Path(__file__).parent / "skill_worker.py"
+
+
+class _SkillWorker:
+    """One warm worker process and its pipe"""
+
+    def __init__(self, script_path: Path, python: str):
+        self.script_path = script_path
+        self.process = subprocess.Popen(
+            [python, str(WORKER_SCRIPT), str(script_path)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            cwd=script_path.parent
+        )
+        self._buffer = b''
+
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    def read(self, timeout: float) -> Optional[Dict]:
+        """Next reply line; None on timeout, EOFError if the worker exited"""
+        deadline = time.monotonic() + timeout
+        fd = self.process.stdout.fileno()
+        while b'\n' not in self._buffer:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            ready, _, _ = select.select([fd], [], [], remaining)
+            if not ready:
+                return None
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                raise EOFError(f"skill worker exited ({self.process.poll()})")
+            self._buffer += chunk
+        line, self._buffer = self._buffer.split(b'\n', 1)
+        return json.loads(line)
+
+    def send(self, message: Dict):
+        self.process.stdin.write(json.dumps(message).encode('utf-8') + b'\n')
+        self.process.stdin.flush()
+
+    def kill(self):
+        if self.alive():
+            self.process.kill()
+        self.process.wait()
+        for pipe in (self.process.stdin, self.process.stdout):
+            try:
+                pipe.close()
+            except OSError:
+                pass
+
+
+class PythonSkillPool:
+    """Warm worker processes for Python skills"""
+
+    def __init__(self, logger: logging.Logger, max_workers_per_skill: int = 2,
+                 timeout: float = 300, startup_timeout: float = 30, python: str = "python3"):
+        """
+        Initialize PythonSkillPool.
+
+        Args:
+            logger: Logger instance
+            max_workers_per_skill: Concurrent warm calls per script (more fall back to subprocesses)
+            timeout: Seconds a call may run before its worker is killed
+            startup_timeout: Seconds a worker may take to import its script
+            python: Interpreter for the workers (the subprocess path uses python3)
+        """
+        self.logger = logger
+        self.max_workers_per_skill = max_workers_per_skill
+        self.timeout = timeout
+        self.startup_timeout = startup_timeout
+        self.python = python
+
+        self.lock = Lock()
+        self.idle: Dict[Path, List[_SkillWorker]] = {}
+        self.busy: Dict[Path, int] = {}
+        # Script -> why it cannot run warm (no main(), import error)
+        self.unavailable: Dict[Path, str] = {}
+        self.closed = False
+        self.stats = {'warm_calls': 0, 'fallbacks': 0, 'started': 0, 'timeouts': 0, 'crashed': 0,
+                      'cancelled': 0}
+        atexit.register(self.close)
+
+    def prestart(self, script_paths: List[Path]):
+        """Start one worker per script in the background so the first call is warm"""
+        def start_all():
+            for script_path in script_paths:
+                worker = self._acquire(Path(script_path))
+                if worker is not None:
+                    self._release(worker)
+        Thread(target=start_all, daemon=True).start()
+
+    def execute(self, script_path: Path, args: List[str] = None,
+                capture: Optional[Dict[str, Any]] = None,
+                on_progress: Optional[Callable[[str, str], None]] = None,
+                call: Optional[Dict[str, Any]] = None) -> Optional[Dict]:
+        """
+        Run a script's main() in a warm worker; None when the caller should use a subprocess.
+
+        capture ({'head', 'tail', 'spill': {stream: path}}) bounds the
+        returned output; on_progress(stream, text) receives progress lines
+        during the call. call (an empty dict) makes the call cancellable
+        with cancel(call).
+        """
+        call = call if call is not None else {}
+        worker = self._acquire(script_path)
+        if worker is None:
+            with self.lock:
+                self.stats['fallbacks'] += 1
+            return None
+
+        with self.lock:
+            cancelled = call.get('cancelled', False)
+            call['worker'] = worker
+        if cancelled:
+            self._release(worker, reason='cancelled')
+            return {'success': False, 'returncode': -1, 'stdout': '', 'stderr': 'Skill execution cancelled'}
+
+        try:
+            worker.send({'args': [str(arg) for arg in (args or [])], 'capture': capture or {}})
+            deadline = time.monotonic() + self.timeout
+            while True:
+                reply = worker.read(deadline - time.monotonic())
+                if reply is None or 'progress' not in reply:
+                    break
+                if on_progress is not None:
+                    try:
+                        on_progress(reply.get('stream', 'stdout'), reply['progress'])
+                    except Exception as e:
+                        self.logger.error(f"Progress callback failed: {e}")
+        except Exception as e:
+            worker.kill()
+            if call.get('cancelled'):
+                self._release(worker, discard=True, reason='cancelled')
+                return {'success': False, 'returncode': -1, 'stdout': '',
+                        'stderr': 'Skill execution cancelled'}
+            self.logger.error(f"Skill worker for {script_path.parent.name} failed: {e}")
+            self._release(worker, discard=True, reason='crashed')
+            return {'success': False, 'returncode': -1, 'stdout': '',
+                    'stderr': f"Skill worker exited during execution: {e}"}
+
+        if reply is None:
+            worker.kill()
+            self._release(worker, discard=True, reason='timeouts')
+            return {'success': False, 'returncode': -1, 'stdout': '',
+                    'stderr': f'Skill execution timed out ({self.timeout:g}s)'}
+
+        self._release(worker)
+        with self.lock:
+            self.stats['warm_calls'] += 1
+        result = {
+            'success': reply['returncode'] == 0,
+            'returncode': reply['returncode'],
+            'stdout': reply['stdout'],
+            'stderr': reply['stderr']
+        }
+        if reply.get('spilled'):
+            result['output_logs'] = reply['spilled']
+        return result
+
+    def cancel(self, call: Dict[str, Any]):
+        """Cancel a call started with execute(call=...): kill its worker mid-call"""
+        with self.lock:
+            call['cancelled'] = True
+            worker = call.get('worker')
+        if worker is not None and worker.alive():
+            worker.process.kill()
+
+    def _acquire(self, script_path: Path) -> Optional[_SkillWorker]:
+        """Take an idle worker, or start one if the script is under its limit"""
+        with self.lock:
+            if self.closed or script_path in self.unavailable:
+                return None
+            idle = self.idle.setdefault(script_path, [])
+            while idle:
+                worker = idle.pop()
+                if worker.alive():
+                    self.busy[script_path] = self.busy.get(script_path, 0) + 1
+                    return worker
+                worker.kill()
+            if self.busy.get(script_path, 0) >= self.max_workers_per_skill:
+                return None
+            # Reserve the slot while the worker imports outside the lock
+            self.busy[script_path] = self.busy.get(script_path, 0) + 1
+
+        worker = None
+        try:
+            worker = _SkillWorker(script_path, self.python)
+            hello = worker.read(self.startup_timeout)
+            if hello is None:
+                raise TimeoutError(f"import took over {self.startup_timeout:g}s")
+            if not hello.get('ready'):
+                with self.lock:
+                    self.unavailable[script_path] = hello.get('error', 'not ready')
+                self.logger.info(f"Skill {script_path.parent.name} cannot run warm "
+                                 f"({hello.get('error')}); using subprocesses")
+                worker.kill()
+                self._release(None, script_path=script_path)
+                return None
+        except Exception as e:
+            self.logger.error(f"Failed to start skill worker for {script_path.parent.name}: {e}; "
+                              f"using subprocesses")
+            with self.lock:
+                self.unavailable[script_path] = str(e)
+            if worker is not None:
+                worker.kill()
+            self._release(None, script_path=script_path)
+            return None
+
+        with self.lock:
+            self.stats['started'] += 1
+        self.logger.info(f"Started warm worker for skill {script_path.parent.name} (pid {worker.process.pid})")
+        return worker
+
+    def _release(self, worker: Optional[_SkillWorker], discard: bool = False,
+                 reason: Optional[str] = None, script_path: Optional[Path] = None):
+        """Return a worker to the idle list (or drop it) and free its slot"""
+        script_path = worker.script_path if worker is not None else script_path
+        with self.lock:
+            self.busy[script_path] -= 1
+            if reason:
+                self.stats[reason] += 1
+            if worker is None or discard:
+                return
+            if self.closed:
+                worker.kill()
+                return
+            self.idle.setdefault(script_path, []).append(worker)
+
+    def get_stats(self) -> Dict:
+        """Get pool statistics"""
+        with self.lock:
+            return {
+                **self.stats,
+                'idle_workers': sum(len(workers) for workers in self.idle.values()),
+                'busy_workers': sum(self.busy.values()),
+                'unavailable': {path.parent.name: reason for path, reason in self.unavailable.items()},
+            }
+
+    def close(self):
+        """Stop all idle workers (busy ones are stopped when their call returns)"""
+        with self.lock:
+            self.closed = True
+            workers = [worker for idle in self.idle.values() for worker in idle]
+            self.idle.clear()
+        for worker in workers:
+            worker.kill()
+        atexit.unregister(self.close)
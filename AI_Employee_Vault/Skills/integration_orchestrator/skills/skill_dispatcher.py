@@ -5,114 +5,325 @@ SkillDispatcher - Core Skill Execution
 
 Executes skills and manages skill processes.
 Supports multiple execution methods (index.js, index.py, process_needs_action.py, run.sh).
+
+Python skills listed in warm_skills run their main() in warm worker
+processes (PythonSkillPool) instead of a fresh python3 per call. A skill
+that cannot run warm, or whose workers are all busy, uses the subprocess
+path.
+
+Skills run as asyncio subprocesses on a dispatcher-owned loop thread.
+Callers that must not block (the event router, the autonomous executor)
+use submit_skill(), which returns a concurrent.futures.Future:
+
+    future = dispatcher.submit_skill('accounting_core', ['summary'])
+    future.add_done_callback(lambda f: ...)
+    future.cancel()   # kills the skill process (or warm worker) if it is running
+
+execute_skill() is the blocking form (submit_skill(...).result()) and
+coroutines on any loop can await execute_skill_async(). A
+global semaphore (max_concurrent) and per-skill semaphores (skill_limits,
+default_skill_limit) bound how many skill processes run at once; extra
+calls wait their turn without holding a thread.
+
+Entrypoints come from a SkillManifest (cached, mtime-invalidated), which
+the orchestrator shares with SkillRegistry and MCPServerManager.
+
+Skill output is streamed into OutputCapture buffers: results keep the
+first and last output_head_bytes/output_tail_bytes of each stream. With
+an output_dir, a stream that overflows is written in full to
+output_dir/<skill>/<execution id>.<stream>.log, named in the result's
+'output_logs' (the newest max_output_logs files per skill are kept).
+PROGRESS: lines are passed to on_progress as the skill prints them.
 """
 
-import subprocess
+import uuid
+import asyncio
 import logging
+from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Optional
+from threading import Lock, Thread, current_thread
+from concurrent.futures import Future
+from typing import Callable, Iterable, List, Dict, Optional, Tuple
+
+from .output_capture import OMITTED, OutputCapture
+from .python_skill_pool import PythonSkillPool
+from .skill_manifest import SkillManifest
 
 
 class SkillDispatcher:
     """Dispatches and executes skills"""
 
-    def __init__(self, skills_dir: Path, logger: logging.Logger):
+    def __init__(self, skills_dir: Path, logger: logging.Logger,
+                 warm_skills: Optional[Iterable[str]] = None, warm_workers: int = 2,
+                 max_concurrent: int = 8, skill_limits: Optional[Dict[str, int]] = None,
+                 default_skill_limit: int = 2, timeout: float = 300,
+                 manifest: Optional[SkillManifest] = None, output_dir: Optional[Path] = None,
+                 output_head_bytes: int = 32768, output_tail_bytes: int = 32768,
+                 max_output_logs: int = 50, on_progress: Optional[Callable[[Dict], None]] = None):
+        """
+        Initialize SkillDispatcher.
+
+        Args:
+            skills_dir: Directory containing the skills
+            logger: Logger instance
+            warm_skills: Python skills to run in warm workers ('*' for all)
+            warm_workers: Warm workers per skill
+            max_concurrent: Skill executions running at once across all skills
+            skill_limits: Skill name -> executions of that skill running at once
+            default_skill_limit: Limit for skills not in skill_limits
+            timeout: Seconds before a skill process is killed
+            manifest: Shared SkillManifest (one is created for skills_dir if omitted)
+            output_dir: Directory for full output of overflowing streams (none: bounded only)
+            output_head_bytes: Bytes kept from the start of each stream
+            output_tail_bytes: Bytes kept from the end of each stream
+            max_output_logs: Spilled output files kept per skill
+            on_progress: Called with {'skill_name', 'execution_id', 'stream', 'message',
+                'timestamp'} per progress line (on the dispatcher's threads; keep it fast)
+        """
         self.skills_dir = skills_dir
         self.logger = logger
+        self.manifest = manifest or SkillManifest(skills_dir, logger)
+        self.warm_skills = set(warm_skills or ())
+        self.python_pool = PythonSkillPool(logger, max_workers_per_skill=warm_workers,
+                                           timeout=timeout) if self.warm_skills else None
+        self.max_concurrent = max_concurrent
+        self.skill_limits = dict(skill_limits or {})
+        self.default_skill_limit = default_skill_limit
+        self.timeout = timeout
+        self.output_dir = output_dir
+        self.output_head_bytes = output_head_bytes
+        self.output_tail_bytes = output_tail_bytes
+        self.max_output_logs = max_output_logs
+        self.on_progress = on_progress
 
-    def execute_skill(self, skill_name: str, args: List[str] = None) -> Dict:
-        """Execute a skill by name"""
-        skill_path = self.skills_dir / skill_name
+        self.lock = Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[Thread] = None
+        # Created on the loop that uses them (bound on first use)
+        self._global_semaphore: Optional[asyncio.Semaphore] = None
+        self._skill_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self.stats = {'submitted': 0, 'waiting': 0, 'running': 0, 'completed': 0,
+                      'timeouts': 0, 'cancelled': 0, 'truncated_outputs': 0, 'spilled_outputs': 0,
+                      'progress_lines': 0}
+
+    def _python_script(self, skill_name: str) -> Optional[Path]:
+        """Entry script of a Python skill"""
+        entry = self.manifest.get(skill_name)
+        if entry is None or entry['interpreter'] != "python3":
+            return None
+        return entry['entrypoint']
+
+    def _is_warm(self, skill_name: str) -> bool:
+        return self.python_pool is not None and ('*' in self.warm_skills or skill_name in self.warm_skills)
+
+    def warm_up(self):
+        """Start the warm skills' workers in the background"""
+        if self.python_pool is None:
+            return
+        names = self.manifest.all() if '*' in self.warm_skills else self.warm_skills
+        scripts = [self._python_script(name) for name in sorted(names) if self._is_warm(name)]
+        self.python_pool.prestart([script for script in scripts if script is not None])
+
+    def get_stats(self) -> Dict:
+        """Execution counters and manifest cache, plus warm worker statistics when enabled"""
+        with self.lock:
+            stats = dict(self.stats)
+        stats['manifest'] = self.manifest.get_stats()
+        if self.python_pool is not None:
+            stats['warm'] = self.python_pool.get_stats()
+        return stats
+
+    def close(self):
+        """Stop the loop thread and warm workers"""
+        with self.lock:
+            loop, thread = self._loop, self._loop_thread
+            self._loop = None
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout=5)
+            loop.close()
+        if self.python_pool is not None:
+            self.python_pool.close()
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        """Loop thread running skill processes (started on first use)"""
+        with self.lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._loop_thread = Thread(target=self._loop.run_forever, daemon=True,
+                                           name="SkillDispatcher-asyncio")
+                self._loop_thread.start()
+                self._global_semaphore = None
+                self._skill_semaphores = {}
+            return self._loop
+
+    def _count(self, key: str, delta: int):
+        with self.lock:
+            self.stats[key] += delta
 
-        if not skill_path.exists():
+    def _semaphores(self, skill_name: str) -> Tuple[asyncio.Semaphore, asyncio.Semaphore]:
+        """Global and per-skill semaphores (called on the loop)"""
+        if self._global_semaphore is None:
+            self._global_semaphore = asyncio.Semaphore(self.max_concurrent)
+        if skill_name not in self._skill_semaphores:
+            limit = self.skill_limits.get(skill_name, self.default_skill_limit)
+            self._skill_semaphores[skill_name] = asyncio.Semaphore(limit)
+        return self._global_semaphore, self._skill_semaphores[skill_name]
+
+    def _command(self, skill_name: str, args: List[str] = None):
+        """(cmd, entry) for a skill, or an error result dict"""
+        entry = self.manifest.get(skill_name)
+
+        if entry is None:
             return {
                 'success': False,
                 'returncode': 1,
                 'stdout': '',
                 'stderr': f"Skill not found: {skill_name}"
             }
-
-        # Determine execution method
-        if (skill_path / "index.js").exists():
-            return self._execute_node_skill(skill_path / "index.js", args)
-        elif (skill_path / "index.py").exists():
-            return self._execute_python_skill(skill_path / "index.py", args)
-        elif (skill_path / "process_needs_action.py").exists():
-            return self._execute_python_skill(skill_path / "process_needs_action.py", args)
-        elif (skill_path / "run.sh").exists():
-            return self._execute_shell_skill(skill_path / "run.sh", args)
-        else:
+        if entry['entrypoint'] is None:
             return {
                 'success': False,
                 'returncode': 1,
                 'stdout': '',
                 'stderr': f"No executable found for skill: {skill_name}"
             }
+        return [entry['interpreter'], str(entry['entrypoint'])] + [str(arg) for arg in (args or [])], entry
+
+    def execute_skill(self, skill_name: str, args: List[str] = None) -> Dict:
+        """Execute a skill by name (blocks the calling thread until it finishes)"""
+        if self._loop_thread is not None and current_thread() is self._loop_thread:
+            raise RuntimeError("execute_skill would deadlock on the dispatcher loop; await execute_skill_async")
+        return self.submit_skill(skill_name, args).result()
+
+    def submit_skill(self, skill_name: str, args: List[str] = None) -> Future:
+        """Start a skill without blocking; the Future resolves to its result dict"""
+        self._count('submitted', 1)
+        return asyncio.run_coroutine_threadsafe(self._execute(skill_name, args), self._get_loop())
+
+    async def execute_skill_async(self, skill_name: str, args: List[str] = None) -> Dict:
+        """Await a skill from any event loop (it runs on the dispatcher loop, under its limits)"""
+        return await asyncio.wrap_future(self.submit_skill(skill_name, args))
+
+    async def _execute(self, skill_name: str, args: List[str] = None) -> Dict:
+        """Execute a skill once the global and per-skill semaphores allow it (dispatcher loop)"""
+        command = self._command(skill_name, args)
+        if isinstance(command, dict):
+            return command
+        cmd, entry = command
 
-    def _execute_node_skill(self, script_path: Path, args: List[str] = None) -> Dict:
-        """Execute Node.js skill"""
+        global_semaphore, skill_semaphore = self._semaphores(skill_name)
+        self._count('waiting', 1)
         try:
-            cmd = ["node", str(script_path)]
-            if args:
-                cmd.extend(args)
-
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=300,
-                cwd=script_path.parent
-            )
+            await skill_semaphore.acquire()
+            try:
+                await global_semaphore.acquire()
+            except BaseException:
+                skill_semaphore.release()
+                raise
+        except asyncio.CancelledError:
+            self._count('cancelled', 1)
+            raise
+        finally:
+            self._count('waiting', -1)
 
-            return {
-                'success': result.returncode == 0,
-                'returncode': result.returncode,
-                'stdout': result.stdout,
-                'stderr': result.stderr
-            }
-        except subprocess.TimeoutExpired:
-            return {
-                'success': False,
-                'returncode': -1,
-                'stdout': '',
-                'stderr': 'Skill execution timed out (300s)'
-            }
+        self._count('running', 1)
+        execution_id = f"{datetime.utcnow():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+        try:
+            result = None
+            if cmd[0] == "python3" and self._is_warm(skill_name):
+                loop = asyncio.get_running_loop()
+                capture = {'head': self.output_head_bytes, 'tail': self.output_tail_bytes,
+                           'spill': {stream: str(path) for stream, path
+                                     in self._spill_paths(skill_name, execution_id).items()}}
+                on_progress = None
+                if self.on_progress is not None:
+                    forward = {stream: self._progress_callback(skill_name, execution_id, stream)
+                               for stream in ('stdout', 'stderr')}
+                    on_progress = lambda stream, message: forward[stream](message)
+                call = {}
+                try:
+                    result = await loop.run_in_executor(None, self.python_pool.execute, entry['entrypoint'],
+                                                        cmd[2:], capture, on_progress, call)
+                except asyncio.CancelledError:
+                    # The executor thread keeps waiting on the worker - kill it
+                    self.python_pool.cancel(call)
+                    raise
+            if result is None:
+                result = await self._run_process(cmd, entry['cwd'], skill_name, execution_id)
+        except asyncio.CancelledError:
+            self._count('cancelled', 1)
+            raise
         except Exception as e:
-            return {
+            self.logger.error(f"Error executing skill {skill_name}: {e}")
+            result = {
                 'success': False,
                 'returncode': -1,
                 'stdout': '',
                 'stderr': str(e)
             }
+        finally:
+            self._count('running', -1)
+            global_semaphore.release()
+            skill_semaphore.release()
+        try:
+            self._note_output(skill_name, result)
+        except Exception as e:
+            self.logger.error(f"Error recording output of skill {skill_name}: {e}")
+        self._count('completed', 1)
+        return result
+
+    def _spill_paths(self, skill_name: str, execution_id: str) -> Dict[str, Path]:
+        """Per-execution spill files ({} without an output_dir)"""
+        if self.output_dir is None:
+            return {}
+        return {stream: self.output_dir / skill_name / f"{execution_id}.{stream}.log"
+                for stream in ('stdout', 'stderr')}
+
+    def _progress_callback(self, skill_name: str, execution_id: str,
+                           stream: str) -> Optional[Callable[[str], None]]:
+        """Progress line handler for one stream of an execution (None without on_progress)"""
+        if self.on_progress is None:
+            return None
+
+        def forward(message: str):
+            self._count('progress_lines', 1)
+            self.on_progress({
+                'skill_name': skill_name,
+                'execution_id': execution_id,
+                'stream': stream,
+                'message': message,
+                'timestamp': datetime.utcnow().isoformat() + 'Z'
+            })
+        return forward
+
+    def _note_output(self, skill_name: str, result: Dict):
+        """Count truncated/spilled output and prune the skill's old spill files"""
+        truncated = sum(1 for stream in ('stdout', 'stderr') if OMITTED in result.get(stream, ''))
+        spilled = len(result.get('output_logs', {}))
+        if truncated or spilled:
+            with self.lock:
+                self.stats['truncated_outputs'] += truncated
+                self.stats['spilled_outputs'] += spilled
+        if spilled:
+            self.logger.info(f"Skill {skill_name} output spilled to {', '.join(result['output_logs'].values())}")
+            try:
+                logs = sorted((self.output_dir / skill_name).glob('*.log'))
+                for path in logs[:-self.max_output_logs or None]:
+                    path.unlink()
+            except OSError as e:
+                self.logger.error(f"Failed to prune output logs of {skill_name}: {e}")
 
-    def _execute_python_skill(self, script_path: Path, args: List[str] = None) -> Dict:
-        """Execute Python skill"""
+    async def _run_process(self, cmd: List[str], cwd: Path, skill_name: str = '',
+                           execution_id: str = '') -> Dict:
+        """Run one skill process, streaming its output; kill it on timeout or cancellation"""
         try:
-            cmd = ["python3", str(script_path)]
-            if args:
-                cmd.extend(args)
-
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=300,
-                cwd=script_path.parent
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=cwd
             )
-
-            return {
-                'success': result.returncode == 0,
-                'returncode': result.returncode,
-                'stdout': result.stdout,
-                'stderr': result.stderr
-            }
-        except subprocess.TimeoutExpired:
-            return {
-                'success': False,
-                'returncode': -1,
-                'stdout': '',
-                'stderr': 'Skill execution timed out (300s)'
-            }
         except Exception as e:
             return {
                 'success': False,
@@ -121,38 +332,52 @@ class SkillDispatcher:
                 'stderr': str(e)
             }
 
-    def _execute_shell_skill(self, script_path: Path, args: List[str] = None) -> Dict:
-        """Execute shell skill"""
-        try:
-            cmd = ["bash", str(script_path)]
-            if args:
-                cmd.extend(args)
-
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=300,
-                cwd=script_path.parent
-            )
+        spill_paths = self._spill_paths(skill_name, execution_id)
+        captures = {
+            stream: OutputCapture(self.output_head_bytes, self.output_tail_bytes,
+                                  spill_path=spill_paths.get(stream),
+                                  on_progress=self._progress_callback(skill_name, execution_id, stream),
+                                  logger=self.logger)
+            for stream in ('stdout', 'stderr')
+        }
 
-            return {
-                'success': result.returncode == 0,
-                'returncode': result.returncode,
-                'stdout': result.stdout,
-                'stderr': result.stderr
-            }
-        except subprocess.TimeoutExpired:
-            return {
-                'success': False,
-                'returncode': -1,
-                'stdout': '',
-                'stderr': 'Skill execution timed out (300s)'
-            }
-        except Exception as e:
+        async def pump(reader: asyncio.StreamReader, capture: OutputCapture):
+            while True:
+                chunk = await reader.read(65536)
+                if not chunk:
+                    return
+                capture.write(chunk)
+
+        try:
+            await asyncio.wait_for(asyncio.gather(pump(process.stdout, captures['stdout']),
+                                                  pump(process.stderr, captures['stderr']),
+                                                  process.wait()), self.timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            self._count('timeouts', 1)
             return {
                 'success': False,
                 'returncode': -1,
                 'stdout': '',
-                'stderr': str(e)
+                'stderr': f'Skill execution timed out ({self.timeout:g}s)'
             }
+        except asyncio.CancelledError:
+            process.kill()
+            await process.wait()
+            raise
+        finally:
+            for capture in captures.values():
+                capture.close()
+
+        result = {
+            'success': process.returncode == 0,
+            'returncode': process.returncode,
+            'stdout': captures['stdout'].getvalue(),
+            'stderr': captures['stderr'].getvalue()
+        }
+        spilled = {stream: str(capture.spilled) for stream, capture in captures.items() if capture.spilled}
+        if spilled:
+            result['output_logs'] = spilled
+        return result
+
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+SkillManifest - Cached Skill Resolution
+========================================
+
+Resolves each skill directory once into an entry:
+
+    {'name', 'path', 'entrypoint', 'interpreter', 'cwd', 'metadata', 'mtime'}
+
+entrypoint follows the dispatcher's order (index.js, index.py,
+process_needs_action.py, run.sh) and is None for directories without one.
+metadata is the parsed skill.json ({} if missing or invalid).
+
+Entries are cached in memory and shared by SkillDispatcher, SkillRegistry
+and MCPServerManager. An entry is re-resolved when its directory's mtime
+or its skill.json's mtime changes. Adding or removing files changes the
+directory's mtime. mtimes are checked at most every check_interval
+seconds per skill, so the hot path costs no stat calls. reload() drops
+the cache explicitly.
+"""
+
+import json
+import time
+import logging
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, Optional, Tuple
+
+# Lookup order and interpreter per entrypoint
+ENTRYPOINTS = (
+    ("index.js", "node"),
+    ("index.py", "python3"),
+    ("process_needs_action.py", "python3"),
+    ("run.sh", "bash"),
+)
+
+
+class SkillManifest:
+    """In-memory skill manifest invalidated by mtime"""
+
+    def __init__(self, skills_dir: Path, logger: Optional[logging.Logger] = None,
+                 check_interval: float = 2.0):
+        """
+        Initialize SkillManifest.
+
+        Args:
+            skills_dir: Directory containing the skills
+            logger: Logger instance (optional)
+            check_interval: Seconds between mtime checks of a cached entry (0 checks every call)
+        """
+        self.skills_dir = skills_dir
+        self.logger = logger or logging.getLogger(__name__)
+        self.check_interval = check_interval
+
+        self.lock = Lock()
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        # Skill -> monotonic time of its last mtime check
+        self._checked: Dict[str, float] = {}
+        self._listing: Optional[Tuple[float, Tuple[str, ...]]] = None
+        self._listing_checked = 0.0
+        self.stats = {'hits': 0, 'resolved': 0, 'reloads': 0}
+
+    def _mtime(self, skill_path: Path) -> Optional[Tuple[float, float]]:
+        """(directory mtime, skill.json mtime or 0), None when the directory is gone"""
+        try:
+            dir_mtime = skill_path.stat().st_mtime
+        except OSError:
+            return None
+        try:
+            json_mtime = (skill_path / "skill.json").stat().st_mtime
+        except OSError:
+            json_mtime = 0.0
+        return dir_mtime, json_mtime
+
+    def _resolve(self, skill_name: str, mtime: Tuple[float, float]) -> Dict[str, Any]:
+        """Probe a skill directory for its entrypoint and metadata"""
+        skill_path = self.skills_dir / skill_name
+        entrypoint = interpreter = None
+        for filename, candidate in ENTRYPOINTS:
+            if (skill_path / filename).exists():
+                entrypoint, interpreter = skill_path / filename, candidate
+                break
+
+        metadata = {}
+        if mtime[1]:
+            try:
+                with open(skill_path / "skill.json", 'r', encoding='utf-8') as f:
+                    metadata = json.load(f)
+            except (OSError, ValueError) as e:
+                self.logger.warning(f"Invalid skill.json for {skill_name}: {e}")
+            if not isinstance(metadata, dict):
+                self.logger.warning(f"Invalid skill.json for {skill_name}: not a JSON object")
+                metadata = {}
+
+        return {
+            'name': skill_name,
+            'path': skill_path,
+            'entrypoint': entrypoint,
+            'interpreter': interpreter,
+            'cwd': skill_path,
+            'metadata': metadata,
+            'mtime': mtime,
+        }
+
+    def get(self, skill_name: str) -> Optional[Dict[str, Any]]:
+        """Resolved entry for a skill, or None if its directory does not exist"""
+        now = time.monotonic()
+        with self.lock:
+            entry = self.entries.get(skill_name)
+            if entry is not None and now - self._checked.get(skill_name, 0.0) < self.check_interval:
+                self.stats['hits'] += 1
+                return entry
+
+        mtime = self._mtime(self.skills_dir / skill_name)
+        with self.lock:
+            self._checked[skill_name] = now
+            if mtime is None:
+                self.entries.pop(skill_name, None)
+                return None
+            entry = self.entries.get(skill_name)
+            if entry is not None and entry['mtime'] == mtime:
+                self.stats['hits'] += 1
+                return entry
+
+        entry = self._resolve(skill_name, mtime)
+        with self.lock:
+            self.entries[skill_name] = entry
+            self.stats['resolved'] += 1
+        return entry
+
+    def all(self) -> Dict[str, Dict[str, Any]]:
+        """Entries for every skill directory (not starting with '.')"""
+        now = time.monotonic()
+        with self.lock:
+            listing = self._listing
+            fresh = listing is not None and now - self._listing_checked < self.check_interval
+
+        if not fresh:
+            try:
+                dir_mtime = self.skills_dir.stat().st_mtime
+            except OSError:
+                return {}
+            if listing is None or listing[0] != dir_mtime:
+                names = tuple(sorted(path.name for path in self.skills_dir.iterdir()
+                                     if path.is_dir() and not path.name.startswith('.')))
+                listing = (dir_mtime, names)
+            with self.lock:
+                self._listing = listing
+                self._listing_checked = now
+
+        entries = {}
+        for name in listing[1]:
+            entry = self.get(name)
+            if entry is not None:
+                entries[name] = entry
+        return entries
+
+    def reload(self, skill_name: Optional[str] = None):
+        """Drop cached entries (one skill, or all) so the next lookup re-resolves"""
+        with self.lock:
+            if skill_name is None:
+                self.entries.clear()
+                self._checked.clear()
+                self._listing = None
+            else:
+                self.entries.pop(skill_name, None)
+                self._checked.pop(skill_name, None)
+            self.stats['reloads'] += 1
+        self.logger.info(f"Skill manifest reloaded ({skill_name or 'all skills'})")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        with self.lock:
+            return {**self.stats, 'skills': len(self.entries)}
@@ -16,12 +16,14 @@ import logging
 from datetime import datetime
 from typing import Dict, List, Optional
 from threading import Lock
+from concurrent.futures import Future
 
 
 class SkillRegistry:
     """Registry wrapper around SkillDispatcher with MCP integration"""
 
-    def __init__(self, dispatcher, event_bus, retry_queue, audit_logger, logger: logging.Logger, mcp_manager=None):
+    def __init__(self, dispatcher, event_bus, retry_queue, audit_logger, logger: logging.Logger, mcp_manager=None,
+                 skill_manifest=None):
         """
         Initialize SkillRegistry.
 
@@ -32,6 +34,7 @@ class SkillRegistry:
             audit_logger: AuditLogger instance
             logger: Logger instance
             mcp_manager: MCPServerManager instance (optional)
+            skill_manifest: SkillManifest to discover skills from (defaults to the dispatcher's)
         """
         self.dispatcher = dispatcher
         self.event_bus = event_bus
@@ -39,6 +42,7 @@ class SkillRegistry:
         self.audit_logger = audit_logger
         self.logger = logger
         self.mcp_manager = mcp_manager
+        self.skill_manifest = skill_manifest or getattr(dispatcher, 'manifest', None)
         self.skill_metadata: Dict[str, Dict] = {}
         self.lock = Lock()
 
@@ -54,6 +58,18 @@ class SkillRegistry:
             }
         self.logger.info(f"Registered skill: {skill_name}")
 
+    def discover_skills(self) -> int:
+        """Register every manifest skill that has an entrypoint; returns how many"""
+        if self.skill_manifest is None:
+            return 0
+        count = 0
+        for name, entry in self.skill_manifest.all().items():
+            if entry['entrypoint'] is None:
+                continue
+            self.register_skill(name, metadata={**entry['metadata'], 'path': str(entry['path'])})
+            count += 1
+        return count
+
     def set_mcp_manager(self, mcp_manager):
         """Set MCP manager after initialization."""
         self.mcp_manager = mcp_manager
@@ -63,7 +79,56 @@ class SkillRegistry:
                      retry_on_failure: bool = True) -> Dict:
         """Execute skill with enhanced error handling, retry, and MCP support"""
         start_time = time.time()
+        result = self._start(skill_name, args)
+        if result is None:
+            result = self.dispatcher.execute_skill(skill_name, args)
+            result['via_mcp'] = False
+        return self._finish(skill_name, args, result, start_time, retry_on_failure)
 
+    def submit_skill(self, skill_name: str, args: List[str] = None,
+                     retry_on_failure: bool = True) -> Future:
+        """
+        Start a skill without blocking the caller.
+
+        Returns a Future resolving to the same result as execute_skill
+        (audit, retry and completion event included). Cancelling it kills
+        the skill process. Skills routed through MCP run inline and come
+        back as an already resolved Future.
+        """
+        start_time = time.time()
+        result = self._start(skill_name, args)
+        if result is not None:
+            future = Future()
+            future.set_result(self._finish(skill_name, args, result, start_time, retry_on_failure))
+            return future
+
+        outer = Future()
+        inner = self.dispatcher.submit_skill(skill_name, args)
+
+        def on_done(done: Future):
+            if done.cancelled():
+                outer.cancel()
+                return
+            try:
+                result = done.result()
+                result['via_mcp'] = False
+                result = self._finish(skill_name, args, result, start_time, retry_on_failure)
+            except Exception as e:
+                self.logger.error(f"Error completing skill {skill_name}: {e}")
+                outer.set_exception(e)
+                return
+            outer.set_result(result)
+
+        def on_outer_done(done: Future):
+            if done.cancelled():
+                inner.cancel()
+
+        outer.add_done_callback(on_outer_done)
+        inner.add_done_callback(on_done)
+        return outer
+
+    def _start(self, skill_name: str, args: List[str] = None) -> Optional[Dict]:
+        """Publish the start event and try MCP; returns the MCP result, or None to dispatch"""
         # Publish pre-execution event
         self.event_bus.publish('skill_execution_started', {
             'skill_name': skill_name,
@@ -76,9 +141,6 @@ class SkillRegistry:
             mcp_result = self.mcp_manager.execute_via_mcp(skill_name, args)
 
             if mcp_result.get('via_mcp'):
-                # Execution went through MCP
-                duration = time.time() - start_time
-
                 # Convert MCP result to standard format
                 result = {
                     'success': mcp_result['success'],
@@ -91,17 +153,16 @@ class SkillRegistry:
                 }
 
                 self.logger.info(f"✓ Skill '{skill_name}' executed via MCP: {result.get('mcp_server')}.{result.get('mcp_action')}")
-            else:
-                # MCP not available for this skill, fall back to direct execution
-                self.logger.debug(f"MCP not available for '{skill_name}', using direct execution")
-                result = self.dispatcher.execute_skill(skill_name, args)
-                result['via_mcp'] = False
-                duration = time.time() - start_time
-        else:
-            # No MCP manager, use direct execution
-            result = self.dispatcher.execute_skill(skill_name, args)
-            result['via_mcp'] = False
-            duration = time.time() - start_time
+                return result
+
+            # MCP not available for this skill, fall back to direct execution
+            self.logger.debug(f"MCP not available for '{skill_name}', using direct execution")
+        return None
+
+    def _finish(self, skill_name: str, args: Optional[List[str]], result: Dict,
+                start_time: float, retry_on_failure: bool) -> Dict:
+        """Record metadata and audit, enqueue a retry on failure, publish completion"""
+        duration = time.time() - start_time
 
         # Update metadata
         with self.lock:
@@ -120,7 +181,8 @@ class SkillRegistry:
                 operation=self.execute_skill,
                 args=(skill_name, args),
                 kwargs={'retry_on_failure': False},  # Prevent infinite retry loop
-                context={'name': f"skill_{skill_name}", 'skill': skill_name}
+                context={'name': f"skill_{skill_name}", 'skill': skill_name},
+                descriptor={'kind': 'skill', 'params': {'skill_name': skill_name, 'args': args}}
             )
 
         # Publish post-execution event
@@ -130,6 +192,7 @@ class SkillRegistry:
             'duration': duration,
             'via_mcp': result.get('via_mcp', False),
             'mcp_server': result.get('mcp_server'),
+            'output_logs': result.get('output_logs'),
             'timestamp': datetime.utcnow().isoformat() + 'Z'
         })
 
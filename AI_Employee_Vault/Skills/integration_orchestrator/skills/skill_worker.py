@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Skill Worker - Warm Python Skill Process
+=========================================
+
+Long-lived process started by PythonSkillPool for one skill script:
+
+    python3 skill_worker.py /path/to/Skills/accounting_core/index.py
+
+It imports the script once (so its imports - social_media_common,
+argparse, ... - are paid once) and then runs its main() per request, with
+sys.argv set to the request's args and stdout/stderr captured. The
+result matches the subprocess path: returncode from SystemExit (0 when
+main() returns), plus the captured output. Output is captured by
+OutputCapture (bounded head + tail, spilling to the request's log files),
+so a chatty skill cannot grow the worker or the reply without bound.
+
+Process state a call may change is put back after each call: the working
+directory, sys.argv, sys.path, sys.stdout/sys.stderr and the root
+logger's handlers and level (as they were after the import). Module
+globals are not reset - a warm skill's main() must build its own state
+per call.
+
+Protocol: one JSON object per line on the worker's original stdin/stdout.
+After the import the worker sends {"ready": true} or {"ready": false,
+"error": ...}, e.g. when the script has no main(). Then each request
+{"args": [...], "capture": {"head", "tail", "spill": {stream: path}}}
+gets zero or more {"progress": text} messages (PROGRESS: lines, sent as
+they are printed) and one {"returncode", "stdout", "stderr", "spilled"}
+reply. The skill itself sees /dev/null on fd 0 and the worker's stderr
+on fd 1, so stray writes cannot corrupt the protocol.
+
+Stdlib only - it runs before the orchestrator's packages are importable
+(output_capture.py is imported from this directory).
+"""
+
+import io
+import os
+import sys
+import json
+import logging
+import traceback
+import importlib.util
+
+from output_capture import OutputCapture
+
+
+class _Capture(io.TextIOBase):
+    """sys.stdout/sys.stderr stand-in writing to the current request's OutputCapture"""
+
+    def __init__(self):
+        self.capture = OutputCapture()
+
+    def reset(self, capture: OutputCapture = None):
+        """(output, spill path or None) of the finished capture; start the next one"""
+        finished = self.capture
+        finished.close()
+        self.capture = capture or OutputCapture()
+        return finished.getvalue(), finished.spilled
+
+    def writable(self):
+        return True
+
+    def write(self, text):
+        self.capture.write(text.encode('utf-8', errors='replace'))
+        return len(text)
+
+
+def _protocol_streams():
+    """Move the protocol pipes off fds 0/1 and give the skill harmless ones"""
+    requests = os.fdopen(os.dup(0), 'r', encoding='utf-8')
+    replies = os.fdopen(os.dup(1), 'w', encoding='utf-8')
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    os.close(devnull)
+    os.dup2(2, 1)
+    return requests, replies
+
+
+def _snapshot(script_path):
+    """Process state to restore after every call"""
+    root = logging.getLogger()
+    return {
+        'cwd': os.getcwd(),
+        'argv': [script_path],
+        'path': list(sys.path),
+        'streams': (sys.stdout, sys.stderr),
+        'handlers': list(root.handlers),
+        'level': root.level,
+    }
+
+
+def _restore(state):
+    """Undo chdir, argv/path edits, replaced streams and root logging changes of a call"""
+    try:
+        os.chdir(state['cwd'])
+    except OSError:
+        pass
+    sys.argv = list(state['argv'])
+    sys.path[:] = state['path']
+    sys.stdout, sys.stderr = state['streams']
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if handler not in state['handlers']:
+            root.removeHandler(handler)
+            try:
+                handler.close()
+            except Exception:
+                pass
+    for handler in state['handlers']:
+        if handler not in root.handlers:
+            root.addHandler(handler)
+    root.setLevel(state['level'])
+
+
+def _send(replies, message):
+    replies.write(json.dumps(message, default=str) + '\n')
+    replies.flush()
+
+
+def main():
+    script_path = os.path.abspath(sys.argv[1])
+    requests, replies = _protocol_streams()
+
+    stdout, stderr = _Capture(), _Capture()
+    sys.stdout, sys.stderr = stdout, stderr
+    sys.stdin = open(os.devnull, 'r')
+    sys.path.insert(0, os.path.dirname(script_path))
+    os.chdir(os.path.dirname(script_path))
+
+    try:
+        spec = importlib.util.spec_from_file_location('__skill__', script_path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules['__skill__'] = module
+        spec.loader.exec_module(module)
+        if not callable(getattr(module, 'main', None)):
+            raise AttributeError(f"{script_path} has no main() entry point")
+    except BaseException as e:
+        _send(replies, {'ready': False, 'error': f"{type(e).__name__}: {e}",
+                        'stderr': stderr.reset()[0]})
+        return
+    # Output printed while importing is not part of any request
+    stdout.reset()
+    stderr.reset()
+    state = _snapshot(script_path)
+    _send(replies, {'ready': True})
+
+    for line in requests:
+        request = json.loads(line)
+        sys.argv = [script_path] + [str(arg) for arg in request.get('args', [])]
+        capture = request.get('capture', {})
+        spill = capture.get('spill', {})
+        for name, stream in (('stdout', stdout), ('stderr', stderr)):
+            stream.reset(OutputCapture(
+                capture.get('head', 32768), capture.get('tail', 32768),
+                spill_path=spill.get(name),
+                on_progress=lambda text, name=name: _send(replies, {'progress': text, 'stream': name})))
+        returncode = 0
+        try:
+            module.main()
+        except SystemExit as e:
+            if e.code is None:
+                returncode = 0
+            elif isinstance(e.code, int):
+                returncode = e.code
+            else:
+                print(e.code, file=sys.stderr)
+                returncode = 1
+        except BaseException:
+            traceback.print_exc()
+            returncode = 1
+        _restore(state)
+        stdout_text, stdout_spilled = stdout.reset()
+        stderr_text, stderr_spilled = stderr.reset()
+        spilled = {name: path for name, path in (('stdout', stdout_spilled), ('stderr', stderr_spilled)) if path}
+        _send(replies, {'returncode': returncode, 'stdout': stdout_text, 'stderr': stderr_text,
+                        'spilled': spilled})
+
+
+if __name__ == "__main__":
+    main()
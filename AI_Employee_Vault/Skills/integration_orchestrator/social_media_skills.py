@@ -145,7 +145,7 @@ class SocialMCPAdapter:
         Schedule a post for future execution.
 
         Enterprise Feature: Integrates with PeriodicTrigger for execution.
-        Stores scheduled posts in state.json.
+        Stores scheduled posts in the scheduled_posts state namespace.
 
         Args:
             platform: Platform name
@@ -169,8 +169,7 @@ class SocialMCPAdapter:
         ).hexdigest()[:16]
 
         # Store in state
-        scheduled_posts = self.state_manager.get_system_state('scheduled_posts', {})
-        scheduled_posts[schedule_id] = {
+        self.state_manager.namespace('scheduled_posts').set(schedule_id, {
             'platform': platform,
             'message': message,
             'media': media,
@@ -178,9 +177,7 @@ class SocialMCPAdapter:
             'scheduled_time': scheduled_time.isoformat(),
             'status': PostStatus.SCHEDULED.value,
             'created_at': datetime.now(UTC).isoformat()
-        }
-
-        self.state_manager.set_system_state('scheduled_posts', scheduled_posts)
+        })
 
         # Emit event
         if self.event_bus:
@@ -211,7 +208,8 @@ class SocialMCPAdapter:
         if not self.state_manager:
             return {'error': 'StateManager not available'}
 
-        scheduled_posts = self.state_manager.get_system_state('scheduled_posts', {})
+        namespace = self.state_manager.namespace('scheduled_posts')
+        scheduled_posts = namespace.items()
         now = datetime.now(UTC)
         executed = []
         failed = []
@@ -257,10 +255,8 @@ class SocialMCPAdapter:
                     post_data['error'] = result.get('error')
                     failed.append(schedule_id)
 
-                scheduled_posts[schedule_id] = post_data
-
-        # Save updated state
-        self.state_manager.set_system_state('scheduled_posts', scheduled_posts)
+                # Only posts that changed are written back
+                namespace.set(schedule_id, post_data)
 
         return {
             'executed': executed,
@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+"""Test AuditLogger writer modes"""
+
+import sys
+import json
+import time
+import logging
+import tempfile
+from pathlib import Path
+from threading import Thread
+from datetime import datetime, timedelta
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from Skills.integration_orchestrator.core import AuditLogger
+
+logger = logging.getLogger("test_audit_logger")
+
+
+def _read_entries(audit_file: Path):
+    return [json.loads(line) for line in audit_file.read_text().splitlines() if line.strip()]
+
+
+def test_sync_writer():
+    """Test the default synchronous writer"""
+    print("\n=== Test 1: Synchronous Writer ===")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        audit_logger = AuditLogger(Path(tmpdir), logger)
+        audit_logger.log_event('test', 'tester', 'write', 'r1', 'success')
+
+        entries = _read_entries(audit_logger.audit_file)
+        assert len(entries) == 1
+        assert entries[0]['resource'] == 'r1'
+        assert audit_logger.get_writer_stats()['mode'] == 'sync'
+
+        print("✓ Entries are on disk when log_event returns")
+
+
+def test_async_writer_drains_on_close():
+    """Test that close() drains every queued entry in order"""
+    print("\n=== Test 2: Async Writer Drain ===")
+
+    for policy in ('always', 'entries', 'interval'):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            audit_logger = AuditLogger(Path(tmpdir), logger, async_writer=True,
+                                       flush_policy=policy, flush_entries=50,
+                                       flush_interval_ms=1000)
+            for i in range(500):
+                audit_logger.log_event('test', 'tester', 'write', f'r{i}', 'success')
+            audit_logger.close()
+
+            entries = _read_entries(audit_logger.audit_file)
+            assert [e['resource'] for e in entries] == [f'r{i}' for i in range(500)], policy
+
+            stats = audit_logger.get_writer_stats()
+            assert stats['entries'] == 500
+            if policy == 'always':
+                assert stats['fsyncs'] == 500
+            else:
+                assert stats['fsyncs'] < 500
+
+            # Logging after close falls back to synchronous writes
+            audit_logger.log_event('test', 'tester', 'write', 'late', 'success')
+            assert _read_entries(audit_logger.audit_file)[-1]['resource'] == 'late'
+
+    print("✓ close() drains the queue for every flush policy")
+
+
+def test_async_query_sees_queued_entries():
+    """Test that query_logs flushes the writer first"""
+    print("\n=== Test 3: Async Query Consistency ===")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        audit_logger = AuditLogger(Path(tmpdir), logger, async_writer=True,
+                                   flush_policy='interval', flush_interval_ms=60000)
+        audit_logger.log_event('skill_execution', 'tester', 'run', 'skill_a', 'success')
+        audit_logger.log_event('approval', 'user', 'approve', 'email_1', 'success')
+
+        results = audit_logger.query_logs(event_type='approval')
+        assert len(results) == 1
+        assert results[0]['resource'] == 'email_1'
+        audit_logger.close()
+
+        print("✓ query_logs returns entries still queued in the writer")
+
+
+def test_invalid_flush_policy():
+    """Test that unknown flush policies are rejected"""
+    print("\n=== Test 4: Invalid Flush Policy ===")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        try:
+            AuditLogger(Path(tmpdir), logger, async_writer=True, flush_policy='sometimes')
+            assert False, "Unknown flush policy must raise"
+        except ValueError:
+            pass
+
+    print("✓ Unknown flush policy raises ValueError")
+
+
+def _write_segment(logs_dir: Path, day: str, count: int):
+    with open(logs_dir / f"audit-{day}.jsonl", 'w') as f:
+        for i in range(count):
+            f.write(json.dumps({'timestamp': f'{day}T{i % 24:02d}:00:00Z', 'event_type': 'test',
+                                'resource': f'{day}_{i}'}) + '\n')
+
+
+def test_segments_and_manifest():
+    """Test daily segments, compression and manifest-pruned queries"""
+    print("\n=== Test 5: Segments and Manifest ===")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        logs_dir = Path(tmpdir)
+        # Segments left behind by earlier days, plus a legacy single file
+        (logs_dir / "audit.jsonl").write_text(
+            json.dumps({'timestamp': '2026-01-01T00:00:00Z', 'event_type': 'legacy'}) + '\n')
+        _write_segment(logs_dir, '2026-01-10', 3)
+        _write_segment(logs_dir, '2026-01-11', 2)
+
+        audit_logger = AuditLogger(logs_dir, logger, async_writer=True, segmented=True)
+        audit_logger.log_event('test', 'tester', 'write', 'today', 'success')
+        audit_logger.close()
+        audit_logger.segments.wait_for_compression()
+
+        today = datetime.utcnow().strftime('%Y-%m-%d')
+        assert audit_logger.audit_file.name == f"audit-{today}.jsonl"
+        assert (logs_dir / "audit-2026-01-10.jsonl.gz").exists()
+        assert not (logs_dir / "audit-2026-01-10.jsonl").exists()
+
+        manifest = json.loads((logs_dir / "audit-manifest.json").read_text())['segments']
+        assert [s['file'] for s in manifest] == [
+            'audit.jsonl', 'audit-2026-01-10.jsonl.gz', 'audit-2026-01-11.jsonl.gz',
+            f'audit-{today}.jsonl']
+        assert [s['entries'] for s in manifest] == [1, 3, 2, 1]
+        assert manifest[1]['start'] == '2026-01-10T00:00:00Z'
+        assert manifest[1]['end'] == '2026-01-10T02:00:00Z'
+
+        # Only overlapping segments are opened
+        paths = audit_logger._segment_paths(datetime(2026, 1, 11), datetime(2026, 1, 11, 23))
+        assert [p.name for p in paths] == ['audit-2026-01-11.jsonl.gz']
+
+        results = audit_logger.query_logs(start_time=datetime.fromisoformat('2026-01-10T01:00:00+00:00'),
+                                          end_time=datetime.fromisoformat('2026-01-11T00:30:00+00:00'))
+        assert [e['resource'] for e in results] == ['2026-01-10_1', '2026-01-10_2', '2026-01-11_0']
+
+        # Appends after the last manifest checkpoint are recovered on restart
+        with open(audit_logger.audit_file, 'a') as f:
+            f.write(json.dumps({'timestamp': f'{today}T23:59:59Z', 'event_type': 'late'}) + '\n')
+        # A read-only reader sees them without rewriting the writer's manifest
+        before = (logs_dir / "audit-manifest.json").read_bytes()
+        reader = AuditLogger(logs_dir, logger, segmented=True, read_only=True)
+        assert reader.segments.get_manifest()[-1]['entries'] == 2
+        assert len(reader.query_logs(event_type='late')) == 1
+        reader.close()
+        assert (logs_dir / "audit-manifest.json").read_bytes() == before
+        assert not list(logs_dir.glob("*.tmp"))
+
+        reopened = AuditLogger(logs_dir, logger, segmented=True)
+        assert reopened.segments.get_manifest()[-1]['entries'] == 2
+        assert reopened.segments.get_manifest()[-1]['end'] == f'{today}T23:59:59Z'
+
+        print("✓ Old segments are compressed and queries open only overlapping segments")
+
+
+def test_segment_size_rollover():
+    """Test size-based segment parts"""
+    print("\n=== Test 6: Segment Size Rollover ===")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        audit_logger = AuditLogger(Path(tmpdir), logger, segmented=True, max_segment_bytes=1000)
+        for i in range(30):
+            audit_logger.log_event('test', 'tester', 'write', f'r{i}', 'success')
+        audit_logger.close()
+
+        manifest = audit_logger.segments.get_manifest()
+        assert len(manifest) > 1
+        assert manifest[1]['file'].endswith('.1.jsonl')
+        assert sum(s['entries'] for s in manifest) == 30
+        assert len(audit_logger.query_logs(limit=100)) == 30
+
+        print("✓ Segments past max_segment_bytes roll over to numbered parts")
+
+
+def test_sparse_timestamp_index():
+    """Test index-backed time-range queries match a full scan"""
+    print("\n=== Test 7: Sparse Timestamp Index ===")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        logs_dir = Path(tmpdir)
+        base = datetime(2026, 3, 1)
+        with open(logs_dir / "audit.jsonl", 'w') as f:
+            for i in range(5000):
+                # Every 7th entry is written slightly out of order, as concurrent writers do
+                skew = -2 if i % 7 == 0 else 0
+                timestamp = (base + timedelta(seconds=i + skew, microseconds=i % 3 * 250000)).isoformat() + 'Z'
+                f.write(json.dumps({'timestamp': timestamp, 'event_type': 'test', 'resource': f'r{i}'}) + '\n')
+
+        audit_logger = AuditLogger(logs_dir, logger, index_interval=100)
+        start = base + timedelta(seconds=3000, microseconds=500000)
+        end = base + timedelta(seconds=3999)
+
+        results = audit_logger.query_logs(start_time=start, end_time=end, limit=None)
+        expected = [
+            e for e in _read_entries(audit_logger.audit_file)
+            if start <= datetime.fromisoformat(e['timestamp'][:-1]) <= end
+        ]
+        assert [e['resource'] for e in results] == [e['resource'] for e in expected]
+
+        # Queries index in memory; only the writer persists the sidecar
+        index = audit_logger._index_for(audit_logger.audit_file)
+        assert not index.index_file.exists()
+        assert index.marks == 49
+        assert index.seek_offset(start.isoformat()[:19]) > 0
+
+        # Appends extend the index incrementally
+        for i in range(150):
+            audit_logger.log_event('test', 'tester', 'write', f'new{i}', 'success')
+        index = audit_logger._index_for(audit_logger.audit_file)
+        assert index.index_file.exists() and not index.read_only
+        assert index.marks == 51
+        assert len(audit_logger.query_logs(start_time=datetime.utcnow() - timedelta(minutes=1),
+                                           limit=None)) == 150
+
+        # A torn index line is ignored by readers, which never write the sidecar
+        with open(index.index_file, 'a') as f:
+            f.write("2026-03-01T")
+        sidecar = index.index_file.read_text()
+        reloaded = AuditLogger(logs_dir, logger, index_interval=100)
+        assert reloaded._index_for(reloaded.audit_file).marks == 51
+        assert len(reloaded.query_logs(start_time=start, end_time=end, limit=None)) == len(expected)
+        assert index.index_file.read_text() == sidecar
+
+        # ... and dropped once the reloaded logger writes to the file itself
+        reloaded.log_event('test', 'tester', 'write', 'owner', 'success')
+        assert reloaded._index_for(reloaded.audit_file).marks == 51
+        assert not index.index_file.read_text().endswith("2026-03-01T")
+
+        print("✓ Indexed time-range queries return the same entries as a full scan")
+
+
+def test_hourly_rollups():
+    """Test rollup counters survive restarts, catch up and rebuild"""
+    print("\n=== Test 8: Hourly Rollups ===")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        logs_dir = Path(tmpdir)
+        _write_segment(logs_dir, '2026-01-10', 5)
+
+        audit_logger = AuditLogger(logs_dir, logger, async_writer=True, segmented=True, rollups=True)
+        for i in range(10):
+            audit_logger.log_event('skill_execution', 'orchestrator', 'run', f's{i}',
+                                   'success' if i % 3 else 'failure')
+        audit_logger.log_event('approval', 'user', 'approve', 'email_1', 'success')
+
+        summary = audit_logger.get_rollup_summary(start_time=datetime.utcnow() - timedelta(hours=1))
+        assert summary['total_events'] == 11
+        assert summary['events_by_type_result']['skill_execution'] == {'success': 6, 'failure': 4}
+        assert summary['events_by_actor'] == {'orchestrator': 10, 'user': 1}
+
+        full = audit_logger.get_rollup_summary()
+        assert full['total_events'] == 16
+        assert full['events_by_type']['test'] == 5
+        audit_logger.close()
+
+        # Entries written after the last checkpoint are counted once on reopen
+        with open(audit_logger.audit_file, 'a') as f:
+            f.write(json.dumps({'timestamp': datetime.utcnow().isoformat() + 'Z',
+                                'event_type': 'late', 'actor': 'x', 'result': 'success'}) + '\n')
+        reopened = AuditLogger(logs_dir, logger, segmented=True, rollups=True)
+        assert reopened.get_rollup_summary()['total_events'] == 17
+        reopened.close()
+        reopened = AuditLogger(logs_dir, logger, segmented=True, rollups=True)
+        assert reopened.get_rollup_summary()['total_events'] == 17
+
+        # Rebuild regenerates identical counts from the raw segments
+        before = reopened.get_rollup_summary()
+        assert reopened.rebuild_rollups() == 17
+        assert reopened.get_rollup_summary() == before
+        reopened.close()
+
+        # A rebuild while the async writer is busy counts every entry once
+        live = AuditLogger(logs_dir, logger, async_writer=True, segmented=True, rollups=True)
+        catch_up = live.rollups.catch_up
+
+        def slow_catch_up(files):
+            # Widen the window between the reset and the re-count
+            time.sleep(0.02)
+            return catch_up(files)
+        live.rollups.catch_up = slow_catch_up
+        def load():
+            for i in range(3000):
+                live.log_event('load', 'x', 'a', f'r{i}', 'success')
+                if i % 100 == 0:
+                    time.sleep(0.005)
+        writer = Thread(target=load)
+        writer.start()
+        rebuilds = 0
+        while writer.is_alive():
+            live.rebuild_rollups()
+            rebuilds += 1
+        writer.join()
+        assert rebuilds > 1
+        assert live.get_rollup_summary()['total_events'] == 17 + 3000
+        live.close()
+
+        print("✓ Rollups match raw entries across restarts and rebuilds")
+
+
+def test_multi_attribute_search():
+    """Test postings-backed search, newest-first paging and gz segments"""
+    print("\n=== Test 9: Multi-Attribute Search ===")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        logs_dir = Path(tmpdir)
+        _write_segment(logs_dir, '2026-01-10', 5)
+
+        audit_logger = AuditLogger(logs_dir, logger, segmented=True, index_interval=50)
+        for i in range(1000):
+            audit_logger.log_event('skill_execution', 'orchestrator', 'execute_skill',
+                                   'rare_skill' if i % 100 == 0 else f'skill_{i % 7}',
+                                   'failure' if i % 3 == 0 else 'success',
+                                   {'returncode': i % 3})
+        audit_logger.segments.wait_for_compression()
+
+        expected = [
+            e for e in _read_entries(audit_logger.audit_file)
+            if e['resource'] == 'rare_skill' and e['result'] == 'failure'
+        ][::-1]
+        page = audit_logger.search(resource='rare_skill', result='failure', limit=2)
+        assert page['entries'] == expected[:2]
+        # Only blocks holding the resource (plus the open tail) are read
+        index = audit_logger._index_for(audit_logger.audit_file)
+        assert index.blocks == 19
+        assert page['blocks'] < 10
+
+        # Following cursors walks every match exactly once
+        seen = list(page['entries'])
+        while page['next_cursor']:
+            page = audit_logger.search(resource='rare_skill', result='failure', limit=2,
+                                       cursor=page['next_cursor'])
+            seen.extend(page['entries'])
+        assert seen == expected
+
+        # Metadata filters are exact; gz segments are searched past the live one
+        assert all(e['metadata']['returncode'] == 2
+                   for e in audit_logger.search(metadata={'returncode': 2}, limit=500)['entries'])
+        everything = audit_logger.search(event_type='test', limit=3)
+        assert [e['resource'] for e in everything['entries']] == [
+            '2026-01-10_4', '2026-01-10_3', '2026-01-10_2']
+        rest = audit_logger.search(event_type='test', limit=3, cursor=everything['next_cursor'])
+        assert [e['resource'] for e in rest['entries']] == ['2026-01-10_1', '2026-01-10_0']
+        assert rest['next_cursor'] is None
+
+        # Postings are rebuilt for blocks that lost them - in memory by readers,
+        # on disk by the writer
+        index.postings_file.unlink()
+        audit_logger.close()
+        reopened = AuditLogger(logs_dir, logger, segmented=True, index_interval=50)
+        assert reopened.search(resource='rare_skill', result='failure', limit=100)['entries'] == expected
+        assert reopened._index_for(reopened.audit_file).blocks == 19
+        assert not index.postings_file.exists()
+        reopened.log_event('skill_execution', 'orchestrator', 'execute_skill', 'skill_0', 'success')
+        # The new entry closed block 20
+        assert len(index.postings_file.read_text().splitlines()) == 20
+
+        try:
+            reopened.search(cursor='bogus')
+            assert False, "Should raise ValueError"
+        except ValueError:
+            pass
+
+        print("✓ Search returns exact matches newest-first across pages and segments")
+
+
+def main():
+    """Run all tests"""
+    print("=" * 60)
+    print("AUDIT LOGGER TEST SUITE")
+    print("=" * 60)
+
+    try:
+        test_sync_writer()
+        test_async_writer_drains_on_close()
+        test_async_query_sees_queued_entries()
+        test_invalid_flush_policy()
+        test_segments_and_manifest()
+        test_segment_size_rollover()
+        test_sparse_timestamp_index()
+        test_hourly_rollups()
+        test_multi_attribute_search()
+
+        print("\n" + "=" * 60)
+        print("ALL TESTS PASSED ✓")
+        print("=" * 60)
+
+    except AssertionError as e:
+        print(f"\n✗ TEST FAILED: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n✗ ERROR: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
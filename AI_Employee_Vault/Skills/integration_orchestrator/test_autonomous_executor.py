@@ -156,6 +156,9 @@ def test_failure_escalation():
     else:
         print("✗ Escalation threshold NOT reached")
 
+    # Never started, so stop() is a no-op - drain the audit writer here
+    orchestrator.audit_logger.close()
+
     print("\n" + "=" * 60)
     print("TEST 2 COMPLETE")
     print("=" * 60)
@@ -192,6 +195,7 @@ def test_health_monitoring():
     orchestrator.autonomous_executor.stop()
     orchestrator.health_monitor.stop()
     orchestrator.retry_queue.stop()
+    orchestrator.audit_logger.close()
 
     print("\n" + "=" * 60)
     print("TEST 3 COMPLETE")
@@ -238,6 +242,7 @@ def test_event_bus_integration():
     # Stop
     print("\n6. Stopping autonomous executor...")
     orchestrator.autonomous_executor.stop()
+    orchestrator.audit_logger.close()
 
     print("\n" + "=" * 60)
     print("TEST 4 COMPLETE")
@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+"""Test EventBus dispatch modes"""
+
+import sys
+import time
+import asyncio
+import logging
+import tempfile
+import threading
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from Skills.integration_orchestrator.core import EventBus, EventLog
+
+logger = logging.getLogger("test_event_bus")
+
+
+def test_sync_dispatch():
+    """Test synchronous mode delivers before publish returns"""
+    print("\n=== Test 1: Synchronous Dispatch ===")
+
+    event_bus = EventBus(logger)
+    received = []
+    event_bus.subscribe('task.done', lambda data: received.append(data['n']))
+    event_bus.subscribe('task.done', lambda data: 1 / 0)
+
+    event_bus.publish('task.done', {'n': 1})
+    assert received == [1]
+    assert event_bus.get_stats()['mode'] == 'sync'
+
+    print("✓ Handlers run on the publisher thread; errors are isolated")
+
+
+def test_async_dispatch_order_and_latency():
+    """Test a slow subscriber neither blocks publish nor reorders events"""
+    print("\n=== Test 2: Async Dispatch Ordering ===")
+
+    event_bus = EventBus(logger, async_dispatch=True)
+    slow, fast = [], []
+    publisher = threading.current_thread()
+    threads = set()
+
+    def slow_handler(data):
+        threads.add(threading.current_thread())
+        time.sleep(0.01)
+        slow.append(data['n'])
+
+    event_bus.subscribe('task.done', slow_handler)
+    event_bus.subscribe('task.done', lambda data: fast.append(data['n']))
+
+    start = time.perf_counter()
+    for i in range(20):
+        event_bus.publish('task.done', {'n': i})
+    elapsed = time.perf_counter() - start
+
+    # 20 slow handler calls take 200ms; publishing must not wait for them
+    assert elapsed < 0.1, f"publish blocked for {elapsed:.3f}s"
+    assert event_bus.flush()
+    assert slow == list(range(20))
+    assert fast == list(range(20))
+    assert publisher not in threads
+    assert event_bus.get_stats()['delivered'] == 40
+
+    event_bus.close()
+    print(f"✓ 20 publishes took {elapsed * 1000:.2f} ms; each subscriber saw events in order")
+
+
+def test_async_backpressure():
+    """Test a full subscriber queue blocks the publisher instead of growing"""
+    print("\n=== Test 3: Bounded Queues ===")
+
+    event_bus = EventBus(logger, async_dispatch=True, queue_size=2)
+    release = threading.Event()
+    received = []
+
+    def gated(data):
+        release.wait(2)
+        received.append(data['n'])
+
+    event_bus.subscribe('burst', gated)
+    publisher = threading.Thread(target=lambda: [event_bus.publish('burst', {'n': i}) for i in range(5)])
+    publisher.start()
+    time.sleep(0.1)
+
+    # One event in the handler, two queued, the publisher waits on the rest
+    assert publisher.is_alive()
+    assert event_bus.get_stats()['queued'] == 2
+
+    release.set()
+    publisher.join(2)
+    assert not publisher.is_alive()
+    event_bus.close()
+    assert received == [0, 1, 2, 3, 4]
+
+    print("✓ Publisher waits on a full queue and resumes as the worker drains it")
+
+
+def test_coroutine_subscriber():
+    """Test coroutine handlers run as asyncio tasks"""
+    print("\n=== Test 4: Coroutine Subscribers ===")
+
+    for async_dispatch in (False, True):
+        event_bus = EventBus(logger, async_dispatch=async_dispatch)
+        received = []
+
+        async def handler(data):
+            await asyncio.sleep(0)
+            received.append(data['n'])
+
+        event_bus.subscribe('mcp.action.started', handler)
+        for i in range(10):
+            event_bus.publish('mcp.action.started', {'n': i})
+        event_bus.flush()
+        assert received == list(range(10))
+
+        # Unsubscribing delivers what is queued, then stops the task
+        event_bus.unsubscribe('mcp.action.started', handler)
+        event_bus.publish('mcp.action.started', {'n': 99})
+        event_bus.close()
+        assert received == list(range(10))
+
+    print("✓ Coroutine handlers are awaited in order in both modes")
+
+
+def test_close_drains():
+    """Test close() delivers queued events before stopping workers"""
+    print("\n=== Test 5: Close Drains Queues ===")
+
+    event_bus = EventBus(logger, async_dispatch=True)
+    received = []
+    event_bus.subscribe('file.moved.to.done', lambda data: (time.sleep(0.001), received.append(data)))
+    for i in range(50):
+        event_bus.publish('file.moved.to.done', {'n': i})
+    event_bus.close()
+
+    assert len(received) == 50
+    assert not [t for t in threading.enumerate() if t.name.startswith('EventBus-')]
+
+    print("✓ Queued events are delivered and workers exit")
+
+
+def test_wildcard_topics():
+    """Test '*' and '#' patterns, delivery order and route cache invalidation"""
+    print("\n=== Test 6: Wildcard Topics ===")
+
+    event_bus = EventBus(logger)
+    received = []
+    event_bus.subscribe('file.#', lambda topic, data: received.append(('file.#', topic)), with_topic=True)
+    event_bus.subscribe('mcp.action.*', lambda topic, data: received.append(('mcp.action.*', topic)),
+                        with_topic=True)
+    event_bus.subscribe('file.moved.to.failed', lambda data: received.append(('exact', data['n'])))
+
+    event_bus.publish('file.moved.to.failed', {'n': 1})
+    event_bus.publish('file', {'n': 2})
+    event_bus.publish('mcp.action.started', {'n': 3})
+    event_bus.publish('mcp.action.started.extra', {'n': 4})
+    event_bus.publish('social.post.started', {'n': 5})
+    assert received == [
+        ('file.#', 'file.moved.to.failed'), ('exact', 1),
+        ('file.#', 'file'),
+        ('mcp.action.*', 'mcp.action.started'),
+    ]
+    assert event_bus.get_stats()['cached_routes'] == 5
+
+    # Subscribing invalidates cached routes
+    received.clear()
+    late = []
+    on_post = lambda data: late.append(data['n'])
+    event_bus.subscribe('*.post.*', on_post)
+    event_bus.publish('social.post.started', {'n': 6})
+    assert late == [6]
+
+    event_bus.unsubscribe('*.post.*', on_post)
+    event_bus.unsubscribe('file.moved.to.failed', event_bus.subscribers['file.moved.to.failed'][0])
+    event_bus.publish('file.moved.to.failed', {'n': 7})
+    assert received == [('file.#', 'file.moved.to.failed')]
+    assert 'file.moved.to.failed' not in event_bus.subscribers
+    assert '*.post.*' not in event_bus.subscribers
+    event_bus.publish('social.post.started', {'n': 8})
+    assert late == [6]
+
+    print("✓ Wildcard subscribers receive matching topics in subscription order")
+
+
+def test_overflow_policies():
+    """Test drop_oldest / drop_newest / coalesce and the counters they update"""
+    print("\n=== Test 7: Overflow Policies ===")
+
+    event_bus = EventBus(logger, async_dispatch=True, queue_size=3)
+    release = threading.Event()
+    received = {'drop_oldest': [], 'drop_newest': [], 'coalesce': []}
+
+    def handler(policy):
+        def handle(data):
+            release.wait(2)
+            received[policy].append(data['n'])
+        handle.__qualname__ = policy
+        return handle
+
+    for policy in ('drop_oldest', 'drop_newest'):
+        event_bus.subscribe('retry_queue_status', handler(policy), overflow=policy)
+    event_bus.subscribe('retry_queue_status', handler('coalesce'), overflow='coalesce',
+                        coalesce_key=lambda data: data['queue'])
+
+    # Wait until each worker holds event 0, then overflow the queues of 3
+    event_bus.publish('retry_queue_status', {'n': 0, 'queue': 'a'})
+    time.sleep(0.1)
+    for n, queue_name in enumerate(['a', 'b', 'c', 'a', 'd', 'b'], start=1):
+        event_bus.publish('retry_queue_status', {'n': n, 'queue': queue_name})
+
+    release.set()
+    assert event_bus.flush()
+    assert received['drop_oldest'] == [0, 4, 5, 6]
+    assert received['drop_newest'] == [0, 1, 2, 3]
+    # 4 replaces queued 'a' (1); 5 ('d') drops the oldest (4); 6 replaces queued 'b' (2)
+    assert received['coalesce'] == [0, 6, 3, 5], received['coalesce']
+
+    stats = event_bus.get_stats()
+    topic = stats['by_topic']['retry_queue_status']
+    assert topic['published'] == 7
+    assert topic['delivered'] == 12
+    assert topic['dropped'] == 3 + 3 + 1
+    assert topic['coalesced'] == 2
+    assert topic['high_water'] == 3
+
+    by_policy = {s['overflow']: s for s in stats['by_subscriber'].values()}
+    assert by_policy['drop_newest']['dropped'] == 3
+    assert by_policy['coalesce']['coalesced'] == 2
+    assert by_policy['drop_oldest']['high_water'] == 3
+    assert stats['published'] == 7 and stats['dropped'] == 7
+
+    try:
+        event_bus.subscribe('x', print, overflow='coalesce')
+        assert False, "Should raise ValueError"
+    except ValueError:
+        pass
+    event_bus.close()
+
+    print("✓ Full queues drop or coalesce per policy and every loss is counted")
+
+
+def test_durable_consumers():
+    """Test durable subscribers replay unacknowledged logged events after a restart"""
+    print("\n=== Test 8: Durable Consumers ===")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        log_dir = Path(temp_dir) / "events"
+        event_log = EventLog(log_dir, logger, topics=('file.moved.to.*',), segment_bytes=200,
+                             retain_segments=2)
+        event_bus = EventBus(logger, async_dispatch=True, event_log=event_log)
+        received = []
+        event_bus.subscribe('file.moved.to.done', lambda data: received.append(data['n']),
+                            durable='done_consumer')
+
+        for i in range(5):
+            event_bus.publish('file.moved.to.done', {'n': i})
+        event_bus.publish('retry_queue_status', {'n': 'not logged'})
+        event_bus.flush()
+        assert received == list(range(5))
+        assert event_log.committed('done_consumer') == 4
+
+        # Published while nobody is subscribed (the orchestrator was down)
+        event_bus.unsubscribe('file.moved.to.done', event_bus.subscribers['file.moved.to.done'][0])
+        for i in range(5, 12):
+            event_bus.publish('file.moved.to.' + ('done' if i % 2 else 'failed'), {'n': i})
+        event_bus.close()
+        event_log.close()
+
+        # Simulate a crash mid-append
+        last = sorted(log_dir.glob('events-*.jsonl'))[-1]
+        with open(last, 'ab') as f:
+            f.write(b'{"offset": 12, "top')
+
+        event_log = EventLog(log_dir, logger, topics=('file.moved.to.*',), segment_bytes=200,
+                             retain_segments=2)
+        assert event_log.next_offset == 12
+        for n, mode in enumerate((True, False), start=12):
+            event_bus = EventBus(logger, async_dispatch=mode, event_log=event_log)
+            replayed = []
+            event_bus.subscribe('file.moved.to.done', lambda data: replayed.append(data['n']),
+                                durable='done_consumer')
+            event_bus.publish('file.moved.to.done', {'n': n})
+            event_bus.flush()
+            # First run resumes after the ack at offset 4, the second after its own acks
+            expected = [5, 7, 9, 11, 12] if mode else [13]
+            assert replayed == expected, replayed
+            assert event_bus.get_stats()['replayed'] == (4 if mode else 0)
+            event_bus.close()
+
+        # A new consumer starts at the end of the log
+        assert event_log.register('late_consumer') == event_log.next_offset
+
+        # Acknowledged segments beyond retain_segments are removed
+        stats = event_log.get_stats()
+        assert stats['segments'] <= 3, stats
+        assert stats['consumers']['done_consumer']['lag'] == 0
+
+        try:
+            EventBus(logger).subscribe('x', print, durable='no_log')
+            assert False, "Should raise ValueError"
+        except ValueError:
+            pass
+        try:
+            event_bus.subscribe('x', print, durable='lossy', overflow='drop_oldest')
+            assert False, "Should raise ValueError"
+        except ValueError:
+            pass
+        event_log.close()
+
+    print("✓ Durable consumers resume from their last acknowledged offset")
+
+
+def test_durable_retention():
+    """Test a durable consumer of a rare topic does not pin log retention"""
+    print("\n=== Test 9: Durable Retention ===")
+
+    for async_dispatch in (False, True):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            event_log = EventLog(Path(temp_dir) / "events", logger, topics=('orchestrator.*',),
+                                 segment_bytes=500, retain_segments=2)
+            event_bus = EventBus(logger, async_dispatch=async_dispatch, event_log=event_log)
+            busy, rare = [], []
+            release = threading.Event()
+
+            def on_rare(data):
+                release.wait(5)
+                rare.append(data['n'])
+
+            event_bus.subscribe('orchestrator.file_done', lambda data: busy.append(data['n']),
+                                durable='done')
+            event_bus.subscribe('orchestrator.file_failed', on_rare, durable='failed')
+
+            if async_dispatch:
+                # Not acknowledged past an event the consumer is still handling
+                event_bus.publish('orchestrator.file_failed', {'n': -1})
+                event_bus.publish('orchestrator.file_done', {'n': -1})
+                time.sleep(0.05)
+                assert event_log.committed('failed') == -1
+            release.set()
+
+            for i in range(1000):
+                event_bus.publish('orchestrator.file_done', {'n': i})
+                # Retention runs when a segment rolls, so let the acks keep up
+                assert event_bus.flush()
+            assert rare == ([-1] if async_dispatch else [])
+
+            stats = event_log.get_stats()
+            assert stats['segments'] <= 3, stats
+            assert stats['consumers']['failed']['lag'] == 0, stats
+            assert stats['consumers']['done']['lag'] == 0, stats
+            event_bus.close()
+            event_log.close()
+
+    print("✓ Idle durable consumers are acknowledged past events they do not subscribe to")
+
+
+def test_coalesce_window():
+    """Test only the newest event per key is delivered within a window"""
+    print("\n=== Test 10: Coalescing Windows ===")
+
+    for async_dispatch in (False, True):
+        event_bus = EventBus(logger, async_dispatch=async_dispatch)
+        received, status = [], []
+        event_bus.subscribe('skill_execution_completed', lambda data: received.append(data),
+                            coalesce_key=lambda data: data['skill_name'], coalesce_window=0.1)
+        event_bus.subscribe('retry_queue_status', lambda data: status.append(data['queue_size']),
+                            coalesce_window=0.1)
+
+        start = time.monotonic()
+        for i in range(100):
+            event_bus.publish('skill_execution_completed', {'skill_name': f'skill_{i % 2}', 'n': i})
+            event_bus.publish('retry_queue_status', {'queue_size': i})
+        # Held for the window, not delivered on publish
+        assert received == [] and status == []
+        assert event_bus.flush()
+        assert time.monotonic() - start >= 0.09
+
+        assert received == [
+            {'skill_name': 'skill_0', 'n': 98},
+            {'skill_name': 'skill_1', 'n': 99},
+        ], received
+        assert status == [99]
+
+        stats = event_bus.get_stats()
+        assert stats['by_topic']['skill_execution_completed']['coalesced'] == 98
+        assert stats['by_topic']['retry_queue_status']['coalesced'] == 99
+        assert stats['coalesced'] == 197 and stats['delivered'] == 3
+
+        # A new window opens once the held event is delivered
+        event_bus.publish('retry_queue_status', {'queue_size': 0})
+        event_bus.close()
+        assert status == [99, 0]
+
+    try:
+        EventBus(logger).subscribe('x', print, coalesce_window=-1)
+        assert False, "Should raise ValueError"
+    except ValueError:
+        pass
+
+    print("✓ 200 heartbeats collapse to 3 handler calls; savings counted as coalesced")
+
+
+def main():
+    """Run all tests"""
+    print("=" * 60)
+    print("EVENT BUS TEST SUITE")
+    print("=" * 60)
+
+    try:
+        test_sync_dispatch()
+        test_async_dispatch_order_and_latency()
+        test_async_backpressure()
+        test_coroutine_subscriber()
+        test_close_drains()
+        test_wildcard_topics()
+        test_overflow_policies()
+        test_durable_consumers()
+        test_durable_retention()
+        test_coalesce_window()
+
+        print("\n" + "=" * 60)
+        print("ALL TESTS PASSED ✓")
+        print("=" * 60)
+
+    except AssertionError as e:
+        print(f"\n✗ TEST FAILED: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n✗ ERROR: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""Test cross-process EventBus publishing over the Unix socket transport"""
+
+import sys
+import time
+import socket
+import logging
+import tempfile
+import multiprocessing
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from Skills.integration_orchestrator.core import EventBus, EventBusServer, EventBusClient
+from Skills.integration_orchestrator.core.event_transport import (
+    encode_frame, read_frame, FrameError, FRAME_HEADER, FRAME_MAGIC, FRAME_VERSION
+)
+
+logger = logging.getLogger("test_event_transport")
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.005)
+    return predicate()
+
+
+def _watcher_process(socket_path: str, count: int):
+    client = EventBusClient(Path(socket_path))
+    for i in range(count):
+        assert client.publish('watcher.event.detected', {'watcher': 'gmail', 'n': i})
+    client.close()
+
+
+def _raw_frame(payload: bytes) -> bytes:
+    return FRAME_HEADER.pack(FRAME_MAGIC, FRAME_VERSION, len(payload)) + payload
+
+
+def test_framing():
+    """Test frames round-trip and malformed headers and payloads are rejected"""
+    print("\n=== Test 1: Framing ===")
+
+    left, right = socket.socketpair()
+    left.sendall(encode_frame('watcher.event.detected', {'n': 1, 'text': 'ünïcode'}))
+    left.sendall(encode_frame('watcher.event.detected', {'n': 2}))
+    assert read_frame(right) == ('watcher.event.detected', {'n': 1, 'text': 'ünïcode'})
+    assert read_frame(right) == ('watcher.event.detected', {'n': 2})
+
+    left.sendall(FRAME_HEADER.pack(b'XX', 1, 0))
+    try:
+        read_frame(right)
+        assert False, "Should raise FrameError"
+    except FrameError:
+        pass
+
+    # Well-framed JSON that is not an event object
+    for payload in (b'[]', b'1', b'"x"', b'{"data": {}}', b'{"topic": 1}',
+                    b'{"topic": "watcher.x", "data": [1]}'):
+        left.sendall(_raw_frame(payload))
+        try:
+            read_frame(right)
+            assert False, f"Should raise FrameError for {payload!r}"
+        except FrameError:
+            pass
+
+    left.close()
+    assert read_frame(right) is None
+    right.close()
+
+    print("✓ Length-prefixed frames decode in order; bad headers and payloads raise FrameError")
+
+
+def test_cross_process_publish():
+    """Test events from another process reach EventBus subscribers"""
+    print("\n=== Test 2: Cross-Process Publish ===")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        socket_path = Path(temp_dir) / "event_bus.sock"
+        event_bus = EventBus(logger, async_dispatch=True)
+        server = EventBusServer(event_bus, socket_path, logger)
+        received = []
+        event_bus.subscribe('watcher.event.detected', lambda data: received.append(data['n']))
+        assert server.start()
+
+        process = multiprocessing.Process(target=_watcher_process, args=(str(socket_path), 50))
+        process.start()
+        process.join(10)
+        assert process.exitcode == 0
+
+        assert _wait_for(lambda: len(received) == 50)
+        assert received == list(range(50))
+        assert server.get_stats()['received'] == 50
+
+        server.stop()
+        event_bus.close()
+        assert not socket_path.exists()
+
+    print("✓ 50 events from a watcher process delivered in order")
+
+
+def test_topic_filter_and_fallback():
+    """Test disallowed topics are rejected and publish reports an absent server"""
+    print("\n=== Test 3: Topic Filter and Fallback ===")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        socket_path = Path(temp_dir) / "event_bus.sock"
+        event_bus = EventBus(logger)
+        received = []
+        event_bus.subscribe('#', lambda topic, data: received.append(topic), with_topic=True)
+
+        # No orchestrator yet - the caller keeps its file drop
+        client = EventBusClient(socket_path)
+        assert not client.publish('watcher.event.detected', {'n': 0})
+
+        server = EventBusServer(event_bus, socket_path, logger)
+        assert server.start()
+        assert client.publish('file.moved.to.approved', {'n': 1})
+        assert client.publish('watcher.event.detected', {'n': 2})
+        assert _wait_for(lambda: received == ['watcher.event.detected'])
+        assert server.get_stats()['rejected'] == 1
+
+        # A malformed payload drops that connection only
+        bad = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        bad.connect(str(socket_path))
+        bad.sendall(_raw_frame(b'[]'))
+        assert _wait_for(lambda: server.get_stats()['errors'] == 1)
+        assert _wait_for(lambda: server.get_stats()['clients'] == 1)
+        bad.close()
+        assert client.publish('watcher.event.detected', {'n': 3})
+        assert _wait_for(lambda: received == ['watcher.event.detected'] * 2)
+
+        # Orchestrator restarts - the client reconnects on the next publish
+        server.stop()
+        assert not client.publish('watcher.event.detected', {'n': 4})
+        server = EventBusServer(event_bus, socket_path, logger)
+        assert server.start()
+        assert client.publish('watcher.event.detected', {'n': 5})
+        assert _wait_for(lambda: len(received) == 3)
+
+        client.close()
+        server.stop()
+
+    print("✓ Only watcher topics are forwarded; clients fall back and reconnect")
+
+
+def main():
+    """Run all tests"""
+    print("=" * 60)
+    print("EVENT TRANSPORT TEST SUITE")
+    print("=" * 60)
+
+    try:
+        test_framing()
+        test_cross_process_publish()
+        test_topic_filter_and_fallback()
+
+        print("\n" + "=" * 60)
+        print("ALL TESTS PASSED ✓")
+        print("=" * 60)
+
+    except AssertionError as e:
+        print(f"\n✗ TEST FAILED: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n✗ ERROR: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
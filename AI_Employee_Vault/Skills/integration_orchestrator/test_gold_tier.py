@@ -286,6 +286,9 @@ def test_orchestrator_integration():
 
     print("✓ Orchestrator: Metrics tracking works")
 
+    # Never started, so stop() is a no-op - drain the audit writer here
+    orchestrator.audit_logger.close()
+
     print("✓ Orchestrator: All integration tests passed")
 
 
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""Test warm Python skill workers"""
+
+import sys
+import time
+import logging
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from Skills.integration_orchestrator.skills import SkillDispatcher, PythonSkillPool
+
+logger = logging.getLogger("test_python_skill_pool")
+
+ECHO_SKILL = '''
+import os
+import sys
+import json
+
+LOADED_AT = os.getpid()
+calls = []
+
+def main():
+    calls.append(sys.argv[1:])
+    print(json.dumps({'args': sys.argv[1:], 'pid': LOADED_AT, 'calls': len(calls), 'cwd': os.getcwd()}))
+    print("warning", file=sys.stderr)
+    if sys.argv[1:] == ['fail']:
+        sys.exit(3)
+    if sys.argv[1:] == ['crash']:
+        os._exit(9)
+    if sys.argv[1:] == ['raise']:
+        raise RuntimeError("boom")
+
+if __name__ == "__main__":
+    main()
+'''
+
+SLOW_SKILL = '''
+import time
+
+def main():
+    time.sleep(5)
+'''
+
+CHATTY_SKILL = '''
+import sys
+
+def main():
+    for i in range(int(sys.argv[1])):
+        if i % 1000 == 0:
+            print(f"PROGRESS: {i}")
+        print(f"line {i}")
+'''
+
+# Changes process state a later call must not see
+LEAKY_SKILL = '''
+import os
+import sys
+import json
+import logging
+
+def main():
+    print(json.dumps({'cwd': os.getcwd(), 'handlers': len(logging.getLogger().handlers),
+                      'argv': sys.argv[1:], 'path': len(sys.path)}))
+    os.chdir('/')
+    sys.path.insert(0, '/nonexistent')
+    sys.argv.append('leaked')
+    logging.basicConfig(level=logging.DEBUG)
+'''
+
+SCRIPT_SKILL = '''
+import sys
+print("no main", sys.argv[1:])
+'''
+
+
+def _skills_dir(temp_dir):
+    skills_dir = Path(temp_dir)
+    for name, source, script in [('echo_skill', ECHO_SKILL, 'index.py'),
+                                 ('slow_skill', SLOW_SKILL, 'index.py'),
+                                 ('script_skill', SCRIPT_SKILL, 'process_needs_action.py')]:
+        (skills_dir / name).mkdir()
+        (skills_dir / name / script).write_text(source)
+    return skills_dir
+
+
+def test_warm_calls_match_subprocess():
+    """Test a warm call returns what the subprocess path returns, from one long-lived process"""
+    print("\n=== Test 1: Warm Calls ===")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        skills_dir = _skills_dir(temp_dir)
+        cold = SkillDispatcher(skills_dir, logger)
+        warm = SkillDispatcher(skills_dir, logger, warm_skills=['echo_skill'])
+
+        for args in (['hello', '42'], ['fail']):
+            expected = cold.execute_skill('echo_skill', args)
+            result = warm.execute_skill('echo_skill', args)
+            assert result['success'] == expected['success']
+            assert result['returncode'] == expected['returncode']
+            assert result['stderr'] == expected['stderr'] == "warning\n"
+            assert '"args": %s' % str(args).replace("'", '"') in result['stdout']
+        assert f'"cwd": "{skills_dir / "echo_skill"}"' in result['stdout']
+
+        # Module state survives between calls: one import, one process
+        first = warm.execute_skill('echo_skill', ['a'])['stdout']
+        second = warm.execute_skill('echo_skill', ['b'])['stdout']
+        assert '"calls": 3' in first and '"calls": 4' in second
+        assert first.split('"pid": ')[1].split(',')[0] == second.split('"pid": ')[1].split(',')[0]
+
+        result = warm.execute_skill('echo_skill', ['raise'])
+        assert result['returncode'] == 1 and 'RuntimeError: boom' in result['stderr']
+
+        stats = warm.get_stats()['warm']
+        assert stats['started'] == 1 and stats['warm_calls'] == 5, stats
+        warm.close()
+
+    print("✓ Warm results match the subprocess path; module imported once")
+
+
+def test_fallbacks():
+    """Test scripts without main() and busy pools fall back to subprocesses"""
+    print("\n=== Test 2: Subprocess Fallback ===")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        skills_dir = _skills_dir(temp_dir)
+        warm = SkillDispatcher(skills_dir, logger, warm_skills=['*'])
+
+        result = warm.execute_skill('script_skill', ['x'])
+        assert result['success'] and "no main ['x']" in result['stdout']
+        assert 'script_skill' in warm.get_stats()['warm']['unavailable']
+
+        # A second call while the only worker is busy runs as a subprocess
+        pool = PythonSkillPool(logger, max_workers_per_skill=1)
+        script = skills_dir / 'echo_skill' / 'index.py'
+        worker = pool._acquire(script)
+        assert pool.execute(script, ['busy']) is None
+        pool._release(worker)
+        assert pool.execute(script, ['free'])['success']
+        assert pool.get_stats()['fallbacks'] == 1
+        pool.close()
+        warm.close()
+
+    print("✓ Script without main() and a saturated pool used subprocesses")
+
+
+def test_crash_and_timeout():
+    """Test crashed and timed-out workers fail the call and are replaced"""
+    print("\n=== Test 3: Crash and Timeout ===")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        skills_dir = _skills_dir(temp_dir)
+        pool = PythonSkillPool(logger, timeout=0.5)
+        echo = skills_dir / 'echo_skill' / 'index.py'
+
+        result = pool.execute(echo, ['crash'])
+        assert not result['success'] and 'exited' in result['stderr']
+        assert pool.execute(echo, ['again'])['success']
+
+        start = time.monotonic()
+        result = pool.execute(skills_dir / 'slow_skill' / 'index.py')
+        assert not result['success'] and 'timed out' in result['stderr']
+        assert time.monotonic() - start < 2
+
+        stats = pool.get_stats()
+        assert stats['crashed'] == 1 and stats['timeouts'] == 1 and stats['busy_workers'] == 0, stats
+        pool.close()
+
+    print("✓ Crash and timeout reported; next call got a fresh worker")
+
+
+def test_warm_output_capture():
+    """Test warm calls bound their output, spill it and stream progress lines"""
+    print("\n=== Test 4: Warm Output Capture ===")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        skills_dir = _skills_dir(temp_dir)
+        (skills_dir / 'chatty').mkdir()
+        (skills_dir / 'chatty' / 'index.py').write_text(CHATTY_SKILL)
+        progress = []
+        warm = SkillDispatcher(skills_dir, logger, warm_skills=['chatty'], output_dir=Path(temp_dir) / "output",
+                               output_head_bytes=512, output_tail_bytes=512, on_progress=progress.append)
+
+        result = warm.execute_skill('chatty', ['3000'])
+        assert result['success'] and len(result['stdout']) < 1200
+        assert result['stdout'].endswith('line 2999\n')
+        full = Path(result['output_logs']['stdout']).read_text()
+        assert full.count('\n') == 3000 + 3
+        assert [(event['stream'], event['message']) for event in progress] == \
+            [('stdout', '0'), ('stdout', '1000'), ('stdout', '2000')]
+
+        assert warm.execute_skill('chatty', ['3'])['stdout'] == 'PROGRESS: 0\nline 0\nline 1\nline 2\n'
+        assert warm.get_stats()['warm']['warm_calls'] == 2
+        warm.close()
+
+    print("✓ Warm worker kept ~1 KB of its output, spilled the rest and streamed progress")
+
+
+def test_cancel_and_errors():
+    """Test cancelling a warm call kills its worker and pool errors become error results"""
+    print("\n=== Test 5: Cancellation and Errors ===")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        skills_dir = _skills_dir(temp_dir)
+        warm = SkillDispatcher(skills_dir, logger, warm_skills=['slow_skill', 'echo_skill'])
+        assert warm.execute_skill('echo_skill', ['x'])['success']
+
+        future = warm.submit_skill('slow_skill')
+        deadline = time.time() + 10
+        while warm.get_stats()['warm']['busy_workers'] == 0 and time.time() < deadline:
+            time.sleep(0.01)
+        start = time.monotonic()
+        assert future.cancel()
+        while warm.get_stats()['warm']['busy_workers'] and time.monotonic() - start < 2:
+            time.sleep(0.01)
+        stats = warm.get_stats()
+        assert stats['warm']['busy_workers'] == 0 and stats['warm']['cancelled'] == 1, stats
+        assert stats['cancelled'] == 1
+
+        def broken(*args, **kwargs):
+            raise RuntimeError("pool broke")
+        warm.python_pool.execute = broken
+        assert warm.execute_skill('echo_skill', ['y']) == {
+            'success': False, 'returncode': -1, 'stdout': '', 'stderr': 'pool broke'}
+        warm.close()
+
+    print("✓ Cancelled warm worker killed within 2 s; pool error returned as a result")
+
+
+def test_state_reset_between_calls():
+    """Test cwd, argv, sys.path and root logging changes do not carry into the next call"""
+    print("\n=== Test 6: Per-Call Isolation ===")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        skills_dir = _skills_dir(temp_dir)
+        (skills_dir / 'leaky').mkdir()
+        (skills_dir / 'leaky' / 'index.py').write_text(LEAKY_SKILL)
+        warm = SkillDispatcher(skills_dir, logger, warm_skills=['leaky'])
+
+        first = warm.execute_skill('leaky', ['a'])['stdout']
+        second = warm.execute_skill('leaky', ['a'])['stdout']
+        assert first == second, (first, second)
+        assert f'"cwd": "{skills_dir / "leaky"}"' in first and '"argv": ["a"]' in first
+        assert warm.get_stats()['warm']['warm_calls'] == 2
+        warm.close()
+
+    print("✓ Second warm call saw the same cwd, argv, sys.path and logging as the first")
+
+
+def main():
+    """Run all tests"""
+    print("=" * 60)
+    print("PYTHON SKILL POOL TEST SUITE")
+    print("=" * 60)
+
+    try:
+        test_warm_calls_match_subprocess()
+        test_fallbacks()
+        test_crash_and_timeout()
+        test_warm_output_capture()
+        test_cancel_and_errors()
+        test_state_reset_between_calls()
+
+        print("\n" + "=" * 60)
+        print("ALL TESTS PASSED ✓")
+        print("=" * 60)
+
+    except AssertionError as e:
+        print(f"\n✗ TEST FAILED: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n✗ ERROR: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
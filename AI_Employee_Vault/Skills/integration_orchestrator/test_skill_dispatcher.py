@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""Test SkillDispatcher async execution"""
+
+import sys
+import time
+import asyncio
+import logging
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from Skills.integration_orchestrator.skills import SkillDispatcher
+from Skills.integration_orchestrator.skills.output_capture import OutputCapture
+
+logger = logging.getLogger("test_skill_dispatcher")
+
+# Records start/end times so overlap can be measured from the outside
+SLEEP_SKILL = '''
+import sys
+import time
+from pathlib import Path
+
+log = Path(sys.argv[1])
+with open(log, 'a') as f:
+    f.write(f"start {time.time()}\\n")
+time.sleep(float(sys.argv[2]))
+with open(log, 'a') as f:
+    f.write(f"end {time.time()}\\n")
+print("slept", sys.argv[2])
+'''
+
+
+# Prints sys.argv[1] numbered lines with progress lines, then a long stderr line
+CHATTY_SKILL = '''
+import sys
+
+for i in range(int(sys.argv[1])):
+    print(f"line {i:06d}")
+    if i % 1000 == 0:
+        print(f"PROGRESS: {i}/{sys.argv[1]}", flush=True)
+print("x" * 5000, file=sys.stderr)
+'''
+
+
+def _skills_dir(temp_dir):
+    skills_dir = Path(temp_dir)
+    for name in ('sleep_a', 'sleep_b'):
+        (skills_dir / name).mkdir()
+        (skills_dir / name / 'index.py').write_text(SLEEP_SKILL)
+    (skills_dir / 'failing').mkdir()
+    (skills_dir / 'failing' / 'run.sh').write_text('echo bad >&2; exit 4\n')
+    (skills_dir / 'chatty').mkdir()
+    (skills_dir / 'chatty' / 'index.py').write_text(CHATTY_SKILL)
+    return skills_dir
+
+
+def _max_overlap(log: Path) -> int:
+    events = []
+    for line in log.read_text().splitlines():
+        kind, at = line.split()
+        events.append((float(at), 1 if kind == 'start' else -1))
+    running = peak = 0
+    for _, delta in sorted(events):
+        running += delta
+        peak = max(peak, running)
+    return peak
+
+
+def test_submit_returns_immediately():
+    """Test submit_skill returns a Future at once and results match the blocking API"""
+    print("\n=== Test 1: Futures ===")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        skills_dir = _skills_dir(temp_dir)
+        dispatcher = SkillDispatcher(skills_dir, logger)
+        log = Path(temp_dir) / "a.log"
+
+        start = time.monotonic()
+        future = dispatcher.submit_skill('sleep_a', [log, 0.3])
+        assert time.monotonic() - start < 0.1
+        assert not future.done()
+        result = future.result(timeout=5)
+        assert result == {'success': True, 'returncode': 0, 'stdout': 'slept 0.3\n', 'stderr': ''}
+
+        failed = dispatcher.execute_skill('failing')
+        assert failed == {'success': False, 'returncode': 4, 'stdout': '', 'stderr': 'bad\n'}
+        assert 'Skill not found' in dispatcher.execute_skill('missing')['stderr']
+        assert dispatcher.get_stats()['completed'] == 2
+        dispatcher.close()
+
+    print(f"✓ submit_skill returned in {(time.monotonic() - start) * 1000:.0f} ms before the skill finished")
+
+
+def test_concurrency_limits():
+    """Test the global and per-skill semaphores bound concurrent processes"""
+    print("\n=== Test 2: Concurrency Limits ===")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        skills_dir = _skills_dir(temp_dir)
+        dispatcher = SkillDispatcher(skills_dir, logger, max_concurrent=3,
+                                     skill_limits={'sleep_a': 1}, default_skill_limit=4)
+        log = Path(temp_dir) / "shared.log"
+        log_a = Path(temp_dir) / "a.log"
+
+        futures = [dispatcher.submit_skill('sleep_a', [log_a, 0.2]) for _ in range(3)]
+        futures += [dispatcher.submit_skill('sleep_b', [log, 0.2]) for _ in range(4)]
+        time.sleep(0.1)
+        stats = dispatcher.get_stats()
+        assert stats['running'] == 3 and stats['waiting'] == 4, stats
+        assert all(future.result(timeout=10)['success'] for future in futures)
+
+        assert _max_overlap(log_a) == 1
+        # sleep_b could take the two global slots sleep_a was not allowed to use
+        assert _max_overlap(log) <= 3
+        dispatcher.close()
+
+    print("✓ sleep_a ran one at a time; never more than 3 processes overall")
+
+
+def test_cancellation():
+    """Test cancelling a running Future kills its process and frees the slot"""
+    print("\n=== Test 3: Cancellation ===")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        skills_dir = _skills_dir(temp_dir)
+        dispatcher = SkillDispatcher(skills_dir, logger, skill_limits={'sleep_a': 1})
+        log = Path(temp_dir) / "a.log"
+
+        running = dispatcher.submit_skill('sleep_a', [log, 30])
+        queued = dispatcher.submit_skill('sleep_a', [log, 30])
+        deadline = time.time() + 5
+        while not log.exists() and time.time() < deadline:
+            time.sleep(0.01)
+
+        assert queued.cancel() and running.cancel()
+        assert running.cancelled()
+        follow_up = dispatcher.submit_skill('sleep_a', [log, 0])
+        assert follow_up.result(timeout=5)['success']
+        assert log.read_text().count('start') == 2 and log.read_text().count('end') == 1
+
+        stats = dispatcher.get_stats()
+        assert stats['cancelled'] == 2 and stats['running'] == 0 and stats['waiting'] == 0, stats
+        dispatcher.close()
+
+    print("✓ Cancelled skill killed before finishing; queued one never started")
+
+
+def test_async_api_and_timeout():
+    """Test execute_skill_async on a caller's loop and the timeout kill"""
+    print("\n=== Test 4: Async API ===")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        skills_dir = _skills_dir(temp_dir)
+        dispatcher = SkillDispatcher(skills_dir, logger, timeout=0.3)
+        log = Path(temp_dir) / "a.log"
+
+        async def run_both():
+            return await asyncio.gather(dispatcher.execute_skill_async('sleep_a', [log, 0]),
+                                        dispatcher.execute_skill_async('sleep_b', [log, 5]))
+
+        start = time.monotonic()
+        quick, slow = asyncio.run(run_both())
+        assert quick['success']
+        assert not slow['success'] and slow['stderr'] == 'Skill execution timed out (0.3s)'
+        assert time.monotonic() - start < 2
+        assert dispatcher.get_stats()['timeouts'] == 1
+        dispatcher.close()
+
+    print("✓ Coroutines awaited on the caller's loop; slow skill killed at its timeout")
+
+
+def test_bounded_output():
+    """Test output is kept as head + tail, spilled in full and progress forwarded live"""
+    print("\n=== Test 5: Bounded Output ===")
+
+    capture = OutputCapture(head_bytes=4, tail_bytes=6)
+    for chunk in (b'ab', b'cdef', b'ghijklmnop', b'qr'):
+        capture.write(chunk)
+    assert capture.getvalue() == 'abcd\n... [8 bytes omitted] ...\nmnopqr'
+    small = OutputCapture(head_bytes=4, tail_bytes=6)
+    small.write(b'0123456789')
+    assert small.getvalue() == '0123456789' and not small.truncated
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        skills_dir = _skills_dir(temp_dir)
+        output_dir = Path(temp_dir) / "output"
+        progress = []
+        dispatcher = SkillDispatcher(skills_dir, logger, output_dir=output_dir,
+                                     output_head_bytes=1024, output_tail_bytes=1024,
+                                     max_output_logs=2, on_progress=progress.append)
+
+        result = dispatcher.execute_skill('chatty', [5000])
+        assert result['success']
+        assert len(result['stdout']) < 2200 and result['stdout'].startswith('line 000000\n')
+        assert result['stdout'].endswith('line 004999\n') and ' bytes omitted; full output in ' in result['stdout']
+        full = Path(result['output_logs']['stdout']).read_text()
+        assert full.count('\n') == 5005 and full.startswith('line 000000') and 'line 002500\n' in full
+        assert len(Path(result['output_logs']['stderr']).read_text()) == 5001
+        assert [event['message'] for event in progress] == [f"{i}/5000" for i in range(0, 5000, 1000)]
+        assert progress[0]['skill_name'] == 'chatty' and progress[0]['stream'] == 'stdout'
+
+        # Output that fits creates no files
+        assert dispatcher.execute_skill('sleep_a', [Path(temp_dir) / "a.log", 0]).get('output_logs') is None
+        for _ in range(2):
+            dispatcher.execute_skill('chatty', [5000])
+        assert len(list((output_dir / 'chatty').glob('*.log'))) == 2
+
+        stats = dispatcher.get_stats()
+        assert stats['spilled_outputs'] == 6 and stats['truncated_outputs'] == 6, stats
+        assert stats['progress_lines'] == 15, stats
+        dispatcher.close()
+
+    print("✓ ~2 KB kept of 60 KB output; full output spilled; 5 progress lines forwarded")
+
+
+def main():
+    """Run all tests"""
+    print("=" * 60)
+    print("SKILL DISPATCHER TEST SUITE")
+    print("=" * 60)
+
+    try:
+        test_submit_returns_immediately()
+        test_concurrency_limits()
+        test_cancellation()
+        test_async_api_and_timeout()
+        test_bounded_output()
+
+        print("\n" + "=" * 60)
+        print("ALL TESTS PASSED ✓")
+        print("=" * 60)
+
+    except AssertionError as e:
+        print(f"\n✗ TEST FAILED: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n✗ ERROR: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
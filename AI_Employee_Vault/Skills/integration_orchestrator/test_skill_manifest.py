@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""Test SkillManifest cached skill resolution"""
+
+import os
+import sys
+import json
+import logging
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from Skills.integration_orchestrator.skills import SkillDispatcher, SkillManifest, SkillRegistry
+from Skills.integration_orchestrator.core import MCPServerManager
+
+logger = logging.getLogger("test_skill_manifest")
+
+
+def _touch_later(path: Path):
+    """Bump a path's mtime past the filesystem's timestamp granularity"""
+    stat = path.stat()
+    os.utime(path, (stat.st_atime, stat.st_mtime + 5))
+
+
+def _skills_dir(temp_dir):
+    skills_dir = Path(temp_dir)
+    (skills_dir / 'py_skill').mkdir()
+    (skills_dir / 'py_skill' / 'index.py').write_text("print('py')\n")
+    (skills_dir / 'sh_skill').mkdir()
+    (skills_dir / 'sh_skill' / 'run.sh').write_text("echo sh\n")
+    (skills_dir / 'sh_skill' / 'skill.json').write_text(json.dumps({'name': 'sh_skill', 'version': '1.0'}))
+    (skills_dir / 'docs_only').mkdir()
+    (skills_dir / 'docs_only' / 'README.md').write_text("no entrypoint\n")
+    (skills_dir / '.hidden').mkdir()
+    return skills_dir
+
+
+def test_resolution_and_cache():
+    """Test entries match the dispatcher's lookup order and are served from memory"""
+    print("\n=== Test 1: Resolution and Cache ===")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        skills_dir = _skills_dir(temp_dir)
+        manifest = SkillManifest(skills_dir, logger, check_interval=60)
+
+        entry = manifest.get('sh_skill')
+        assert entry['interpreter'] == 'bash' and entry['entrypoint'] == skills_dir / 'sh_skill' / 'run.sh'
+        assert entry['cwd'] == skills_dir / 'sh_skill'
+        assert entry['metadata'] == {'name': 'sh_skill', 'version': '1.0'}
+        assert manifest.get('py_skill')['interpreter'] == 'python3'
+        assert manifest.get('docs_only')['entrypoint'] is None
+        assert manifest.get('missing') is None
+
+        for _ in range(100):
+            assert manifest.get('sh_skill') is entry
+        stats = manifest.get_stats()
+        assert stats['resolved'] == 3 and stats['hits'] == 100, stats
+        assert sorted(manifest.all()) == ['docs_only', 'py_skill', 'sh_skill']
+
+    print("✓ 100 lookups served from memory; hidden directories skipped")
+
+
+def test_mtime_invalidation_and_reload():
+    """Test new files, skill.json edits and reload() re-resolve an entry"""
+    print("\n=== Test 2: Invalidation ===")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        skills_dir = _skills_dir(temp_dir)
+        manifest = SkillManifest(skills_dir, logger, check_interval=0)
+
+        assert manifest.get('py_skill')['interpreter'] == 'python3'
+        (skills_dir / 'py_skill' / 'index.js').write_text("console.log('js')\n")
+        _touch_later(skills_dir / 'py_skill')
+        assert manifest.get('py_skill')['interpreter'] == 'node'
+
+        (skills_dir / 'sh_skill' / 'skill.json').write_text(json.dumps({'version': '2.0'}))
+        _touch_later(skills_dir / 'sh_skill' / 'skill.json')
+        assert manifest.get('sh_skill')['metadata'] == {'version': '2.0'}
+
+        (skills_dir / 'new_skill').mkdir()
+        (skills_dir / 'new_skill' / 'run.sh').write_text("echo new\n")
+        _touch_later(skills_dir)
+        assert 'new_skill' in manifest.all()
+
+        # Within check_interval a change is only seen after reload()
+        cached = SkillManifest(skills_dir, logger, check_interval=60)
+        assert cached.get('docs_only')['entrypoint'] is None
+        (skills_dir / 'docs_only' / 'run.sh').write_text("echo docs\n")
+        _touch_later(skills_dir / 'docs_only')
+        assert cached.get('docs_only')['entrypoint'] is None
+        cached.reload('docs_only')
+        assert cached.get('docs_only')['interpreter'] == 'bash'
+        assert cached.get_stats()['reloads'] == 1
+
+    print("✓ Added entrypoint, edited skill.json, new skill and reload() all picked up")
+
+
+def test_shared_by_components():
+    """Test the dispatcher, registry and MCP manager use one manifest"""
+    print("\n=== Test 3: Shared Manifest ===")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        skills_dir = _skills_dir(temp_dir)
+        (skills_dir / 'sh_skill' / 'skill.json').write_text(json.dumps(
+            {'version': '1.0', 'mcp': {'server': 'notification', 'action_map': {'send': 'send_email'}}}))
+        manifest = SkillManifest(skills_dir, logger, check_interval=60)
+        dispatcher = SkillDispatcher(skills_dir, logger, manifest=manifest)
+        registry = SkillRegistry(dispatcher, None, None, None, logger)
+        mcp_manager = MCPServerManager(logger, base_dir=skills_dir.parent, skill_manifest=manifest)
+
+        assert registry.discover_skills() == 2
+        assert registry.skill_metadata['sh_skill']['metadata']['version'] == '1.0'
+        assert 'docs_only' not in registry.skill_metadata
+
+        assert dispatcher.execute_skill('sh_skill')['stdout'] == 'sh\n'
+        assert 'No executable found' in dispatcher.execute_skill('docs_only')['stderr']
+        assert mcp_manager._mapping('sh_skill')['server'] == 'notification'
+        assert mcp_manager._mapping('accounting_core')['server'] == 'accounting'
+
+        # A skill.json mapping without a server is rejected, not a KeyError
+        (skills_dir / 'py_skill' / 'skill.json').write_text(json.dumps({'mcp': {'action_map': {}}}))
+        manifest.reload('py_skill')
+        assert mcp_manager._mapping('py_skill') is None
+        assert 'No MCP mapping' in mcp_manager.execute_via_mcp('py_skill')['error']
+
+        # Invalid or non-object skill.json reads as no metadata, not a failed discovery
+        for content in ('{not json', '[]', '"x"'):
+            (skills_dir / 'py_skill' / 'skill.json').write_text(content)
+            manifest.reload('py_skill')
+            assert manifest.get('py_skill')['metadata'] == {}
+            assert mcp_manager._mapping('py_skill') is None
+            assert registry.discover_skills() == 2
+
+        resolved = manifest.get_stats()['resolved']
+        dispatcher.execute_skill('sh_skill')
+        assert manifest.get_stats()['resolved'] == resolved
+        assert dispatcher.get_stats()['manifest']['skills'] == 3
+        dispatcher.close()
+
+    print("✓ One resolution per skill across dispatcher, registry and MCP manager")
+
+
+def main():
+    """Run all tests"""
+    print("=" * 60)
+    print("SKILL MANIFEST TEST SUITE")
+    print("=" * 60)
+
+    try:
+        test_resolution_and_cache()
+        test_mtime_invalidation_and_reload()
+        test_shared_by_components()
+
+        print("\n" + "=" * 60)
+        print("ALL TESTS PASSED ✓")
+        print("=" * 60)
+
+    except AssertionError as e:
+        print(f"\n✗ TEST FAILED: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n✗ ERROR: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+"""Test StateManager persistence modes"""
+
+import sys
+import json
+import time
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from Skills.integration_orchestrator.core import StateManager
+
+
+def test_legacy_snapshot_loads():
+    """Test that existing state.json layouts still load in journal mode"""
+    print("\n=== Test 1: Legacy Snapshot Loading ===")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        # Old format - bare processed events map
+        old_file = Path(tmpdir) / "old_state.json"
+        old_file.write_text(json.dumps({'evt_1': {'file': 'a.md'}}))
+        state_manager = StateManager(old_file, journal=True)
+        assert state_manager.is_processed('evt_1')
+        assert state_manager.system_state == {}
+
+        # Current format
+        new_file = Path(tmpdir) / "state.json"
+        new_file.write_text(json.dumps({
+            'processed_events': {'evt_2': {}},
+            'system_state': {'last_startup': 'x'},
+            'metrics': {'total_startups': {'value': 3}},
+        }))
+        state_manager = StateManager(new_file, journal=True)
+        assert state_manager.is_processed('evt_2')
+        assert state_manager.get_system_state('last_startup') == 'x'
+        assert state_manager.get_metric('total_startups')['value'] == 3
+
+        print("✓ Old and new snapshot formats load with journaling enabled")
+
+
+def test_journal_replay():
+    """Test that mutations survive a restart via the journal"""
+    print("\n=== Test 2: Journal Replay ===")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        state_file = Path(tmpdir) / "state.json"
+
+        state_manager = StateManager(state_file, journal=True)
+        state_manager.mark_processed('evt_1', {'file': 'a.md'})
+        state_manager.set_system_state('mode', 'autonomous')
+        state_manager.increment_counter('skills_started')
+        state_manager.increment_counter('skills_started', 2)
+        state_manager.update_metric('queue_depth', 7)
+
+        # Nothing was compacted yet - only the journal was written
+        assert not state_file.exists(), "Snapshot should not be rewritten per mutation"
+        assert state_manager.storage.journal_file.exists()
+
+        reloaded = StateManager(state_file, journal=True)
+        assert reloaded.is_processed('evt_1')
+        assert reloaded.get_system_state('mode') == 'autonomous'
+        assert reloaded.get_metric('skills_started')['value'] == 3
+        assert reloaded.get_metric('queue_depth')['value'] == 7
+
+        print("✓ Snapshot + journal replay restores all mutations")
+
+
+def test_compaction():
+    """Test journal compaction into a snapshot"""
+    print("\n=== Test 3: Compaction ===")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        state_file = Path(tmpdir) / "state.json"
+
+        state_manager = StateManager(state_file, journal=True, compact_threshold=10)
+        for i in range(25):
+            state_manager.mark_processed(f'evt_{i}', {})
+
+        # 25 records with threshold 10 -> two compactions, 5 records left
+        assert state_file.exists()
+        assert state_manager.storage._journal_records == 5
+
+        state_manager.close()
+        assert not state_manager.storage.journal_file.exists()
+
+        data = json.loads(state_file.read_text())
+        assert len(data['processed_events']) == 25
+
+        reloaded = StateManager(state_file)
+        assert all(reloaded.is_processed(f'evt_{i}') for i in range(25))
+
+        print("✓ Journal compacts into a snapshot readable without journaling")
+
+
+def test_compact_interval():
+    """Test the snapshot is rewritten on a timer so direct readers stay current"""
+    print("\n=== Test 4: Timed Compaction ===")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        state_file = Path(tmpdir) / "state.json"
+
+        state_manager = StateManager(state_file, journal=True, flush_interval=0.02,
+                                     compact_interval=0.1)
+        for i in range(5):
+            state_manager.mark_processed(f'evt_{i}', {})
+        state_manager.set_system_state('last_check', 'now')
+
+        # Far below compact_threshold, and before close()
+        deadline = time.time() + 2
+        while time.time() < deadline and not state_file.exists():
+            time.sleep(0.01)
+        data = json.loads(state_file.read_text())
+        assert len(data['processed_events']) == 5
+        assert data['system_state']['last_check'] == 'now'
+        assert not state_manager.storage.journal_file.exists()
+
+        # Without mutations the snapshot is not rewritten again
+        mtime = state_file.stat().st_mtime_ns
+        time.sleep(0.2)
+        assert state_file.stat().st_mtime_ns == mtime
+        state_manager.close()
+
+    print("✓ Journal folded into state.json within compact_interval")
+
+
+def test_truncated_journal_record():
+    """Test that a torn trailing journal record is ignored"""
+    print("\n=== Test 5: Truncated Journal Record ===")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        state_file = Path(tmpdir) / "state.json"
+
+        state_manager = StateManager(state_file, journal=True)
+        state_manager.mark_processed('evt_1', {})
+        state_manager.storage._journal_handle.write('{"t":"processed_events","k":"evt_')
+        state_manager.storage._journal_handle.flush()
+
+        reloaded = StateManager(state_file, journal=True)
+        assert reloaded.is_processed('evt_1')
+        assert len(reloaded.processed_events) == 1
+
+        print("✓ Torn journal tail is skipped on replay")
+
+
+def test_sqlite_backend():
+    """Test SQLite backend persistence and single-row operations"""
+    print("\n=== Test 6: SQLite Backend ===")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        state_file = Path(tmpdir) / "state.json"
+
+        state_manager = StateManager(state_file, backend='sqlite')
+        state_manager.mark_processed('evt_1', {'file': 'a.md'})
+        state_manager.set_system_state('circuit_breakers', {'gmail': {'state': 'closed'}})
+        state_manager.increment_counter('skills_started')
+        state_manager.increment_counter('skills_started')
+        state_manager.close()
+
+        assert (Path(tmpdir) / "state.db").exists()
+        assert not state_file.exists(), "SQLite backend must not write state.json"
+
+        reloaded = StateManager(state_file, backend='sqlite')
+        assert reloaded.is_processed('evt_1')
+        assert not reloaded.is_processed('evt_2')
+        assert reloaded.get_system_state('circuit_breakers')['gmail']['state'] == 'closed'
+        assert reloaded.get_system_state('missing', 'default') == 'default'
+        assert reloaded.get_metric('skills_started')['value'] == 2
+        assert reloaded.processed_events['evt_1']['file'] == 'a.md'
+        reloaded.close()
+
+        # A corrupt database is moved aside and the manager starts empty
+        db_file = Path(tmpdir) / "state.db"
+        db_file.write_bytes(b"not a database" * 100)
+        recovered = StateManager(state_file, backend='sqlite')
+        assert not recovered.is_processed('evt_1')
+        recovered.mark_processed('evt_3', {})
+        recovered.close()
+        assert (Path(tmpdir) / "state.db.corrupt").exists()
+        reopened = StateManager(state_file, backend='sqlite')
+        assert reopened.is_processed('evt_3')
+        reopened.close()
+
+        print("✓ SQLite backend persists processed events, state and counters")
+
+
+def test_sqlite_migration():
+    """Test migration of an existing state.json (plus journal) into SQLite"""
+    print("\n=== Test 7: JSON -> SQLite Migration ===")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        state_file = Path(tmpdir) / "state.json"
+
+        json_manager = StateManager(state_file, journal=True)
+        for i in range(10):
+            json_manager.mark_processed(f'evt_{i}', {})
+        json_manager.compact()
+        json_manager.set_system_state('last_startup', 'yesterday')  # journal only
+        json_manager.increment_counter('total_startups', 4)
+
+        sqlite_manager = StateManager(state_file, backend='sqlite')
+        assert all(sqlite_manager.is_processed(f'evt_{i}') for i in range(10))
+        assert sqlite_manager.get_system_state('last_startup') == 'yesterday'
+        assert sqlite_manager.get_metric('total_startups')['value'] == 4
+
+        # Migration runs once - later JSON edits are not re-imported
+        sqlite_manager.set_system_state('last_startup', 'today')
+        sqlite_manager.close()
+        json_manager.mark_processed('evt_late', {})
+
+        reopened = StateManager(state_file, backend='sqlite')
+        assert reopened.get_system_state('last_startup') == 'today'
+        assert not reopened.is_processed('evt_late')
+        reopened.close()
+
+        print("✓ Existing JSON state migrates into SQLite exactly once")
+
+
+def test_group_commit():
+    """Test group-commit flushing, explicit flush and durable writes"""
+    print("\n=== Test 8: Group Commit ===")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        state_file = Path(tmpdir) / "state.json"
+
+        state_manager = StateManager(state_file, flush_interval=60)
+        for i in range(100):
+            state_manager.increment_counter('skills_started')
+
+        # Flusher has not run yet - nothing on disk
+        assert not state_file.exists()
+        stats = state_manager.get_persistence_stats()
+        assert stats['mode'] == 'group_commit'
+        assert stats['pending_mutations'] == 100
+        assert stats['writes'] == 0
+
+        state_manager.flush()
+        stats = state_manager.get_persistence_stats()
+        assert stats['writes'] == 1
+        assert stats['writes_avoided'] == 99
+        assert json.loads(state_file.read_text())['metrics']['skills_started']['value'] == 100
+
+        # durable=True bypasses the flusher for this call
+        state_manager.set_system_state('last_shutdown', 'now', durable=True)
+        assert json.loads(state_file.read_text())['system_state']['last_shutdown'] == 'now'
+
+        # close() flushes whatever is pending
+        state_manager.mark_processed('evt_1', {})
+        state_manager.close()
+        assert StateManager(state_file).is_processed('evt_1')
+
+        print("✓ Mutations coalesce into one write; flush/durable/close persist")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        state_file = Path(tmpdir) / "state.json"
+
+        state_manager = StateManager(state_file, backend='sqlite', flush_interval=0.05)
+        state_manager.mark_processed('evt_1', {})
+        time.sleep(0.3)
+        assert state_manager.get_persistence_stats()['pending_mutations'] == 0
+        state_manager.close()
+
+        print("✓ Background flusher commits on its interval")
+
+
+def test_retention_and_bloom_filter():
+    """Test max-entry/TTL eviction and the Bloom filter fast path"""
+    print("\n=== Test 9: Retention and Bloom Filter ===")
+
+    for backend in ('json', 'sqlite'):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            state_file = Path(tmpdir) / "state.json"
+
+            state_manager = StateManager(state_file, backend=backend, journal=True,
+                                         max_processed_events=50, bloom_filter=True)
+            for i in range(120):
+                state_manager.mark_processed(f'evt_{i}', {})
+            # Re-marking moves an entry to the newest position
+            state_manager.mark_processed('evt_70', {})
+            state_manager.mark_processed('evt_120', {})
+
+            stats = state_manager.get_retention_stats()
+            assert stats['processed_events'] == 50
+            assert stats['evicted'] == 71
+            assert not state_manager.is_processed('evt_0')
+            assert not state_manager.is_processed('evt_71')
+            assert state_manager.is_processed('evt_70')
+            assert state_manager.is_processed('evt_119')
+
+            before = state_manager.get_retention_stats()['bloom_negatives']
+            assert not state_manager.is_processed('never_seen')
+            assert state_manager.get_retention_stats()['bloom_negatives'] == before + 1
+            state_manager.close()
+
+            reloaded = StateManager(state_file, backend=backend, journal=True, bloom_filter=True)
+            assert reloaded.get_retention_stats()['processed_events'] == 50
+            assert reloaded.is_processed('evt_70') and not reloaded.is_processed('evt_0')
+            reloaded.close()
+
+            print(f"✓ [{backend}] oldest entries evicted past max_processed_events")
+
+    for backend in ('json', 'sqlite'):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            state_file = Path(tmpdir) / "state.json"
+            # Legacy files are not in age order and may lack processed_at
+            state_file.write_text(json.dumps({
+                'processed_events': {
+                    'new': {'processed_at': '2999-01-01T00:00:00Z'},
+                    'old': {'processed_at': '2020-01-01T00:00:00Z'},
+                    'unstamped': {'file': 'a.md'},
+                },
+                'system_state': {},
+                'metrics': {},
+            }))
+
+            state_manager = StateManager(state_file, backend=backend, processed_ttl=86400)
+            assert not state_manager.is_processed('old')
+            assert state_manager.is_processed('new')
+            assert state_manager.is_processed('unstamped')
+            state_manager.close()
+
+        print("✓ Entries older than processed_ttl are evicted on load")
+
+
+def test_namespaces():
+    """Test independently persisted state namespaces"""
+    print("\n=== Test 10: State Namespaces ===")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        state_file = Path(tmpdir) / "state.json"
+
+        # Legacy whole-map value in system_state is moved into the namespace
+        state_manager = StateManager(state_file, journal=True)
+        state_manager.set_system_state('circuit_breakers', {'gmail': {'state': 'open'}})
+        breakers = state_manager.namespace('circuit_breakers')
+        assert state_manager.namespace('circuit_breakers') is breakers
+        assert breakers.get('gmail')['state'] == 'open'
+        assert state_manager.get_system_state('circuit_breakers') is None
+
+        breakers.set('odoo', {'state': 'closed'})
+        main_journal = Path(tmpdir) / "state.json.journal"
+        size_before = main_journal.stat().st_size
+        breakers.set('gmail', {'state': 'closed'})
+        assert main_journal.stat().st_size == size_before, "Namespace writes must not touch the main store"
+        state_manager.close()
+
+        assert (Path(tmpdir) / "state.circuit_breakers.json").exists()
+
+        reloaded = StateManager(state_file, journal=True)
+        breakers = reloaded.namespace('circuit_breakers')
+        assert breakers.items() == {'gmail': {'state': 'closed'}, 'odoo': {'state': 'closed'}}
+        breakers.delete('odoo')
+        assert 'odoo' not in breakers
+        reloaded.close()
+
+        sqlite_manager = StateManager(state_file, backend='sqlite')
+        posts = sqlite_manager.namespace('scheduled_posts')
+        posts.set('p1', {'status': 'scheduled'})
+        sqlite_manager.close()
+        assert (Path(tmpdir) / "state.scheduled_posts.db").exists()
+
+        try:
+            sqlite_manager.namespace('../escape')
+            assert False, "Invalid namespace names must be rejected"
+        except ValueError:
+            pass
+
+        print("✓ Namespaces persist, lock and migrate independently")
+
+
+def main():
+    """Run all tests"""
+    print("=" * 60)
+    print("STATE MANAGER TEST SUITE")
+    print("=" * 60)
+
+    try:
+        test_legacy_snapshot_loads()
+        test_journal_replay()
+        test_compaction()
+        test_compact_interval()
+        test_truncated_journal_record()
+        test_sqlite_backend()
+        test_sqlite_migration()
+        test_group_commit()
+        test_retention_and_bloom_filter()
+        test_namespaces()
+
+        print("\n" + "=" * 60)
+        print("ALL TESTS PASSED ✓")
+        print("=" * 60)
+
+    except AssertionError as e:
+        print(f"\n✗ TEST FAILED: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n✗ ERROR: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
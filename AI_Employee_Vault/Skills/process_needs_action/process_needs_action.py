@@ -422,6 +422,10 @@ estimated_complexity: {analysis['complexity']}
         self.log(f"=== Processing Complete ===")
         self.log(f"Success: {success_count}, Failures: {failure_count}")
 
-if __name__ == "__main__":
+def main():
+    """CLI entry point (also run in-process by the orchestrator's warm skill workers)"""
     skill = ProcessNeedsActionSkill()
     skill.run()
+
+if __name__ == "__main__":
+    main()
@@ -33,6 +33,7 @@ Usage:
 import os
 import sys
 import json
+import gzip
 import argparse
 import hashlib
 from pathlib import Path
@@ -71,6 +72,8 @@ class WeeklyCEOBriefing:
         self.ledger_file = self.data_dir / "ledger.json"
         self.state_file = base_dir / "Skills" / "integration_orchestrator" / "state.json"
         self.audit_file = self.logs_dir / "audit.jsonl"
+        self.audit_manifest_file = self.logs_dir / "audit-manifest.json"
+        self.audit_rollup_file = self.logs_dir / "audit-rollups.jsonl"
 
         # Create directories
         if not dry_run:
@@ -193,32 +196,73 @@ class WeeklyCEOBriefing:
         Returns:
             List of audit log entries
         """
-        if not self.audit_file.exists():
-            return []
-
         logs = []
 
         try:
-            with open(self.audit_file, 'r') as f:
-                for line in f:
-                    try:
-                        entry = json.loads(line.strip())
+            for path in self._audit_files_for_range(start_date, end_date):
+                opener = gzip.open if path.suffix == '.gz' else open
+                with opener(path, 'rt') as f:
+                    for line in f:
+                        try:
+                            entry = json.loads(line.strip())
 
-                        # Parse timestamp
-                        entry_time = datetime.fromisoformat(entry['timestamp'].replace('Z', '+00:00'))
+                            # Parse timestamp
+                            entry_time = datetime.fromisoformat(entry['timestamp'].replace('Z', '+00:00'))
 
-                        # Check if in range
-                        if start_date <= entry_time <= end_date:
-                            logs.append(entry)
+                            # Check if in range
+                            if start_date <= entry_time <= end_date:
+                                logs.append(entry)
 
-                    except (json.JSONDecodeError, KeyError, ValueError):
-                        continue
+                        except (json.JSONDecodeError, KeyError, ValueError):
+                            continue
 
         except Exception as e:
             print(f"Warning: Could not load audit logs: {e}")
 
         return logs
 
+    def _audit_files_for_range(self, start_date: datetime, end_date: datetime) -> List[Path]:
+        """
+        Get audit files that may hold entries in the date range
+
+        Uses the AuditLogger segment manifest when present so only segments
+        overlapping the range are read; otherwise falls back to audit.jsonl.
+
+        Args:
+            start_date: Start of range
+            end_date: End of range
+
+        Returns:
+            List of audit file paths, oldest first
+        """
+        if not self.audit_manifest_file.exists():
+            return [self.audit_file] if self.audit_file.exists() else []
+
+        with open(self.audit_manifest_file, 'r') as f:
+            segments = json.load(f).get('segments', [])
+
+        def parse(value):
+            return datetime.fromisoformat(value.replace('Z', '+00:00')) if value else None
+
+        files = []
+        for index, segment in enumerate(segments):
+            seg_start = parse(segment.get('start'))
+            # The newest segment may have grown since the manifest was written
+            seg_end = parse(segment.get('end')) if index < len(segments) - 1 else None
+
+            if seg_start and seg_start > end_date:
+                continue
+            if seg_end and seg_end < start_date:
+                continue
+
+            path = self.logs_dir / segment['file']
+            if not path.exists() and (self.logs_dir / (segment['file'] + '.gz')).exists():
+                path = self.logs_dir / (segment['file'] + '.gz')
+            if path.exists():
+                files.append(path)
+
+        return files
+
     def _analyze_accounting_data(self, ledger: Dict, start_date: datetime, end_date: datetime) -> Dict:
         """
         Analyze accounting data for the week
@@ -285,6 +329,77 @@ class WeeklyCEOBriefing:
             'transaction_count': txn_count
         }
 
+    def _load_audit_rollups(self, start_date: datetime, end_date: datetime) -> Optional[Dict]:
+        """
+        Load hourly audit rollup counts for date range
+
+        Prefers the live AuditLogger when attached; otherwise replays the
+        AuditLogger rollup journal (Logs/audit-rollups.jsonl) and counts the
+        entries appended since its last checkpoint.
+
+        Args:
+            start_date: Start of range
+            end_date: End of range
+
+        Returns:
+            Rollup summary with per-type/actor/result counts, or None when
+            no rollups are available
+        """
+        get_summary = getattr(self.audit_logger, 'get_rollup_summary', None)
+        if get_summary:
+            try:
+                summary = get_summary(start_date, end_date)
+                if summary is not None:
+                    return summary
+            except Exception as e:
+                print(f"Warning: Could not read audit rollups from AuditLogger: {e}")
+
+        if not self.audit_rollup_file.exists():
+            return None
+
+        try:
+            vault_dir = str(Path(__file__).resolve().parent.parent.parent)
+            if vault_dir not in sys.path:
+                sys.path.insert(0, vault_dir)
+            from Skills.integration_orchestrator.core.audit_rollups import AuditRollups
+
+            # Checkpoints trail the log by up to CHECKPOINT_ENTRIES entries;
+            # count those from the raw files without touching the journal
+            rollups = AuditRollups(self.audit_rollup_file, read_only=True)
+            rollups.catch_up(self._audit_files_for_range(start_date, end_date))
+            return rollups.summary(start_date, end_date)
+
+        except Exception as e:
+            print(f"Warning: Could not load audit rollups: {e}")
+            return None
+
+    def _analyze_audit_rollups(self, rollup: Dict) -> Dict:
+        """
+        Analyze hourly audit rollups for the week
+
+        Produces the same shape as _analyze_audit_logs in O(buckets).
+
+        Args:
+            rollup: Rollup summary from _load_audit_rollups
+
+        Returns:
+            Analysis dictionary
+        """
+        by_type = dict(rollup['events_by_type'])
+        skills = rollup['events_by_type_result'].get('skill_execution', {})
+        skill_executions = sum(skills.values())
+
+        return {
+            'total_events': rollup['total_events'],
+            'events_by_type': by_type,
+            'events_by_actor': dict(rollup['events_by_actor']),
+            'skill_executions': skill_executions,
+            'skill_successes': skills.get('success', 0),
+            'skill_failures': skill_executions - skills.get('success', 0),
+            'escalations': by_type.get('escalation', 0),
+            'email_actions': by_type.get('email_action', 0)
+        }
+
     def _analyze_audit_logs(self, logs: List[Dict]) -> Dict:
         """
         Analyze audit logs for the week
@@ -592,13 +707,21 @@ class WeeklyCEOBriefing:
         print("\n1. Loading data sources...")
         ledger = self._load_accounting_data()
         state = self._load_state_data()
-        audit_logs = self._load_audit_logs(week_start, week_end)
-        print(f"   ✓ Loaded {len(audit_logs)} audit log entries")
+        audit_rollup = self._load_audit_rollups(week_start, week_end)
+        if audit_rollup is not None:
+            print(f"   ✓ Loaded {audit_rollup['total_events']} audit events "
+                  f"from {audit_rollup['buckets']} hourly rollups")
+        else:
+            audit_logs = self._load_audit_logs(week_start, week_end)
+            print(f"   ✓ Loaded {len(audit_logs)} audit log entries")
 
         # Analyze data
         print("\n2. Analyzing data...")
         accounting = self._analyze_accounting_data(ledger, week_start, week_end)
-        audit = self._analyze_audit_logs(audit_logs)
+        if audit_rollup is not None:
+            audit = self._analyze_audit_rollups(audit_rollup)
+        else:
+            audit = self._analyze_audit_logs(audit_logs)
         workflows = self._get_workflow_status()
         health = self._get_system_health()
         retry = self._get_retry_queue_stats()
@@ -856,7 +979,7 @@ class WeeklyCEOBriefing:
         md.append("")
         md.append("For detailed information:")
         md.append("- Accounting: `Data/ledger.json`")
-        md.append("- Audit logs: `Logs/audit.jsonl`")
+        md.append("- Audit logs: `Logs/audit-*.jsonl` (see `Logs/audit-manifest.json`)")
         md.append("- System state: `Skills/integration_orchestrator/state.json`")
         md.append("")
         md.append("---")